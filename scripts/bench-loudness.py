@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark and validate the RDX loudness meter against reference fixtures.
+
+Usage:
+  bench-loudness.py                       # built-in EBU Tech 3341 style tones
+  bench-loudness.py take1.wav:-23.0 ...   # recorded fixtures with expected integrated LUFS
+  bench-loudness.py --block 256           # simulate a different JACK period
+
+Fixtures are 16/24/32-bit PCM WAV files; the expected integrated loudness is
+appended after a colon (omit it to just measure). CPU use is reported as a
+percentage of real time on one core.
+"""
+import sys
+import time
+import wave
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from rdx import loudness  # noqa: E402
+
+np = loudness.np
+TOLERANCE_LU = 0.1
+
+
+def read_wav(path: Path):
+    with wave.open(str(path), 'rb') as w:
+        channels = w.getnchannels()
+        width = w.getsampwidth()
+        rate = w.getframerate()
+        raw = w.readframes(w.getnframes())
+    if width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        ints = (b[:, 0].astype(np.int32) | (b[:, 1].astype(np.int32) << 8) | (b[:, 2].astype(np.int32) << 16))
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        data = ints / float(1 << 23)
+    elif width in (2, 4):
+        dtype = np.int16 if width == 2 else np.int32
+        data = np.frombuffer(raw, dtype=dtype) / float(np.iinfo(dtype).max + 1)
+    else:
+        raise SystemExit(f"{path}: unsupported sample width {width}")
+    return rate, data.reshape(-1, channels).T
+
+
+def tone(dbfs, seconds, rate=48000, freq=997.0):
+    t = np.arange(int(rate * seconds)) / rate
+    s = 10 ** (dbfs / 20.0) * np.sin(2 * np.pi * freq * t)
+    return np.vstack([s, s])
+
+
+def builtin_fixtures():
+    """EBU Tech 3341 cases 1-3 (stereo 1 kHz sine) plus an inter-sample peak case."""
+    return [
+        ("3341 #1: -23 dBFS, 20 s", 48000, tone(-23, 20), -23.0),
+        ("3341 #2: -33 dBFS, 20 s", 48000, tone(-33, 20), -33.0),
+        ("3341 #3: -36/-23/-36 dBFS, 10/60/10 s", 48000,
+         np.concatenate([tone(-36, 10), tone(-23, 60), tone(-36, 10)], axis=1), -23.0),
+        ("3341 #4: -72/-36/-23/-36/-72 dBFS", 48000,
+         np.concatenate([tone(-72, 10), tone(-36, 10), tone(-23, 60), tone(-36, 10), tone(-72, 10)], axis=1), -23.0),
+        ("fs/4 sine at 45° (true peak 0 dBTP)", 48000,
+         np.vstack([np.sin(2 * np.pi * np.arange(48000 * 5) / 4 + np.pi / 4)] * 2), None),
+    ]
+
+
+def run(name, rate, data, expected, block):
+    meter = loudness.LoudnessMeter(rate=rate, channels=data.shape[0])
+    t0 = time.process_time()
+    for i in range(0, data.shape[1], block):
+        meter.process(data[:, i:i + block])
+    cpu = time.process_time() - t0
+    snap = meter.snapshot()
+    load = 100.0 * cpu / max(1e-9, data.shape[1] / rate)
+    ok = expected is None or abs(snap['integrated'] - expected) <= TOLERANCE_LU
+    mark = "✅" if ok else "❌"
+    exp = f"{expected:6.1f}" if expected is not None else "     —"
+    print(f"{mark} {name:<42} I={snap['integrated']:6.1f} (exp {exp})  "
+          f"M={snap['momentary']:6.1f}  S={snap['short_term']:6.1f}  TP={snap['true_peak']:5.1f} dBTP  "
+          f"CPU={load:4.2f}%")
+    return ok, load
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the RDX EBU R128 loudness meter")
+    ap.add_argument("fixtures", nargs="*", help="WAV fixtures as path[:expected_lufs]")
+    ap.add_argument("--block", type=int, default=1024, help="frames per process() call (JACK period)")
+    args = ap.parse_args()
+
+    if not loudness.available():
+        print("❌ NumPy is not installed; cannot run the loudness benchmark")
+        return 2
+
+    cases = []
+    if args.fixtures:
+        for spec in args.fixtures:
+            path, _, exp = spec.partition(":")
+            rate, data = read_wav(Path(path))
+            cases.append((Path(path).name, rate, data, float(exp) if exp else None))
+    else:
+        cases = builtin_fixtures()
+
+    print(f"🎚️ Loudness benchmark (block={args.block} frames)")
+    results = [run(name, rate, data, exp, args.block) for name, rate, data, exp in cases]
+    worst = max(load for _, load in results)
+    passed = all(ok for ok, _ in results)
+    print(f"\nWorst-case CPU: {worst:.2f}% of one core (budget 5%)")
+    return 0 if passed and worst < 5.0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
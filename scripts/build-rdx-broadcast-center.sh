@@ -35,34 +35,55 @@ mkdir -p "$PACKAGE_DIR/etc/skel/.config/rdx"
 
 # Pre-copy source sanity check (non-destructive)
 echo "🧪 Pre-checking source syntax..."
-if ! python3 -m py_compile "$RDX_ROOT/src/rdx-broadcast-control-center.py" >/dev/null 2>&1; then
-    echo "⚠️  Source compile failed. Will rely on packaging-time normalization."
-    if [ "${RDX_FAIL_ON_SOURCE_SYNTAX:-0}" = "1" ]; then
-        echo "❌ RDX_FAIL_ON_SOURCE_SYNTAX=1 set; aborting build due to source syntax error." >&2
-        python3 -m py_compile "$RDX_ROOT/src/rdx-broadcast-control-center.py"  # show error
-        exit 1
-    fi
-    if [ "${RDX_FIX_SOURCE:-0}" = "1" ]; then
-        echo "🔧 Applying opt-in source normalization (RDX_FIX_SOURCE=1)..."
-        python3 "$RDX_ROOT/scripts/fix-rdx-app-indentation.py" --file "$RDX_ROOT/src/rdx-broadcast-control-center.py" --write --backup || true
-        # Re-check after normalization
-        python3 -m py_compile "$RDX_ROOT/src/rdx-broadcast-control-center.py" || true
+for src_py in "$RDX_ROOT/src/rdx-broadcast-control-center.py" "$RDX_ROOT"/src/rdx/gui/*.py; do
+    if ! python3 -m py_compile "$src_py" >/dev/null 2>&1; then
+        echo "⚠️  Source compile failed: ${src_py#$RDX_ROOT/}. Will rely on packaging-time normalization."
+        if [ "${RDX_FAIL_ON_SOURCE_SYNTAX:-0}" = "1" ]; then
+            echo "❌ RDX_FAIL_ON_SOURCE_SYNTAX=1 set; aborting build due to source syntax error." >&2
+            python3 -m py_compile "$src_py"  # show error
+            exit 1
+        fi
+        if [ "${RDX_FIX_SOURCE:-0}" = "1" ]; then
+            echo "🔧 Applying opt-in source normalization (RDX_FIX_SOURCE=1)..."
+            python3 "$RDX_ROOT/scripts/fix-rdx-app-indentation.py" --file "$src_py" --write --backup || true
+            # Re-check after normalization
+            python3 -m py_compile "$src_py" || true
+        fi
     fi
-fi
+done
 
 # Copy main application
 echo "📋 Installing main application..."
 cp "$RDX_ROOT/src/rdx-broadcast-control-center.py" "$PACKAGE_DIR/usr/local/bin/"
 chmod +x "$PACKAGE_DIR/usr/local/bin/rdx-broadcast-control-center.py"
 
-# Sanity-check and normalize indentation if needed (prevents stray IndentationError)
+# Core library used by the application (loudness metering, ...)
+mkdir -p "$PACKAGE_DIR/usr/share/rdx/python"
+cp -r "$RDX_ROOT/src/rdx" "$PACKAGE_DIR/usr/share/rdx/python/"
+find "$PACKAGE_DIR/usr/share/rdx/python" -name '__pycache__' -type d -prune -exec rm -rf {} +
+
+# Headless daemon (status engine, JACK session, watchers) used by the GUI as a thin client
+install -m 0755 "$RDX_ROOT/src/rdx-daemon.py" "$PACKAGE_DIR/usr/local/bin/rdx-daemon"
+
+# Command-line interface for batch operations (no Qt import)
+install -m 0755 "$RDX_ROOT/src/rdx-cli.py" "$PACKAGE_DIR/usr/local/bin/rdx"
+
+# Readiness helper for ExecStartPre= in the generated units (JACK callbacks, no polling)
+install -m 0755 "$RDX_ROOT/src/rdx-wait.py" "$PACKAGE_DIR/usr/local/bin/rdx-wait"
+
+# Sanity-check and normalize indentation if needed (prevents stray IndentationError).
+# The launcher is a thin shim; the tabs and main window live in the rdx.gui package.
 echo "🧪 Sanity-checking Python script syntax..."
+for RDX_CHECK_PY in "$PACKAGE_DIR/usr/local/bin/rdx-broadcast-control-center.py" "$PACKAGE_DIR"/usr/share/rdx/python/rdx/gui/*.py; do
+echo "   ${RDX_CHECK_PY#$PACKAGE_DIR}"
 python3 - <<PY
 import sys, re, ast
 from pathlib import Path
 
-path = Path("$PACKAGE_DIR/usr/local/bin/rdx-broadcast-control-center.py")
+path = Path("$RDX_CHECK_PY")
 code = path.read_text(encoding='utf-8')
+# The JackMatrixTab integrity guard only applies to the module that defines it
+check_matrix = path.name == "jack_matrix.py"
 
 def try_compile(txt):
     try:
@@ -205,7 +226,7 @@ if errs:
     print("   ✅ Fixed and valid")
     # After normalization, enforce JackMatrixTab methods presence
     present, have, classes = jackmatrix_methods_present(fixed)
-    if not present:
+    if check_matrix and not present:
         print("   ❌ JackMatrixTab integrity check failed: required methods missing (e.g., _pretty_client). Aborting build.")
         print(f"      Found methods: {sorted(have)}")
         print(f"      Classes in module: {sorted(classes)}")
@@ -222,7 +243,7 @@ if ok:
         sys.exit(1)
     # Enforce JackMatrixTab methods presence
     present, have, classes = jackmatrix_methods_present(code)
-    if not present:
+    if check_matrix and not present:
         print("   ❌ Build guard: JackMatrixTab missing required methods (_pretty_client/_pretty_port_name). Failing build.")
         print(f"      Found methods: {sorted(have)}")
         print(f"      Classes in module: {sorted(classes)}")
@@ -261,6 +282,17 @@ if ok:
 print("   ❌ Invalid and no auto-normalization applied; aborting build.")
 sys.exit(1)
 PY
+done
+
+# Cold-start import budget (rdx CLI/daemon must stay Qt-free; the window must not pull in every tab)
+echo "⏱️  Checking import-time budgets..."
+if ! python3 "$RDX_ROOT/scripts/check-import-time.py"; then
+    if [ "${RDX_FAIL_ON_IMPORT_BUDGET:-0}" = "1" ]; then
+        echo "❌ RDX_FAIL_ON_IMPORT_BUDGET=1 set; aborting build." >&2
+        exit 1
+    fi
+    echo "⚠️  Import budget exceeded (set RDX_FAIL_ON_IMPORT_BUDGET=1 to fail the build)."
+fi
 
 # Copy desktop entries
 echo "🖥️ Installing desktop integration..."
@@ -559,7 +591,7 @@ Priority: optional
 Architecture: $ARCHITECTURE
 Maintainer: $MAINTAINER
 Depends: python3 (>= 3.6), python3-pyqt5, liquidsoap (>= 2.0.0), jackd2, icecast2, vlc, vlc-plugin-jack
-Recommends: liquidsoap-plugin-ffmpeg | liquidsoap-plugin-all | liquidsoap-plugin-extra, qjackctl
+Recommends: liquidsoap-plugin-ffmpeg | liquidsoap-plugin-all | liquidsoap-plugin-extra, qjackctl, python3-numpy, python3-jack-client
 Suggests: stereo-tool
 Description: $DESCRIPTION
  Professional broadcast streaming center providing complete GUI management
@@ -616,6 +648,10 @@ case "$1" in
             fi
         done < <(getent passwd)
         
+        # Byte-compile the rdx package: /usr/share is not writable for users, so without
+        # this every launch of the GUI, daemon and CLI would recompile it from source
+        python3 -m compileall -q /usr/share/rdx/python/rdx >/dev/null 2>&1 || true
+
         # Update desktop database
         if command -v update-desktop-database >/dev/null 2>&1; then
             update-desktop-database /usr/share/applications
@@ -981,6 +1017,8 @@ case "$1" in
     remove|upgrade|deconfigure)
         # Stop any running services gracefully
         echo "Stopping RDX services..."
+        # Drop the byte-code written by postinst so dpkg can remove the directories
+        find /usr/share/rdx/python -name '__pycache__' -type d -prune -exec rm -rf {} + 2>/dev/null || true
         ;;
 esac
 
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Cold-start import budget for the rdx package.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter per
+target (best of several runs) and charges each target the self-time of every
+module a bare interpreter does not already import. A target fails when it
+exceeds its budget or pulls in a module it must not load at import time
+(Qt in the CLI/daemon, NumPy or a rarely used tab in the main window).
+
+Usage:
+  check-import-time.py                 # all targets; GUI skipped if PyQt5 is missing
+  check-import-time.py rdx.cli         # one target
+  check-import-time.py --runs 9 --verbose
+  check-import-time.py --strict        # fail (instead of skip) when PyQt5 is missing
+
+Budgets can be scaled for slow build hosts with RDX_IMPORT_BUDGET_SCALE=2.
+"""
+import os
+import re
+import sys
+import argparse
+import compileall
+import subprocess
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+_GUI_TABS = ("rdx.gui.stream_builder", "rdx.gui.icecast", "rdx.gui.jack_matrix", "rdx.gui.jack_graph",
+             "rdx.gui.service_control", "rdx.gui.loudness", "rdx.gui.stereotool", "rdx.gui.settings",
+             "rdx.gui.diagnostics")
+
+# module -> (budget in ms, modules that must not be imported)
+TARGETS = {
+    "rdx.cli": (50.0, ("PyQt5", "numpy", "jack", "rdx.daemon", "rdx.gui")),
+    "rdx.daemon": (80.0, ("PyQt5", "numpy", "jack", "rdx.gui")),
+    "rdx.gui.main_window": (350.0, ("numpy", "jack", "urllib.request", "xml.etree", "rdx.loudness") + _GUI_TABS),
+}
+NEEDS_QT = {"rdx.gui.main_window"}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(code: str) -> dict:
+    """Return {module: self_us} from ``-X importtime`` for *code* run in a fresh interpreter."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")])))
+    env.pop("PYTHONIMPORTTIME", None)
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                         capture_output=True, text=True, env=env, timeout=60)
+    if res.returncode != 0:
+        tail = res.stderr.strip().splitlines()[-1:] or ["(no output)"]
+        raise RuntimeError(tail[0])
+    out = {}
+    for line in res.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            out[m.group(4)] = int(m.group(1))
+    return out
+
+
+def measure(module: str, baseline: set, runs: int):
+    """Best-of-*runs* cost in ms and the module set of the fastest run."""
+    best = None
+    for _ in range(runs):
+        prof = import_profile(f"import {module}")
+        own = {name: us for name, us in prof.items() if name not in baseline}
+        cost = sum(own.values()) / 1000.0
+        if best is None or cost < best[0]:
+            best = (cost, own)
+    return best
+
+
+def forbidden_hits(modules, forbidden) -> list:
+    return sorted(m for m in modules for f in forbidden if m == f or m.startswith(f + "."))
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Check rdx cold-start import cost against budgets")
+    ap.add_argument("targets", nargs="*", help="modules to check (default: all)")
+    ap.add_argument("--runs", type=int, default=5, help="runs per target; the fastest counts")
+    ap.add_argument("--strict", action="store_true", help="fail if a target cannot be imported here")
+    ap.add_argument("--verbose", "-v", action="store_true", help="list the slowest modules per target")
+    args = ap.parse_args(argv)
+
+    # Measure warm-cache imports (installed packages are byte-compiled by postinst)
+    compileall.compile_dir(str(SRC / "rdx"), quiet=1)
+    scale = float(os.environ.get("RDX_IMPORT_BUDGET_SCALE", "1") or 1)
+    targets = args.targets or list(TARGETS)
+    baseline = set(import_profile("pass"))
+    failed = False
+    for module in targets:
+        budget, forbidden = TARGETS.get(module, (100.0, ()))
+        budget *= scale
+        if module in NEEDS_QT and not args.strict:
+            try:
+                import_profile("import PyQt5.QtWidgets")
+            except Exception:
+                print(f"  skip  {module:<22} (PyQt5 not available)")
+                continue
+        try:
+            cost, own = measure(module, baseline, max(1, args.runs))
+        except Exception as e:
+            print(f"  FAIL  {module:<22} import failed: {e}")
+            failed = True
+            continue
+        hits = forbidden_hits(own, forbidden)
+        ok = cost <= budget and not hits
+        failed = failed or not ok
+        print(f"  {'ok' if ok else 'FAIL':<4}  {module:<22} {cost:7.1f} ms / {budget:.0f} ms  ({len(own)} modules)")
+        for h in hits:
+            print(f"        imports {h} at start-up")
+        if args.verbose or cost > budget:
+            for name, us in sorted(own.items(), key=lambda kv: -kv[1])[:8]:
+                print(f"        {us / 1000.0:6.1f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,15 @@ while [[ $# -gt 0 ]]; do
   esac
 done
 
+# rdx-wait (ships with RDX) waits on a JACK callback instead of polling jack_lsp;
+# it takes globs, so only the default encoder list is handed over.
+if have rdx-wait && [[ "${CLIENTS_REGEX}" == '^(liquidsoap|darkice|butt|glasscoder):' ]]; then
+  if (( STRICT )); then
+    exec rdx-wait --client '{liquidsoap,darkice,butt,glasscoder}' --timeout "${TIMEOUT}"
+  fi
+  exec rdx-wait --client '{liquidsoap,darkice,butt,glasscoder}' --timeout "${TIMEOUT}" --soft
+fi
+
 if ! have jack_lsp; then
   die "jack_lsp not found in PATH"
 fi
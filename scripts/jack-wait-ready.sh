@@ -2,6 +2,7 @@
 # jack-wait-ready.sh — Wait for a running JACK server with at least one port.
 # Usage: jack-wait-ready.sh [--timeout SECONDS] [--interval SECONDS]
 # Exits 0 when ready, 1 on timeout, 2 on missing tools.
+# Kept for units written before rdx-wait; hands over to rdx-wait when installed.
 set -euo pipefail
 
 TIMEOUT=30
@@ -20,6 +21,12 @@ done
 
 have() { command -v "$1" >/dev/null 2>&1; }
 
+# rdx-wait (ships with RDX) returns the moment JACK has ports, from a JACK
+# callback instead of polling jack_lsp; the loop below is the fallback.
+if have rdx-wait; then
+  exec rdx-wait --timeout "${TIMEOUT}"
+fi
+
 if ! have jack_lsp; then
   echo "[jack-wait] jack_lsp not found in PATH" >&2
   exit 2
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Profile JACK topology parsing and the JACK Graph / Patchboard tabs on synthetic graphs.
+
+Usage:
+  profile-jack-graph.py                         # 100 and 1000 ports, seed 0
+  profile-jack-graph.py --ports 5000 --seed 3   # one size, another random layout
+  profile-jack-graph.py --tab graph --top 30    # only the graph tab, longer profile
+  profile-jack-graph.py --ports 1000 --dump /tmp/topo   # write jack_lsp-*.txt and exit
+
+Topologies come from tests/synthetic_jack.py (multi-card Rivendell, Stereo
+Tool, Liquidsoap, VLC, a 64-channel system client and awkward port names).
+The tabs are built off-screen (QT_QPA_PLATFORM=offscreen) with HOME pointed
+at a scratch directory, so your profiles and protected pairs are not read.
+Without PyQt5 only the parser timings are printed.
+"""
+import os
+import sys
+import time
+import cProfile
+import pstats
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "tests"))
+from rdx import jack as rdx_jack  # noqa: E402
+import synthetic_jack  # noqa: E402
+
+
+def timed(fn, *args, repeat=5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return result, best * 1000.0
+
+
+def profile(label, fn, top):
+    prof = cProfile.Profile()
+    t0 = time.perf_counter()
+    prof.enable()
+    fn()
+    prof.disable()
+    ms = (time.perf_counter() - t0) * 1000.0
+    print(f"  {label:<28} {ms:9.1f} ms")
+    if top:
+        pstats.Stats(prof, stream=sys.stdout).strip_dirs().sort_stats("cumulative").print_stats(top)
+    return ms
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Profile RDX JACK parsing and graph rendering on synthetic topologies")
+    ap.add_argument("--ports", type=int, nargs="+", default=[100, 1000], help="topology sizes (ports)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--cards", type=int, default=None, help="Rivendell cards (default: scales with size)")
+    ap.add_argument("--plain", action="store_true", help="leave out the awkward port names")
+    ap.add_argument("--tab", choices=["graph", "matrix", "both", "none"], default="both")
+    ap.add_argument("--top", type=int, default=0, help="print the N most expensive calls per tab")
+    ap.add_argument("--dump", metavar="DIR", help="write jack_lsp output files for the first size and exit")
+    args = ap.parse_args()
+
+    if args.dump:
+        topo = synthetic_jack.generate(args.ports[0], args.seed, cards=args.cards, odd_names=not args.plain)
+        out = topo.write_stub_data(args.dump)
+        print(f"✅ {len(topo)} ports, {len(topo.connections)} connections written to {out}")
+        return 0
+
+    tabs = []
+    if args.tab != "none":
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        os.environ["HOME"] = tempfile.mkdtemp(prefix="rdx-profile-")
+        try:
+            from PyQt5.QtWidgets import QApplication
+            app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+            if args.tab in ("graph", "both"):
+                from rdx.gui.jack_graph import JackGraphTab
+                tabs.append(("JackGraphTab", JackGraphTab))
+            if args.tab in ("matrix", "both"):
+                from rdx.gui.jack_matrix import JackMatrixTab
+                tabs.append(("JackMatrixTab", JackMatrixTab))
+        except ImportError as e:
+            print(f"⚠️ {e}; profiling the parsers only")
+
+    for n in args.ports:
+        topo = synthetic_jack.generate(n, args.seed, cards=args.cards, odd_names=not args.plain)
+        with_props, full = topo.lsp("-p"), topo.lsp("-c", "-p", "-t")
+        print(f"\n🎛️ {len(topo)} ports, {len(topo.connections)} connections (seed {args.seed})")
+        parsed, ms = timed(rdx_jack.parse_topology, full)
+        print(f"  {'parse_topology (-c -p -t)':<28} {ms:9.2f} ms")
+        ports = parsed[0]
+        for name, cls in tabs:
+            tab = cls()
+            _, ms = timed(cls._parse_jack_ports, tab, with_props)
+            print(f"  {name + '._parse_jack_ports':<28} {ms:9.2f} ms")
+            if name == "JackGraphTab":
+                profile("JackGraphTab render", lambda: tab._render_topology(parsed), args.top)
+            else:
+                def populate():
+                    tab.ports = ports
+                    tab.jack_clients = sorted(ports)
+                    tab._populate_combos()
+                    tab._populate_port_combos()
+                    tab._update_info()
+                profile("JackMatrixTab populate", populate, args.top)
+            tab.deleteLater()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
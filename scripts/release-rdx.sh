@@ -168,11 +168,17 @@ import re, sys, pathlib
 ver = sys.argv[1]
 root = pathlib.Path('.')
 
-pyf = root / 'src' / 'rdx-broadcast-control-center.py'
-s = pyf.read_text(encoding='utf-8')
-# Replace occurrences of the app version in common spots
-s_new = re.sub(r'(?<=Broadcast Control Center v)\d+\.\d+\.\d+', ver, s)
-pyf.write_text(s_new, encoding='utf-8')
+# Launcher docstring plus the window title/status strings in the rdx.gui package
+for pyf in [root / 'src' / 'rdx-broadcast-control-center.py', *sorted((root / 'src' / 'rdx' / 'gui').glob('*.py'))]:
+    s = pyf.read_text(encoding='utf-8')
+    # Replace occurrences of the app version in common spots
+    s_new = re.sub(r'(?<=Broadcast Control Center v)\d+\.\d+\.\d+', ver, s)
+    if s_new != s:
+        pyf.write_text(s_new, encoding='utf-8')
+
+init = root / 'src' / 'rdx' / '__init__.py'
+s = init.read_text(encoding='utf-8')
+init.write_text(re.sub(r'(?m)^(__version__ = ")\d+\.\d+\.\d+(")', fr'\g<1>{ver}\2', s), encoding='utf-8')
 
 bs = root / 'scripts' / 'build-rdx-broadcast-center.sh'
 t = bs.read_text(encoding='utf-8')
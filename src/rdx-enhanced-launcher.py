@@ -14,6 +14,15 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
 from PyQt5.QtCore import Qt, QProcess, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon, QPalette
 
+# Core library (src/rdx): next to this script in a source checkout, /usr/share/rdx/python when packaged
+for _rdx_lib in (os.path.dirname(os.path.abspath(__file__)), "/usr/share/rdx/python"):
+    if os.path.isdir(os.path.join(_rdx_lib, "rdx")) and _rdx_lib not in sys.path:
+        sys.path.insert(0, _rdx_lib)
+try:
+    from rdx import rpc as rdx_rpc
+except Exception:
+    rdx_rpc = None
+
 class RDXEnhancedLauncher(QMainWindow):
     """Enhanced launcher combining RDAdmin functionality with RDX controls"""
     
@@ -224,7 +233,26 @@ class RDXEnhancedLauncher(QMainWindow):
         else:
             status_parts.append("❌ JACK")
             
+        # Service states come from the rdx daemon (no local probing from the launcher)
+        snapshot = self.daemon_status()
+        if snapshot:
+            icons = {'running': "✅", 'restarting': "♻️", 'timeout': "⏳"}
+            for info in snapshot.get('services', {}).values():
+                status_parts.append(f"{icons.get(info.get('state'), '❌')} {info.get('name')}")
+        else:
+            status_parts.append("⚪ rdx daemon offline")
+
         self.status_label.setText(" | ".join(status_parts))
+
+    def daemon_status(self):
+        """Return the rdx daemon status snapshot, or None when the daemon is not running"""
+        if rdx_rpc is None:
+            return None
+        try:
+            with rdx_rpc.Client(timeout=0.5) as client:
+                return client.call("status.get")
+        except Exception:
+            return None
         
     def run_command(self, command, show_output=False):
         """Run a command and optionally show output"""
@@ -294,7 +322,16 @@ class RDXEnhancedLauncher(QMainWindow):
         self.run_command("rdx-stream stop", show_output=True)
         
     def rdx_status(self):
-        self.run_command("rdx-jack-helper --status", show_output=True)
+        snapshot = self.daemon_status()
+        if not snapshot:
+            self.run_command("rdx-jack-helper --status", show_output=True)
+            return
+        self.rdx_status_display.append("$ rdx status")
+        for info in snapshot.get('services', {}).values():
+            self.rdx_status_display.append(f"{info.get('name', '?'):<14} {info.get('state', 'unknown')}")
+        jack = snapshot.get('jack', {})
+        self.rdx_status_display.append(f"JACK session: {'event-driven' if jack.get('session') else 'polling'}")
+        self.check_system_status()
         
     def rdx_deps_check(self):
         self.run_command("rdx-deps check", show_output=True)
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+RDX readiness helper (installed as /usr/local/bin/rdx-wait)
+Blocks until JACK is running and the wanted ports exist; used in ExecStartPre=.
+"""
+
+import os
+import sys
+
+# Core library (src/rdx): next to this script in a source checkout, /usr/share/rdx/python when packaged
+for _rdx_lib in (os.path.dirname(os.path.abspath(__file__)), "/usr/share/rdx/python"):
+    if os.path.isdir(os.path.join(_rdx_lib, "rdx")) and _rdx_lib not in sys.path:
+        sys.path.insert(0, _rdx_lib)
+
+from rdx.wait import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+RDX core library
+
+Non-GUI building blocks shared by the Broadcast Control Center and helper tools.
+Modules here must stay importable without PyQt5; optional dependencies
+(numpy, the ``jack`` client bindings) are imported lazily or guarded.
+"""
+
+__version__ = "4.0.1"
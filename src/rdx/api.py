@@ -0,0 +1,382 @@
+"""
+Control methods exposed by the rdx daemon.
+
+Everything the GUI can do to the running chain is reachable here so cron
+jobs, autologgen hooks and remote-control scripts don't need a display:
+
+    jack.ports / jack.connect / jack.disconnect / jack.transaction / jack.profiles / jack.apply_profile
+    jack.panic / jack.restore / jack.switch_profile
+    journal.list / journal.undo / journal.redo / journal.restore_to
+    routing.plan / routing.reconcile / routing.set_profile
+    services.start / services.stop / services.restart / services.expect / services.health
+    streams.list / streams.apply / config.generate_liquidsoap / config.generate_icecast
+    logs.tail / logs.follow
+    diagnostics.commands / diagnostics.reset / diagnostics.xruns
+
+Methods raise ``rpc.RPCError``; the daemon turns that into a JSON-RPC error.
+"""
+
+import os
+import threading
+import time
+
+from . import config
+from . import exporter
+from . import jack as rdx_jack
+from . import jackserver
+from . import reconciler
+from . import journal
+from . import rpc
+from . import runner
+from . import services as rdx_services
+from . import streaming
+
+LOG_FILES = {
+    'liquidsoap': lambda: config.config_dir() / "liquidsoap.log",
+    'jackd': lambda: config.config_dir() / "jackd.log",
+}
+
+
+def _require(value, name: str):
+    if value in (None, ""):
+        raise rpc.RPCError(rpc.INVALID_PARAMS, f"missing parameter: {name}")
+    return value
+
+
+def _log_path(name: str):
+    if name not in LOG_FILES:
+        raise rpc.RPCError(rpc.INVALID_PARAMS, f"unknown log '{name}' (known: {', '.join(sorted(LOG_FILES))})")
+    return LOG_FILES[name]()
+
+
+class LogFollower(threading.Thread):
+    """Tails one log file and publishes new lines as ``log`` events while anyone listens."""
+
+    def __init__(self, daemon, name: str, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.rdx_daemon = daemon
+        self.name_ = name
+        self.path = _log_path(name)
+        self.interval = interval
+
+    def _listeners(self) -> bool:
+        return any(s.streaming and ("log" in s.topics or "*" in s.topics) for s in list(self.rdx_daemon.sessions))
+
+    def run(self):
+        try:
+            pos = self.path.stat().st_size
+        except Exception:
+            pos = 0
+        partial = ""
+        while not self.rdx_daemon.stopping and self._listeners():
+            try:
+                size = self.path.stat().st_size
+                if size < pos:
+                    pos = 0  # truncated or rotated
+                if size > pos:
+                    with open(self.path, 'r', errors='ignore') as f:
+                        f.seek(pos)
+                        chunk = f.read()
+                        pos = f.tell()
+                    lines = (partial + chunk).split("\n")
+                    partial = lines.pop()
+                    if lines:
+                        self.rdx_daemon.publish("log", {'name': self.name_, 'lines': lines})
+            except FileNotFoundError:
+                pos = 0
+            except Exception:
+                pass
+            time.sleep(self.interval)
+        if self.rdx_daemon.followers.get(self.name_) is self:
+            self.rdx_daemon.followers.pop(self.name_, None)
+
+
+class ControlAPI:
+    def __init__(self, daemon):
+        self.d = daemon
+        self._follow_lock = threading.Lock()
+
+    def install(self):
+        for name, fn in (
+            ("jack.ports", self.jack_ports),
+            ("jack.connect", self.jack_connect),
+            ("jack.disconnect", self.jack_disconnect),
+            ("jack.transaction", self.jack_transaction),
+            ("jack.profiles", self.jack_profiles),
+            ("jack.apply_profile", self.jack_apply_profile),
+            ("jack.panic", self.jack_panic),
+            ("jack.restore", self.jack_restore),
+            ("jack.server_config", self.jack_server_config),
+            ("jack.switch_profile", self.jack_switch_profile),
+            ("routing.plan", self.routing_plan),
+            ("routing.reconcile", self.routing_reconcile),
+            ("routing.set_profile", self.routing_set_profile),
+            ("journal.list", self.journal_list),
+            ("journal.undo", lambda session, n=1: self.journal_step(journal.undo, "undo", n)),
+            ("journal.redo", lambda session, n=1: self.journal_step(journal.redo, "redo", n)),
+            ("journal.restore_to", self.journal_restore_to),
+            ("services.start", lambda session, service=None: self.service(service, "start")),
+            ("services.stop", lambda session, service=None: self.service(service, "stop")),
+            ("services.restart", lambda session, service=None: self.service(service, "restart")),
+            ("services.expect", self.services_expect),
+            ("services.health", self.services_health),
+            ("streams.list", self.streams_list),
+            ("streams.apply", self.streams_apply),
+            ("config.generate_liquidsoap", self.generate_liquidsoap),
+            ("config.generate_icecast", self.generate_icecast),
+            ("logs.tail", self.logs_tail),
+            ("logs.follow", self.logs_follow),
+            ("diagnostics.commands", self.diagnostics_commands),
+            ("diagnostics.reset", self.diagnostics_reset),
+            ("diagnostics.xruns", self.diagnostics_xruns),
+        ):
+            self.d.register(name, fn)
+
+    # ---- JACK ----
+    def jack_ports(self, session):
+        return self.d.refresh_topology()['ports']
+
+    def jack_connect(self, session, src=None, dst=None):
+        src, dst = _require(src, "src"), _require(dst, "dst")
+        try:
+            status = rdx_jack.apply_pair("connect", src, dst, origin="api", client=self.d.jack_session.client)
+        except RuntimeError as e:
+            raise rpc.RPCError(rpc.OPERATION_FAILED, str(e).split("\n\n", 1)[0], {'detail': str(e)})
+        if status == "done":
+            self.d.topology_changed(origin="api", connected=[[src, dst]])
+        return {'connected': [src, dst], 'status': status}
+
+    def jack_disconnect(self, session, src=None, dst=None):
+        src, dst = _require(src, "src"), _require(dst, "dst")
+        try:
+            status = rdx_jack.apply_pair("disconnect", src, dst, origin="api", client=self.d.jack_session.client)
+        except RuntimeError as e:
+            raise rpc.RPCError(rpc.OPERATION_FAILED, f"jack_disconnect failed: {e}")
+        if status == "done":
+            self.d.topology_changed(origin="api", disconnected=[[src, dst]])
+        return {'disconnected': [src, dst], 'status': status}
+
+    def jack_transaction(self, session, ops=None):
+        ops = _require(ops, "ops")
+        usage = "ops must be a list of {op, src, dst} or [op, src, dst]"
+        if not isinstance(ops, list):
+            raise rpc.RPCError(rpc.INVALID_PARAMS, usage)
+        batch = []
+        for item in ops:
+            if isinstance(item, dict):
+                item = (item.get('op'), item.get('src'), item.get('dst'))
+            # A 3-character string would unpack too
+            if not isinstance(item, (list, tuple)) or len(item) != 3:
+                raise rpc.RPCError(rpc.INVALID_PARAMS, usage)
+            op, src, dst = item
+            batch.append((str(op), _require(src, "src"), _require(dst, "dst")))
+        res = rdx_jack.transaction(batch, client=self.d.jack_session.client, origin="api")
+        return self._routing_changed("api", res)
+
+    def jack_profiles(self, session):
+        return {name: len(pairs) for name, pairs in sorted(rdx_jack.load_profiles().items())}
+
+    def jack_apply_profile(self, session, name=None):
+        name = _require(name, "name")
+        try:
+            res = rdx_jack.apply_profile(name, client=self.d.jack_session.client)
+        except KeyError:
+            raise rpc.RPCError(rpc.INVALID_PARAMS, f"unknown profile: {name}")
+        if any(r['status'] == "done" for r in res['results']):
+            self.d.topology_changed(origin="profile", profile=name, applied=res['applied'])
+        return res
+
+    def jack_switch_profile(self, session, name=None, dry_run=False):
+        name = _require(name, "name")
+        try:
+            res = jackserver.apply_profile(name, dry_run=bool(dry_run))
+        except KeyError:
+            raise rpc.RPCError(rpc.INVALID_PARAMS, f"unknown rdx-profiles.xml profile: {name}")
+        if not dry_run and res['ok']:
+            # After a restart the session client belongs to the old server
+            client = self.d.jack_session.client if res['action'] != "restart" else None
+            res['routing'] = rdx_jack.apply_profile(name, client=client)
+            self.d.topology_changed(origin="profile", profile=name, applied=res['routing']['applied'])
+        return res
+
+    def jack_panic(self, session, deadline_ms=None, ignore_protection=False):
+        # Cut from the cached (event-driven) topology: no jack_lsp on the way
+        try:
+            deadline = float(deadline_ms if deadline_ms is not None else self.d.settings.get('panic_deadline_ms', 200)) / 1000.0
+        except (TypeError, ValueError):
+            raise rpc.RPCError(rpc.INVALID_PARAMS, "deadline_ms must be a number")
+        cons = self.d.topology['connections'] if self.d.topology['updated'] else None
+        res = rdx_jack.panic_disconnect(cons, protected=set() if ignore_protection else None,
+                                        deadline=deadline, client=self.d.jack_session.client)
+        if res['cut'] or res['pending']:
+            self.d.topology_changed(origin="panic", disconnected=res['cut'] + res['pending'])
+        return res
+
+    def jack_restore(self, session):
+        try:
+            res = rdx_jack.restore_panic(client=self.d.jack_session.client)
+        except LookupError as e:
+            raise rpc.RPCError(rpc.OPERATION_FAILED, str(e))
+        done = [[r['src'], r['dst']] for r in res['results'] if r['status'] == "done"]
+        if done:
+            self.d.topology_changed(origin="restore", connected=done)
+        return res
+
+    # ---- routing reconciler ----
+    def routing_plan(self, session):
+        self.d.reload_settings()
+        topo = self.d.refresh_topology()
+        ops = reconciler.plan((topo['ports'], topo['connections']), self.d.settings)
+        return {'active_profile': self.d.settings.get('active_profile'),
+                'ops': [list(op) for op in ops]}
+
+    def routing_reconcile(self, session):
+        self.d.reload_settings()
+        res = self.d.reconcile()
+        return res or {'applied': 0, 'total': 0, 'errors': [], 'results': []}
+
+    def routing_set_profile(self, session, name=None):
+        if name and name not in reconciler.profile_names():
+            raise rpc.RPCError(rpc.INVALID_PARAMS, f"unknown profile: {name}")
+        settings = config.load_settings()
+        settings['active_profile'] = name or None
+        if not config.save_json(config.settings_file(), settings):
+            raise rpc.RPCError(rpc.OPERATION_FAILED, "could not write settings.json")
+        self.d.reload_settings()
+        # Reconciles on the next watcher pass
+        self.d.topology_changed(origin="profile", active_profile=settings['active_profile'])
+        return {'active_profile': settings['active_profile']}
+
+    # ---- routing journal ----
+    def journal_list(self, session, limit=50):
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise rpc.RPCError(rpc.INVALID_PARAMS, "limit must be an integer")
+        return journal.entries(limit=max(1, limit))
+
+    def _routing_changed(self, origin: str, res: dict):
+        # Tell routing listeners about the pairs a transaction changed
+        done = [r for r in res['results'] if r['status'] == "done"]
+        if done:
+            self.d.topology_changed(origin=origin,
+                                    connected=[[r['src'], r['dst']] for r in done if r['op'] == "connect"],
+                                    disconnected=[[r['src'], r['dst']] for r in done if r['op'] == "disconnect"])
+        return res
+
+    def journal_step(self, fn, origin: str, n=1):
+        try:
+            res = fn(int(n), client=self.d.jack_session.client)
+        except (TypeError, ValueError):
+            raise rpc.RPCError(rpc.INVALID_PARAMS, "n must be an integer")
+        except LookupError as e:
+            raise rpc.RPCError(rpc.OPERATION_FAILED, str(e))
+        return self._routing_changed(origin, res)
+
+    def journal_restore_to(self, session, seq=None, time=None):
+        try:
+            if seq is None:
+                seq = journal.seq_at(float(_require(time, "seq or time")))
+            res = journal.restore_to(int(seq), client=self.d.jack_session.client)
+        except (TypeError, ValueError):
+            raise rpc.RPCError(rpc.INVALID_PARAMS, "seq must be an integer and time a Unix timestamp")
+        except LookupError as e:
+            raise rpc.RPCError(rpc.OPERATION_FAILED, str(e))
+        return self._routing_changed("restore", res)
+
+    def jack_server_config(self, session):
+        return {'settings': jackserver.load_settings(), 'running': jackserver.probe_running_config()}
+
+    # ---- services ----
+    def _service_key(self, key):
+        key = _require(key, "service")
+        if key not in rdx_services.SERVICES:
+            raise rpc.RPCError(rpc.INVALID_PARAMS,
+                               f"unknown service '{key}' (known: {', '.join(rdx_services.SERVICES)})")
+        return key
+
+    def service(self, key, action: str):
+        key = self._service_key(key)
+        self.d.supervisor.expect(key, action)
+        ok, msg = rdx_services.control(key, action)
+        exporter.SERVICE_ACTIONS.labels(service=key, action=action).inc()
+        self.d.poke_status()
+        if not ok:
+            raise rpc.RPCError(rpc.OPERATION_FAILED, msg)
+        return {'service': key, 'action': action, 'message': msg}
+
+    def services_expect(self, session, service=None, action=None):
+        # Clients that control a service themselves (the GUI) announce it, so it is not taken for a crash
+        key = self._service_key(service)
+        if action not in ("start", "stop", "restart"):
+            raise rpc.RPCError(rpc.INVALID_PARAMS, "action must be start, stop or restart")
+        self.d.supervisor.expect(key, action)
+        self.d.poke_status()
+        return True
+
+    def services_health(self, session, service=None, log=True):
+        if service:
+            return self.d.supervisor.health(self._service_key(service), log=bool(log))
+        return self.d.supervisor.snapshot(log=bool(log))
+
+    # ---- streams / configs ----
+    def streams_list(self, session):
+        return streaming.load_streams()
+
+    def streams_apply(self, session, dry_run=False, restart=True):
+        # Live where possible; a restart (new encoder) is announced to the supervisor first
+        return streaming.apply_streams(dry_run=bool(dry_run), restart=bool(restart),
+                                       before_restart=lambda: self.d.supervisor.expect('liquidsoap', "restart"))
+
+    def generate_liquidsoap(self, session):
+        streams = streaming.load_streams()
+        if not streams:
+            raise rpc.RPCError(rpc.OPERATION_FAILED, "no streams configured")
+        return {'path': str(streaming.write_liquidsoap_config(streams)), 'streams': len(streams)}
+
+    def generate_icecast(self, session, **kwargs):
+        allowed = {'host', 'port', 'source_pass', 'admin_pass', 'relay_pass'}
+        unknown = set(kwargs) - allowed
+        if unknown:
+            raise rpc.RPCError(rpc.INVALID_PARAMS, f"unexpected parameters: {', '.join(sorted(unknown))}")
+        return {'path': str(streaming.write_icecast_config(**kwargs))}
+
+    # ---- logs ----
+    def logs_tail(self, session, name="liquidsoap", lines=100):
+        path = _log_path(name)
+        try:
+            n = max(1, min(int(lines), 5000))
+        except (TypeError, ValueError):
+            raise rpc.RPCError(rpc.INVALID_PARAMS, "lines must be an integer")
+        text = jackserver.tail_file(path, n)
+        return {'name': name, 'path': str(path), 'lines': text.splitlines() if text else []}
+
+    def logs_follow(self, session, name="liquidsoap"):
+        _log_path(name)
+        session.topics.add("log")
+        with self._follow_lock:
+            follower = self.d.followers.get(name)
+            if follower is None or not follower.is_alive():
+                follower = LogFollower(self.d, name)
+                self.d.followers[name] = follower
+                follower.start()
+        return sorted(session.topics)
+
+    # ---- diagnostics ----
+    def diagnostics_commands(self, session):
+        return {'pid': os.getpid(), 'commands': runner.snapshot()}
+
+    def diagnostics_reset(self, session):
+        runner.reset()
+        return True
+
+    def diagnostics_xruns(self, session, limit=50, reset=False):
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise rpc.RPCError(rpc.INVALID_PARAMS, "limit must be an integer")
+        snap = self.d.xruns.snapshot(limit)
+        snap['session'] = self.d.jack_session.active
+        if reset:
+            self.d.xruns.reset()
+        return snap
@@ -0,0 +1,88 @@
+"""
+Settings bundles: zip archives of the user's ~/.config/rdx state.
+"""
+
+import datetime
+import json
+import zipfile
+from pathlib import Path
+
+from . import config
+
+# Relative paths inside ~/.config/rdx to include in export
+BUNDLE_FILES = [
+    "settings.json",
+    "streams.json",
+    "radio.liq",
+    "jack_settings.json",
+    "jack_profiles.json",
+    "jack_protected.json",
+    "processing/stereotool/stereotool_instances.json",
+]
+
+
+def bundle_file_list(base: Path = None) -> list:
+    """[(absolute_path, relative_name)] of every file that belongs in a bundle."""
+    base = base or config.config_dir()
+    out = []
+    for r in BUNDLE_FILES:
+        try:
+            p = base / r
+            if p.exists():
+                out.append((p, r))
+        except Exception:
+            pass
+    # Also include any Stereo Tool preset/state files (*.rc, *.sts) under processing/stereotool
+    try:
+        st_dir = base / "processing" / "stereotool"
+        if st_dir.exists():
+            for ext in ("*.rc", "*.sts"):
+                for p in st_dir.rglob(ext):
+                    try:
+                        out.append((p, str(p.relative_to(base))))
+                    except Exception:
+                        pass
+    except Exception:
+        pass
+    return out
+
+
+def timestamp() -> str:
+    return datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def default_export_path() -> Path:
+    return Path.home() / f"rdx-settings-{timestamp()}.zip"
+
+
+def export_bundle(path, version: str = "", manifest: bool = True) -> list:
+    """Write a settings bundle to ``path``; returns the relative names included."""
+    ts = timestamp()
+    files = bundle_file_list()
+    with zipfile.ZipFile(str(path), 'w', compression=zipfile.ZIP_DEFLATED) as z:
+        if manifest:
+            # Write a small manifest
+            z.writestr("rdx-export.json", json.dumps({
+                "product": "rdx-broadcast-control-center",
+                "version": version,
+                "exported_at": ts,
+                "base": "~/.config/rdx",
+                "files": [rel for (_abs, rel) in files],
+            }, indent=2))
+        for abs_p, rel in files:
+            try:
+                z.write(str(abs_p), arcname=rel)
+            except Exception:
+                pass
+    return [rel for (_abs, rel) in files]
+
+
+def safety_backup() -> Path:
+    """Snapshot current settings before an import; returns Path("") on failure."""
+    backup_path = config.config_dir() / f"backup-before-import-{timestamp()}.zip"
+    try:
+        export_bundle(backup_path, manifest=False)
+    except Exception:
+        # Non-fatal
+        return Path("")
+    return backup_path
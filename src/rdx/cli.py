@@ -0,0 +1,579 @@
+"""
+``rdx`` command-line interface for batch and scripted operations.
+
+Only the non-GUI core is imported, and each subcommand imports what it needs
+lazily, so ``rdx status`` from cron or an autologgen hook starts in well under
+100 ms instead of bringing up the Qt window.
+
+    rdx status [--json]
+    rdx start [--timeout 30] [--json]
+    rdx jack ports|profiles
+    rdx jack connect SRC DST | disconnect SRC DST | apply-profile NAME | switch-profile NAME [--dry-run]
+    rdx jack panic [--deadline-ms 200] [--ignore-protection] | restore
+    rdx jack history [-n 20] [--json] | undo [-n N] | redo [-n N] | restore-to SEQ|TIME
+    rdx jack reconcile [--dry-run] | keep-profile [NAME]
+    rdx jack latency [--json]
+    rdx streams list [--json] | add --codec MP3 --bitrate 128 --mount /live | generate | apply [--dry-run] [--no-restart]
+    rdx icecast render [-o FILE]
+    rdx backup export [FILE]
+"""
+
+import argparse
+import json
+import sys
+import time
+
+
+def _err(msg: str) -> int:
+    print(f"rdx: {msg}", file=sys.stderr)
+    return 1
+
+
+def _print_json(data):
+    json.dump(data, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+
+
+# ---- status ----
+def cmd_status(args) -> int:
+    from . import rpc
+    snapshot = None
+    try:
+        with rpc.Client(timeout=0.5) as c:
+            snapshot = c.call("status.get")
+        source = "daemon"
+    except Exception:
+        snapshot = None
+    if not snapshot or not snapshot.get('services'):
+        # No daemon (or it has not finished its first probe): probe directly
+        from . import services as rdx_services
+        states = rdx_services.probe_all()
+        snapshot = {'services': {k: {'name': info['name'], 'state': states.get(k, 'unknown')}
+                                 for k, info in rdx_services.SERVICES.items()},
+                    'jack': {'running': states.get('jack') == 'running', 'session': False}}
+        source = "probe"
+    health = None
+    if args.health and source == "daemon":
+        try:
+            with rpc.Client(timeout=0.5) as c:
+                health = c.call("services.health")['services']
+        except Exception:
+            health = None
+    if args.json:
+        _print_json(dict(snapshot, source=source, **({'health': health} if health is not None else {})))
+        return 0
+    for key, svc in snapshot['services'].items():
+        crashes = svc.get('crashes') or 0
+        note = f"  {crashes} crash{'es' if crashes != 1 else ''}" if crashes else ""
+        print(f"{svc.get('name', key):<14} {svc.get('state', 'unknown')}{note}"
+              + ("  CRASH LOOP" if svc.get('crash_loop') else ""))
+        h = (health or {}).get(key)
+        if h and h['crashes']:
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(h['last_crash']))
+            mtbf = f"{h['mtbf'] / 3600.0:.1f} h" if h['mtbf'] >= 3600 else f"{h['mtbf']:.0f} s"
+            print(f"{'':<14} MTBF {mtbf}, last crash {when}"
+                  + (f", systemd restarts {h['systemd_restarts']}" if h['systemd_restarts'] is not None else ""))
+            for line in (h['recent'][-1].get('log') or [])[-5:]:
+                print(f"{'':<16}| {line}")
+    if source == "probe":
+        print("(rdx daemon offline; probed directly)")
+    elif args.health and health is None:
+        print("(crash history unavailable)")
+    states = [svc.get('state') for svc in snapshot['services'].values()]
+    return 0 if all(s == "running" for s in states) else 3
+
+
+# ---- start ----
+def _expect(keys, action: str):
+    """Tell the daemon's supervisor these starts/restarts are ours, so they are not counted as crashes."""
+    from . import rpc
+    try:
+        with rpc.Client(timeout=0.5) as c:
+            for key in keys:
+                c.call("services.expect", service=key, action=action)
+    except (OSError, rpc.RPCError):
+        pass   # no daemon (or an old one): nobody to tell
+
+
+def cmd_start(args) -> int:
+    from . import startup
+    keys = startup.configured()
+    _expect(keys, "start")
+
+    def progress(key, entry):
+        if not args.json:
+            when = f"{entry['ready']:6.2f} s" if entry['ready'] is not None else f"{'':>8}"
+            print(f"{when}  {key:<12} {entry['state']}" + (f"  ({' '.join(entry['message'].split())})" if entry['message'] else ""),
+                  flush=True)
+
+    if not args.json:
+        print(" -> ".join(", ".join(wave) for wave in startup.plan(keys)))
+    res = startup.start_chain(keys, timeouts={k: args.timeout for k in keys}, progress=progress)
+    if args.json:
+        _print_json(res)
+    else:
+        print(f"{'All services ready' if res['ok'] else 'Not everything came up'} after {res['seconds']:.2f} s.")
+    return 0 if res['ok'] else 3
+
+
+# ---- jack ----
+def _journal_point(text: str) -> int:
+    """Journal seq for ``restore-to``: "41" / "#41", "14:05[:30]" today, or an ISO date and time."""
+    from . import journal
+    text = text.strip()
+    if text.lstrip("#").isdigit():
+        return int(text.lstrip("#"))
+    import datetime
+    try:
+        t = datetime.time.fromisoformat(text)
+        when = datetime.datetime.combine(datetime.date.today(), t)
+    except ValueError:
+        when = datetime.datetime.fromisoformat(text)
+    return journal.seq_at(when.timestamp())
+
+
+def _apply_profile(name: str) -> int:
+    from . import jack as rdx_jack
+    try:
+        res = rdx_jack.apply_profile(name)
+    except KeyError:
+        return _err(f"unknown profile: {name}")
+    print(f"Applied {res['applied']}/{res['total']} connections from '{name}'.")
+    for e in res['errors']:
+        print(f"  {e}", file=sys.stderr)
+    return 0 if not res['errors'] else 1
+
+
+def _reconcile(dry_run: bool = False) -> int:
+    from . import jack as rdx_jack
+    from . import reconciler
+    topo = rdx_jack.list_topology()
+    if topo is None:
+        return _err("JACK is not running (jack_lsp failed)")
+    if dry_run:
+        for op, s, d in reconciler.plan(topo):
+            print(f"{'+' if op == 'connect' else '-'} {s} -> {d}")
+        return 0
+    res = reconciler.reconcile(topo)
+    if not res:
+        print("Routing already matches the desired state.")
+        return 0
+    print(f"Applied {res['applied']}/{res['total']} changes.")
+    for e in res['errors']:
+        print(f"  {e}", file=sys.stderr)
+    return 0 if not res['errors'] else 1
+
+
+def cmd_jack(args) -> int:
+    from . import jack as rdx_jack
+    from . import journal
+    if args.action == "ports":
+        ports = rdx_jack.list_ports()
+        if not ports:
+            return _err("JACK is not running (jack_lsp failed)")
+        if args.json:
+            _print_json(ports)
+        else:
+            for client in sorted(ports):
+                for direction in ("out", "in"):
+                    for p in ports[client][direction]:
+                        print(f"{direction:<4}{p}")
+        return 0
+    if args.action == "profiles":
+        profiles = rdx_jack.load_profiles()
+        if args.json:
+            _print_json(profiles)
+        else:
+            from . import rules
+            for name in sorted(profiles):
+                print(f"{name} ({len(profiles[name])} connections)")
+            for name, prof in rules.load_xml_profiles().items():
+                if name not in profiles:
+                    print(f"{name} ({len(prof['matcher'])} rules, rdx-profiles.xml)")
+        return 0
+    if args.action == "connect":
+        try:
+            rdx_jack.apply_pair("connect", args.src, args.dst, origin="cli")
+        except RuntimeError as e:
+            return _err(str(e))
+        return 0
+    if args.action == "disconnect":
+        try:
+            rdx_jack.apply_pair("disconnect", args.src, args.dst, origin="cli")
+        except RuntimeError as e:
+            return _err(f"could not disconnect {args.src} -> {args.dst}: {e}")
+        return 0
+    if args.action == "apply-profile":
+        return _apply_profile(args.name)
+    if args.action == "latency":
+        from . import jackserver
+        from . import latency
+        cfg = dict(jackserver.load_settings(), **jackserver.probe_running_config())
+        ports = rdx_jack.list_ports(timeout=1.5)
+        lat, chain = (latency.port_latencies(), latency.air_chain(ports)) if ports else ({}, [])
+        rows = latency.budget_table(cfg['rate'], cfg['nperiods'], lat, chain)
+        if args.json:
+            _print_json({'rate': cfg['rate'], 'nperiods': cfg['nperiods'], 'period': cfg['period'],
+                         'chain': [c for c, _, _ in chain], 'budgets': rows})
+            return 0
+        print(f"{cfg['rate']} Hz, {cfg['nperiods']} periods; air chain: {' → '.join(c for c, _, _ in chain) or 'not patched'}")
+        print(f"{'frames':>7} {'in ms':>8} {'out ms':>8} {'round trip':>11} {'air chain':>10}")
+        for b in rows:
+            mark = " *" if b['period'] == cfg['period'] else ""
+            print(f"{b['period']:>7} {b['capture_ms']:>8} {b['playback_ms']:>8} {b['round_trip_ms']:>11} {b['chain_ms']:>10}{mark}")
+        return 0
+    if args.action == "switch-profile":
+        from . import jackserver
+        try:
+            res = jackserver.apply_profile(args.name, dry_run=args.dry_run)
+        except KeyError:
+            return _err(f"unknown rdx-profiles.xml profile: {args.name}")
+        changes = ", ".join(f"{k} {a} -> {b}" for k, (a, b) in sorted(res['changes'].items()))
+        print(f"JACK: {res['action']}" + (f" ({changes})" if changes else "")
+              + (f". {res['message']}" if res['message'] else ""))
+        if args.dry_run:
+            return 0
+        if not res['ok']:
+            return 1
+        return _apply_profile(args.name)
+    if args.action == "panic":
+        from . import rpc
+        params = {'ignore_protection': args.ignore_protection}
+        if args.deadline_ms is not None:
+            params['deadline_ms'] = args.deadline_ms
+        try:
+            with rpc.Client(timeout=2.0) as c:
+                res = c.call("jack.panic", **params)
+        except rpc.RPCError as e:
+            return _err(e.message)
+        except Exception:
+            # No daemon: read one snapshot and cut from it
+            deadline = (args.deadline_ms if args.deadline_ms is not None else rdx_jack.PANIC_DEADLINE * 1000.0) / 1000.0
+            res = rdx_jack.panic_disconnect(protected=set() if args.ignore_protection else None, deadline=deadline)
+        for s, d in res['cut']:
+            print(f"cut  {s} -> {d}")
+        for s, d in res['pending']:
+            print(f"late {s} -> {d}")
+        for s, d in res['failed']:
+            print(f"  failed: {s} -> {d}", file=sys.stderr)
+        print(f"Cut {len(res['cut'])} connections in {res['elapsed_ms']:.0f} ms "
+              f"({len(res['kept'])} protected kept). Undo with: rdx jack restore")
+        return 0 if not res['failed'] else 1
+    if args.action == "tune":
+        from . import jackserver
+        from . import latency
+        from . import tuner
+        if args.show:
+            saved = tuner.load_results()
+            if args.json:
+                _print_json(saved)
+                return 0
+            for host, backends in sorted(saved.items()):
+                for backend, r in sorted(backends.items()):
+                    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(r.get('time', 0)))
+                    rec = r['recommended']
+                    print(f"{host} {backend} {r.get('device') or ''}: {rec['period']} x {rec['nperiods']} "
+                          f"at {r.get('rate')} Hz (tuned {when})")
+            return 0
+        if args.window:
+            try:
+                if not tuner.in_window(args.window):
+                    return _err(f"outside the maintenance window {args.window}; nothing changed")
+            except ValueError as e:
+                return _err(str(e))
+        if not args.yes:
+            return _err("tuning changes the live JACK server step by step (audio may glitch); "
+                        "run it in a maintenance window with --yes")
+
+        def _progress(step):
+            load = (step['load'] or {}).get('max')
+            verdict = "stable" if step['stable'] else ("failed: " + step['message'] if not step['ok'] else "unstable")
+            print(f"{step['period']:>5} x {step['nperiods']}  {step['action']:<8} xruns {step['xruns']!s:>4}  "
+                  f"max load {'—' if load is None else f'{load:.1f}%':>7}  {verdict}", flush=True)
+
+        try:
+            res = tuner.tune(seconds=args.seconds, max_load=args.max_load, min_period=args.min_period,
+                             synthetic=args.synthetic / 100.0, keep=args.apply,
+                             progress=None if args.json else _progress)
+        except RuntimeError as e:
+            return _err(str(e))
+        if args.json:
+            _print_json(res)
+            return 0
+        rec = res['recommended']
+        b = latency.budget(res['rate'] or jackserver.load_settings()['rate'], rec['period'], rec['nperiods'])
+        print(f"Lowest stable: {rec['period']} frames x {rec['nperiods']} periods "
+              f"(round trip {b['round_trip_ms']} ms)" + ("; applied" if res['applied'] else "; original settings restored"))
+        return 0
+    if args.action == "xruns":
+        from . import rpc
+        try:
+            with rpc.Client(timeout=2.0) as c:
+                res = c.call("diagnostics.xruns", limit=args.n, reset=args.reset)
+        except rpc.RPCError as e:
+            return _err(e.message)
+        except Exception:
+            return _err("xruns are counted by the rdx daemon, which is not running")
+        if args.json:
+            _print_json(res)
+            return 0
+        load = res['load']
+        print(f"xruns: {res['total']} since {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(res['since']))}, "
+              f"{res['last_minute']} in the last minute, {res['last_hour']} in the last hour")
+        if load['samples']:
+            print(f"DSP load (1 min): {load['current']}% now, mean {load['mean']}%, p95 {load['p95']}%, max {load['max']}%")
+        elif not res.get('session'):
+            print("The daemon has no JACK session (JACK stopped, or python3-jack-client missing)")
+        for x in res['xruns']:
+            when = time.strftime("%H:%M:%S", time.localtime(x['time']))
+            print(f"{when}  {x['delayed_usecs'] / 1000.0:7.2f} ms" + (f"  load {x['load']}%" if x['load'] is not None else ""))
+            for e in x['events']:
+                print(f"           {e['time'] - x['time']:+6.1f} s  {e['kind']}: {e['detail']}")
+        return 0
+    if args.action == "restore":
+        try:
+            res = rdx_jack.restore_panic()
+        except LookupError as e:
+            return _err(str(e))
+        print(f"Restored {res['applied']}/{res['total']} connections.")
+        for e in res['errors']:
+            print(f"  {e}", file=sys.stderr)
+        return 0 if not res['errors'] else 1
+    if args.action == "history":
+        items = journal.entries(limit=args.n)
+        if args.json:
+            _print_json(items)
+            return 0
+        for e in items:
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(e.get('time', 0)))
+            print(f"#{e['seq']:<5} {when}  {e.get('origin', '?')}")
+            for op, s, d in e.get('ops', []):
+                print(f"       {'+' if op == 'connect' else '-'} {s} -> {d}")
+        return 0
+    if args.action in ("undo", "redo", "restore-to"):
+        try:
+            if args.action == "undo":
+                res = journal.undo(args.n)
+            elif args.action == "redo":
+                res = journal.redo(args.n)
+            else:
+                res = journal.restore_to(_journal_point(args.point))
+        except LookupError as e:
+            return _err(str(e))
+        except ValueError as e:
+            return _err(f"bad point in time: {e}")
+        print(f"Applied {res['applied']}/{res['total']} connections.")
+        for e in res['errors']:
+            print(f"  {e}", file=sys.stderr)
+        return 0 if not res['errors'] else 1
+    if args.action == "reconcile":
+        return _reconcile(args.dry_run)
+    if args.action == "keep-profile":
+        from . import config
+        from . import reconciler
+        if args.name and args.name not in reconciler.profile_names():
+            return _err(f"unknown profile: {args.name}")
+        settings = config.load_settings()
+        settings['active_profile'] = args.name
+        if not config.save_json(config.settings_file(), settings):
+            return _err("could not write settings.json")
+        print(f"Keeping '{args.name}' connected." if args.name else "No profile kept connected.")
+        return _reconcile() if args.name else 0
+    return 2
+
+
+# ---- streams ----
+def cmd_streams(args) -> int:
+    from . import streaming
+    if args.action == "list":
+        streams = streaming.load_streams()
+        if args.json:
+            _print_json(streams)
+        else:
+            for s in streams:
+                print(f"{s.get('mount', ''):<20} {s.get('codec', ''):<6} {s.get('bitrate', ''):<10} {s.get('station_name', '')}")
+        return 0
+    if args.action == "add":
+        try:
+            stream = streaming.make_stream(args.codec, args.bitrate, args.mount, args.name or "",
+                                           args.genre or "", args.description or "")
+            streams = streaming.add_stream(streaming.load_streams(), stream)
+        except ValueError as e:
+            return _err(str(e))
+        if not streaming.save_streams(streams):
+            return _err(f"could not write {streaming.streams_file()}")
+        print(f"Added {stream['codec']} {stream['bitrate']} stream at {stream['mount']}")
+        return 0
+    if args.action == "generate":
+        streams = streaming.load_streams()
+        if not streams:
+            return _err("no streams configured (rdx streams add ...)")
+        if args.output == "-":
+            sys.stdout.write(streaming.build_liquidsoap_config(streams))
+            return 0
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(streaming.build_liquidsoap_config(streams))
+            print(args.output)
+        else:
+            print(streaming.write_liquidsoap_config(streams))
+        return 0
+    if args.action == "apply":
+        res = streaming.apply_streams(dry_run=args.dry_run, restart=not args.no_restart,
+                                      before_restart=lambda: _expect(['liquidsoap'], "restart"))
+        if args.json:
+            _print_json(res)
+        else:
+            for change in res['changes']:
+                print(f"  {change}")
+            print(f"{res['action']}: {res['message']}" if res['message'] else res['action'])
+        return 0 if res['ok'] and res['action'] != "pending" or args.dry_run else 1
+    return 2
+
+
+# ---- icecast ----
+def cmd_icecast(args) -> int:
+    from . import streaming
+    d = streaming.ICECAST_DEFAULTS
+    xml = streaming.build_icecast_config(
+        host=args.host or d['host'],
+        port=args.port or d['port'],
+        source_pass=args.source_pass or d['source_password'],
+        admin_pass=args.admin_pass or d['admin_password'],
+        relay_pass=args.relay_pass or d['relay_password'],
+    )
+    if args.output and args.output != "-":
+        with open(args.output, 'w') as f:
+            f.write(xml)
+        print(args.output)
+    else:
+        sys.stdout.write(xml)
+    return 0
+
+
+# ---- backup ----
+def cmd_backup(args) -> int:
+    from . import __version__, backup
+    path = args.file or str(backup.default_export_path())
+    try:
+        files = backup.export_bundle(path, version=f"RDX {__version__} (cli)")
+    except Exception as e:
+        return _err(f"export failed: {e}")
+    print(f"Exported {len(files)} file(s) to {path}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="rdx", description="RDX broadcast chain control (no GUI)")
+    sub = ap.add_subparsers(dest="command", metavar="COMMAND")
+    sub.required = True
+
+    p = sub.add_parser("status", help="service states (exit 3 if anything is not running)")
+    p.add_argument("--json", action="store_true")
+    p.add_argument("--health", action="store_true", help="crash history, MTBF and the log lines at the last crash")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("start", help="start the configured services in dependency order, in parallel where possible")
+    p.add_argument("--timeout", type=float, default=30.0, help="seconds each service gets to become ready")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_start)
+
+    p = sub.add_parser("jack", help="JACK ports, connections and profiles")
+    jsub = p.add_subparsers(dest="action", metavar="ACTION")
+    jsub.required = True
+    for name in ("ports", "profiles"):
+        q = jsub.add_parser(name)
+        q.add_argument("--json", action="store_true")
+    for name in ("connect", "disconnect"):
+        q = jsub.add_parser(name)
+        q.add_argument("src")
+        q.add_argument("dst")
+    q = jsub.add_parser("apply-profile")
+    q.add_argument("name")
+    q = jsub.add_parser("latency", help="latency budget per buffer size, including the air chain clients")
+    q.add_argument("--json", action="store_true")
+    q = jsub.add_parser("switch-profile", help="apply an rdx-profiles.xml profile's JACK settings, then its connections")
+    q.add_argument("name")
+    q.add_argument("--dry-run", action="store_true", help="only show what would change on the JACK server")
+    q = jsub.add_parser("panic", help="cut every non-protected connection now")
+    q.add_argument("--deadline-ms", type=float, default=None)
+    q.add_argument("--ignore-protection", action="store_true")
+    jsub.add_parser("restore", help="reconnect what the last panic cut")
+    q = jsub.add_parser("tune", help="find the lowest period/nperiods without xruns (changes the live server)")
+    q.add_argument("--seconds", type=float, default=30.0, help="measurement time per step")
+    q.add_argument("--max-load", type=float, default=75.0, help="highest acceptable DSP load, percent")
+    q.add_argument("--min-period", type=int, default=64)
+    q.add_argument("--synthetic", type=float, default=0.0, metavar="PERCENT",
+                   help="extra load: a client busy for this share of every period")
+    q.add_argument("--window", metavar="HH:MM-HH:MM", help="only run inside this maintenance window")
+    q.add_argument("--apply", action="store_true", help="keep the recommendation instead of restoring")
+    q.add_argument("--show", action="store_true", help="print the saved results and exit")
+    q.add_argument("--yes", action="store_true", help="confirm that the server may be changed")
+    q.add_argument("--json", action="store_true")
+    q = jsub.add_parser("xruns", help="xruns and DSP load seen by the daemon, with the changes around each xrun")
+    q.add_argument("-n", type=int, default=20, help="recent xruns to list")
+    q.add_argument("--reset", action="store_true", help="clear the history afterwards")
+    q.add_argument("--json", action="store_true")
+    q = jsub.add_parser("history", help="routing journal")
+    q.add_argument("-n", type=int, default=20)
+    q.add_argument("--json", action="store_true")
+    for name in ("undo", "redo"):
+        q = jsub.add_parser(name, help=f"{name} the last N routing changes")
+        q.add_argument("-n", type=int, default=1)
+    q = jsub.add_parser("reconcile", help="apply the active profile and routing rules now")
+    q.add_argument("--dry-run", action="store_true", help="only print the changes")
+    q = jsub.add_parser("keep-profile", help="profile the reconciler keeps connected (none: clear)")
+    q.add_argument("name", nargs="?")
+    q = jsub.add_parser("restore-to", help="put routing back as it was right after journal entry SEQ or at TIME")
+    q.add_argument("point", metavar="SEQ|TIME")
+    p.set_defaults(func=cmd_jack)
+
+    p = sub.add_parser("streams", help="stream definitions and radio.liq")
+    ssub = p.add_subparsers(dest="action", metavar="ACTION")
+    ssub.required = True
+    q = ssub.add_parser("list")
+    q.add_argument("--json", action="store_true")
+    q = ssub.add_parser("add")
+    q.add_argument("--codec", required=True, help="MP3, AAC+, FLAC, OGG or OPUS")
+    q.add_argument("--bitrate", required=True, help="e.g. 128 or '128 kbps'")
+    q.add_argument("--mount", required=True)
+    q.add_argument("--name", help="station name")
+    q.add_argument("--genre")
+    q.add_argument("--description")
+    q = ssub.add_parser("generate", help="write ~/.config/rdx/radio.liq")
+    q.add_argument("-o", "--output", help="write elsewhere ('-' for stdout)")
+    q = ssub.add_parser("apply", help="write radio.liq and change the running outputs (restart only for a new encoder)")
+    q.add_argument("--dry-run", action="store_true", help="only show what would change")
+    q.add_argument("--no-restart", action="store_true", help="never restart Liquidsoap; report it as pending")
+    q.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_streams)
+
+    p = sub.add_parser("icecast", help="Icecast configuration")
+    isub = p.add_subparsers(dest="action", metavar="ACTION")
+    isub.required = True
+    q = isub.add_parser("render", help="print icecast.xml for the configured streams")
+    q.add_argument("-o", "--output", help="write to FILE instead of stdout")
+    q.add_argument("--host")
+    q.add_argument("--port", type=int)
+    q.add_argument("--source-pass")
+    q.add_argument("--admin-pass")
+    q.add_argument("--relay-pass")
+    p.set_defaults(func=cmd_icecast)
+
+    p = sub.add_parser("backup", help="settings bundles")
+    bsub = p.add_subparsers(dest="action", metavar="ACTION")
+    bsub.required = True
+    q = bsub.add_parser("export", help="zip ~/.config/rdx settings")
+    q.add_argument("file", nargs="?", help="default: ~/rdx-settings-<timestamp>.zip")
+    p.set_defaults(func=cmd_backup)
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        return 0
@@ -0,0 +1,66 @@
+"""
+Shared locations and small JSON helpers for RDX state under ~/.config/rdx.
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+def config_dir() -> Path:
+    p = Path.home() / ".config" / "rdx"
+    try:
+        p.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        pass
+    return p
+
+
+def settings_file() -> Path:
+    return config_dir() / "settings.json"
+
+
+def load_json(path: Path, default=None):
+    """Read a JSON file, returning ``default`` when missing or unreadable."""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+
+def save_json(path: Path, data) -> bool:
+    """Write JSON atomically (temp file + rename) so readers never see a partial file."""
+    try:
+        tmp = Path(str(path) + ".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        return False
+
+
+def load_settings() -> dict:
+    data = load_json(settings_file(), {})
+    return data if isinstance(data, dict) else {}
+
+
+def runtime_dir() -> Path:
+    """Per-user runtime directory for sockets ($XDG_RUNTIME_DIR/rdx, else ~/.config/rdx/run)."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    p = Path(base) / "rdx" if base else config_dir() / "run"
+    try:
+        p.mkdir(parents=True, exist_ok=True)
+        p.chmod(0o700)
+    except Exception:
+        pass
+    return p
+
+
+def socket_path() -> Path:
+    """Unix socket of the rdx daemon; ``RDX_SOCKET`` overrides the default."""
+    env = os.environ.get("RDX_SOCKET")
+    if env:
+        return Path(env)
+    return runtime_dir() / "rdxd.sock"
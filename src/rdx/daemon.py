@@ -0,0 +1,660 @@
+"""
+Headless RDX daemon
+
+Owns what used to live inside the GUI widgets and died with the window:
+- the service status engine (one probe cycle shared by every viewer),
+- a persistent JACK session (when the ``jack`` bindings are installed) whose
+  port/connection callbacks drive topology updates,
+- the routing reconciler (``rdx.reconciler``): active profile and rules such
+  as VLC → Rivendell Record-In, re-applied on each topology change,
+- xrun and DSP-load telemetry (``rdx.xruns``) next to the service and
+  routing changes they may have coincided with,
+- crash tracking for the services (``rdx.supervisor``): crash loops, MTBF
+  and the log lines at each crash, from the states the status loop probes.
+
+Clients (GUI, launcher, CLI, scripts) talk JSON-RPC over a Unix socket; see
+``rdx.rpc`` for the framing. Subscribed clients receive pushed events, so any
+number of viewers costs no extra probing.
+
+The same socket also answers plain HTTP/1.1 (detected from the first line) so
+shell scripts can use ``curl --unix-socket``: ``POST /rpc`` takes one JSON-RPC
+request per keep-alive round trip, ``GET /status`` returns the snapshot and
+``GET /events`` streams events as Server-Sent Events. ``GET /metrics`` returns
+Prometheus text format, which is also served over TCP for scrapers (see
+``rdx.exporter``). See docs/API.md.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from . import __version__
+from . import api
+from . import config
+from . import exporter
+from . import jack as rdx_jack
+from . import metrics
+from . import reconciler
+from . import rpc
+from . import services as rdx_services
+from . import supervisor
+from . import xruns
+
+
+def _import_pyjack():
+    """python-jack-client if installed (optional, for event-driven topology); imported on
+    first use so clients importing this module for the unit helpers don't load libjack."""
+    try:
+        import jack as _pyjack
+    except Exception:
+        _pyjack = None
+    return _pyjack
+
+
+def _log(msg: str):
+    print(f"[rdxd] {msg}", flush=True)
+
+
+class JackSession:
+    """Persistent JACK client used only for notifications (no audio ports)."""
+
+    def __init__(self, on_change, on_shutdown, on_xrun=None):
+        self.client = None
+        self._on_change = on_change
+        self._on_shutdown = on_shutdown
+        self._on_xrun = on_xrun or (lambda delayed_usecs: None)
+
+    @property
+    def active(self) -> bool:
+        return self.client is not None
+
+    def open(self) -> bool:
+        _pyjack = _import_pyjack()
+        if _pyjack is None or self.client is not None:
+            return self.client is not None
+        try:
+            client = _pyjack.Client("rdxd", no_start_server=True)
+        except Exception:
+            return False
+        # Callbacks run on JACK's notification thread: only flag, never call back into JACK
+        client.set_port_registration_callback(lambda port, register: self._on_change("port"))
+        client.set_port_connect_callback(lambda a, b, connect: self._on_change("connection"))
+        client.set_shutdown_callback(lambda status, reason: self._on_shutdown(reason))
+        client.set_xrun_callback(lambda delayed_usecs: self._on_xrun(delayed_usecs))
+        try:
+            client.activate()
+        except Exception:
+            try:
+                client.close()
+            except Exception:
+                pass
+            return False
+        self.client = client
+        return True
+
+    def cpu_load(self):
+        client = self.client
+        if client is None:
+            return None
+        try:
+            return float(client.cpu_load())
+        except Exception:
+            return None
+
+    def close(self):
+        client, self.client = self.client, None
+        if client is not None:
+            try:
+                client.deactivate()
+                client.close()
+            except Exception:
+                pass
+
+
+HTTP_METHODS = (b"GET ", b"POST ", b"HEAD ", b"PUT ", b"DELETE ", b"OPTIONS ")
+HTTP_MAX_BODY = 1 << 20
+HTTP_REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class _Session(socketserver.StreamRequestHandler):
+    """One connected client: reads requests line by line, writes responses and events.
+
+    ``mode`` is "line" for JSON-RPC clients, "http" for plain request/response
+    HTTP and "sse" once an HTTP client has switched to ``GET /events``.
+    """
+
+    def setup(self):
+        super().setup()
+        self.topics = set()
+        self.write_lock = threading.Lock()
+        self.alive = True
+        self.mode = "line"
+
+    @property
+    def streaming(self) -> bool:
+        return self.alive and self.mode != "http"
+
+    def send(self, msg: dict) -> bool:
+        if not self.streaming:
+            return False
+        try:
+            if self.mode == "sse":
+                params = msg.get("params") or {}
+                data = (f"event: {params.get('topic', 'message')}\n"
+                        f"data: {json.dumps(params.get('data'), separators=(',', ':'))}\n\n").encode("utf-8")
+            else:
+                data = rpc.encode(msg)
+            with self.write_lock:
+                self.wfile.write(data)
+                self.wfile.flush()
+            return True
+        except Exception:
+            self.alive = False
+            return False
+
+    def handle(self):
+        daemon = self.server.rdx_daemon
+        daemon.sessions.add(self)
+        try:
+            first = self.rfile.readline()
+            if first.startswith(HTTP_METHODS):
+                self.mode = "http"
+                self._handle_http(daemon, first)
+                return
+            line = first
+            while line:
+                line = line.strip()
+                if line:
+                    reply = daemon.dispatch(self, line)
+                    if reply is not None:
+                        self.send(reply)
+                line = self.rfile.readline()
+        except Exception:
+            pass
+        finally:
+            self.alive = False
+            daemon.sessions.discard(self)
+
+    # ---- HTTP/1.1 ----
+    def _http_respond(self, status: int, payload=None, content_type: str = "application/json",
+                      keep_alive: bool = True):
+        if payload is None:
+            body = b""
+        elif isinstance(payload, bytes):
+            body = payload
+        else:
+            body = (json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
+        head = (f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        with self.write_lock:
+            self.wfile.write(head.encode("latin-1") + body)
+            self.wfile.flush()
+
+    def _read_http_headers(self) -> dict:
+        headers = {}
+        while True:
+            raw = self.rfile.readline(65537)
+            if not raw or raw in (b"\r\n", b"\n"):
+                return headers
+            key, _, value = raw.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+    def _handle_http(self, daemon, request_line: bytes):
+        while request_line:
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                self._http_respond(400, {"error": "malformed request line"}, keep_alive=False)
+                return
+            method, target, version = parts
+            headers = self._read_http_headers()
+            conn = headers.get("connection", "").lower()
+            keep_alive = ("close" not in conn) and (version != "HTTP/1.0" or "keep-alive" in conn)
+            try:
+                length = int(headers.get("content-length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0 or length > HTTP_MAX_BODY:
+                self._http_respond(413 if length > 0 else 400, {"error": "bad Content-Length"}, keep_alive=False)
+                return
+            body = self.rfile.read(length) if length else b""
+            url = urlsplit(target)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+            if url.path == "/rpc":
+                if method != "POST":
+                    self._http_respond(405, {"error": "use POST"}, keep_alive=keep_alive)
+                else:
+                    reply = daemon.dispatch(self, body)
+                    self._http_respond(200 if reply is not None else 204, reply, keep_alive=keep_alive)
+            elif url.path == "/status" and method in ("GET", "HEAD"):
+                self._http_respond(200, daemon.status if method == "GET" else None, keep_alive=keep_alive)
+            elif url.path == "/metrics" and method == "GET":
+                self._http_respond(200, metrics.REGISTRY.render().encode("utf-8"),
+                                   content_type=metrics.CONTENT_TYPE, keep_alive=keep_alive)
+            elif url.path == "/events" and method == "GET":
+                self._stream_events(daemon, query)
+                return
+            else:
+                self._http_respond(404, {"error": "not found",
+                                         "routes": ["POST /rpc", "GET /status", "GET /events", "GET /metrics"]},
+                                   keep_alive=keep_alive)
+            if not keep_alive:
+                return
+            request_line = self.rfile.readline()
+
+    def _stream_events(self, daemon, query: dict):
+        """Switch this connection to Server-Sent Events until the client hangs up."""
+        topics = [t for t in (query.get("topics") or "*").split(",") if t]
+        with self.write_lock:
+            self.wfile.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                             b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n")
+            self.wfile.flush()
+        self.mode = "sse"
+        daemon.dispatch(self, rpc.encode({"jsonrpc": "2.0", "method": "events.subscribe",
+                                          "params": {"topics": topics}}))
+        if query.get("follow"):
+            daemon.dispatch(self, rpc.encode({"jsonrpc": "2.0", "method": "logs.follow",
+                                              "params": {"name": query["follow"]}}))
+        # Nothing more is read from an event stream; wait for EOF
+        while self.alive and self.rfile.read(1):
+            pass
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Daemon:
+    def __init__(self, socket_path=None, status_interval: float = 3.0, watch_interval: float = 1.5,
+                 heartbeat_interval: float = 15.0, metrics_listen=None, load_interval: float = 1.0):
+        self.socket_path = Path(socket_path or config.socket_path())
+        self.metrics_listen = metrics_listen
+        self.status_interval = status_interval
+        self.watch_interval = watch_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.load_interval = load_interval
+        self.started = time.time()
+        self.sessions = set()
+        self.followers = {}
+        self._stop = threading.Event()
+        self._topology_dirty = threading.Event()
+        self._status_poke = threading.Event()
+        self._lock = threading.Lock()
+        self.status = {'services': {}, 'jack': {'running': False, 'session': False}, 'updated': 0.0}
+        self.topology = {'ports': {}, 'connections': [], 'types': {}, 'updated': 0.0}
+        self.xruns = xruns.Collector()
+        self.supervisor = supervisor.Supervisor()
+        self.jack_session = JackSession(self._on_jack_change, self._on_jack_shutdown, self._on_xrun)
+        self._settings_mtime = None
+        self.settings = {}
+        self.methods = {}
+        self.register("ping", lambda session, **p: "pong")
+        self.register("daemon.info", self._rpc_info)
+        self.register("status.get", lambda session, **p: self.status)
+        self.register("jack.topology", self._rpc_topology)
+        self.register("events.subscribe", self._rpc_subscribe)
+        self.register("events.unsubscribe", self._rpc_unsubscribe)
+        api.ControlAPI(self).install()
+        exporter.install(self)
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    # ---- RPC plumbing ----
+    def register(self, name: str, fn):
+        """Expose ``fn(session, **params)`` as RPC method ``name``."""
+        self.methods[name] = fn
+
+    def dispatch(self, session, line: bytes):
+        try:
+            msg = json.loads(line.decode("utf-8"))
+        except Exception:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": rpc.PARSE_ERROR, "message": "Parse error"}}
+        if not isinstance(msg, dict) or not isinstance(msg.get("method"), str):
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": rpc.INVALID_REQUEST, "message": "Invalid request"}}
+        req_id = msg.get("id")
+        params = msg.get("params") or {}
+        fn = self.methods.get(msg["method"])
+        try:
+            if fn is None:
+                raise rpc.RPCError(rpc.METHOD_NOT_FOUND, f"Unknown method: {msg['method']}")
+            if not isinstance(params, dict):
+                raise rpc.RPCError(rpc.INVALID_PARAMS, "params must be an object")
+            try:
+                result = fn(session, **params)
+            except TypeError as e:
+                raise rpc.RPCError(rpc.INVALID_PARAMS, str(e))
+        except rpc.RPCError as e:
+            return None if req_id is None else {"jsonrpc": "2.0", "id": req_id, "error": e.to_dict()}
+        except Exception as e:
+            return None if req_id is None else {"jsonrpc": "2.0", "id": req_id,
+                                                "error": {"code": rpc.INTERNAL_ERROR, "message": str(e)}}
+        if req_id is None:
+            return None
+        return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+    def publish(self, topic: str, data):
+        msg = rpc.notification(topic, data)
+        for session in list(self.sessions):
+            if topic in session.topics or "*" in session.topics:
+                session.send(msg)
+
+    def poke_status(self):
+        """Run the next service probe now instead of waiting for the interval."""
+        self._status_poke.set()
+
+    def topology_changed(self, **info):
+        """Record a change made through the API: tell routing listeners and refresh topology."""
+        self.publish("routing", info)
+        self.xruns.event("routing", xruns.routing_detail(info))
+        self._topology_dirty.set()
+
+    def _rpc_info(self, session, **params):
+        return {
+            'version': __version__,
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 1),
+            'clients': len(self.sessions),
+            'jack_session': self.jack_session.active,
+            'methods': sorted(self.methods.keys()),
+        }
+
+    def _rpc_topology(self, session, **params):
+        if not self.jack_session.active and time.time() - self.topology['updated'] > self.watch_interval:
+            self.refresh_topology()
+        return self.topology
+
+    def _rpc_subscribe(self, session, topics=None):
+        topics = topics or ["*"]
+        session.topics.update(topics)
+        # Fresh subscribers get the current state right away instead of waiting for a change
+        if "status" in topics or "*" in topics:
+            session.send(rpc.notification("status", self.status))
+        return sorted(session.topics)
+
+    def _rpc_unsubscribe(self, session, topics=None):
+        if topics:
+            session.topics.difference_update(topics)
+        else:
+            session.topics.clear()
+        return sorted(session.topics)
+
+    # ---- settings ----
+    def reload_settings(self):
+        try:
+            mtime = config.settings_file().stat().st_mtime
+        except Exception:
+            mtime = None
+        if mtime != self._settings_mtime:
+            self._settings_mtime = mtime
+            self.settings = config.load_settings()
+
+    def setting_enabled(self, key: str, default: bool = True) -> bool:
+        return bool(self.settings.get(key, default))
+
+    # ---- JACK session ----
+    def _on_jack_change(self, what: str):
+        self._topology_dirty.set()
+
+    def _on_xrun(self, delayed_usecs):
+        exporter.JACK_XRUNS.inc()
+        self.xruns.xrun(delayed_usecs)
+
+    def _on_jack_shutdown(self, reason):
+        self.xruns.event("jack", f"server shut down: {reason}")
+        # Drop the client from a helper thread; closing inside the callback deadlocks libjack
+        threading.Thread(target=self.jack_session.close, daemon=True).start()
+        self._topology_dirty.set()
+
+    def refresh_topology(self):
+        ports, cons, types = rdx_jack.list_topology() or ({}, [], {})
+        with self._lock:
+            self.topology = {'ports': ports, 'connections': cons, 'types': types, 'updated': time.time()}
+        exporter.record_topology(ports, cons)
+        return self.topology
+
+    # ---- engines ----
+    def _status_loop(self):
+        while not self._stop.is_set():
+            t0 = time.monotonic()
+            states = rdx_services.probe_all()
+            jack_running = states.get('jack') == 'running'
+            if jack_running and not self.jack_session.active and self.jack_session.open():
+                _log("JACK session opened; topology is now event-driven")
+                self.xruns.event("jack", "session opened")
+                self._topology_dirty.set()
+            for crash in self.supervisor.observe(states):
+                _log(f"{crash['service']} crashed ({crash['result'] or crash['state']})")
+                self.xruns.event("service", f"{crash['service']} crashed")
+                exporter.SERVICE_CRASHES.labels(service=crash['service']).inc()
+                self.publish("crash", crash)
+            services = {}
+            for k, info in rdx_services.SERVICES.items():
+                health = self.supervisor.health(k)
+                services[k] = {'name': info['name'], 'state': states.get(k, 'unknown'),
+                               'crashes': health['crashes'], 'crash_loop': health['crash_loop']}
+                exporter.SERVICE_CRASH_LOOP.labels(service=k).set(1 if health['crash_loop'] else 0)
+            jack_info = {'running': jack_running, 'session': self.jack_session.active}
+            changed = services != self.status.get('services') or jack_info != self.status.get('jack')
+            for key, info in services.items():
+                old = self.status.get('services', {}).get(key, {}).get('state')
+                if old is not None and old != info['state']:
+                    self.xruns.event("service", f"{key}: {old} → {info['state']}")
+            elapsed = time.monotonic() - t0
+            self.status = {'services': services, 'jack': jack_info, 'updated': time.time(),
+                           'probe_ms': round(elapsed * 1000.0, 1)}
+            exporter.record_status(states, elapsed, self.status['updated'])
+            if changed:
+                self.publish("status", self.status)
+            # A control request pokes the loop; re-probe shortly after so the transition shows up
+            if self._status_poke.wait(self.status_interval):
+                self._status_poke.clear()
+                self._stop.wait(0.5)
+
+    def _load_loop(self):
+        # DSP load has no JACK callback: sample it, and tell subscribers about new xruns
+        # here rather than from the xrun callback, which runs on JACK's thread
+        seen = self.xruns.total
+        while not self._stop.wait(self.load_interval):
+            load = self.jack_session.cpu_load()
+            self.xruns.load(load)
+            total = self.xruns.total
+            if total != seen:
+                self.publish("xrun", {'total': total, 'new': total - seen, 'load': load,
+                                      'last_minute': self.xruns.xruns_since(time.time() - 60)})
+                seen = total
+
+    def _heartbeat_loop(self):
+        # Keep-alive for idle event streams (proxies and SSE clients drop silent connections)
+        while not self._stop.wait(self.heartbeat_interval):
+            msg = rpc.notification("heartbeat", {'time': time.time(), 'clients': len(self.sessions)})
+            for session in list(self.sessions):
+                if session.topics:
+                    session.send(msg)
+
+    def _watch_loop(self):
+        while not self._stop.is_set():
+            # Event-driven when a JACK session exists; fall back to interval polling otherwise
+            timeout = 30.0 if self.jack_session.active else self.watch_interval
+            fired = self._topology_dirty.wait(timeout)
+            if self._stop.is_set():
+                break
+            self._topology_dirty.clear()
+            if fired:
+                # Let bursts of port registrations settle into one refresh
+                time.sleep(0.05)
+                self._topology_dirty.clear()
+            try:
+                self.reload_settings()
+                watching = reconciler.active(self.settings)
+                if not (fired or watching):
+                    continue
+                if not rdx_jack.is_running(timeout=0.6):
+                    continue
+                topo = self.refresh_topology()
+                if fired:
+                    self.publish("topology", topo)
+                if watching:
+                    self.reconcile(topo)
+            except Exception as e:
+                _log(f"watcher error: {e}")
+
+    def reconcile(self, topo: dict = None):
+        """Converge routing on the desired state (rdx.reconciler) from ``topo`` or a fresh snapshot."""
+        topo = topo or self.refresh_topology()
+        res = reconciler.reconcile((topo['ports'], topo['connections'], topo.get('types', {})),
+                                   client=self.jack_session.client, settings=self.settings)
+        if not res:
+            return res
+        done = [r for r in res['results'] if r['status'] == "done"]
+        if done:
+            _log("reconciled: " + ", ".join(f"{'+' if r['op'] == 'connect' else '-'}{r['src']} → {r['dst']}"
+                                           for r in done))
+            info = {'origin': reconciler.ORIGIN,
+                    'connected': [[r['src'], r['dst']] for r in done if r['op'] == "connect"],
+                    'disconnected': [[r['src'], r['dst']] for r in done if r['op'] == "disconnect"]}
+            self.publish("routing", info)
+            self.xruns.event("routing", xruns.routing_detail(info))
+        if res['errors']:
+            _log("reconcile errors: " + "; ".join(res['errors'][:5]))
+        return res
+
+    # ---- lifecycle ----
+    def _prepare_socket(self):
+        if self.socket_path.exists():
+            if rpc.daemon_available(self.socket_path):
+                raise SystemExit(f"rdx daemon already running on {self.socket_path}")
+            try:
+                self.socket_path.unlink()
+            except Exception:
+                pass
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _start_metrics_listener(self):
+        listen = self.metrics_listen
+        if listen is None:
+            self.reload_settings()
+            listen = self.settings.get('metrics_listen', exporter.DEFAULT_LISTEN)
+        try:
+            address = exporter.parse_listen(listen)
+        except ValueError:
+            _log(f"metrics: invalid listen address {listen!r}")
+            return None
+        if address is None:
+            return None
+        try:
+            server = exporter.serve_tcp(address)
+        except OSError as e:
+            # Another user's daemon may own the port; the socket still serves GET /metrics
+            _log(f"metrics: cannot listen on {address[0]}:{address[1]} ({e})")
+            return None
+        _log(f"metrics on http://{address[0]}:{address[1]}/metrics")
+        return server
+
+    def serve_forever(self):
+        self._prepare_socket()
+        server = _Server(str(self.socket_path), _Session)
+        server.rdx_daemon = self
+        try:
+            os.chmod(self.socket_path, 0o600)
+        except Exception:
+            pass
+        for target in (self._status_loop, self._watch_loop, self._load_loop, self._heartbeat_loop):
+            threading.Thread(target=target, daemon=True).start()
+        _log(f"listening on {self.socket_path}")
+        metrics_server = self._start_metrics_listener()
+
+        def _shutdown(signum, frame):
+            self._stop.set()
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, _shutdown)
+        signal.signal(signal.SIGINT, _shutdown)
+        try:
+            server.serve_forever(poll_interval=0.5)
+        finally:
+            self._stop.set()
+            self._topology_dirty.set()
+            self._status_poke.set()
+            self.jack_session.close()
+            if metrics_server is not None:
+                metrics_server.shutdown()
+                metrics_server.server_close()
+            server.server_close()
+            try:
+                self.socket_path.unlink()
+            except Exception:
+                pass
+            _log("stopped")
+
+
+# ---- systemd integration ----
+UNIT_NAME = "rdx-daemon.service"
+
+
+def unit_path() -> Path:
+    return Path.home() / ".config" / "systemd" / "user" / UNIT_NAME
+
+
+def unit_text(script: str = "/usr/local/bin/rdx-daemon") -> str:
+    return (
+        "[Unit]\n"
+        "Description=RDX headless daemon (JACK session, service status, watchers)\n"
+        "\n"
+        "[Service]\n"
+        "Type=simple\n"
+        f"ExecStart={sys.executable} {script}\n"
+        "Restart=on-failure\n"
+        "RestartSec=2\n"
+        "\n"
+        "[Install]\n"
+        "WantedBy=default.target\n"
+    )
+
+
+def ensure_user_unit(script: str = "/usr/local/bin/rdx-daemon") -> bool:
+    """Write (or refresh) the per-user unit; returns True when the file changed."""
+    path = unit_path()
+    text = unit_text(script)
+    try:
+        if path.exists() and path.read_text() == text:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return True
+    except Exception:
+        return False
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="rdx-daemon", description="RDX headless daemon")
+    ap.add_argument("--socket", help=f"Unix socket path (default: {config.socket_path()})")
+    ap.add_argument("--status-interval", type=float, default=3.0, help="seconds between service probes")
+    ap.add_argument("--watch-interval", type=float, default=1.5,
+                    help="watcher interval when no JACK session is available")
+    ap.add_argument("--heartbeat-interval", type=float, default=15.0,
+                    help="seconds between keep-alive events on idle subscriptions")
+    ap.add_argument("--load-interval", type=float, default=1.0, help="seconds between JACK DSP load samples")
+    ap.add_argument("--metrics-listen", metavar="HOST:PORT",
+                    help=f"Prometheus /metrics over TCP (default: settings 'metrics_listen' or "
+                         f"{exporter.DEFAULT_LISTEN}; 'off' disables)")
+    args = ap.parse_args(argv)
+    Daemon(args.socket, args.status_interval, args.watch_interval, args.heartbeat_interval,
+           args.metrics_listen, args.load_interval).serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
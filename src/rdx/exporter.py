@@ -0,0 +1,188 @@
+"""
+Metric families exported by the rdx daemon and the TCP listener that serves them.
+
+The daemon socket answers ``GET /metrics`` itself; Prometheus cannot scrape a
+Unix socket, so the daemon also listens on ``127.0.0.1:9648`` by default
+(``metrics_listen`` in settings.json or ``rdx-daemon --metrics-listen``;
+``off`` disables it, ``0.0.0.0:9648`` exposes it to a remote scraper). The TCP
+listener serves metrics only, never the control API.
+"""
+
+from . import metrics
+from . import runner
+from . import services as rdx_services
+from . import streaming
+
+DEFAULT_LISTEN = "127.0.0.1:9648"
+
+STATES = ("running", "stopped", "restarting", "failed", "timeout", "unknown")
+# Processes whose CPU time is exported (encoders and the audio chain)
+PROCESSES = ("liquidsoap", "stereo_tool", "darkice", "butt", "glasscoder", "jackd", "jackdbus")
+
+SERVICE_UP = metrics.gauge("rdx_service_up", "1 if the service is running, else 0", ["service"])
+SERVICE_STATE = metrics.gauge("rdx_service_state", "1 for the service's current state", ["service", "state"])
+SERVICE_RESTARTS = metrics.counter("rdx_service_restarts_total",
+                                   "Times the service was seen coming back up after being down", ["service"])
+SERVICE_CRASHES = metrics.counter("rdx_service_crashes_total",
+                                  "Times the service stopped or failed without being asked to (rdx.supervisor)",
+                                  ["service"])
+SERVICE_CRASH_LOOP = metrics.gauge("rdx_service_crash_loop", "1 while the service is in a crash loop", ["service"])
+SERVICE_ACTIONS = metrics.counter("rdx_service_actions_total",
+                                  "Start/stop/restart requests made through the control API", ["service", "action"])
+STATUS_POLL = metrics.histogram("rdx_status_poll_seconds", "Duration of one service status probe cycle",
+                                buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+STATUS_UPDATED = metrics.gauge("rdx_status_last_poll_timestamp_seconds", "Unix time of the last status probe")
+
+JACK_RUNNING = metrics.gauge("rdx_jack_running", "1 if the JACK server answers")
+JACK_SESSION = metrics.gauge("rdx_jack_session", "1 if the daemon holds a JACK client (event-driven topology)")
+JACK_XRUNS = metrics.counter("rdx_jack_xruns_total", "xruns reported to the daemon's JACK client")
+JACK_CPU = metrics.gauge("rdx_jack_cpu_load_percent", "JACK DSP load as reported by the server")
+JACK_PORTS = metrics.gauge("rdx_jack_ports", "JACK ports by direction", ["direction"])
+JACK_CLIENTS = metrics.gauge("rdx_jack_clients", "JACK clients with at least one port")
+JACK_CONNECTIONS = metrics.gauge("rdx_jack_connections", "JACK port connections")
+
+ICECAST_UP = metrics.gauge("rdx_icecast_stats_up", "1 if Icecast's status-json.xsl could be read")
+LISTENERS = metrics.gauge("rdx_icecast_listeners", "Current listeners per mount", ["mount"])
+
+PROCESS_CPU = metrics.counter("rdx_process_cpu_seconds_total", "User+system CPU time of the process(es)",
+                              ["process"])
+PROCESS_RSS = metrics.gauge("rdx_process_resident_memory_bytes", "Resident memory of the process(es)",
+                            ["process"])
+PROCESS_COUNT = metrics.gauge("rdx_process_count", "Running processes with this name", ["process"])
+
+COMMAND_SECONDS = metrics.histogram("rdx_command_duration_seconds",
+                                    "External command latency (rdx.runner)", ["command"],
+                                    buckets=tuple(b / 1000.0 for b in runner.BUCKETS_MS))
+COMMAND_TIMEOUTS = metrics.counter("rdx_command_timeouts_total", "External commands that hit their timeout",
+                                   ["command"])
+COMMAND_FAILURES = metrics.counter("rdx_command_failures_total",
+                                   "External commands that exited non-zero or could not start", ["command"])
+
+_last_states = {}
+
+
+def record_status(states: dict, probe_seconds: float, updated: float):
+    """Called by the status loop after each probe cycle."""
+    for key, state in states.items():
+        SERVICE_UP.labels(service=key).set(1 if state == "running" else 0)
+        for s in STATES:
+            SERVICE_STATE.labels(service=key, state=s).set(1 if s == state else 0)
+        prev = _last_states.get(key)
+        if prev is not None and prev != "running" and state == "running":
+            SERVICE_RESTARTS.labels(service=key).inc()
+        # Pre-create the series so a scrape shows 0 rather than nothing
+        SERVICE_RESTARTS.labels(service=key).inc(0)
+        _last_states[key] = state
+    JACK_RUNNING.set(1 if states.get('jack') == "running" else 0)
+    STATUS_POLL.observe(probe_seconds)
+    STATUS_UPDATED.set(updated)
+
+
+def record_topology(ports: dict, connections: list):
+    """Called whenever the daemon refreshes its topology snapshot."""
+    JACK_PORTS.labels(direction="in").set(sum(len(v.get('in', [])) for v in ports.values()))
+    JACK_PORTS.labels(direction="out").set(sum(len(v.get('out', [])) for v in ports.values()))
+    JACK_CLIENTS.set(len(ports))
+    JACK_CONNECTIONS.set(len(connections))
+
+
+def _collect_runner():
+    for row in runner.snapshot():
+        key = (row['command'],)
+        COMMAND_SECONDS.set_buckets(key, row['histogram'], row['mean_ms'] * row['count'] / 1000.0)
+        COMMAND_TIMEOUTS.labels(command=row['command']).set(row['timeouts'])
+        COMMAND_FAILURES.labels(command=row['command']).set(row['nonzero'] + row['errors'])
+
+
+_process_stats = metrics.Cached(lambda: metrics.process_stats(PROCESSES), ttl=2.0)
+
+
+def _collect_processes():
+    stats = _process_stats() or {}
+    for name in PROCESSES:
+        cpu, rss, count = stats.get(name, (None, 0, 0))
+        PROCESS_COUNT.labels(process=name).set(count)
+        if cpu is not None:
+            PROCESS_CPU.labels(process=name).set(cpu)
+            PROCESS_RSS.labels(process=name).set(rss)
+
+
+def _read_listeners():
+    return streaming.icecast_listeners(timeout=0.5)
+
+
+_listeners = metrics.Cached(_read_listeners, ttl=5.0)
+
+
+def _collect_listeners():
+    mounts = _listeners()
+    if mounts is None:
+        ICECAST_UP.set(0)
+        return
+    ICECAST_UP.set(1)
+    LISTENERS.clear()
+    for mount, n in mounts.items():
+        LISTENERS.labels(mount=mount).set(n)
+
+
+def install(daemon):
+    """Register the scrape-time collectors for *daemon*."""
+    def _collect_jack():
+        JACK_SESSION.set(1 if daemon.jack_session.active else 0)
+        load = daemon.jack_session.cpu_load()
+        if load is not None:
+            JACK_CPU.set(load)
+
+    def _collect_icecast():
+        # Only ask Icecast when the status loop says it is up
+        if daemon.status.get('services', {}).get('icecast', {}).get('state') == "running":
+            _collect_listeners()
+        else:
+            ICECAST_UP.set(0)
+            LISTENERS.clear()
+
+    for fn in (_collect_runner, _collect_processes, _collect_jack, _collect_icecast):
+        metrics.REGISTRY.add_collector(fn)
+    for key in rdx_services.SERVICES:
+        for action in ("start", "stop", "restart"):
+            SERVICE_ACTIONS.labels(service=key, action=action).inc(0)
+
+
+def parse_listen(value):
+    """``"host:port"`` / ``":port"`` / ``"port"`` -> (host, port); None when disabled."""
+    value = str(value if value is not None else "").strip()
+    if not value or value.lower() in ("off", "no", "false", "0", "none"):
+        return None
+    host, _, port = value.rpartition(":")
+    host = host.strip("[]") or "127.0.0.1"
+    return host, int(port)
+
+
+def serve_tcp(address):
+    """Serve ``GET /metrics`` on *address* in a daemon thread; returns the server (or raises OSError)."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "rdx-daemon"
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                body = b'<a href="/metrics">/metrics</a>\n'
+                self.send_response(404 if self.path != "/" else 200)
+                self.send_header("Content-Type", "text/html")
+            else:
+                body = metrics.REGISTRY.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", metrics.CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer(address, Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.5}, daemon=True).start()
+    return server
@@ -0,0 +1,6 @@
+"""
+PyQt5 Control Center.
+
+``main_window`` holds the window and imports each tab module only when that tab
+is first shown; nothing outside this package imports PyQt5.
+"""
@@ -0,0 +1,120 @@
+"""
+Shared helpers for the Control Center tabs.
+"""
+
+import threading
+
+from PyQt5.QtCore import pyqtSignal, QObject
+from PyQt5.QtWidgets import QMessageBox
+
+from rdx import jack as rdx_jack
+from rdx import timeline as rdx_timeline
+
+# Start-up timeline for this process; the launcher prepends its own early marks
+STARTUP = rdx_timeline.Timeline()
+
+_pyjack_module = False
+
+
+def optional_pyjack():
+    """python-jack-client if installed, else None; imported on first use (it loads libjack via cffi)."""
+    global _pyjack_module
+    if _pyjack_module is False:
+        try:
+            import jack as _pyjack  # Optional: python-jack-client for QJackCtl-style probing
+        except Exception:
+            _pyjack = None
+        _pyjack_module = _pyjack
+    return _pyjack_module
+
+
+class _AsyncRelay(QObject):
+    done = pyqtSignal(object)
+
+
+def run_async(fn, callback, parent=None):
+    """Run fn() on a worker thread and hand its result to callback on the GUI thread.
+    Exceptions in fn are swallowed and delivered as None, matching the tabs' best-effort probes.
+    """
+    relay = _AsyncRelay(parent)
+    relay.done.connect(callback)
+    relay.done.connect(relay.deleteLater)
+
+    def _work():
+        try:
+            result = fn()
+        except Exception:
+            result = None
+        relay.done.emit(result)
+
+    threading.Thread(target=_work, daemon=True).start()
+    return relay
+
+
+def panic_disconnect(tab, connections=None, ignore_protection: bool = False, done=None):
+    """Emergency disconnect for the JACK tabs.
+
+    Cuts straight away, without a confirmation dialog or a fresh jack_lsp:
+    through the daemon (its event-driven topology and JACK client) when it is
+    connected, else locally from ``connections``, the tab's last refresh.
+    Bounded by the ``panic_deadline_ms`` setting (200 ms). The report that
+    follows offers to reconnect everything that was cut.
+    """
+    main = getattr(tab, "main", None)
+    settings = getattr(main, "_settings", None) or {}
+    try:
+        deadline_ms = float(settings.get('panic_deadline_ms', rdx_jack.PANIC_DEADLINE * 1000.0))
+    except (TypeError, ValueError):
+        deadline_ms = rdx_jack.PANIC_DEADLINE * 1000.0
+    link = getattr(main, "daemon_link", None)
+    if link is not None and not link.is_connected():
+        link = None
+
+    def restore():
+        try:
+            if link is not None:
+                link.call("jack.restore", callback=lambda r, e: restored(r, e and e.get('message')))
+            else:
+                restored(rdx_jack.restore_panic(), None)
+        except Exception as e:
+            restored(None, str(e))
+
+    def restored(res, error):
+        if done:
+            done()
+        if error or not res:
+            QMessageBox.critical(tab, "Restore Connections", f"Could not restore: {error or 'unknown error'}")
+        elif res['errors']:
+            QMessageBox.warning(tab, "Restore Connections", f"Restored {res['applied']}/{res['total']}; some failed:\n"
+                                + "\n".join(res['errors'][:5]))
+
+    def report(res, error=None):
+        if done:
+            done()
+        if error or not res:
+            QMessageBox.critical(tab, "Emergency Disconnect", f"Emergency disconnect failed: {error or 'unknown error'}")
+            return
+        text = f"Cut {len(res['cut'])} connections in {res['elapsed_ms']:.0f} ms ({len(res['kept'])} protected kept)."
+        if res['pending']:
+            text += f"\n{len(res['pending'])} more were still being cut at the {res['deadline_ms']:.0f} ms deadline."
+        if res['failed']:
+            text += "\n\nCould not cut:\n" + "\n".join(f"{s} → {d}" for s, d in res['failed'][:5])
+        if not (res['cut'] or res['pending']):
+            QMessageBox.information(tab, "Emergency Disconnect", text)
+            return
+        reply = QMessageBox.question(tab, "Emergency Disconnect", text + "\n\nReconnect them?",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            restore()
+
+    if link is not None:
+        link.call("jack.panic", {'deadline_ms': deadline_ms, 'ignore_protection': bool(ignore_protection)},
+                  callback=lambda r, e: report(r, e and e.get('message')))
+        return
+    try:
+        res = rdx_jack.panic_disconnect(connections or None, protected=set() if ignore_protection else None,
+                                        deadline=deadline_ms / 1000.0)
+    except Exception as e:
+        report(None, str(e))
+        return
+    report(res)
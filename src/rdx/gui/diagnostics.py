@@ -0,0 +1,160 @@
+"""
+Diagnostics tab: per-command latency and failure statistics from rdx.runner.
+"""
+
+import math
+
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QWidget,
+                             QGroupBox, QComboBox, QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QColor
+
+from rdx import runner as rdx_runner
+
+
+def suggested_timeout(row: dict):
+    """1.5x the observed p99 rounded up to 0.1 s (at least 0.3 s), once there is enough data."""
+    if row.get('count', 0) < 20:
+        return None
+    return max(0.3, math.ceil(row['p99_ms'] * 1.5 / 100.0) / 10.0)
+
+
+class DiagnosticsTab(QWidget):
+    """Tab: Diagnostics - how long external commands take and how often they fail or time out"""
+
+    REFRESH_MS = 3000
+    COLUMNS = ["Command", "Runs", "Mean", "p50", "p95", "p99", "Max",
+               "Timeout", "Suggested", "Timeouts", "Errors"]
+
+    def __init__(self, main_window=None):
+        super().__init__()
+        self.main_window = main_window
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        group = QGroupBox("🩺 Command Latency")
+        group_layout = QVBoxLayout(group)
+        row = QHBoxLayout()
+        row.addWidget(QLabel("Source:"))
+        self.source_combo = QComboBox()
+        self.source_combo.addItem("rdx daemon", "daemon")
+        self.source_combo.addItem("This window", "local")
+        self.source_combo.setToolTip("The daemon runs the status probes and watchers; this window runs "
+                                     "the commands behind its buttons")
+        self.source_combo.currentIndexChanged.connect(lambda _i: self.refresh())
+        row.addWidget(self.source_combo)
+        row.addStretch(1)
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        row.addWidget(refresh_btn)
+        reset_btn = QPushButton("🧹 Reset")
+        reset_btn.setToolTip("Clear the counters for the selected source")
+        reset_btn.clicked.connect(self.reset)
+        row.addWidget(reset_btn)
+        group_layout.addLayout(row)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for col in range(1, len(self.COLUMNS)):
+            header.setSectionResizeMode(col, QHeaderView.ResizeToContents)
+        group_layout.addWidget(self.table)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("QLabel { color: #7f8c8d; }")
+        group_layout.addWidget(self.summary_label)
+        layout.addWidget(group)
+
+        hint = QLabel("Latencies are histogram estimates (bucket upper bounds). Rows turn orange when p99 "
+                      "is above 80% of the configured timeout and red when the command has timed out. "
+                      "Errors include non-zero exits (e.g. pgrep finding nothing).")
+        hint.setWordWrap(True)
+        hint.setStyleSheet("QLabel { color: #7f8c8d; font-size: 10px; }")
+        layout.addWidget(hint)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
+
+    def _daemon_link(self):
+        link = getattr(self.main_window, "daemon_link", None) if self.main_window is not None else None
+        return link if link is not None and link.is_connected() else None
+
+    def refresh(self):
+        if self.source_combo.currentData() == "daemon":
+            link = self._daemon_link()
+            if link is None:
+                self._render([], "rdx daemon not connected - select 'This window' for local commands")
+                return
+            link.call("diagnostics.commands", callback=self._on_daemon_stats)
+        else:
+            self._render(rdx_runner.snapshot(), "")
+
+    def _on_daemon_stats(self, result, error):
+        if self.source_combo.currentData() != "daemon":
+            return
+        if error:
+            self._render([], f"rdx daemon: {error.get('message', 'error')}")
+            return
+        self._render((result or {}).get('commands', []), f"rdx daemon (pid {(result or {}).get('pid', '?')})")
+
+    def reset(self):
+        if self.source_combo.currentData() == "daemon":
+            link = self._daemon_link()
+            if link is not None:
+                link.call("diagnostics.reset", callback=lambda _r, _e: self.refresh())
+        else:
+            rdx_runner.reset()
+            self.refresh()
+
+    def _render(self, rows: list, source: str):
+        self.table.setRowCount(len(rows))
+        total = 0
+        for r, row in enumerate(rows):
+            total += row.get('count', 0)
+            timeout_s = row.get('timeout_s')
+            suggested = suggested_timeout(row)
+            cells = [
+                row.get('command', '?'),
+                str(row.get('count', 0)),
+                f"{row.get('mean_ms', 0.0):.0f} ms",
+                f"{row.get('p50_ms', 0.0):.0f} ms",
+                f"{row.get('p95_ms', 0.0):.0f} ms",
+                f"{row.get('p99_ms', 0.0):.0f} ms",
+                f"{row.get('max_ms', 0.0):.0f} ms",
+                f"{timeout_s:g} s" if timeout_s else "none",
+                f"{suggested:g} s" if suggested else "—",
+                f"{row.get('timeouts', 0)} ({row.get('timeout_rate', 0.0) * 100:.1f}%)",
+                f"{row.get('nonzero', 0) + row.get('errors', 0)} ({row.get('error_rate', 0.0) * 100:.1f}%)",
+            ]
+            color = None
+            if row.get('timeouts'):
+                color = QColor("#e74c3c")
+            elif timeout_s and row.get('p99_ms', 0.0) > timeout_s * 800.0:
+                color = QColor("#f39c12")
+            for c, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if c:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                if color is not None:
+                    item.setForeground(color)
+                if c == 0 and row.get('histogram'):
+                    bounds = [f"≤{b} ms" for b in row.get('buckets_ms', [])] + ["more"]
+                    item.setToolTip("\n".join(f"{b:>10}: {n}" for b, n in zip(bounds, row['histogram']) if n))
+                self.table.setItem(r, c, item)
+        parts = [p for p in (source, f"{len(rows)} command(s), {total} run(s)") if p]
+        self.summary_label.setText(" · ".join(parts))
@@ -0,0 +1,403 @@
+"""
+Icecast Management tab: service control and icecast.xml generation/deployment.
+"""
+
+import os
+import json
+import subprocess
+from pathlib import Path
+
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QWidget,
+                             QMessageBox, QGridLayout, QGroupBox, QLineEdit, QTableWidget,
+                             QHeaderView, QSpinBox, QFormLayout, QSizePolicy)
+from PyQt5.QtCore import QTimer
+
+from rdx import runner as rdx_runner
+from rdx import services as rdx_services
+from rdx import streaming as rdx_streaming
+from .common import run_async
+
+
+class IcecastManagementTab(QWidget):
+    """Tab 2: Icecast Management - Server configuration and mount management"""
+    
+    def __init__(self):
+        super().__init__()
+        self.setup_ui()
+        
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        # Server Settings Section
+        server_group = QGroupBox("📡 Server Settings")
+        server_layout = QFormLayout(server_group)
+        
+        # Host and Port
+        self.host_input = QLineEdit("localhost")
+        server_layout.addRow("Host:", self.host_input)
+        
+        self.port_input = QSpinBox()
+        self.port_input.setRange(1000, 65535)
+        self.port_input.setValue(8000)
+        server_layout.addRow("Port:", self.port_input)
+        
+        # Passwords
+        self.source_password = QLineEdit()
+        self.source_password.setEchoMode(QLineEdit.Password)
+        self.source_password.setText("hackm3")
+        server_layout.addRow("Source Password:", self.source_password)
+        
+        self.admin_password = QLineEdit()
+        self.admin_password.setEchoMode(QLineEdit.Password)
+        self.admin_password.setText("Hackm333")
+        server_layout.addRow("Admin Password:", self.admin_password)
+        
+        self.relay_password = QLineEdit()
+        self.relay_password.setEchoMode(QLineEdit.Password)
+        self.relay_password.setText("hackm33")
+        server_layout.addRow("Relay Password:", self.relay_password)
+        
+        layout.addWidget(server_group)
+        
+        # Mount Points Section
+        mounts_group = QGroupBox("🎵 Mount Points")
+        mounts_layout = QVBoxLayout(mounts_group)
+        
+        # Mounts table
+        self.mounts_table = QTableWidget()
+        self.mounts_table.setColumnCount(4)
+        self.mounts_table.setHorizontalHeaderLabels(["Mount", "Status", "Listeners", "Actions"])
+        self.mounts_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        mounts_layout.addWidget(self.mounts_table)
+        
+        layout.addWidget(mounts_group)
+        
+        # Icecast Control Section
+        control_group = QGroupBox("⚙️ Icecast Control")
+        control_layout = QGridLayout(control_group)
+        
+        # Service control buttons
+        start_btn = QPushButton("▶️ START ICECAST")
+        start_btn.setStyleSheet("QPushButton { background-color: #27ae60; color: white; font-weight: bold; padding: 10px; }")
+        start_btn.clicked.connect(self.start_icecast)
+        control_layout.addWidget(start_btn, 0, 0)
+        
+        stop_btn = QPushButton("⏹️ STOP ICECAST")
+        stop_btn.setStyleSheet("QPushButton { background-color: #e74c3c; color: white; font-weight: bold; padding: 10px; }")
+        stop_btn.clicked.connect(self.stop_icecast)
+        control_layout.addWidget(stop_btn, 0, 1)
+        
+        restart_btn = QPushButton("🔄 RESTART ICECAST")
+        restart_btn.setStyleSheet("QPushButton { background-color: #f39c12; color: white; font-weight: bold; padding: 10px; }")
+        restart_btn.clicked.connect(self.restart_icecast)
+        control_layout.addWidget(restart_btn, 0, 2)
+        
+        # Status display
+        self.status_label = QLabel("Status: ⏳ Checking...")
+        self.status_label.setStyleSheet("QLabel { padding: 10px; background-color: #ecf0f1; border-radius: 5px; }")
+        control_layout.addWidget(self.status_label, 1, 0, 1, 3)
+        
+        layout.addWidget(control_group)
+        
+        # Configuration management
+        config_group = QGroupBox("📄 Configuration Management")
+        config_layout = QHBoxLayout(config_group)
+
+        generate_config_btn = QPushButton("🔧 GENERATE ICECAST.XML")
+        generate_config_btn.setStyleSheet("QPushButton { background-color: #3498db; color: white; font-weight: bold; padding: 10px; font-size: 14px; }")
+        generate_config_btn.setMinimumHeight(44)
+        generate_config_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        generate_config_btn.clicked.connect(self.generate_icecast_config)
+        config_layout.addWidget(generate_config_btn)
+        
+        apply_config_btn = QPushButton("🚀 PREPARE FOR DEPLOYMENT")
+        apply_config_btn.setStyleSheet("QPushButton { background-color: #27ae60; color: white; font-weight: bold; padding: 10px; font-size: 14px; }")
+        apply_config_btn.setMinimumHeight(44)
+        apply_config_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        apply_config_btn.clicked.connect(self.apply_icecast_config)
+        config_layout.addWidget(apply_config_btn)
+        
+        layout.addWidget(config_group)
+        
+        # Initial status check runs after the first paint
+        self._icecast_probe_pending = False
+        QTimer.singleShot(0, self.check_icecast_status)
+        
+        # Status update timer
+        self.status_timer = QTimer()
+        self.status_timer.timeout.connect(self.check_icecast_status)
+        self.status_timer.start(5000)  # Check every 5 seconds
+        
+    def start_icecast(self):
+        """Start Icecast service"""
+        try:
+            # Use interactive sudo as before; you've confirmed this flow works reliably for you.
+            rdx_runner.run(["sudo", "systemctl", "start", "icecast2"], check=True)
+            self.status_label.setText("Status: ✅ Starting Icecast...")
+        except subprocess.CalledProcessError:
+            self.status_label.setText("Status: ❌ Failed to start Icecast")
+            
+    def stop_icecast(self):
+        """Stop Icecast service"""
+        try:
+            rdx_runner.run(["sudo", "systemctl", "stop", "icecast2"], check=True)
+            self.status_label.setText("Status: ⏹️ Stopping Icecast...")
+        except subprocess.CalledProcessError:
+            self.status_label.setText("Status: ❌ Failed to stop Icecast")
+            
+    def restart_icecast(self):
+        """Restart Icecast service"""
+        try:
+            rdx_runner.run(["sudo", "systemctl", "restart", "icecast2"], check=True)
+            self.status_label.setText("Status: 🔄 Restarting Icecast...")
+        except subprocess.CalledProcessError:
+            self.status_label.setText("Status: ❌ Failed to restart Icecast")
+            
+    def check_icecast_status(self):
+        """Check Icecast service status (probe runs off the GUI thread)"""
+        if self._icecast_probe_pending:
+            return
+        self._icecast_probe_pending = True
+        run_async(lambda: rdx_services.probe('icecast'), self._on_icecast_probed, self)
+
+    def _on_icecast_probed(self, state):
+        self._icecast_probe_pending = False
+        self.apply_icecast_state(state or "unknown")
+
+    def apply_icecast_state(self, state: str):
+        """Render an Icecast state (from a local probe or the rdx daemon)"""
+        if state == "running":
+            self.status_label.setText("Status: ✅ Running (Active)")
+            self.status_label.setStyleSheet("QLabel { padding: 10px; background-color: #d5f4e6; color: #27ae60; border-radius: 5px; font-weight: bold; }")
+        elif state in ("stopped", "failed"):
+            self.status_label.setText("Status: ❌ Stopped")
+            self.status_label.setStyleSheet("QLabel { padding: 10px; background-color: #fadbd8; color: #e74c3c; border-radius: 5px; font-weight: bold; }")
+        else:
+            self.status_label.setText("Status: ❓ Unknown")
+            self.status_label.setStyleSheet("QLabel { padding: 10px; background-color: #ecf0f1; border-radius: 5px; }")
+
+    def set_daemon_mode(self, enabled: bool):
+        """When the rdx daemon pushes status, stop polling locally"""
+        if enabled:
+            self.status_timer.stop()
+        elif not self.status_timer.isActive():
+            self.status_timer.start(5000)
+            
+    def generate_icecast_config(self):
+        """Generate Icecast configuration"""
+        try:
+            # Get config directory
+            config_dir = self.get_config_directory()
+            
+            icecast_config = self.build_icecast_config()
+            
+            config_file = config_dir / "icecast.xml"
+            with open(config_file, 'w') as f:
+                f.write(icecast_config)
+            QMessageBox.information(self, "Config Generated", f"Icecast configuration generated:\n{config_file}")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Config Error", f"Failed to generate config:\n{str(e)}")
+            
+    def build_icecast_config(self):
+        """Build Icecast XML configuration with comprehensive template"""
+        return rdx_streaming.build_icecast_config(
+            host=self.host_input.text(),
+            port=self.port_input.value(),
+            source_pass=self.source_password.text(),
+            admin_pass=self.admin_password.text(),
+            relay_pass=self.relay_password.text(),
+            streams=self.load_streams_from_storage(),
+        )
+        
+    def apply_icecast_config(self):
+        """Apply Icecast configuration and restart service automatically"""
+        # Get config directory
+        config_dir = self.get_config_directory()
+        config_file = config_dir / "icecast.xml"
+        
+        # Auto-generate config if it doesn't exist
+        if not config_file.exists():
+            try:
+                self.generate_icecast_config()
+                # Recheck if config was created
+                if not config_file.exists():
+                    QMessageBox.warning(self, "Config Generation Failed", "Could not generate Icecast configuration.")
+                    return
+            except Exception as e:
+                QMessageBox.critical(self, "Config Generation Error", f"Failed to generate config:\n{str(e)}")
+                return
+            
+        # Verify the config file is readable
+        try:
+            with open(config_file, 'r') as f:
+                config_content = f.read()
+            if len(config_content) < 100:  # Basic sanity check
+                QMessageBox.warning(self, "Invalid Config", "Generated config file appears to be incomplete.")
+                return
+        except Exception as e:
+            QMessageBox.critical(self, "Config Read Error", f"Cannot read config file:\n{str(e)}")
+            return
+            
+        try:
+            # Create a temporary script to execute all privileged operations in one pkexec call
+            # This prevents multiple authentication prompts
+            temp_script = config_dir / "deploy_icecast_temp.sh"
+            script_content = f'''#!/bin/bash
+set -e
+
+# Stop Icecast if running
+systemctl stop icecast2 2>/dev/null || true
+
+# Backup original config if it exists
+if [ -f "/etc/icecast2/icecast.xml" ]; then
+    cp "/etc/icecast2/icecast.xml" "/etc/icecast2/icecast.xml.backup"
+fi
+
+# Apply configuration by copying to system location
+cp "{config_file}" "/etc/icecast2/icecast.xml"
+
+# Set proper ownership and permissions
+chown root:icecast "/etc/icecast2/icecast.xml"
+chmod 640 "/etc/icecast2/icecast.xml"
+
+# Start Icecast with new configuration
+systemctl start icecast2
+
+echo "SUCCESS: Icecast configuration deployed and service restarted"
+'''
+            
+            # Write the temporary script
+            with open(temp_script, 'w') as f:
+                f.write(script_content)
+            
+            # Make script executable
+            temp_script.chmod(0o755)
+            
+            # Execute the script with pkexec (single authentication prompt)
+            result = rdx_runner.run(["pkexec", str(temp_script)], 
+                                  capture_output=True, text=True, check=True)
+            
+            # Clean up temporary script
+            temp_script.unlink()
+            
+            # Get mount point count from persistent storage
+            streams = self.load_streams_from_storage()
+            mount_count = len(streams)
+            stream_info = "No streams configured in Stream Builder tab"
+            if mount_count > 0:
+                stream_names = [stream.get('mount', 'Unknown') for stream in streams]
+                stream_info = f"Streams: {', '.join(stream_names)}"
+            else:
+                stream_info = "No streams configured in Stream Builder tab - add streams first!"
+            
+            QMessageBox.information(self, "Configuration Applied", 
+                                  f"Icecast configuration applied and service restarted successfully!\n\n"
+                                  f"Host: {self.host_input.text()}\n"
+                                  f"Port: {self.port_input.value()}\n"
+                                  f"Mount Points: {mount_count} configured\n"
+                                  f"{stream_info}\n\n"
+                                  f"Config file: {config_file}\n"
+                                  f"Backup saved: /etc/icecast2/icecast.xml.backup")
+                                  
+        except subprocess.CalledProcessError as e:
+            # Clean up temporary script if it exists
+            temp_script = config_dir / "deploy_icecast_temp.sh"
+            if temp_script.exists():
+                temp_script.unlink()
+                
+            error_details = f"Command: {' '.join(e.cmd)}\n"
+            error_details += f"Exit code: {e.returncode}\n"
+            if e.stdout:
+                error_details += f"stdout: {e.stdout}\n"
+            if e.stderr:
+                error_details += f"stderr: {e.stderr}\n"
+                
+            # If pkexec failed, suggest alternative
+            if "pkexec" in str(e.cmd):
+                error_details += f"\nNote: pkexec (PolicyKit) is required for GUI sudo operations.\n"
+                error_details += f"Alternative: Run 'sudo rdx-control-center' from terminal for sudo access.\n"
+                
+            QMessageBox.critical(self, "Configuration Failed", 
+                               f"Failed to apply Icecast configuration:\n\n{error_details}\n"
+                               f"Source file: {config_file}\n"
+                               f"Target: /etc/icecast2/icecast.xml")
+        except Exception as e:
+            # Clean up temporary script if it exists
+            temp_script = config_dir / "deploy_icecast_temp.sh"
+            if temp_script.exists():
+                temp_script.unlink()
+                
+            QMessageBox.critical(self, "Configuration Error", 
+                               f"Error applying configuration:\n{str(e)}")
+
+    def get_config_directory(self):
+        """Get the application config directory, creating it if needed with proper ownership"""
+        import getpass
+        import pwd
+        import grp
+        
+        # Always use standard config directory - no fallbacks
+        config_dir = Path.home() / ".config" / "rdx"
+        
+        try:
+            current_user = getpass.getuser()
+            user_info = pwd.getpwnam(current_user)
+            user_uid = user_info.pw_uid
+            user_gid = user_info.pw_gid
+            
+            # Ensure parent .config directory exists and has correct ownership
+            config_parent = config_dir.parent
+            config_parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.chown(config_parent, user_uid, user_gid)
+            except (PermissionError, OSError):
+                # If we can't fix .config ownership, try to continue anyway
+                pass
+            
+            # Create and fix ownership of rdx directory
+            config_dir.mkdir(parents=True, exist_ok=True)
+            os.chown(config_dir, user_uid, user_gid)
+            
+            # Set proper permissions (755 for directory)
+            config_dir.chmod(0o755)
+            
+            # Test write access
+            test_file = config_dir / ".test"
+            test_file.touch()
+            test_file.unlink()
+            
+            return config_dir
+            
+        except (PermissionError, OSError) as e:
+            # Try to provide helpful error message and recovery
+            error_msg = f"Cannot create or access config directory {config_dir}: {e}\n\n"
+            error_msg += "To fix this manually:\n"
+            error_msg += f"sudo mkdir -p {config_dir}\n"
+            error_msg += f"sudo chown {current_user}:{current_user} {config_dir}\n"
+            error_msg += f"sudo chown {current_user}:{current_user} {config_parent}\n"
+            error_msg += f"sudo chmod 755 {config_dir}\n"
+            raise Exception(error_msg)
+            test_file = config_dir / ".test"
+            test_file.touch()
+            test_file.unlink()
+            return config_dir
+            
+        except (PermissionError, OSError) as e:
+            # If we can't create or write to .config/rdx, there's a serious problem
+            # Don't fall back to .rdx as it causes confusion
+            raise Exception(f"Cannot create config directory {config_dir}: {e}\nCheck permissions on ~/.config/")
+            
+    def load_streams_from_storage(self):
+        """Load streams from persistent storage"""
+        try:
+            config_dir = self.get_config_directory()
+            streams_file = config_dir / "streams.json"
+            
+            if streams_file.exists():
+                with open(streams_file, 'r') as f:
+                    return json.load(f)
+            return []
+        except Exception as e:
+            print(f"Could not load streams from storage: {e}")
+            return []
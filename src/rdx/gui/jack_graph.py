@@ -0,0 +1,1298 @@
+"""
+JACK Graph tab: visual port graph, manual connections, profiles and protected pairs.
+"""
+
+import json
+import subprocess
+import time
+from pathlib import Path
+
+from PyQt5.QtWidgets import (QApplication, QVBoxLayout, QHBoxLayout, QPushButton, QWidget,
+                             QMessageBox, QComboBox, QCheckBox, QMenu, QGraphicsView,
+                             QGraphicsScene, QGraphicsEllipseItem, QGraphicsLineItem,
+                             QGraphicsTextItem, QGraphicsPathItem)
+from PyQt5.QtCore import Qt, QTimer, QPointF, QPoint
+from PyQt5.QtGui import QFont, QPen, QColor, QPainter, QPainterPath, QCursor, QBrush
+
+from rdx import jack as rdx_jack
+from rdx import journal as rdx_journal
+from rdx import rules as rdx_rules
+from rdx import runner as rdx_runner
+from .common import run_async, optional_pyjack, panic_disconnect
+
+
+class GraphScene(QGraphicsScene):
+    """Scene with robust scene-level context menu dispatch for the JACK graph."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._graph = None  # type: JackGraphTab
+
+    def setGraph(self, graph):
+        self._graph = graph
+
+    def contextMenuEvent(self, event):
+        try:
+            if not self._graph:
+                return super().contextMenuEvent(event)
+            pos = event.scenePos()
+            items = self.items(pos)
+            # Prefer edge hit-area/line first, then port dots
+            edge_item = None
+            port_item = None
+            for it in items:
+                # Edge: QGraphicsPathItem with stored endpoints
+                try:
+                    if isinstance(it, QGraphicsPathItem) and it.data(10) and it.data(11):
+                        edge_item = it
+                        break
+                except Exception:
+                    pass
+            if not edge_item:
+                for it in items:
+                    try:
+                        if isinstance(it, QGraphicsEllipseItem) and it.data(0):
+                            port_item = it
+                            break
+                    except Exception:
+                        pass
+            if edge_item:
+                sp = str(edge_item.data(10))
+                dp = str(edge_item.data(11))
+                self._graph._show_edge_menu(sp, dp, event.screenPos())
+                event.accept()
+                return
+            if port_item:
+                fp = str(port_item.data(0))
+                self._graph._show_port_menu(fp, event.screenPos())
+                event.accept()
+                return
+            return super().contextMenuEvent(event)
+        except Exception:
+            try:
+                return super().contextMenuEvent(event)
+            except Exception:
+                return
+
+
+class JackGraphTab(QWidget):
+    """Visual JACK graph: clients/ports as nodes with connectable edges and lock/unlock.
+    Preview version designed to complement the Patchboard.
+    """
+
+    def __init__(self, main=None):
+        super().__init__()
+        self.main = main
+        self.scene = GraphScene(self)
+        self.view = QGraphicsView(self.scene, self)
+        try:
+            self.view.setRenderHints(self.view.renderHints() | QPainter.Antialiasing | QPainter.TextAntialiasing | QPainter.SmoothPixmapTransform)
+        except Exception:
+            pass
+        # Avoid rubber-band selection interfering with right-click menus
+        self.view.setDragMode(QGraphicsView.NoDrag)
+        # Improve zoom behavior
+        try:
+            self.view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+            self.view.setResizeAnchor(QGraphicsView.AnchorViewCenter)
+        except Exception:
+            pass
+        self._zoom_level = 1.0
+        self._fit_pending = True  # Fit once by default; user can control zoom after
+        self.ports = {}
+        self.connections = []
+        self.port_types = {}
+        self.critical_pairs = set()
+        self.profiles = {}
+        self._load_protected_pairs()
+        self._load_profiles()
+        self._selected_out = None  # full port string (output)
+        self._selected_in = None   # full port string (input)
+        self._ignore_protection = False
+        self._sel_edge = None  # (sp, dp) for Actions… button
+        try:
+            self.scene.setGraph(self)
+            self.scene.selectionChanged.connect(self._on_selection_changed)
+        except Exception:
+            pass
+        # Drag-to-connect state
+        self._drag_line = None
+        self._drag_src_item = None
+        self._drag_hover_item = None
+        self._drag_started = False
+        # Layout constants for tidy alignment
+        self._layout = {
+            "row_h": 26,
+            "left_dot_x": 320,
+            "right_dot_x": 680,
+            "port_label_offset": 12,   # gap between dot and port label
+            "client_label_gap": 32,    # increased gap between client label and first port label
+            "left_port_label_x": 320 - 180,   # left column port labels
+            "left_client_label_x": 320 - 180 - 160,
+            "right_port_label_x": 680 + 12,   # right column port labels
+            "right_client_label_x": 680 + 12 + 180,
+        }
+
+        self._setup_ui()
+        # First topology probe (several jack_lsp calls) runs after the tab has painted
+        self._refresh_pending = False
+        self.scene.addText("Loading JACK graph…")
+        QTimer.singleShot(0, self.refresh_async)
+
+    def _setup_ui(self):
+        root = QVBoxLayout(self)
+        # Toolbar
+        bar = QHBoxLayout()
+        btn_refresh = QPushButton("🔄 Refresh")
+        btn_refresh.clicked.connect(self.refresh)
+        btn_auto = QPushButton("🎯 Auto-Connect")
+        btn_auto.clicked.connect(self.auto_connect)
+        btn_emerg = QPushButton("🚨 Disconnect Non-Critical")
+        btn_emerg.clicked.connect(self.emergency_disconnect)
+        # Ignore protection toggle
+        self.chk_ignore_prot = QCheckBox("Ignore Protected Locks")
+        def _on_ignore(_s):
+            self._ignore_protection = bool(self.chk_ignore_prot.isChecked())
+            # Redraw to reflect styling/menus
+            self.refresh()
+        self.chk_ignore_prot.stateChanged.connect(_on_ignore)
+        btn_zoom_out = QPushButton("➖ Zoom Out")
+        btn_zoom_out.clicked.connect(lambda: self._zoom(0.9))
+        btn_zoom_in = QPushButton("➕ Zoom In")
+        btn_zoom_in.clicked.connect(lambda: self._zoom(1.1))
+        btn_fit = QPushButton("🖼️ Fit All")
+        def _do_fit():
+            try:
+                rect = self.scene.itemsBoundingRect()
+                if rect.isValid():
+                    self.view.fitInView(rect, Qt.KeepAspectRatio)
+                    self._zoom_level = 1.0
+            except Exception:
+                pass
+            self._fit_pending = False
+        btn_fit.clicked.connect(_do_fit)
+        # Patch-specific toggle on this tab
+        self.chk_vlc_reconnect = QCheckBox("Auto VLC → Rivendell Record-In")
+        try:
+            # Initialize from global settings if present
+            if self.main and hasattr(self.main, "_settings"):
+                self.chk_vlc_reconnect.setChecked(bool(self.main._settings.get('auto_reconnect_vlc', True)))
+            self.chk_vlc_reconnect.stateChanged.connect(self._on_graph_vlc_toggle)
+        except Exception:
+            pass
+
+        bar.addWidget(btn_refresh)
+        bar.addWidget(btn_auto)
+        bar.addWidget(btn_emerg)
+        bar.addWidget(self.chk_ignore_prot)
+        bar.addStretch(1)
+        bar.addWidget(self.chk_vlc_reconnect)
+        bar.addWidget(btn_zoom_out)
+        bar.addWidget(btn_zoom_in)
+        bar.addWidget(btn_fit)
+        # Fallback Actions button for selected edge
+        self.btn_actions = QPushButton("⋯ Actions…")
+        self.btn_actions.setEnabled(False)
+        self.btn_actions.setVisible(False)
+        def _do_actions():
+            if self._sel_edge:
+                sp, dp = self._sel_edge
+                # Try to show near the center of the view
+                try:
+                    center = self.view.mapToGlobal(self.view.viewport().rect().center())
+                except Exception:
+                    center = None
+                self._show_edge_menu(sp, dp, center)
+        self.btn_actions.clicked.connect(_do_actions)
+        bar.addWidget(self.btn_actions)
+        root.addLayout(bar)
+
+        # Profiles row (no dropdowns on the tab)
+        prof = QHBoxLayout()
+        btn_profiles = QPushButton("📁 Profiles…")
+        btn_profiles.clicked.connect(self.open_profiles_dialog)
+        btn_generate = QPushButton("✨ Generate Profile")
+        btn_generate.clicked.connect(self.generate_profile)
+        prof.addWidget(btn_profiles)
+        prof.addWidget(btn_generate)
+        prof.addStretch(1)
+        # Routing journal (~/.config/rdx/routing-journal.jsonl)
+        btn_undo = QPushButton("↶ Undo")
+        btn_undo.setToolTip("Revert the last routing change (any origin: graph, profiles, auto-connect, VLC watcher…)")
+        btn_undo.clicked.connect(self.undo_routing)
+        btn_redo = QPushButton("↷ Redo")
+        btn_redo.clicked.connect(self.redo_routing)
+        btn_history = QPushButton("🕘 History…")
+        btn_history.clicked.connect(self.open_history_dialog)
+        prof.addWidget(btn_undo)
+        prof.addWidget(btn_redo)
+        prof.addWidget(btn_history)
+        root.addLayout(prof)
+
+        # Manual per-port connect UI (guaranteed fallback)
+        man = QHBoxLayout()
+        try:
+            from PyQt5.QtWidgets import QLabel
+            man.addWidget(QLabel("Output:"))
+        except Exception:
+            pass
+        self.manual_out = QComboBox()
+        man.addWidget(self.manual_out)
+        try:
+            from PyQt5.QtWidgets import QLabel
+            man.addWidget(QLabel("Input:"))
+        except Exception:
+            pass
+        self.manual_in = QComboBox()
+        man.addWidget(self.manual_in)
+        btn_m_connect = QPushButton("Connect")
+        btn_m_connect.clicked.connect(self.connect_manual_ports)
+        btn_m_disconnect = QPushButton("Disconnect")
+        btn_m_disconnect.clicked.connect(self.disconnect_manual_ports)
+        man.addWidget(btn_m_connect)
+        man.addWidget(btn_m_disconnect)
+        man.addStretch(1)
+        root.addLayout(man)
+
+        root.addWidget(self.view)
+    # ----- Persistence -----
+    def _config_dir(self) -> Path:
+        p = Path.home() / ".config" / "rdx"
+        try:
+            p.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+        return p
+
+    def _prot_file(self) -> Path:
+        return self._config_dir() / "jack_protected.json"
+
+    def _load_protected_pairs(self):
+        try:
+            pf = self._prot_file()
+            if pf.exists():
+                with open(pf, 'r') as f:
+                    data = json.load(f)
+                pairs = data.get('pairs', [])
+                if isinstance(pairs, list):
+                    self.critical_pairs = set(str(x) for x in pairs)
+        except Exception:
+            self.critical_pairs = set()
+
+    def _save_protected_pairs(self):
+        try:
+            pf = self._prot_file()
+            with open(pf, 'w') as f:
+                json.dump({"pairs": sorted(list(self.critical_pairs))}, f, indent=2)
+        except Exception:
+            pass
+
+    # ----- Profiles persistence -----
+    def _profiles_file(self) -> Path:
+        return self._config_dir() / "jack_profiles.json"
+
+    def _load_profiles(self):
+        try:
+            pf = self._profiles_file()
+            if pf.exists():
+                with open(pf, 'r') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self.profiles = {str(k): list(v) for k, v in data.items()}
+        except Exception:
+            self.profiles = {}
+        # No on-tab profile combo to refresh; dialog lists are built on demand
+
+    def _save_profiles(self):
+        try:
+            pf = self._profiles_file()
+            with open(pf, 'w') as f:
+                json.dump(self.profiles, f, indent=2)
+        except Exception:
+            pass
+
+    # ---- Profiles dialog and helpers ----
+    def open_profiles_dialog(self):
+        try:
+            from PyQt5.QtWidgets import QDialog, QVBoxLayout, QListWidget, QHBoxLayout, QPushButton, QInputDialog
+            dlg = QDialog(self)
+            dlg.setWindowTitle("JACK Profiles")
+            lay = QVBoxLayout(dlg)
+            lst = QListWidget()
+            lay.addWidget(lst)
+
+            def fill():
+                active = self._active_profile()
+                lst.clear()
+                for name in sorted(self.profiles.keys(), key=lambda s: s.lower()):
+                    lst.addItem(f"{name}  ★ kept connected" if name == active else name)
+                    lst.item(lst.count() - 1).setData(Qt.UserRole, name)
+            fill()
+            row = QHBoxLayout()
+            btn_keep = QPushButton("Keep Connected")
+            btn_keep.setToolTip("Make this the active profile: its connections are restored whenever JACK changes")
+            btn_apply = QPushButton("Apply")
+            btn_delete = QPushButton("Delete")
+            btn_edit = QPushButton("Edit…")
+            btn_save = QPushButton("Save Current As…")
+            btn_close = QPushButton("Close")
+            row.addWidget(btn_apply); row.addWidget(btn_keep); row.addWidget(btn_delete); row.addWidget(btn_edit); row.addWidget(btn_save); row.addStretch(1); row.addWidget(btn_close)
+            lay.addLayout(row)
+
+            def cur_name():
+                item = lst.currentItem()
+                return item.data(Qt.UserRole) if item else None
+
+            def do_keep():
+                name = cur_name()
+                if name:
+                    self.set_active_profile(None if name == self._active_profile() else name)
+                    fill()
+
+            def do_apply():
+                name = cur_name()
+                if name:
+                    self.apply_profile(name)
+                    self.refresh()
+
+            def do_delete():
+                name = cur_name()
+                if name:
+                    if name == self._active_profile():
+                        self.set_active_profile(None)
+                    self.delete_profile(name)
+                    fill()
+            def do_edit():
+                name = cur_name()
+                if name:
+                    self.edit_profile(name)
+                    fill()
+
+            def do_save():
+                name, ok = QInputDialog.getText(dlg, "Save Profile", "Profile name:")
+                if ok and name.strip():
+                    self.save_current_as_profile(name.strip())
+                    fill()
+
+            btn_apply.clicked.connect(do_apply)
+            btn_keep.clicked.connect(do_keep)
+            btn_delete.clicked.connect(do_delete)
+            btn_save.clicked.connect(do_save)
+            btn_edit.clicked.connect(do_edit)
+            btn_close.clicked.connect(dlg.accept)
+            dlg.exec_()
+        except Exception:
+            pass
+
+    # ----- Routing journal -----
+    def _journal_result(self, title: str, fn):
+        try:
+            res = fn()
+        except LookupError as e:
+            QMessageBox.information(self, title, str(e).capitalize() + ".")
+            return
+        except Exception as e:
+            QMessageBox.critical(self, title, f"{title} failed: {e}")
+            return
+        self.refresh()
+        if res['errors']:
+            QMessageBox.warning(self, title, f"Applied {res['applied']}/{res['total']} connections; some failed:\n"
+                                + "\n".join(res['errors'][:5]))
+
+    def undo_routing(self):
+        self._journal_result("Undo", rdx_journal.undo)
+
+    def redo_routing(self):
+        self._journal_result("Redo", rdx_journal.redo)
+
+    def open_history_dialog(self):
+        """Recent journal entries; restore routing to right after any of them."""
+        try:
+            from PyQt5.QtWidgets import QDialog, QListWidget, QListWidgetItem
+            dlg = QDialog(self)
+            dlg.setWindowTitle("Routing History")
+            dlg.resize(720, 420)
+            lay = QVBoxLayout(dlg)
+            lst = QListWidget()
+            lay.addWidget(lst)
+
+            def fill():
+                lst.clear()
+                for e in reversed(rdx_journal.entries(limit=200)):
+                    ops = e.get('ops', [])
+                    head = ", ".join(f"{'+' if op == 'connect' else '−'} {s} → {d}" for op, s, d in ops[:2])
+                    more = f" (+{len(ops) - 2} more)" if len(ops) > 2 else ""
+                    when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(e.get('time', 0)))
+                    item = QListWidgetItem(f"#{e['seq']}  {when}  [{e.get('origin', '?')}]  {head}{more}")
+                    item.setData(Qt.UserRole, e['seq'])
+                    lst.addItem(item)
+
+            row = QHBoxLayout()
+            btn_restore = QPushButton("Restore to After Selected")
+            btn_undo = QPushButton("↶ Undo")
+            btn_redo = QPushButton("↷ Redo")
+            btn_close = QPushButton("Close")
+            row.addWidget(btn_restore); row.addWidget(btn_undo); row.addWidget(btn_redo); row.addStretch(1); row.addWidget(btn_close)
+            lay.addLayout(row)
+
+            def do_restore():
+                item = lst.currentItem()
+                if item is not None:
+                    seq = int(item.data(Qt.UserRole))
+                    self._journal_result("Restore", lambda: rdx_journal.restore_to(seq))
+                    fill()
+
+            btn_restore.clicked.connect(do_restore)
+            btn_undo.clicked.connect(lambda: (self.undo_routing(), fill()))
+            btn_redo.clicked.connect(lambda: (self.redo_routing(), fill()))
+            btn_close.clicked.connect(dlg.accept)
+            fill()
+            dlg.exec_()
+        except Exception:
+            pass
+
+    def _active_profile(self):
+        try:
+            return self.main._settings.get('active_profile') if self.main else None
+        except Exception:
+            return None
+
+    def set_active_profile(self, name):
+        """Profile the reconciler keeps connected (None: none); takes effect right away."""
+        if not (self.main and hasattr(self.main, "_settings")):
+            return
+        self.main._settings['active_profile'] = name or None
+        self.main.save_settings()
+        link = getattr(self.main, "daemon_link", None)
+        if link is not None and link.is_connected():
+            link.call("routing.reconcile", callback=lambda _r, _e: self.refresh_async())
+        else:
+            watcher = getattr(self.main, "routing_watcher", None)
+            if watcher is not None:
+                watcher.reconcile()
+
+    def edit_profile(self, name: str):
+        """Simple editor to add/remove pairs within a profile."""
+        try:
+            if name not in self.profiles:
+                return
+            pairs = [list(p) for p in self.profiles.get(name, [])]
+            from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QComboBox, QMessageBox
+            dlg = QDialog(self)
+            dlg.setWindowTitle(f"Edit Profile: {name}")
+            lay = QVBoxLayout(dlg)
+            table = QTableWidget(0, 2, dlg)
+            table.setHorizontalHeaderLabels(["Source (out)", "Destination (in)"])
+            lay.addWidget(table)
+
+            # Populate port combos
+            outs = []
+            ins = []
+            for c, d in self.ports.items():
+                outs.extend(d.get("out", []))
+                ins.extend(d.get("in", []))
+            outs = sorted(outs, key=lambda s: s.lower())
+            ins = sorted(ins, key=lambda s: s.lower())
+
+            def refresh_table():
+                table.setRowCount(len(pairs))
+                for r, (s, d) in enumerate(pairs):
+                    table.setItem(r, 0, QTableWidgetItem(s))
+                    table.setItem(r, 1, QTableWidgetItem(d))
+            refresh_table()
+
+            # Add controls
+            row = QHBoxLayout()
+            cmb_s = QComboBox(); cmb_s.addItems(outs)
+            cmb_d = QComboBox(); cmb_d.addItems(ins)
+            btn_add = QPushButton("Add Pair")
+            btn_rm = QPushButton("Remove Selected")
+            btn_save = QPushButton("Save")
+            btn_close = QPushButton("Close")
+            row.addWidget(cmb_s); row.addWidget(cmb_d); row.addWidget(btn_add); row.addWidget(btn_rm); row.addStretch(1); row.addWidget(btn_save); row.addWidget(btn_close)
+            lay.addLayout(row)
+
+            def on_add():
+                s = cmb_s.currentText().strip(); d = cmb_d.currentText().strip()
+                if s and d:
+                    pairs.append([s, d])
+                    refresh_table()
+            def on_rm():
+                r = table.currentRow()
+                if 0 <= r < len(pairs):
+                    pairs.pop(r)
+                    refresh_table()
+            def on_save():
+                self.profiles[name] = pairs
+                self._save_profiles()
+                QMessageBox.information(dlg, "Profile Saved", f"Updated '{name}' with {len(pairs)} connection(s).")
+            def on_close():
+                dlg.accept()
+
+            btn_add.clicked.connect(on_add)
+            btn_rm.clicked.connect(on_rm)
+            btn_save.clicked.connect(on_save)
+            btn_close.clicked.connect(on_close)
+            dlg.exec_()
+        except Exception as e:
+            try:
+                QMessageBox.critical(self, "Edit Profile", f"Could not edit profile: {e}")
+            except Exception:
+                pass
+
+    def save_current_as_profile(self, name: str = None):
+        try:
+            # Refresh connections to ensure current
+            self.connections = self._list_connections()
+            key = name
+            if not key:
+                from PyQt5.QtWidgets import QInputDialog
+                key, ok = QInputDialog.getText(self, "Save Profile", "Profile name:")
+                if not ok or not str(key).strip():
+                    return
+                key = str(key).strip()
+            # Store as list of [src, dst]
+            self.profiles[key] = [[s, d] for (s, d) in self.connections]
+            self._save_profiles()
+            QMessageBox.information(self, "Profile Saved", f"Saved profile '{key}' with {len(self.connections)} connections.")
+        except Exception as e:
+            QMessageBox.critical(self, "Save Profile", f"Could not save profile: {e}")
+
+    def apply_profile(self, name: str):
+        try:
+            if not name or name not in self.profiles:
+                return
+            pairs = self.profiles.get(name, [])
+            # Pairs whose ports are gone are skipped ("missing"), not errors
+            res = rdx_jack.transaction([("connect", s, d) for s, d in pairs], origin=f"profile:{name}")
+            self.refresh()
+            text = f"Applied {res['applied']}/{res['total']} connections from '{name}'."
+            if res['errors']:
+                QMessageBox.warning(self, "Profile Applied", text + "\n\n" + "\n".join(res['errors'][:5]))
+            else:
+                QMessageBox.information(self, "Profile Applied", text)
+        except Exception as e:
+            QMessageBox.critical(self, "Apply Profile", f"Could not apply profile: {e}")
+
+    def delete_profile(self, name: str):
+        try:
+            if not name or name not in self.profiles:
+                return
+            reply = QMessageBox.question(self, "Delete Profile",
+                                         f"Delete profile '{name}'? This cannot be undone.",
+                                         QMessageBox.Yes | QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+            self.profiles.pop(name, None)
+            self._save_profiles()
+        except Exception as e:
+            QMessageBox.critical(self, "Delete Profile", f"Could not delete profile: {e}")
+
+    # ----- JACK queries -----
+    def _run(self, args: list, timeout: float = 0.8):
+        try:
+            return rdx_runner.run(args, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return subprocess.CompletedProcess(args=args, returncode=1, stdout="", stderr="timeout")
+
+    def _parse_ports(self, txt: str) -> dict:
+        return rdx_jack.parse_ports(txt)
+
+    def _parse_jack_ports(self, txt: str) -> dict:
+        """Parse 'jack_lsp -p' output into {client: {in:[ports], out:[ports]}} (see rdx.jack.parse_topology)."""
+        return rdx_jack.parse_ports(txt)
+
+    def _list_connections(self) -> list:
+        """Current connections as (output, input) pairs, each once."""
+        topo = rdx_jack.list_topology(timeout=1.2)
+        return topo[1] if topo else []
+
+    # ----- Graph build -----
+    def refresh(self):
+        self._render_topology(self._probe_topology())
+
+    def refresh_async(self):
+        """Probe JACK on a worker thread, then redraw; used for passive refreshes"""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        run_async(self._probe_topology, self._on_topology_probed, self)
+
+    def _on_topology_probed(self, topo):
+        self._refresh_pending = False
+        self._render_topology(topo)
+
+    def _probe_topology(self):
+        """Return (ports, connections, types), or None when JACK is not running. Safe off the GUI thread."""
+        # Probe JACK (QJackCtl-style fallback)
+        def _fast_probe() -> bool:
+            _pyjack = optional_pyjack()
+            if _pyjack is not None:
+                try:
+                    c = _pyjack.Client("rdx-probe", no_start_server=True)
+                    try:
+                        c.close()
+                    except Exception:
+                        pass
+                    return True
+                except Exception:
+                    pass
+            try:
+                jc = self._run(["bash","-lc","command -v jack_control >/dev/null 2>&1 && jack_control status || true"], timeout=1.0)
+                if "started" in (jc.stdout or "").lower():
+                    return True
+            except Exception:
+                pass
+            try:
+                pg = self._run(["pgrep", "-x", "jackd"], timeout=0.6)
+                if getattr(pg, 'returncode', 1) == 0:
+                    return True
+            except Exception:
+                pass
+            return False
+
+        # One jack_lsp call for ports, directions, types and connections
+        res = self._run(["jack_lsp", "-c", "-p", "-t"], timeout=3.0)
+        if res.returncode != 0 and not _fast_probe():
+            return None
+        return rdx_jack.parse_topology(res.stdout)
+
+    def _render_topology(self, topo):
+        # Clear
+        self.scene.clear()
+        if topo is None:
+            self.scene.addText("JACK is not running")
+            return
+        self.ports, self.connections, self.port_types = topo
+        # Layout: outputs on left, inputs on right (tidy aligned columns)
+        L = self._layout
+        left_x = L["left_dot_x"]
+        right_x = L["right_dot_x"]
+        y = 20
+        port_items = {}
+        header_font = QFont(); header_font.setBold(True)
+        # Left column
+        for client in sorted(self.ports.keys(), key=lambda x: x.lower()):
+            outs = self.ports[client].get("out", [])
+            if not outs:
+                continue
+            # Place client label above its port labels, left-justified with them
+            title = self.scene.addText(client)
+            title.setFont(header_font)
+            title.setDefaultTextColor(QColor("#2c3e50"))
+            title.setPos(L["left_port_label_x"], y)
+            y2 = y + L.get("client_label_gap", 16)
+            for p in outs:
+                item = self._add_port_node(p, QPointF(left_x, y2), is_output=True)
+                port_items[p] = item
+                y2 += L["row_h"]
+            y = y2 + 8
+        # Right column
+        y = 20
+        for client in sorted(self.ports.keys(), key=lambda x: x.lower()):
+            ins = self.ports[client].get("in", [])
+            if not ins:
+                continue
+            # Place client label above its port labels, left-justified with them
+            title = self.scene.addText(client)
+            title.setFont(header_font)
+            title.setDefaultTextColor(QColor("#2c3e50"))
+            title.setPos(L["right_port_label_x"], y)
+            y2 = y + L.get("client_label_gap", 16)
+            for p in ins:
+                item = self._add_port_node(p, QPointF(right_x, y2), is_output=False)
+                port_items[p] = item
+                y2 += L["row_h"]
+            y = y2 + 8
+        # Edges
+        for sp, dp in self.connections:
+            sp_item = port_items.get(sp)
+            dp_item = port_items.get(dp)
+            if not sp_item or not dp_item:
+                continue
+            self._add_edge(sp_item, dp_item)
+        # Fit only if requested/pending; otherwise preserve user's zoom/scroll
+        if getattr(self, "_fit_pending", False):
+            rect = self.scene.itemsBoundingRect()
+            if rect.isValid():
+                self.view.fitInView(rect, Qt.KeepAspectRatio)
+            self._fit_pending = False
+        # Populate manual combos
+        self._populate_manual_combos()
+
+    def _on_selection_changed(self):
+        try:
+            items = self.scene.selectedItems()
+        except Exception:
+            items = []
+        sel_edge = None
+        for it in items:
+            try:
+                if isinstance(it, QGraphicsPathItem) and it.data(10) and it.data(11):
+                    sel_edge = (str(it.data(10)), str(it.data(11)))
+                    break
+            except Exception:
+                continue
+        self._sel_edge = sel_edge
+        has_edge = sel_edge is not None
+        try:
+            self.btn_actions.setVisible(has_edge)
+            self.btn_actions.setEnabled(has_edge)
+        except Exception:
+            pass
+
+    def _add_port_node(self, fullport: str, pos: QPointF, is_output: bool):
+        r = 6
+        color = QColor("#27ae60") if is_output else QColor("#3498db")
+        if self.port_types.get(fullport) == "midi":
+            color = QColor("#8e44ad")
+        pen = QPen(color); pen.setWidth(2)
+        ell = QGraphicsEllipseItem(-r, -r, 2*r, 2*r)
+        ell.setPen(pen)
+        ell.setBrush(QColor("#ecf0f1"))
+        ell.setToolTip(fullport)
+        ell.setPos(pos)
+        ell.setZValue(2)
+        ell.setFlag(ell.ItemIsSelectable, True)
+        try:
+            ell.setAcceptedMouseButtons(Qt.LeftButton | Qt.RightButton)
+        except Exception:
+            pass
+        # Attach metadata for drag/drop logic
+        try:
+            ell.setData(0, fullport)   # full port name
+            ell.setData(1, bool(is_output))  # True if output node
+        except Exception:
+            pass
+        # label
+        lab = QGraphicsTextItem(fullport.split(":",1)[1])
+        # Place labels in tidy columns
+        L = self._layout
+        if is_output:
+            lab.setPos(QPointF(L["left_port_label_x"], pos.y() - 10))
+        else:
+            lab.setPos(QPointF(L["right_port_label_x"], pos.y() - 10))
+        lab.setDefaultTextColor(QColor("#2c3e50"))
+        self.scene.addItem(lab)
+        self.scene.addItem(ell)
+
+        # Drag-to-connect + click-to-connect combined handler
+        ell._press_pos = None
+        ell._orig_pen = pen
+
+        def begin_drag(start_item, start_scene_pos):
+            # Start a temporary line from the source output node
+            self._drag_src_item = start_item
+            self._drag_started = True
+            p1 = start_item.scenePos()
+            self._drag_line = QGraphicsLineItem(p1.x()+6, p1.y(), start_scene_pos.x(), start_scene_pos.y())
+            dl_pen = QPen(QColor("#8e44ad")); dl_pen.setStyle(Qt.DashLine); dl_pen.setWidth(2)
+            self._drag_line.setPen(dl_pen)
+            self._drag_line.setZValue(0.5)
+            self.scene.addItem(self._drag_line)
+
+        def update_drag(to_scene_pos):
+            if not self._drag_line or not self._drag_src_item:
+                return
+            p1 = self._drag_src_item.scenePos()
+            self._drag_line.setLine(p1.x()+6, p1.y(), to_scene_pos.x(), to_scene_pos.y())
+            # Hover highlight for valid input targets
+            try:
+                items = self.scene.items(to_scene_pos)
+            except Exception:
+                items = []
+            target = None
+            for it in items:
+                try:
+                    if isinstance(it, QGraphicsEllipseItem) and (it.data(1) is False):
+                        target = it
+                        break
+                except Exception:
+                    continue
+            if target is not self._drag_hover_item:
+                # Clear previous highlight
+                if isinstance(self._drag_hover_item, QGraphicsEllipseItem):
+                    try:
+                        self._drag_hover_item.setPen(self._drag_hover_item._orig_pen)
+                    except Exception:
+                        pass
+                self._drag_hover_item = target
+                if isinstance(self._drag_hover_item, QGraphicsEllipseItem):
+                    hl = QPen(QColor("#f1c40f")); hl.setWidth(3)
+                    self._drag_hover_item.setPen(hl)
+
+        def end_drag(end_scene_pos):
+            # Finalize drag: connect if dropped over an input node
+            if self._drag_line:
+                try:
+                    self.scene.removeItem(self._drag_line)
+                except Exception:
+                    pass
+                self._drag_line = None
+            target = None
+            try:
+                items = self.scene.items(end_scene_pos)
+            except Exception:
+                items = []
+            for it in items:
+                try:
+                    if isinstance(it, QGraphicsEllipseItem) and (it.data(1) is False):
+                        target = it
+                        break
+                except Exception:
+                    continue
+            # Clear hover highlight
+            if isinstance(self._drag_hover_item, QGraphicsEllipseItem):
+                try:
+                    self._drag_hover_item.setPen(self._drag_hover_item._orig_pen)
+                except Exception:
+                    pass
+            self._drag_hover_item = None
+
+            if self._drag_src_item and target:
+                try:
+                    sp = str(self._drag_src_item.data(0))
+                    dp = str(target.data(0))
+                    self._jack_connect(sp, dp)
+                    self.refresh()
+                except Exception as e:
+                    QMessageBox.critical(self, "JACK Error", f"Connect failed: {e}\n{sp} → {dp}")
+
+            self._drag_src_item = None
+            self._drag_started = False
+
+        def on_press(event):
+            if event.button() == Qt.RightButton:
+                # Context menu: disconnects for this port, copy name
+                try:
+                    menu = QMenu()
+                    act_disc_all = menu.addAction("Disconnect all on this port")
+                    act_copy = menu.addAction("Copy port name")
+                    chosen = menu.exec_(event.screenPos().toPoint())
+                    if chosen == act_disc_all:
+                        self._disconnect_port(fullport)
+                    elif chosen == act_copy:
+                        try:
+                            QApplication.clipboard().setText(fullport)
+                        except Exception:
+                            pass
+                    return
+                except Exception:
+                    pass
+            if event.button() == Qt.LeftButton:
+                ell._press_pos = event.scenePos()
+            return super(QGraphicsEllipseItem, ell).mousePressEvent(event)
+
+        def on_move(event):
+            # Start drag only when moved a bit and source is an output node
+            if bool(ell.data(1)) and ell._press_pos is not None:
+                delta = event.scenePos() - ell._press_pos
+                if not self._drag_started and (abs(delta.x()) > 3 or abs(delta.y()) > 3):
+                    # Suppress click-to-connect selection when drag begins
+                    self._selected_out = None
+                    self._selected_in = None
+                    begin_drag(ell, event.scenePos())
+            if self._drag_started:
+                update_drag(event.scenePos())
+            return super(QGraphicsEllipseItem, ell).mouseMoveEvent(event)
+
+        def on_release(event):
+            # If a drag was in progress, finish it; otherwise fall back to click-to-connect
+            if self._drag_started:
+                end_drag(event.scenePos())
+            else:
+                if event.button() == Qt.LeftButton:
+                    if is_output:
+                        self._selected_out = fullport
+                    else:
+                        self._selected_in = fullport
+                    if self._selected_out and self._selected_in:
+                        try:
+                            self._jack_connect(self._selected_out, self._selected_in)
+                            self.refresh()
+                        except Exception as e:
+                            QMessageBox.critical(self, "JACK Error", f"Connect failed: {e}")
+                        finally:
+                            self._selected_out = None
+                            self._selected_in = None
+            ell._press_pos = None
+            return super(QGraphicsEllipseItem, ell).mouseReleaseEvent(event)
+
+        ell.mousePressEvent = on_press
+        ell.mouseMoveEvent = on_move
+        ell.mouseReleaseEvent = on_release
+        return ell
+
+    # ---- Zoom helper ----
+    def _zoom(self, factor: float):
+        try:
+            new_level = self._zoom_level * float(factor)
+            new_level = max(0.2, min(4.0, new_level))
+            ratio = new_level / (self._zoom_level if self._zoom_level else 1.0)
+            self.view.scale(ratio, ratio)
+            self._zoom_level = new_level
+            self._fit_pending = False
+        except Exception:
+            pass
+
+    # ---- Manual connect helpers ----
+    def _populate_manual_combos(self):
+        try:
+            outs = []
+            ins = []
+            for c, d in self.ports.items():
+                outs.extend(d.get("out", []))
+                ins.extend(d.get("in", []))
+            outs_sorted = sorted(outs, key=lambda s: s.lower())
+            ins_sorted = sorted(ins, key=lambda s: s.lower())
+            if hasattr(self, 'manual_out') and hasattr(self, 'manual_in'):
+                self.manual_out.clear(); self.manual_in.clear()
+                for p in outs_sorted:
+                    self.manual_out.addItem(p)
+                for p in ins_sorted:
+                    self.manual_in.addItem(p)
+        except Exception:
+            pass
+
+    def connect_manual_ports(self):
+        try:
+            sp = (self.manual_out.currentText() or '').strip()
+            dp = (self.manual_in.currentText() or '').strip()
+            if sp and dp:
+                if not self._direction_ok(sp, dp):
+                    QMessageBox.warning(self, "Port Direction",
+                                        "The selected source doesn't look like an output or the destination isn't an input.\nProceed anyway?",
+                                        QMessageBox.Ok, QMessageBox.Ok)
+                self._jack_connect(sp, dp)
+                self.refresh()
+        except Exception as e:
+            QMessageBox.critical(self, "JACK Error", f"Connect failed: {e}")
+
+    def disconnect_manual_ports(self):
+        try:
+            sp = (self.manual_out.currentText() or '').strip()
+            dp = (self.manual_in.currentText() or '').strip()
+            if sp and dp:
+                self._jack_disconnect(sp, dp)
+                self.refresh()
+        except Exception as e:
+            QMessageBox.critical(self, "JACK Error", f"Disconnect failed: {e}")
+
+    def toggle_lock_manual_pair(self):
+        try:
+            sp = (self.manual_out.currentText() or '').strip()
+            dp = (self.manual_in.currentText() or '').strip()
+            if not (sp and dp):
+                return
+            s_client = sp.split(":",1)[0]
+            d_client = dp.split(":",1)[0]
+            key = f"{s_client}→{d_client}"
+            if key in self.critical_pairs:
+                self.critical_pairs.remove(key)
+            else:
+                self.critical_pairs.add(key)
+            self._save_protected_pairs()
+            self.refresh()
+        except Exception:
+            pass
+
+    def _add_edge(self, sp_item: QGraphicsEllipseItem, dp_item: QGraphicsEllipseItem):
+        p1 = sp_item.scenePos()
+        p2 = dp_item.scenePos()
+        # Curved, sexy cable using cubic Bezier
+        path = QPainterPath(QPointF(p1.x()+6, p1.y()))
+        dx = max(40.0, abs(p2.x() - p1.x()) * 0.35)
+        c1 = QPointF(p1.x() + dx, p1.y())
+        c2 = QPointF(p2.x() - dx, p2.y())
+        path.cubicTo(c1, c2, QPointF(p2.x()-6, p2.y()))
+        line = QGraphicsPathItem(path)
+        s_client = sp_item.toolTip().split(":",1)[0]
+        d_client = dp_item.toolTip().split(":",1)[0]
+        key = f"{s_client}→{d_client}"
+        is_prot = (key in self.critical_pairs) and (not getattr(self, "_ignore_protection", False))
+        pen = QPen(QColor("#e67e22") if is_prot else QColor("#34495e"))
+        pen.setWidth(4 if is_prot else 3)
+        try:
+            pen.setCapStyle(Qt.RoundCap)
+            pen.setJoinStyle(Qt.RoundJoin)
+        except Exception:
+            pass
+        line.setPen(pen)
+        line.setZValue(1)
+        line.setToolTip(f"{sp_item.toolTip()} → {dp_item.toolTip()}")
+        line.setFlag(line.ItemIsSelectable, True)
+        try:
+            line.setAcceptedMouseButtons(Qt.LeftButton | Qt.RightButton)
+        except Exception:
+            pass
+        # Mark endpoints on the edge for scene-level hit testing/menus
+        try:
+            line.setData(10, sp_item.toolTip())
+            line.setData(11, dp_item.toolTip())
+        except Exception:
+            pass
+        self.scene.addItem(line)
+
+        # Add a small state icon near the middle of the line
+        midx = (p1.x()+p2.x())/2
+        midy = (p1.y()+p2.y())/2
+        icon = QGraphicsTextItem("🔐" if is_prot else "⚠️")
+        icon.setDefaultTextColor(QColor("#e67e22") if is_prot else QColor("#7f8c8d"))
+        icon.setPos(midx - 6, midy - 10)
+        icon.setZValue(1.5)
+        try:
+            icon.setAcceptedMouseButtons(Qt.NoButton)
+        except Exception:
+            pass
+        self.scene.addItem(icon)
+
+        # Add a wide transparent hit-area to make right-clicking easier
+        hit = QGraphicsPathItem(path)
+        hit.setPen(QPen(QColor(0,0,0,0), 14))
+        # setBrush expects a QBrush/QColor; pass a brush with NoBrush style
+        hit.setBrush(QBrush(Qt.NoBrush))
+        hit.setZValue(1.6)
+        try:
+            hit.setAcceptedMouseButtons(Qt.LeftButton | Qt.RightButton)
+            hit.setFlag(hit.ItemIsSelectable, True)
+        except Exception:
+            pass
+        try:
+            hit.setData(10, sp_item.toolTip())
+            hit.setData(11, dp_item.toolTip())
+        except Exception:
+            pass
+        self.scene.addItem(hit)
+
+        def on_line_press(event):
+            if event.button() == Qt.RightButton:
+                # Delegate to shared edge menu to keep logic consistent
+                self._show_edge_menu(sp_item.toolTip(), dp_item.toolTip(), event.screenPos())
+                return
+            return super(QGraphicsPathItem, line).mousePressEvent(event)
+
+        line.mousePressEvent = on_line_press
+        hit.mousePressEvent = on_line_press
+
+    def _show_port_menu(self, fullport: str, screen_pos):
+        try:
+            menu = QMenu()
+            act_disc_all = menu.addAction("Disconnect all on this port")
+            act_copy = menu.addAction("Copy port name")
+            chosen = menu.exec_(QPoint(int(screen_pos.x()), int(screen_pos.y())) if screen_pos else QCursor.pos())
+            if chosen == act_disc_all:
+                self._disconnect_port(fullport)
+            elif chosen == act_copy:
+                try:
+                    QApplication.clipboard().setText(fullport)
+                except Exception:
+                    pass
+        except Exception:
+            pass
+
+    def _show_edge_menu(self, sp_full: str, dp_full: str, screen_pos):
+        try:
+            s_client = sp_full.split(":",1)[0]
+            d_client = dp_full.split(":",1)[0]
+            key = f"{s_client}→{d_client}"
+            is_prot = (key in self.critical_pairs) and (not getattr(self, "_ignore_protection", False))
+            menu = QMenu()
+            act_disc = menu.addAction("Disconnect")
+            if is_prot and not getattr(self, "_ignore_protection", False):
+                act_disc.setEnabled(False)
+            # Explicit Lock and Unlock actions (one enabled depending on state)
+            act_lock = menu.addAction("Lock (protect)")
+            act_unlock = menu.addAction("Unlock (unprotect)")
+            if getattr(self, "_ignore_protection", False):
+                act_lock.setEnabled(False)
+                act_unlock.setEnabled(False)
+            else:
+                act_lock.setEnabled(not is_prot)
+                act_unlock.setEnabled(is_prot)
+            menu.addSeparator()
+            act_stereo = menu.addAction("Make Stereo Pair (L→L, R→R)")
+            chosen = menu.exec_(QPoint(int(screen_pos.x()), int(screen_pos.y())) if screen_pos else QCursor.pos())
+            if chosen == act_disc:
+                try:
+                    self._jack_disconnect(sp_full, dp_full)
+                    self.refresh()
+                except Exception as e:
+                    QMessageBox.critical(self, "JACK Error", f"Disconnect failed: {e}")
+            elif chosen in (act_lock, act_unlock):
+                if not getattr(self, "_ignore_protection", False):
+                    if chosen == act_lock and not is_prot:
+                        self.critical_pairs.add(key)
+                        self._save_protected_pairs()
+                    elif chosen == act_unlock and is_prot:
+                        if key in self.critical_pairs:
+                            self.critical_pairs.remove(key)
+                            self._save_protected_pairs()
+                    self.refresh()
+            elif chosen == act_stereo:
+                try:
+                    s_ports = self._first_two(self.ports.get(s_client, {}).get("out", []))
+                    d_ports = self._first_two(self.ports.get(d_client, {}).get("in", []))
+                    if len(d_ports) < 2:
+                        return
+                    if len(s_ports) >= 2:
+                        # Both legs in one transaction: one journal entry, one undo
+                        res = rdx_jack.transaction([("connect", s_ports[0], d_ports[0]),
+                                                    ("connect", s_ports[1], d_ports[1])], origin="graph")
+                        if res['errors']:
+                            QMessageBox.warning(self, "Partial Failure", "Some connections failed:\n" + "\n".join(res['errors']))
+                    self.refresh()
+                except Exception:
+                    pass
+        except Exception:
+            pass
+
+    # ---- Settings and watcher ----
+    def _setting_enabled(self, key: str, default: bool = True) -> bool:
+        try:
+            if self.main and hasattr(self.main, "_settings"):
+                return bool(self.main._settings.get(key, default))
+        except Exception:
+            pass
+        return default
+
+    def on_topology_changed(self):
+        """Redraw after a pushed topology change, coalescing bursts and skipping hidden tabs"""
+        if not self.isVisible():
+            self._topology_stale = True
+            return
+        if not hasattr(self, "_topology_refresh_timer"):
+            self._topology_refresh_timer = QTimer(self)
+            self._topology_refresh_timer.setSingleShot(True)
+            self._topology_refresh_timer.timeout.connect(self.refresh_async)
+        self._topology_refresh_timer.start(250)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if getattr(self, "_topology_stale", False):
+            self._topology_stale = False
+            self.refresh_async()
+
+    def _on_graph_vlc_toggle(self, _state):
+        try:
+            val = bool(self.chk_vlc_reconnect.isChecked())
+            if self.main and hasattr(self.main, "_settings"):
+                self.main._settings['auto_reconnect_vlc'] = val
+                self.main.save_settings()
+        except Exception:
+            pass
+
+    # ----- Quick actions -----
+    def auto_connect(self):
+        # Simple delegate using current graph state; avoid creating feedback loops
+        actions = []
+        ops = []
+        topo = rdx_jack.list_topology(timeout=1.2)
+        existing = set((s.split(":",1)[0], d.split(":",1)[0]) for (s,d) in (topo[1] if topo else []))
+        # Chain plus external audio (VLC) into Rivendell if available (see rdx.rules.CHAIN)
+        for m in rdx_rules.CHAIN.resolve(self.ports):
+            a, b = m['pairs'][0][0].split(":", 1)[0], m['pairs'][0][1].split(":", 1)[0]
+            # Avoid connecting if reverse path exists to prevent feedback (b→a already)
+            if (b, a) in existing:
+                continue
+            ops += [("connect", sp, dp) for sp, dp in m['pairs']]
+            actions.append(f"{a}→{b}")
+        if not actions:
+            QMessageBox.information(self, "Auto-Connect", "No suitable clients found for auto patching.")
+            return
+        # One batch against the snapshot above, verified with one more
+        res = rdx_jack.transaction(ops, topology=topo, origin="auto-connect")
+        if res['errors']:
+            QMessageBox.warning(self, "Auto-Connect", f"Connected {res['applied']}/{res['total']} ports; some failed:\n"
+                                + "\n".join(res['errors'][:5]))
+        self.refresh()
+
+    # (Old on-tab Profiles actions removed; using dialog-based save/apply/delete implementations above.)
+
+    def generate_profile(self):
+        try:
+            # Suggested stereo chain: VLC→RD(in), RD(out)→ST(in), ST(out)→LS(in), LS(out)→system(playback)
+            pairs = [[s, d] for m in rdx_rules.CHAIN.resolve(self.ports) for s, d in m['pairs']]
+
+            if not pairs:
+                QMessageBox.information(self, "Generate Profile", "No suitable stereo clients found to generate a profile.")
+                return
+
+            # Show summary and ask for name
+            summary = "\n".join([f"{s} → {d}" for s, d in pairs])
+            msg = QMessageBox(self)
+            msg.setIcon(QMessageBox.Information)
+            msg.setWindowTitle("Generated Profile")
+            msg.setText("Proposed connections:\n\n" + summary)
+            msg.setStandardButtons(QMessageBox.Ok | QMessageBox.Cancel)
+            ret = msg.exec_()
+            if ret != QMessageBox.Ok:
+                return
+
+            from PyQt5.QtWidgets import QInputDialog
+            default_name = time.strftime("Suggested %Y-%m-%d %H:%M")
+            name, ok = QInputDialog.getText(self, "Save Generated Profile", "Profile name:", text=default_name)
+            if not ok or not name.strip():
+                return
+            key = name.strip()
+            self.profiles[key] = pairs
+            self._save_profiles()
+            # Offer immediate apply (best-effort; continue on individual errors)
+            res = rdx_jack.transaction([("connect", s, d) for s, d in pairs], origin=f"profile:{key}")
+            applied = res['applied']
+            errs = [r.get('error', "failed") for r in res['results'] if r['status'] == "failed"]
+            self.refresh()
+            if errs:
+                # Show a concise warning but confirm partial success
+                uniq = []
+                for m in errs:
+                    lm = m.strip()
+                    if lm and lm not in uniq:
+                        uniq.append(lm)
+                detail = "\n".join(uniq[:3])  # limit noise
+                QMessageBox.warning(self, "Profile Generated",
+                                    f"Saved '{key}' and applied {applied}/{len(pairs)} connections, with some non-fatal issues:\n{detail}")
+            else:
+                QMessageBox.information(self, "Profile Generated", f"Saved '{key}' and applied {applied}/{len(pairs)} connections.")
+        except Exception as e:
+            QMessageBox.critical(self, "Generate Profile", f"Could not generate profile: {e}")
+
+    def emergency_disconnect(self):
+        """Cut every non-protected connection now, from the last refresh (see common.panic_disconnect)."""
+        panic_disconnect(self, self.connections, getattr(self, "_ignore_protection", False), done=self.refresh)
+
+    # ----- helpers -----
+    def _first_two(self, arr):
+        """Pick a sensible stereo pair from a list of full port names (see rdx.jack.first_two)."""
+        return rdx_jack.first_two(arr)
+
+    def _jack_connect(self, src_port: str, dst_port: str):
+        """Connect one pair, journaled only if it was not connected already (RuntimeError with guidance)."""
+        rdx_jack.apply_pair("connect", src_port, dst_port, origin="graph")
+
+    def _jack_disconnect(self, src_port: str, dst_port: str):
+        rdx_jack.apply_pair("disconnect", src_port, dst_port, origin="graph")
+
+    def _disconnect_port(self, fullport: str):
+        """Cut every connection on one port as one transaction (a single undo restores them)."""
+        try:
+            topo = rdx_jack.list_topology(timeout=1.2)
+            ops = [("disconnect", s, d) for s, d in (topo[1] if topo else []) if fullport in (s, d)]
+            if ops:
+                res = rdx_jack.transaction(ops, topology=topo, origin="graph")
+                if res['errors']:
+                    QMessageBox.warning(self, "Disconnect Issues", "\n".join(res['errors'][:5]))
+            self.refresh()
+        except Exception:
+            pass
+
+    def _direction_ok(self, sp: str, dp: str) -> bool:
+        try:
+            s_client = sp.split(":",1)[0]
+            d_client = dp.split(":",1)[0]
+            ts, td = self.port_types.get(sp), self.port_types.get(dp)
+            if ts and td and ts != td:
+                return False  # JACK refuses audio <-> MIDI
+            return (sp in self.ports.get(s_client,{}).get("out", [])) and (dp in self.ports.get(d_client,{}).get("in", []))
+        except Exception:
+            return True
+
+    # ---- JACK helpers ----
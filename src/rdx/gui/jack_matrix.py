@@ -0,0 +1,468 @@
+"""
+Legacy JACK patchboard tab (not shown; kept for reference and the build integrity check).
+"""
+
+import json
+import subprocess
+from pathlib import Path
+
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QWidget,
+                             QMessageBox, QGridLayout, QGroupBox, QTextEdit, QComboBox,
+                             QCheckBox)
+
+from .common import optional_pyjack, panic_disconnect
+from rdx import jack as rdx_jack
+from rdx import rules as rdx_rules
+from rdx import runner as rdx_runner
+
+
+class JackMatrixTab(QWidget):
+    """Tab 3: JACK Patchboard - Simple stereo-aware patching with protection"""
+
+    def __init__(self, main=None):
+        super().__init__()
+        # Optional reference to main window for settings access
+        self.main = main
+        # Parsed JACK ports by client: {client: {"in": [fullport,...], "out": [...]}}
+        self.ports = {}
+        # Known clients (sorted)
+        self.jack_clients = []
+        # Critical protected pairs: {"src→dst", ...}
+        self.critical_pairs = set()
+        # Load persisted protected pairs (if any)
+        self._load_protected_pairs()
+        self.setup_ui()
+
+        # ---- Persistence for protected pairs (Matrix) ----
+    def _config_dir(self) -> Path:
+        p = Path.home() / ".config" / "rdx"
+        try:
+            p.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+        return p
+
+    def _prot_file(self) -> Path:
+        return self._config_dir() / "jack_protected.json"
+
+    def _load_protected_pairs(self):
+        try:
+            pf = self._prot_file()
+            if pf.exists():
+                with open(pf, 'r') as f:
+                    data = json.load(f)
+                pairs = data.get('pairs', [])
+                if isinstance(pairs, list):
+                    self.critical_pairs = set(str(x) for x in pairs)
+        except Exception:
+            self.critical_pairs = set()
+
+    def _save_protected_pairs(self):
+        try:
+            pf = self._prot_file()
+            with open(pf, 'w') as f:
+                json.dump({"pairs": sorted(list(self.critical_pairs))}, f, indent=2)
+        except Exception:
+            pass
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        # JACK Status Section
+        status_group = QGroupBox("🔌 JACK Status")
+        status_layout = QHBoxLayout(status_group)
+
+        self.jack_status_label = QLabel("Status: ⏳ Checking JACK…")
+        status_layout.addWidget(self.jack_status_label)
+
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.clicked.connect(self.refresh_jack_connections)
+        status_layout.addWidget(refresh_btn)
+
+        layout.addWidget(status_group)
+
+        # Patchboard Section (Stereo)
+        patch_group = QGroupBox("🎚️ Patchboard (Stereo)")
+        patch_layout = QGridLayout(patch_group)
+
+        patch_layout.addWidget(QLabel("Source (stereo out)"), 0, 0)
+        patch_layout.addWidget(QLabel("Destination (stereo in)"), 0, 1)
+        patch_layout.addWidget(QLabel("Actions"), 0, 2)
+
+        self.source_combo = QComboBox()
+        self.dest_combo = QComboBox()
+        patch_layout.addWidget(self.source_combo, 1, 0)
+        patch_layout.addWidget(self.dest_combo, 1, 1)
+
+        actions_w = QWidget()
+        actions_h = QHBoxLayout(actions_w)
+        actions_h.setContentsMargins(0, 0, 0, 0)
+        self.protect_checkbox = QCheckBox("Protect pair")
+        btn_connect = QPushButton("🔗 Connect L/R")
+        btn_connect.setStyleSheet("QPushButton { background-color: #27ae60; color: white; }")
+        btn_connect.clicked.connect(self.connect_selected_pair)
+        btn_disconnect = QPushButton("⛓️ Disconnect")
+        btn_disconnect.setStyleSheet("QPushButton { background-color: #e74c3c; color: white; }")
+        btn_disconnect.clicked.connect(self.disconnect_selected_pair)
+        actions_h.addWidget(self.protect_checkbox)
+        btn_unprotect = QPushButton("Unprotect current")
+        btn_unprotect.clicked.connect(self.unprotect_current_pair)
+        actions_h.addWidget(btn_unprotect)
+        actions_h.addWidget(btn_connect)
+        actions_h.addWidget(btn_disconnect)
+        actions_h.addStretch(1)
+        patch_layout.addWidget(actions_w, 1, 2)
+
+        layout.addWidget(patch_group)
+
+        # Fine-grained manual patching (single ports)
+        fine_group = QGroupBox("🔧 Manual Patching (Per-Port)")
+        fine_grid = QGridLayout(fine_group)
+        fine_grid.addWidget(QLabel("Source Port (output)"), 0, 0)
+        fine_grid.addWidget(QLabel("Destination Port (input)"), 0, 1)
+        self.port_src_combo = QComboBox()
+        self.port_dst_combo = QComboBox()
+        fine_grid.addWidget(self.port_src_combo, 1, 0)
+        fine_grid.addWidget(self.port_dst_combo, 1, 1)
+        fine_actions = QWidget()
+        fine_actions_h = QHBoxLayout(fine_actions)
+        fine_actions_h.setContentsMargins(0,0,0,0)
+        btn_p_connect = QPushButton("Connect")
+        btn_p_connect.clicked.connect(self.connect_manual_ports)
+        btn_p_disconnect = QPushButton("Disconnect")
+        btn_p_disconnect.clicked.connect(self.disconnect_manual_ports)
+        fine_actions_h.addWidget(btn_p_connect)
+        fine_actions_h.addWidget(btn_p_disconnect)
+        fine_actions_h.addStretch(1)
+        fine_grid.addWidget(fine_actions, 1, 2)
+        layout.addWidget(fine_group)
+
+        # Info on detected ports
+        info_group = QGroupBox("📊 Detected JACK clients and ports")
+        info_v = QVBoxLayout(info_group)
+        self.jack_info = QTextEdit()
+        self.jack_info.setReadOnly(True)
+        self.jack_info.setMinimumHeight(140)
+        self.jack_info.setStyleSheet("QTextEdit { font-family: monospace; }")
+        info_v.addWidget(self.jack_info)
+        layout.addWidget(info_group)
+
+        # Quick actions
+        controls_group = QGroupBox("⚙️ Quick Actions")
+        controls_layout = QHBoxLayout(controls_group)
+        auto_connect_btn = QPushButton("🎯 Auto-Connect (RD → ST → LS)")
+        auto_connect_btn.setStyleSheet("QPushButton { background-color: #2980b9; color: white; }")
+        auto_connect_btn.clicked.connect(self.auto_connect)
+        emergency_btn = QPushButton("🚨 Disconnect All (non-critical)")
+        emergency_btn.setStyleSheet("QPushButton { background-color: #c0392b; color: white; }")
+        emergency_btn.clicked.connect(self.emergency_disconnect)
+        controls_layout.addWidget(auto_connect_btn)
+        controls_layout.addWidget(emergency_btn)
+        controls_layout.addStretch(1)
+        layout.addWidget(controls_group)
+
+        # Initialize
+        self.refresh_jack_connections()
+        # Note: auto-reconnect watcher lives on the Graph tab (user-facing control)
+
+        # ---- JACK helpers (Matrix) ----
+    def refresh_jack_connections(self):
+        """Refresh JACK ports and update UI elements."""
+        try:
+            # Fast, QJackCtl-style probe: try opening a client without starting the server
+            def _fast_probe() -> bool:
+                # 1) python-jack-client if available (no_start_server)
+                _pyjack = optional_pyjack()
+                if _pyjack is not None:
+                    try:
+                        c = _pyjack.Client("rdx-probe", no_start_server=True)
+                        try:
+                            c.close()
+                        except Exception:
+                            pass
+                        return True
+                    except Exception:
+                        pass
+                # 2) jack_control reports started (jackdbus)
+                try:
+                    jc = rdx_runner.run(["bash","-lc","command -v jack_control >/dev/null 2>&1 && jack_control status || true"],
+                                        capture_output=True, text=True, timeout=1.2)
+                    if "started" in (jc.stdout or "").lower():
+                        return True
+                except Exception:
+                    pass
+                # 3) Rivendell-managed jackd without dbus: detect jackd process
+                try:
+                    pg = rdx_runner.run(["pgrep", "-x", "jackd"], capture_output=True, text=True, timeout=0.6)
+                    if pg.returncode == 0:
+                        return True
+                except Exception:
+                    pass
+                return False
+
+                # Check if JACK is running
+            try:
+                # First, a fast probe
+                base = rdx_runner.run(["jack_lsp"], capture_output=True, text=True, timeout=1.2)
+            except subprocess.TimeoutExpired:
+                # Retry with a longer timeout before giving up (VMs/xRDP can be slower)
+                try:
+                    base = rdx_runner.run(["jack_lsp"], capture_output=True, text=True, timeout=3.5)
+                except subprocess.TimeoutExpired:
+                    # As a last resort, consider JACK present if fast probe succeeds
+                    if _fast_probe():
+                        base = subprocess.CompletedProcess(args=["jack_lsp"], returncode=0, stdout="", stderr="")
+                        self.jack_status_label.setText("Status: ✅ JACK Running")
+                        self.jack_status_label.setStyleSheet("QLabel { color: #27ae60; font-weight: bold; }")
+                    else:
+                        self.jack_status_label.setText("Status: ⏳ JACK Probe Timed Out")
+                        self.jack_status_label.setStyleSheet("QLabel { color: #f39c12; font-weight: bold; }")
+                        # Do not hard-fail: preserve existing state and hint user to Refresh again
+                        return
+            if base.returncode != 0:
+                # If fast probe says running, tolerate a transient non-zero from jack_lsp
+                if _fast_probe():
+                    self.jack_status_label.setText("Status: ✅ JACK Running")
+                    self.jack_status_label.setStyleSheet("QLabel { color: #27ae60; font-weight: bold; }")
+                else:
+                    self.jack_status_label.setText("Status: ❌ JACK Not Running")
+                    self.jack_status_label.setStyleSheet("QLabel { color: #e74c3c; font-weight: bold; }")
+                    self.ports = {}
+                    self.jack_clients = []
+                    self.source_combo.clear()
+                    self.dest_combo.clear()
+                    self.jack_info.setPlainText("JACK is not running. Start JACK and refresh.")
+                    return
+            # Ports with properties
+            try:
+                res = rdx_runner.run(["jack_lsp", "-p"], capture_output=True, text=True, timeout=3.0)
+            except subprocess.TimeoutExpired:
+                res = subprocess.CompletedProcess(args=["jack_lsp","-p"], returncode=1, stdout=base.stdout, stderr="")
+            out = res.stdout if res.returncode == 0 else base.stdout
+            self.ports = self._parse_jack_ports(out)
+            self.jack_clients = sorted(list(self.ports.keys()))
+            # Populate combos
+            self._populate_combos()
+            self._populate_port_combos()
+            # Info text
+            self._update_info()
+            # If we previously marked dbus-running, keep that label; otherwise show Running
+            if "dbus" in (self.jack_status_label.text() or "").lower():
+                pass
+            else:
+                self.jack_status_label.setText("Status: ✅ JACK Running")
+                self.jack_status_label.setStyleSheet("QLabel { color: #27ae60; font-weight: bold; }")
+        except FileNotFoundError:
+            self.jack_status_label.setText("Status: ❌ JACK Tools Not Found")
+            self.jack_status_label.setStyleSheet("QLabel { color: #e74c3c; font-weight: bold; }")
+
+    def _parse_jack_ports(self, txt: str) -> dict:
+        """Parse 'jack_lsp -p' output into {client: {in:[ports], out:[ports]}} (see rdx.jack.parse_topology)."""
+        return rdx_jack.parse_ports(txt)
+
+    def _populate_combos(self):
+        def stereo_candidates(direction: str) -> list:
+            cands = []
+            for c, d in self.ports.items():
+                if len(d.get(direction, [])) >= 2:
+                    cands.append(c)
+            def key(name: str):
+                ln = name.lower(); score = 0
+                if "rivendell" in ln or ln.startswith("rd"): score -= 10
+                if "stereo" in ln: score -= 9
+                if "liquidsoap" in ln: score -= 8
+                if name.startswith("system"): score -= 7
+                return (score, name)
+            return [x for x in sorted(cands, key=key)]
+        srcs = stereo_candidates("out")
+        dsts = stereo_candidates("in")
+        cur_s = self.source_combo.currentText()
+        cur_d = self.dest_combo.currentText()
+        self.source_combo.clear(); self.source_combo.addItems(srcs)
+        self.dest_combo.clear(); self.dest_combo.addItems(dsts)
+        if cur_s in srcs:
+            self.source_combo.setCurrentText(cur_s)
+        if cur_d in dsts:
+            self.dest_combo.setCurrentText(cur_d)
+
+    def _populate_port_combos(self):
+        outs = []; ins = []
+        for c, d in self.ports.items():
+            outs.extend(d.get("out", []))
+            ins.extend(d.get("in", []))
+        def keyp(p: str):
+            client, pn = p.split(":", 1)
+            return (client.lower(), pn.lower())
+        outs.sort(key=keyp); ins.sort(key=keyp)
+        def label(p: str) -> str:
+            client, pn = p.split(":", 1)
+            pretty_c = self._pretty_client(client)
+            pretty_p = self._pretty_port_name(pn)
+            return f"{pretty_c}: {pretty_p}  ({pn})"
+        cur_sp = self.port_src_combo.currentData() if self.port_src_combo.count() else None
+        cur_dp = self.port_dst_combo.currentData() if self.port_dst_combo.count() else None
+        self.port_src_combo.clear();
+        for p in outs:
+            self.port_src_combo.addItem(label(p), p)
+        self.port_dst_combo.clear();
+        for p in ins:
+            self.port_dst_combo.addItem(label(p), p)
+        if cur_sp:
+            idx = self.port_src_combo.findData(cur_sp)
+            if idx >= 0:
+                self.port_src_combo.setCurrentIndex(idx)
+        if cur_dp:
+            idx = self.port_dst_combo.findData(cur_dp)
+            if idx >= 0:
+                self.port_dst_combo.setCurrentIndex(idx)
+
+    def _update_info(self):
+        lines = []
+        for c in self.jack_clients:
+            ins = len(self.ports.get(c, {}).get("in", []))
+            outs = len(self.ports.get(c, {}).get("out", []))
+            lines.append(f"{c}: in={ins} out={outs}")
+        self.jack_info.setPlainText("\n".join(lines) if lines else "No JACK clients detected.")
+
+    def _stereo_pair(self, client: str, direction: str) -> list:
+        """Best stereo pair (L/R, 0/1 or 1/2) for client in given direction (see rdx.jack.stereo_pairs)."""
+        return rdx_jack.first_two(self.ports.get(client, {}).get(direction, []))
+
+    def connect_selected_pair(self):
+        src = self.source_combo.currentText().strip()
+        dst = self.dest_combo.currentText().strip()
+        if not src or not dst or src == dst:
+            QMessageBox.warning(self, "Invalid Selection", "Choose distinct source and destination with stereo ports.")
+            return
+        key = f"{src}→{dst}"
+        if self.protect_checkbox.isChecked():
+            self.critical_pairs.add(key)
+            self._save_protected_pairs()
+        s_ports = self._stereo_pair(src, "out")
+        d_ports = self._stereo_pair(dst, "in")
+        if len(s_ports) < 2 or len(d_ports) < 2:
+            QMessageBox.warning(self, "Not Stereo", "Selected clients do not expose at least 2 ports each.")
+            return
+        res = rdx_jack.transaction([("connect", sp, dp) for sp, dp in zip(s_ports, d_ports)], origin="patchboard")
+        if not res['errors']:
+            QMessageBox.information(self, "Connected", f"{src} → {dst} (L/R)")
+        else:
+            QMessageBox.warning(self, "Partial Failure", "Some connections failed:\n" + "\n".join(res['errors']))
+
+    def disconnect_selected_pair(self):
+        src = self.source_combo.currentText().strip()
+        dst = self.dest_combo.currentText().strip()
+        if not src or not dst or src == dst:
+            return
+        key = f"{src}→{dst}"
+        if key in self.critical_pairs:
+            reply = QMessageBox.question(self, "Protected Pair", f"{key} is protected. Disconnect anyway?",
+                                         QMessageBox.Yes | QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        s_ports = self._stereo_pair(src, "out")
+        d_ports = self._stereo_pair(dst, "in")
+        res = rdx_jack.transaction([("disconnect", sp, dp) for sp, dp in zip(s_ports, d_ports)], origin="patchboard")
+        if res['errors']:
+            QMessageBox.warning(self, "Disconnect Issues", "\n".join(res['errors']))
+        else:
+            QMessageBox.information(self, "Disconnected", f"{src} ⛓️ {dst}")
+
+    def unprotect_current_pair(self):
+        src = self.source_combo.currentText().strip()
+        dst = self.dest_combo.currentText().strip()
+        if not src or not dst or src == dst:
+            return
+        key = f"{src}→{dst}"
+        if key in self.critical_pairs:
+            self.critical_pairs.remove(key)
+            self._save_protected_pairs()
+            QMessageBox.information(self, "Unprotected", f"Removed protection for: {key}")
+        else:
+            QMessageBox.information(self, "Not Protected", f"Current pair is not protected: {key}")
+
+    def auto_connect(self):
+        actions = []
+        ops = []
+        # Rivendell → processor → Liquidsoap → soundcard (see rdx.rules.STATION_CHAIN)
+        for m in rdx_rules.STATION.resolve(self.ports):
+            a, b = m['pairs'][0][0].split(":", 1)[0], m['pairs'][0][1].split(":", 1)[0]
+            if self.protect_checkbox.isChecked():
+                self.critical_pairs.add(f"{a}→{b}")
+            ops += [("connect", sp, dp) for sp, dp in m['pairs']]
+            actions.append(f"{a}→{b}")
+        if not actions:
+            QMessageBox.information(self, "Auto-Connect", "No suitable clients found for auto patching.")
+            return
+        if self.protect_checkbox.isChecked():
+            self._save_protected_pairs()
+        # One batch: every pair is made, then checked against a single snapshot
+        res = rdx_jack.transaction(ops, origin="auto-connect")
+        if res['errors']:
+            QMessageBox.warning(self, "Auto-Connect", f"Connected {res['applied']}/{res['total']} ports; some failed:\n"
+                                + "\n".join(res['errors'][:5]))
+        else:
+            QMessageBox.information(self, "Auto-Connect", "Connected:\n" + "\n".join(actions))
+
+    def emergency_disconnect(self):
+        """Cut every non-protected connection now (see common.panic_disconnect)."""
+        panic_disconnect(self)
+
+        # ---- Low-level JACK ops (Matrix) ----
+    def _jack_connect(self, src_port: str, dst_port: str):
+        # Journaled only when it took effect: re-connecting an existing pair must not be undoable
+        rdx_jack.apply_pair("connect", src_port, dst_port, origin="patchboard")
+
+    def _jack_disconnect(self, src_port: str, dst_port: str):
+        rdx_jack.apply_pair("disconnect", src_port, dst_port, origin="patchboard")
+
+    def _is_connected(self, src_port: str, dst_port: str) -> bool:
+        return rdx_jack.is_connected(src_port, dst_port)
+
+    def connect_manual_ports(self):
+        sp = self.port_src_combo.currentData()
+        dp = self.port_dst_combo.currentData()
+        if not sp or not dp:
+            return
+        try:
+            self._jack_connect(sp, dp)
+            QMessageBox.information(self, "Connected", f"{sp} → {dp}")
+        except Exception as e:
+            QMessageBox.critical(self, "JACK Error", str(e))
+
+    def disconnect_manual_ports(self):
+        sp = self.port_src_combo.currentData()
+        dp = self.port_dst_combo.currentData()
+        if not sp or not dp:
+            return
+        try:
+            self._jack_disconnect(sp, dp)
+            QMessageBox.information(self, "Disconnected", f"{sp} ⛓️ {dp}")
+        except Exception as e:
+            QMessageBox.critical(self, "JACK Error", str(e))
+
+        # ---- Pretty naming helpers (Matrix) ----
+    def _pretty_client(self, name: str) -> str:
+        ln = (name or '').lower()
+        if ln.startswith('system'):
+            return 'System'
+        if 'rivendell' in ln or ln.startswith('rd'):
+            return 'Rivendell'
+        if 'liquidsoap' in ln:
+            return 'Liquidsoap'
+        if 'stereo_tool' in ln or 'stereotool' in ln or 'stereo tool' in ln:
+            return 'Stereo Tool'
+        return name
+
+    def _pretty_port_name(self, pn: str) -> str:
+        lpn = (pn or '').lower()
+        # Common JACK port namings
+        if lpn in ("in_1", "capture_1", "playout_0l", "left", "l", "in_l", "in:left"):
+            return "Left In"
+        if lpn in ("in_2", "capture_2", "playout_0r", "right", "r", "in_r", "in:right"):
+            return "Right In"
+        if lpn in ("out_1", "playback_1", "out_l", "left", "l", "out:left"):
+            return "Left Out"
+        if lpn in ("out_2", "playback_2", "out_r", "right", "r", "out:right"):
+            return "Right Out"
+        return pn
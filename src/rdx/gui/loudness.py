@@ -0,0 +1,208 @@
+"""
+Loudness tab: EBU R128 meter on the outgoing program feed.
+"""
+
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QWidget,
+                             QGridLayout, QGroupBox, QComboBox, QSpinBox)
+from PyQt5.QtCore import Qt, QTimer
+
+from rdx import loudness as rdx_loudness
+
+
+class LoudnessMeterTab(QWidget):
+    """Tab: Loudness - EBU R128 meter on the outgoing program feed"""
+
+    def __init__(self):
+        super().__init__()
+        self.tap = None
+        self._pairs = []
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        meter_group = QGroupBox("📏 Loudness (EBU R128)")
+        meter_layout = QGridLayout(meter_group)
+        self.value_labels = {}
+        readings = [
+            ('momentary', "Momentary (400 ms)", "LUFS"),
+            ('short_term', "Short-term (3 s)", "LUFS"),
+            ('integrated', "Integrated", "LUFS"),
+            ('true_peak', "True Peak", "dBTP"),
+        ]
+        for col, (key, title, unit) in enumerate(readings):
+            title_label = QLabel(title)
+            title_label.setAlignment(Qt.AlignCenter)
+            title_label.setStyleSheet("QLabel { font-weight: bold; }")
+            meter_layout.addWidget(title_label, 0, col)
+            value_label = QLabel("—")
+            value_label.setAlignment(Qt.AlignCenter)
+            value_label.setStyleSheet("QLabel { font-size: 28px; font-family: monospace; padding: 10px; }")
+            meter_layout.addWidget(value_label, 1, col)
+            unit_label = QLabel(unit)
+            unit_label.setAlignment(Qt.AlignCenter)
+            unit_label.setStyleSheet("QLabel { color: #7f8c8d; font-size: 10px; }")
+            meter_layout.addWidget(unit_label, 2, col)
+            self.value_labels[key] = value_label
+        layout.addWidget(meter_group)
+
+        # Target row
+        target_row = QHBoxLayout()
+        target_row.addWidget(QLabel("Target:"))
+        self.target_spin = QSpinBox()
+        self.target_spin.setRange(-40, -5)
+        self.target_spin.setValue(-23)
+        self.target_spin.setSuffix(" LUFS")
+        self.target_spin.setToolTip("EBU R128 broadcast target is -23 LUFS; many web streams use -16 or -14")
+        target_row.addWidget(self.target_spin)
+        target_row.addWidget(QLabel("Max true peak:"))
+        self.peak_spin = QSpinBox()
+        self.peak_spin.setRange(-10, 0)
+        self.peak_spin.setValue(-1)
+        self.peak_spin.setSuffix(" dBTP")
+        target_row.addWidget(self.peak_spin)
+        target_row.addStretch(1)
+        layout.addLayout(target_row)
+
+        # Source selection and controls
+        src_group = QGroupBox("🎧 Source")
+        src_layout = QHBoxLayout(src_group)
+        self.source_combo = QComboBox()
+        self.source_combo.setMinimumWidth(320)
+        self.source_combo.setToolTip("JACK output pair to measure (defaults to whatever feeds Liquidsoap)")
+        src_layout.addWidget(self.source_combo, 1)
+        self.start_btn = QPushButton("▶️ Start")
+        self.start_btn.setStyleSheet("QPushButton { background-color: #27ae60; color: white; }")
+        self.start_btn.clicked.connect(self.start_meter)
+        src_layout.addWidget(self.start_btn)
+        self.stop_btn = QPushButton("⏹️ Stop")
+        self.stop_btn.setStyleSheet("QPushButton { background-color: #e74c3c; color: white; }")
+        self.stop_btn.clicked.connect(self.stop_meter)
+        self.stop_btn.setEnabled(False)
+        src_layout.addWidget(self.stop_btn)
+        reset_btn = QPushButton("🔄 Reset Integrated")
+        reset_btn.clicked.connect(self.reset_integrated)
+        src_layout.addWidget(reset_btn)
+        layout.addWidget(src_group)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("QLabel { color: #7f8c8d; }")
+        layout.addWidget(self.status_label)
+        layout.addStretch(1)
+
+        if not rdx_loudness.available():
+            self._set_status("NumPy is not installed (apt install python3-numpy); loudness metering disabled.", "#e74c3c")
+            self.start_btn.setEnabled(False)
+        elif not rdx_loudness.jack_available():
+            self._set_status("JACK-Client bindings are not installed (apt install python3-jack-client); loudness metering disabled.", "#e74c3c")
+            self.start_btn.setEnabled(False)
+        else:
+            self._set_status("Stopped. Press Start to attach a metering client to JACK.", "#7f8c8d")
+
+        # UI refresh timer; only runs while the meter is attached
+        self.meter_timer = QTimer()
+        self.meter_timer.timeout.connect(self.update_meter)
+
+    def _set_status(self, text, color):
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(f"QLabel {{ color: {color}; }}")
+
+    def _populate_sources(self):
+        """Fill the source combo with stereo output pairs, preselecting the Liquidsoap feed."""
+        client = self.tap.client
+        current = self.source_combo.currentData()
+        by_client = {}
+        for port in client.get_ports(is_audio=True, is_output=True):
+            if port.name.startswith(client.name + ":"):
+                continue
+            by_client.setdefault(port.name.split(":", 1)[0], []).append(port.name)
+        self._pairs = []
+        for names in by_client.values():
+            for i in range(0, len(names) - 1, 2):
+                self._pairs.append((names[i], names[i + 1]))
+        # What currently feeds the encoder is the outgoing program
+        feed = []
+        try:
+            for port in client.get_ports("liquidsoap", is_audio=True, is_input=True)[:2]:
+                conns = client.get_all_connections(port)
+                feed.append(conns[0].name if conns else None)
+        except Exception:
+            feed = []
+        self.source_combo.clear()
+        select = -1
+        for idx, pair in enumerate(self._pairs):
+            self.source_combo.addItem(f"{pair[0]}  +  {pair[1].split(':', 1)[1]}", pair)
+            if current and tuple(current) == pair:
+                select = idx
+            elif select < 0 and len(feed) == 2 and tuple(feed) == pair:
+                select = idx
+        if select >= 0:
+            self.source_combo.setCurrentIndex(select)
+
+    def start_meter(self):
+        try:
+            if self.tap is None:
+                self.tap = rdx_loudness.JackLoudnessTap()
+                self.tap.start()
+                self._populate_sources()
+                self.source_combo.currentIndexChanged.connect(self._on_source_changed)
+            pair = self.source_combo.currentData()
+            if pair:
+                self.tap.connect_sources(pair)
+            self.meter_timer.start(100)
+            self.start_btn.setEnabled(False)
+            self.stop_btn.setEnabled(True)
+            self._set_status(f"Measuring {pair[0]} / {pair[1]}" if pair else "Attached; no source selected.", "#27ae60")
+        except Exception as e:
+            self.stop_meter()
+            self._set_status(f"Could not attach to JACK: {e}", "#e74c3c")
+
+    def _on_source_changed(self, idx):
+        pair = self.source_combo.itemData(idx)
+        if self.tap is not None and pair:
+            try:
+                self.tap.connect_sources(pair)
+                self.tap.meter.reset()
+                self._set_status(f"Measuring {pair[0]} / {pair[1]}", "#27ae60")
+            except Exception as e:
+                self._set_status(f"Could not connect source: {e}", "#e74c3c")
+
+    def stop_meter(self):
+        self.meter_timer.stop()
+        if self.tap is not None:
+            try:
+                self.source_combo.currentIndexChanged.disconnect(self._on_source_changed)
+            except Exception:
+                pass
+            self.tap.stop()
+            self.tap = None
+            self._set_status("Stopped.", "#7f8c8d")
+        self.start_btn.setEnabled(rdx_loudness.jack_available())
+        self.stop_btn.setEnabled(False)
+
+    def reset_integrated(self):
+        if self.tap is not None:
+            self.tap.meter.reset_integrated()
+        self.update_meter()
+
+    def update_meter(self):
+        if self.tap is None:
+            for label in self.value_labels.values():
+                label.setText("—")
+            return
+        self.tap.drain()
+        snap = self.tap.meter.snapshot()
+        target = self.target_spin.value()
+        for key, label in self.value_labels.items():
+            value = snap.get(key, float('-inf'))
+            if value == float('-inf'):
+                label.setText("—")
+                label.setStyleSheet("QLabel { font-size: 28px; font-family: monospace; padding: 10px; }")
+                continue
+            label.setText(f"{value:5.1f}")
+            if key == 'true_peak':
+                color = "#e74c3c" if value > self.peak_spin.value() else "#27ae60"
+            else:
+                off = value - target
+                color = "#27ae60" if abs(off) <= 1.0 else ("#e74c3c" if off > 1.0 else "#f39c12")
+            label.setStyleSheet(f"QLabel {{ font-size: 28px; font-family: monospace; padding: 10px; color: {color}; }}")
@@ -0,0 +1,542 @@
+"""
+Main window: lazily built tabs, rdx daemon link, tray and start-up timeline.
+"""
+
+import importlib
+import sys
+import os
+import json
+import signal
+import threading
+import time
+from pathlib import Path
+
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QLabel, QWidget,
+                             QTabWidget, QSystemTrayIcon, QMenu)
+from PyQt5.QtCore import Qt, QProcess, QTimer, pyqtSignal, QObject
+from PyQt5.QtNetwork import QLocalSocket
+from PyQt5.QtGui import QIcon
+
+from rdx import config as rdx_config
+from rdx import daemon as rdx_daemon
+from rdx import reconciler as rdx_reconciler
+from rdx import runner as rdx_runner
+from .common import STARTUP, run_async
+
+
+class LazyTab(QWidget):
+    """Tab placeholder that constructs the real widget the first time it is shown"""
+
+    built = pyqtSignal(str, object)
+
+    def __init__(self, name: str, factory, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self._factory = factory
+        self.widget = None
+        self.failed = False
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def ensure(self):
+        if self.widget is None and not self.failed:
+            t0 = time.perf_counter()
+            try:
+                self.widget = self._factory()
+            except Exception as e:
+                # Non-fatal (e.g. graphics unavailable): show why instead of the tab
+                self.failed = True
+                msg = QLabel(f"This tab could not be loaded:\n{e}")
+                msg.setAlignment(Qt.AlignCenter)
+                self.layout().addWidget(msg)
+                return None
+            self.layout().addWidget(self.widget)
+            STARTUP.mark(f"tab '{self.name}' built ({(time.perf_counter() - t0) * 1000.0:.0f} ms)")
+            self.built.emit(self.name, self.widget)
+        return self.widget
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.ensure()
+
+
+class DaemonLink(QObject):
+    """Non-blocking client for the rdx daemon socket (JSON-RPC lines over QLocalSocket).
+
+    The window becomes a thin viewer while connected: status and topology arrive as
+    pushed events, and the daemon owns the watchers. When the daemon is unreachable
+    the tabs keep their local timers, so the GUI still works standalone.
+    """
+
+    connection_changed = pyqtSignal(bool)
+    event_received = pyqtSignal(str, object)
+
+    RECONNECT_MS = 5000
+
+    def __init__(self, parent=None, topics=("status", "topology", "routing", "xrun")):
+        super().__init__(parent)
+        self._topics = list(topics)
+        self._buf = b""
+        self._next_id = 1
+        self._callbacks = {}
+        self._connected = False
+        self._spawn_attempted = False
+        self.socket = QLocalSocket(self)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.disconnected.connect(self._on_disconnected)
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.error.connect(self._on_error)
+        self._retry = QTimer(self)
+        self._retry.setSingleShot(True)
+        self._retry.timeout.connect(self.connect_to_daemon)
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def connect_to_daemon(self):
+        if self.socket.state() != QLocalSocket.UnconnectedState:
+            return
+        self._buf = b""
+        self.socket.connectToServer(str(rdx_config.socket_path()))
+
+    def call(self, method: str, params: dict = None, callback=None):
+        """Send a request; ``callback(result, error)`` runs when the response arrives."""
+        if not self._connected:
+            if callback:
+                callback(None, {"code": -1, "message": "rdx daemon not connected"})
+            return
+        req_id = self._next_id
+        self._next_id += 1
+        if callback:
+            self._callbacks[req_id] = callback
+        msg = {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params or {}}
+        self.socket.write((json.dumps(msg) + "\n").encode("utf-8"))
+
+    def _on_connected(self):
+        self._connected = True
+        self.call("events.subscribe", {"topics": self._topics})
+        self.connection_changed.emit(True)
+
+    def _on_disconnected(self):
+        was = self._connected
+        self._connected = False
+        self._callbacks.clear()
+        if was:
+            self.connection_changed.emit(False)
+        self._retry.start(self.RECONNECT_MS)
+
+    def _on_error(self, _err):
+        if not self._connected:
+            # First failure: make sure the per-user daemon unit exists and ask systemd to start it
+            if not self._spawn_attempted:
+                self._spawn_attempted = True
+                self._start_daemon_unit()
+                self._retry.start(1000)
+            else:
+                self._retry.start(self.RECONNECT_MS)
+
+    def _start_daemon_unit(self):
+        try:
+            script = "/usr/local/bin/rdx-daemon"
+            if not os.path.exists(script):
+                # Source checkout: src/rdx/gui/main_window.py -> src/rdx-daemon.py
+                src_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+                script = os.path.join(src_dir, "rdx-daemon.py")
+            if not os.path.exists(script):
+                return
+            if rdx_daemon.ensure_user_unit(script):
+                rdx_runner.run(["systemctl", "--user", "daemon-reload"], capture_output=True, timeout=3)
+            QProcess.startDetached("systemctl", ["--user", "start", "--no-block", rdx_daemon.UNIT_NAME])
+        except Exception:
+            pass
+
+    def _on_ready_read(self):
+        self._buf += bytes(self.socket.readAll())
+        while b"\n" in self._buf:
+            line, self._buf = self._buf.split(b"\n", 1)
+            if not line.strip():
+                continue
+            try:
+                msg = json.loads(line.decode("utf-8"))
+            except Exception:
+                continue
+            if msg.get("method") == "event":
+                params = msg.get("params") or {}
+                self.event_received.emit(params.get("topic", ""), params.get("data"))
+                continue
+            cb = self._callbacks.pop(msg.get("id"), None)
+            if cb:
+                try:
+                    cb(msg.get("result"), msg.get("error"))
+                except Exception:
+                    pass
+
+
+class RoutingWatcher(QObject):
+    """Runs rdx.reconciler in the GUI while the daemon is offline.
+
+    With python-jack-client a notification-only JACK client (the daemon's
+    JackSession) turns port and connection changes into reconcile passes,
+    debounced so a burst of registrations costs one pass; without it the
+    watcher falls back to checking every POLL_MS.
+    """
+
+    reconciled = pyqtSignal(object)
+    _jack_event = pyqtSignal()
+    _jack_gone = pyqtSignal()
+
+    POLL_MS = 1500
+    DEBOUNCE_MS = 100
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+        self._settings = settings
+        self._pending = False
+        self._dirty = False
+        self._enabled = False
+        self.session = rdx_daemon.JackSession(lambda _what: self._jack_event.emit(),
+                                              lambda _reason: self._jack_gone.emit())
+        self._poll = QTimer(self)
+        self._poll.setInterval(self.POLL_MS)
+        self._poll.timeout.connect(self._on_poll)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.reconcile)
+        self._jack_event.connect(self._debounce.start)
+        self._jack_gone.connect(self._on_jack_gone)
+
+    def start(self):
+        self._enabled = True
+        self._on_poll()
+        if not self.session.active:
+            self._poll.start()
+
+    def stop(self):
+        self._enabled = False
+        self._poll.stop()
+        self._debounce.stop()
+        self.session.close()
+
+    def _on_poll(self):
+        if not self._enabled:
+            return
+        if not self.session.active and self.session.open():
+            # Event-driven from here on; one pass for whatever changed before the client existed
+            self._poll.stop()
+        self.reconcile()
+
+    def _on_jack_gone(self):
+        # Close from a helper thread (closing inside the shutdown callback deadlocks libjack)
+        threading.Thread(target=self.session.close, daemon=True).start()
+        if self._enabled:
+            self._poll.start()
+
+    def reconcile(self):
+        if not self._enabled or not rdx_reconciler.active(self._settings()):
+            return
+        if self._pending:
+            self._dirty = True
+            return
+        self._pending = True
+        settings = self._settings()
+        run_async(lambda: rdx_reconciler.reconcile(settings=settings, client=self.session.client),
+                  self._on_done, self)
+
+    def _on_done(self, res):
+        self._pending = False
+        if res and any(r['status'] == "done" for r in res['results']):
+            self.reconciled.emit(res)
+        if self._dirty:
+            self._dirty = False
+            self.reconcile()
+
+
+class RDXBroadcastControlCenter(QMainWindow):
+    """Main application window with tabbed interface"""
+    
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("RDX Professional Broadcast Control Center v4.0.1")
+        self.setMinimumSize(1000, 700)
+        # Tray/minimize settings
+        self.tray_minimize_on_close = False
+        self._settings = {}
+        self._load_settings()
+        self._lazy_tabs = {}
+        self._daemon_connected = False
+        self._last_states = None
+        self.setup_ui()
+        STARTUP.mark("main window built")
+        self._setup_tray()
+        self._setup_routing_watcher()
+        self._setup_daemon_link()
+        STARTUP.mark("daemon link started")
+
+    def __getattr__(self, name):
+        # Tabs are attributes (self.service_control, ...) even before they are built:
+        # the first access constructs them.
+        lazy = self.__dict__.get("_lazy_tabs") or {}
+        if name in lazy:
+            return lazy[name].ensure()
+        raise AttributeError(name)
+
+    def built_tab(self, name: str):
+        """The tab widget if it has been constructed already, else None (never builds it)"""
+        return self.__dict__.get(name)
+
+    def _add_lazy_tab(self, name: str, label: str, module: str, cls: str, with_main: bool = False):
+        def factory():
+            tab_class = getattr(importlib.import_module(f"rdx.gui.{module}"), cls)
+            return tab_class(self) if with_main else tab_class()
+        placeholder = LazyTab(name, factory)
+        placeholder.built.connect(self._on_tab_built)
+        self._lazy_tabs[name] = placeholder
+        self.tab_widget.addTab(placeholder, label)
+
+    def _on_tab_built(self, name: str, widget):
+        setattr(self, name, widget)
+        # Bring a late tab up to date with what the rest of the window already knows
+        if hasattr(widget, "set_daemon_mode"):
+            widget.set_daemon_mode(self._daemon_connected)
+        if self._last_states is not None:
+            if name == "service_control":
+                widget.apply_status(self._last_states)
+            elif name == "icecast_management":
+                widget.apply_icecast_state(self._last_states.get('icecast', 'unknown'))
+        
+    def setup_ui(self):
+        """Setup the main user interface"""
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        
+        layout = QVBoxLayout(central_widget)
+        
+        # Header
+        header = QLabel("RDX Professional Broadcast Control Center")
+        header.setAlignment(Qt.AlignCenter)
+        header.setStyleSheet(
+            "QLabel { "
+            "font-size: 20px; "
+            "font-weight: bold; "
+            "padding: 15px; "
+            "background-color: #2c3e50; "
+            "color: white; "
+            "border-radius: 8px; "
+            "margin-bottom: 10px; "
+            "}"
+        )
+        layout.addWidget(header)
+        
+        # Tab widget
+        self.tab_widget = QTabWidget()
+        
+        # Add tabs. Each module is imported and the tab constructed the first time it
+        # is shown (or accessed as an attribute), so start-up only pays for the tab on screen.
+        self._add_lazy_tab("stream_builder", "🎵 Stream Builder", "stream_builder", "StreamBuilderTab",
+                           with_main=True)
+        self._add_lazy_tab("icecast_management", "📡 Icecast Management", "icecast", "IcecastManagementTab")
+
+        # Add remaining tabs
+        # Hide the legacy Patchboard tab (kept in code for future use)
+        # self.jack_matrix = JackMatrixTab(self)
+        # self.tab_widget.addTab(self.jack_matrix, "🔌 JACK Patchboard")
+
+        # Visual Graph (preview)
+        self._add_lazy_tab("jack_graph", "🕸️ JACK Graph", "jack_graph", "JackGraphTab", with_main=True)
+
+        # Stereo Tool Manager
+        self._add_lazy_tab("stereo_tool_manager", "🎚️ Stereo Tool Manager", "stereotool", "StereoToolManagerTab")
+
+        self._add_lazy_tab("service_control", "⚙️ Service Control", "service_control", "ServiceControlTab",
+                           with_main=True)
+
+        # Loudness meter (EBU R128) on the outgoing program feed
+        self._add_lazy_tab("loudness_meter", "📏 Loudness", "loudness", "LoudnessMeterTab")
+
+        # Command latency/timeout statistics (rdx.runner) for this window and the daemon
+        self._add_lazy_tab("diagnostics", "🩺 Diagnostics", "diagnostics", "DiagnosticsTab", with_main=True)
+
+        # Settings tab
+        self._add_lazy_tab("settings_tab", "🛠️ Settings", "settings", "SettingsTab", with_main=True)
+        
+        layout.addWidget(self.tab_widget)
+        
+        # Status bar
+        self.statusBar().showMessage("Ready - Professional Broadcast Control Center v4.0.1")
+
+        # ---- rdx daemon ----
+    def _setup_daemon_link(self):
+        self.daemon_link = DaemonLink(self)
+        self.daemon_link.connection_changed.connect(self._on_daemon_connection)
+        self.daemon_link.event_received.connect(self._on_daemon_event)
+        self.daemon_link.connect_to_daemon()
+
+    def _on_daemon_connection(self, connected: bool):
+        self._daemon_connected = connected
+        self.set_routing_watcher_enabled(not connected)
+        for name in ("service_control", "icecast_management"):
+            tab = self.built_tab(name)
+            if tab is not None:
+                tab.set_daemon_mode(connected)
+        if connected:
+            self.statusBar().showMessage("Connected to rdx daemon", 5000)
+        else:
+            self.statusBar().showMessage("rdx daemon unavailable - polling locally", 5000)
+
+    def _on_daemon_event(self, topic: str, data):
+        try:
+            if topic == "status":
+                states = {k: v.get('state', 'unknown') for k, v in (data or {}).get('services', {}).items()}
+                self._last_states = states
+                if self.built_tab("service_control") is not None:
+                    self.service_control.apply_status(states, (data or {}).get('services'))
+                if self.built_tab("icecast_management") is not None:
+                    self.icecast_management.apply_icecast_state(states.get('icecast', 'unknown'))
+            elif topic in ("topology", "routing"):
+                if self.built_tab("jack_graph") is not None:
+                    self.jack_graph.on_topology_changed()
+            elif topic == "xrun":
+                if self.built_tab("service_control") is not None:
+                    self.service_control.on_xrun_event(data)
+        except Exception:
+            pass
+
+        # ---- Routing reconciler (local fallback while the daemon is offline) ----
+    def _setup_routing_watcher(self):
+        self.routing_watcher = RoutingWatcher(lambda: dict(self._settings), self)
+        self.routing_watcher.reconciled.connect(self._on_reconciled)
+        self.routing_watcher.start()
+
+    def set_routing_watcher_enabled(self, enabled: bool):
+        if enabled:
+            self.routing_watcher.start()
+        else:
+            self.routing_watcher.stop()
+
+    def _on_reconciled(self, _res):
+        if self.built_tab("jack_graph") is not None:
+            self.jack_graph.on_topology_changed()
+
+        # ---- Deferred start-up work ----
+    def start_deferred(self):
+        """Runs once the event loop is up and the window has painted"""
+        STARTUP.mark("event loop running (first paint)")
+        # Optionally prompt to install missing core dependencies on fresh systems
+        QTimer.singleShot(400, self._check_core_deps)
+        QTimer.singleShot(0, self._report_startup)
+
+    def _check_core_deps(self):
+        try:
+            from .service_control import ServiceControlTab
+            if ServiceControlTab._missing_core_deps():
+                self.service_control.maybe_prompt_install_core_deps()
+        except Exception:
+            pass
+
+    def _report_startup(self):
+        STARTUP.mark("startup complete")
+        STARTUP.write(self._config_dir() / "startup-timeline.log")
+        if os.environ.get("RDX_STARTUP_TIMELINE"):
+            print(STARTUP.report(), file=sys.stderr)
+        self.statusBar().showMessage(
+            f"Ready in {STARTUP.elapsed_ms('event loop running (first paint)') / 1000.0:.2f} s - "
+            "Professional Broadcast Control Center v4.0.1", 8000)
+
+        # ---- System tray ----
+    def _setup_tray(self):
+        try:
+            self.tray = QSystemTrayIcon(self)
+            # Try themed icon, fallback to default if theme not found
+            icon = QIcon.fromTheme("audio-card")
+            if icon.isNull():
+                icon = self.windowIcon() or QIcon()
+            self.tray.setIcon(icon)
+            menu = QMenu()
+            act_show = menu.addAction("Show/Hide")
+            act_quit = menu.addAction("Quit")
+            act_show.triggered.connect(self.toggle_visibility)
+            act_quit.triggered.connect(self.quit_app)
+            self.tray.setContextMenu(menu)
+            self.tray.activated.connect(lambda reason: self.toggle_visibility() if reason == QSystemTrayIcon.Trigger else None)
+            self.tray.show()
+        except Exception:
+            # Tray optional; ignore errors
+            self.tray = None
+
+    def toggle_visibility(self):
+        if self.isVisible():
+            self.hide()
+        else:
+            self.showNormal()
+            self.raise_()
+            self.activateWindow()
+
+    def hide_to_tray(self):
+        if self.tray:
+            self.hide()
+            self.tray.showMessage("RDX Control Center", "Running in system tray.", QSystemTrayIcon.Information, 2000)
+
+    def quit_app(self):
+        QApplication.instance().quit()
+
+    def closeEvent(self, event):
+        if getattr(self, 'tray_minimize_on_close', False) and self.tray:
+            event.ignore()
+            self.hide_to_tray()
+        else:
+            super().closeEvent(event)
+
+        # ---- Settings persistence ----
+    def _config_dir(self) -> Path:
+        p = Path.home() / ".config" / "rdx"
+        try:
+            p.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+        return p
+
+    def _settings_file(self) -> Path:
+        return self._config_dir() / "settings.json"
+
+    def _load_settings(self):
+        try:
+            p = self._settings_file()
+            if p.exists():
+                with open(p, 'r') as f:
+                    self._settings = json.load(f)
+                self.tray_minimize_on_close = bool(self._settings.get('tray_minimize_on_close', False))
+        except Exception:
+            self._settings = {}
+
+    def save_settings(self):
+        try:
+            self._settings['tray_minimize_on_close'] = bool(self.tray_minimize_on_close)
+            with open(self._settings_file(), 'w') as f:
+                json.dump(self._settings, f, indent=2)
+        except Exception:
+            pass
+
+
+def main(startup_marks=None):
+    # Marks taken by the launcher before this package was imported
+    STARTUP.marks[:0] = list(startup_marks or [])
+    STARTUP.mark("GUI imported")
+    app = QApplication(sys.argv)
+    STARTUP.mark("QApplication created")
+    
+    # Set application properties
+    app.setApplicationName("RDX Broadcast Control Center")
+    app.setApplicationVersion("4.0.0")
+    
+    # Create and show main window
+    window = RDXBroadcastControlCenter()
+    window.show()
+    STARTUP.mark("window shown")
+    # Probes and prompts wait until the window has painted
+    QTimer.singleShot(0, window.start_deferred)
+    
+    # Handle Ctrl+C gracefully
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    
+    sys.exit(app.exec_())
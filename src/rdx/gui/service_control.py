@@ -0,0 +1,1854 @@
+"""
+Service Control tab: JACK, Stereo Tool, Liquidsoap and Icecast lifecycle.
+"""
+
+import os
+import json
+import subprocess
+import time
+import re
+import shutil
+import shlex
+from pathlib import Path
+
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QWidget,
+                             QMessageBox, QGridLayout, QGroupBox, QTextEdit, QCheckBox,
+                             QDialog, QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt5.QtCore import QProcess, QTimer
+
+from rdx import jackserver as rdx_jackserver
+from rdx import latency as rdx_latency
+from rdx import runner as rdx_runner
+from rdx import services as rdx_services
+from rdx import startup as rdx_startup
+from rdx import supervisor as rdx_supervisor
+from rdx import wait as rdx_wait
+from rdx import streaming as rdx_streaming
+from .common import run_async
+
+
+class ServiceControlTab(QWidget):
+    """Tab 4: Service Control - Start/stop/configure all broadcast services"""
+    
+    XRUN_REFRESH_MS = 5000
+
+    def __init__(self, main_window=None):
+        super().__init__()
+        self.main_window = main_window
+        # Persisted JACK settings used to start/stop server
+        self.jack_settings = self._load_jack_settings()
+        self.services = {
+            'jack': {'name': 'JACK Audio', 'systemd': 'jack', 'status': 'unknown', 'user_service': False},
+            # Use a per-user unit that points to the currently active Stereo Tool instance
+            'stereo_tool': {'name': 'Stereo Tool', 'systemd': 'rdx-stereotool-active', 'status': 'unknown', 'user_service': True},
+            'liquidsoap': {'name': 'Liquidsoap', 'systemd': 'liquidsoap', 'status': 'unknown', 'user_service': True},
+            'icecast': {'name': 'Icecast', 'systemd': 'icecast2', 'status': 'unknown', 'user_service': False}
+        }
+        self.setup_ui()
+        
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        
+        # Individual Service Controls
+        services_group = QGroupBox("🛠️ Individual Service Controls")
+        services_layout = QGridLayout(services_group)
+        
+        # Header row
+        services_layout.addWidget(QLabel("Service"), 0, 0)
+        services_layout.addWidget(QLabel("Status"), 0, 1)
+        services_layout.addWidget(QLabel("Actions"), 0, 2, 1, 4)
+        
+        # Service rows
+        row = 1
+        for service_key, service_info in self.services.items():
+            # Service name
+            name_label = QLabel(service_info['name'])
+            name_label.setStyleSheet("QLabel { font-weight: bold; }")
+            services_layout.addWidget(name_label, row, 0)
+            
+            # Status label
+            status_label = QLabel("⏳ Checking...")
+            setattr(self, f"{service_key}_status_label", status_label)
+            services_layout.addWidget(status_label, row, 1)
+            
+            # Control buttons
+            start_btn = QPushButton("▶️ Start")
+            start_btn.setStyleSheet("QPushButton { background-color: #27ae60; color: white; }")
+            start_btn.clicked.connect(lambda checked, s=service_key: self.start_service(s))
+            services_layout.addWidget(start_btn, row, 2)
+            
+            stop_btn = QPushButton("⏹️ Stop")
+            stop_btn.setStyleSheet("QPushButton { background-color: #e74c3c; color: white; }")
+            stop_btn.clicked.connect(lambda checked, s=service_key: self.stop_service(s))
+            services_layout.addWidget(stop_btn, row, 3)
+            
+            restart_btn = QPushButton("🔄 Restart")
+            restart_btn.setStyleSheet("QPushButton { background-color: #f39c12; color: white; }")
+            restart_btn.clicked.connect(lambda checked, s=service_key: self.restart_service(s))
+            services_layout.addWidget(restart_btn, row, 4)
+            
+            config_btn = QPushButton("⚙️ Configure")
+            config_btn.setStyleSheet("QPushButton { background-color: #3498db; color: white; }")
+            config_btn.clicked.connect(lambda checked, s=service_key: self.configure_service(s))
+            services_layout.addWidget(config_btn, row, 5)
+
+            # Keep references for JACK to enable/disable based on management mode
+            if service_key == 'jack':
+                self.jack_status_label = status_label
+                self.jack_start_btn = start_btn
+                self.jack_stop_btn = stop_btn
+                self.jack_restart_btn = restart_btn
+
+            # Stereo Tool extras: Logs button and active status label
+            if service_key == 'stereo_tool':
+                logs_btn = QPushButton("📄 Logs")
+                logs_btn.setStyleSheet("QPushButton { background-color: #8e44ad; color: white; }")
+                logs_btn.clicked.connect(self.open_stereotool_logs)
+                services_layout.addWidget(logs_btn, row, 6)
+
+                self.stereotool_active_label = QLabel("Active: —")
+                self.stereotool_active_label.setStyleSheet("QLabel { color: #7f8c8d; font-size: 10px; }")
+                services_layout.addWidget(self.stereotool_active_label, row, 7)
+
+            # Optional, compact capability line for Liquidsoap encoders
+            if service_key == 'liquidsoap':
+                self.liquidsoap_encoders_label = QLabel("")
+                self.liquidsoap_encoders_label.setStyleSheet(
+                    "QLabel { color: #7f8c8d; font-size: 10px; }"
+                )
+                self.liquidsoap_encoders_label.setVisible(False)
+                services_layout.addWidget(self.liquidsoap_encoders_label, row, 6)
+            
+            row += 1
+            
+        layout.addWidget(services_group)
+        
+        # Master Controls
+        master_group = QGroupBox("🎛️ Master Control")
+        master_layout = QGridLayout(master_group)
+        
+        self.start_all_btn = QPushButton("🚀 START ALL SERVICES")
+        self.start_all_btn.setStyleSheet("QPushButton { background-color: #27ae60; color: white; font-weight: bold; padding: 15px; font-size: 14px; }")
+        self.start_all_btn.clicked.connect(lambda: self.start_all_services())
+        master_layout.addWidget(self.start_all_btn, 0, 0)
+        
+        stop_all_btn = QPushButton("⏹️ STOP ALL SERVICES")
+        stop_all_btn.setStyleSheet("QPushButton { background-color: #e74c3c; color: white; font-weight: bold; padding: 15px; font-size: 14px; }")
+        stop_all_btn.clicked.connect(self.stop_all_services)
+        master_layout.addWidget(stop_all_btn, 0, 1)
+        
+        emergency_btn = QPushButton("🚨 EMERGENCY STOP")
+        emergency_btn.setStyleSheet("QPushButton { background-color: #8e44ad; color: white; font-weight: bold; padding: 15px; font-size: 14px; }")
+        emergency_btn.clicked.connect(self.emergency_stop)
+        master_layout.addWidget(emergency_btn, 1, 0, 1, 2)
+        
+        layout.addWidget(master_group)
+
+        # xruns and DSP load, from the rdx daemon's JACK client
+        xrun_group = QGroupBox("📉 JACK xruns && DSP Load")
+        xrun_layout = QVBoxLayout(xrun_group)
+        xrun_row = QHBoxLayout()
+        self.xrun_summary_label = QLabel("Needs the rdx daemon")
+        self.xrun_summary_label.setStyleSheet("QLabel { font-weight: bold; }")
+        xrun_row.addWidget(self.xrun_summary_label, 1)
+        xrun_reset_btn = QPushButton("🧹 Reset")
+        xrun_reset_btn.setToolTip("Clear the xrun history, load samples and events kept by the daemon")
+        xrun_reset_btn.clicked.connect(lambda: self.refresh_xruns(reset=True))
+        xrun_row.addWidget(xrun_reset_btn)
+        xrun_layout.addLayout(xrun_row)
+        self.xrun_table = QTableWidget(0, 4)
+        self.xrun_table.setHorizontalHeaderLabels(["Time", "Delay", "DSP Load", "Around it"])
+        self.xrun_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.xrun_table.verticalHeader().setVisible(False)
+        self.xrun_table.setMaximumHeight(140)
+        header = self.xrun_table.horizontalHeader()
+        for col in range(3):
+            header.setSectionResizeMode(col, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.Stretch)
+        self.xrun_table.setToolTip("Recent xruns, newest first, with the service and routing changes "
+                                   "from 10 s before to 3 s after each one")
+        xrun_layout.addWidget(self.xrun_table)
+        layout.addWidget(xrun_group)
+
+        # Optional tools row
+        tools_row = QHBoxLayout()
+        deps_btn = QPushButton("Install Dependencies…")
+        deps_btn.setToolTip("Install core services (JACK, Icecast, VLC) and audio permissions")
+        deps_btn.clicked.connect(self.install_core_deps_via_dialog)
+        tools_row.addWidget(deps_btn)
+        tools_row.addStretch(1)
+        layout.addLayout(tools_row)
+
+        # Removed the static "Service Dependencies" info block to give the log/status area more room
+        
+        # Liquidsoap Log Viewer
+        log_group = QGroupBox("📄 Liquidsoap Log (latest 500 lines)")
+        log_layout = QVBoxLayout(log_group)
+        
+        # Controls row for log
+        log_controls = QHBoxLayout()
+        self.follow_log_checkbox = QCheckBox("Follow")
+        self.follow_log_checkbox.setChecked(True)
+        refresh_btn = QPushButton("Refresh Now")
+        refresh_btn.clicked.connect(self.update_log_view)
+        log_controls.addWidget(self.follow_log_checkbox)
+        log_controls.addStretch(1)
+        log_controls.addWidget(refresh_btn)
+        
+        # Log text area
+        self.log_text = QTextEdit()
+        self.log_text.setReadOnly(True)
+        self.log_text.setStyleSheet("QTextEdit { font-family: monospace; background: #0e0e0e; color: #e0e0e0; }")
+        self.log_text.setPlaceholderText("Liquidsoap log will appear here after starting the service...")
+        
+        log_layout.addLayout(log_controls)
+        log_layout.addWidget(self.log_text)
+        layout.addWidget(log_group)
+        
+        # Status update timer
+        self.status_timer = QTimer()
+        self.status_timer.timeout.connect(self.update_all_status)
+        self.status_timer.start(3000)  # Check every 3 seconds
+        
+        # xrun panel: pulled from the daemon while the tab is visible; "xrun" events refresh it at once
+        self.xrun_timer = QTimer(self)
+        self.xrun_timer.setInterval(self.XRUN_REFRESH_MS)
+        self.xrun_timer.timeout.connect(self.refresh_xruns)
+
+        # Log update timer
+        self.log_timer = QTimer()
+        self.log_timer.timeout.connect(self.update_log_view)
+        self.log_timer.start(2000)
+        
+        # Initial probes run after the first paint, off the GUI thread
+        self._status_probe_pending = False
+        self._encoder_probe_pending = False
+        self._last_liq_probe_ts = 0.0
+        QTimer.singleShot(0, self.update_all_status)
+        QTimer.singleShot(0, self.update_log_view)
+        # One-time probe for Liquidsoap encoder capabilities (six `liquidsoap -h` runs)
+        QTimer.singleShot(0, lambda: self.update_liquidsoap_encoders_label(force=True))
+
+        # Apply initial JACK management state to controls
+        self._apply_jack_manage_mode_to_controls()
+
+
+        # ---- Core dependency checks and installer prompt --------------------
+    @staticmethod
+    def _missing_core_deps() -> list:
+        """Return a list of missing core tools that impact first-run UX.
+        We check presence of binaries as a proxy for packages.
+        """
+        missing = []
+        want = {
+            'jackd': ['jackd', 'jack_control'],
+            'icecast2': ['icecast2'],
+            'vlc': ['vlc'],
+        }
+        for label, candidates in want.items():
+            ok = False
+            for c in candidates:
+                if shutil.which(c):
+                    ok = True
+                    break
+            if not ok:
+                missing.append(label)
+        return missing
+
+    def maybe_prompt_install_core_deps(self):
+        try:
+            missing = self._missing_core_deps()
+        except Exception:
+            missing = []
+        if not missing:
+            return
+        # Avoid nagging repeatedly: remember we prompted recently
+        try:
+            flag = Path.home() / '.config' / 'rdx' / 'core_deps_prompted'
+            flag.parent.mkdir(parents=True, exist_ok=True)
+            if flag.exists() and (time.time() - flag.stat().st_mtime) < 3600:
+                return
+        except Exception:
+            pass
+
+        msg = (
+            "Some core broadcast tools are missing: " + ", ".join(missing) + "\n\n"
+            "Install now? This will:\n"
+            "  • Install jackd2, icecast2, vlc, vlc-plugin-jack, qjackctl\n"
+            "  • Ensure your user is in the 'audio' group (for realtime)\n"
+            "  • Add sane realtime limits for @audio\n\n"
+            "You may be asked for your admin password."
+        )
+        ret = QMessageBox.question(self, "Install Core Dependencies?", msg,
+                                   QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+        try:
+            # Touch prompt flag regardless to reduce nagging if user says No
+            (Path.home() / '.config' / 'rdx' / 'core_deps_prompted').touch()
+        except Exception:
+            pass
+        if ret != QMessageBox.Yes:
+            return
+
+        # Run installer with a modal log window
+        try:
+            self._run_deps_installer_dialog()
+        except Exception as e:
+            QMessageBox.critical(self, "Install Error", f"Could not run installer: {e}")
+
+    def install_core_deps_via_dialog(self):
+        """Manual entry point from the tools row to run the dependency installer."""
+        try:
+            self._run_deps_installer_dialog()
+        except Exception as e:
+            QMessageBox.critical(self, "Install Error", f"Could not run installer: {e}")
+
+    def _run_deps_installer_dialog(self):
+        dlg = QDialog(self)
+        dlg.setWindowTitle("Installing Core Dependencies…")
+        v = QVBoxLayout(dlg)
+        log_view = QTextEdit(); log_view.setReadOnly(True); log_view.setMinimumSize(600, 320)
+        v.addWidget(log_view)
+        proc = QProcess(dlg)
+        proc.setProgram("pkexec")
+        proc.setArguments(["/bin/bash", "/usr/share/rdx/install-deps.sh"]) 
+        proc.setProcessChannelMode(QProcess.MergedChannels)
+        proc.readyRead.connect(lambda: log_view.append(proc.readAll().data().decode(errors="replace").rstrip()))
+        fin = {"code": None}
+        proc.finished.connect(lambda code, status: (fin.update({"code": int(code)}), dlg.accept()))
+        proc.start()
+        dlg.exec_()
+        code = fin["code"] if fin["code"] is not None else 1
+        if code == 0:
+            QMessageBox.information(self, "Dependencies Installed",
+                                    "Core dependencies were installed. You may need to log out and back in for audio group changes to take effect.")
+            # Re-check statuses after a short delay
+            QTimer.singleShot(1000, self.update_all_status)
+        else:
+            tail = "\n".join(log_view.toPlainText().splitlines()[-80:])
+            QMessageBox.warning(self, "Install Incomplete",
+                                 f"The dependency installer exited with code {code}.\n\nLast output:\n{tail}")
+
+        # ---- JACK settings persistence and helpers ---------------------------
+    def _jack_settings_path(self) -> Path:
+        return rdx_jackserver.settings_path()
+
+    def _load_jack_settings(self) -> dict:
+        return rdx_jackserver.load_settings()
+
+    def _save_jack_settings(self, data: dict):
+        if rdx_jackserver.save_settings(data):
+            self.jack_settings = data
+
+    def _jack_is_running(self) -> bool:
+        return rdx_jackserver.is_running()
+
+    def _build_jackd_command(self) -> list:
+        return rdx_jackserver.build_jackd_command(self.jack_settings)
+
+    def _jackdbus_preview_commands(self) -> list:
+        """Return a list of strings representing jack_control commands to apply settings (one batched run)."""
+        return [" ".join(shlex.quote(a) for a in rdx_jackserver.jackdbus_batch(self.jack_settings))]
+
+    def _start_jack_server(self) -> tuple:
+        """Start JACK according to selected mode. Returns (ok: bool, message: str)."""
+        return rdx_jackserver.start(self.jack_settings)
+
+    def _stop_jack_server(self):
+        """Best-effort stop regardless of mode."""
+        rdx_jackserver.stop()
+
+    def _alsa_devices(self) -> list:
+        """Return a list of ALSA device identifiers like 'hw:0', 'hw:PCH'."""
+        devs = []
+        try:
+            r = rdx_runner.run(["bash", "-lc", "aplay -l"], capture_output=True, text=True, timeout=1.5)
+            out = (r.stdout or "") + (r.stderr or "")
+            # Parse lines like: card 0: PCH [HDA Intel PCH], device 0: ALC... [..]
+            cards = {}
+            for line in out.splitlines():
+                line = line.strip()
+                m = re.match(r"card\s+(\d+):\s+([^\s\[]+)", line)
+                if m:
+                    cid = m.group(1)
+                    cname = m.group(2)
+                    cards[cid] = cname
+            for cid, cname in cards.items():
+                devs.append(f"hw:{cid}")
+                if cname and cname != cid:
+                    devs.append(f"hw:{cname}")
+        except Exception:
+            pass
+        # Always include defaults
+        base = ["default", "hw:0", "hw:1"]
+        seen = set()
+        out = []
+        for dname in base + devs:
+            if dname and dname not in seen:
+                seen.add(dname)
+                out.append(dname)
+        return out
+
+    def _probe_running_jack_config(self) -> dict:
+        return rdx_jackserver.probe_running_config()
+
+    def _tail_file(self, path: Path, n: int = 60) -> str:
+        return rdx_jackserver.tail_file(path, n)
+
+    def _apply_jack_manage_mode_to_controls(self):
+        manage = self.jack_settings.get("manage", False)
+        # If not managing, disable start/stop/restart for JACK
+        for btn in (getattr(self, 'jack_start_btn', None), getattr(self, 'jack_stop_btn', None), getattr(self, 'jack_restart_btn', None)):
+            if btn is not None:
+                btn.setEnabled(bool(manage))
+        # Ensure user systemd unit exists/updated and enabled state reflects settings
+        try:
+            self._ensure_jack_unit()
+            autostart = bool(self.jack_settings.get("autostart", False)) and manage
+            if autostart:
+                rdx_runner.run(["systemctl", "--user", "enable", "rdx-jack"], check=False)
+            else:
+                rdx_runner.run(["systemctl", "--user", "disable", "rdx-jack"], check=False)
+        except Exception:
+            pass
+
+    def _jack_unit_path(self) -> Path:
+        return Path.home() / ".config" / "systemd" / "user" / "rdx-jack.service"
+
+    def _ensure_jack_unit(self):
+        """Create/update per-user systemd unit for JACK based on current settings.
+        This enables autostart at login if the unit is enabled. For headless pre-login,
+        consider enabling lingering for the user (loginctl enable-linger $USER) and prefer jackd mode.
+        """
+        try:
+            unit_dir = self._jack_unit_path().parent
+            unit_dir.mkdir(parents=True, exist_ok=True)
+            s = self.jack_settings
+            mode = s.get("mode", "jackd").lower()
+            if mode == "jackdbus":
+                # Stop, then configure and start in one jack_control run
+                seq = ["jack_control stop", " ".join(shlex.quote(a) for a in rdx_jackserver.jackdbus_batch(s))]
+                execstart = f"/bin/bash -lc '{' && '.join(seq)}'"
+            else:
+                # jackd command as built for interactive start
+                cmd = self._build_jackd_command()
+                # Quote safely for ExecStart
+                execstart = " ".join(shlex.quote(x) for x in cmd)
+            unit = f"""[Unit]
+Description=RDX JACK Server
+After=default.target
+Wants=default.target
+{rdx_supervisor.UNIT_POLICY}
+[Service]
+Type=simple
+ExecStart={execstart}
+{rdx_supervisor.RESTART_POLICY}
+[Install]
+WantedBy=default.target
+"""
+            self._jack_unit_path().write_text(unit, encoding="utf-8")
+            rdx_runner.run(["systemctl", "--user", "daemon-reload"], check=False)
+        except Exception:
+            # Non-fatal: interactive controls still work
+            pass
+
+    def _st_path_root(self) -> Path:
+        return Path.home() / ".config" / "rdx" / "processing" / "stereotool"
+
+    def _active_symlink(self) -> Path:
+        return self._st_path_root() / "active"
+
+    def _active_stereotool_display(self) -> str:
+        try:
+            link = self._active_symlink()
+            if link.is_symlink():
+                target = os.path.realpath(str(link))
+                return os.path.basename(target)
+        except Exception:
+            pass
+        return "—"
+
+        # ---- Liquidsoap path/env helpers ------------------------------------
+    def _liquidsoap_bin(self) -> str:
+        """Prefer the per-user OPAM shim at ~/.local/bin/liquidsoap if present."""
+        return rdx_streaming.liquidsoap_bin()
+
+    def _subprocess_env_with_localbin(self) -> dict:
+        """Return env with ~/.local/bin prepended to PATH so OPAM shim is found."""
+        return rdx_streaming.env_with_localbin()
+
+    def update_liquidsoap_encoders_label(self, force: bool = False):
+        """Update the compact Liquidsoap encoders label with detected capabilities.
+        Keeps UI uncluttered by hiding if nothing is found or liquidsoap missing.
+        """
+        label = getattr(self, 'liquidsoap_encoders_label', None)
+        if label is None:
+            return
+        try:
+            import shutil, time as _time
+            if shutil.which("liquidsoap") is None:
+                label.setVisible(False)
+                return
+            now = _time.time()
+            if not force and hasattr(self, '_last_liq_probe_ts') and (now - getattr(self, '_last_liq_probe_ts', 0.0) < 30.0):
+                return
+            self._last_liq_probe_ts = now
+            if self._encoder_probe_pending:
+                return
+            self._encoder_probe_pending = True
+
+            names = ["fdkaac", "ffmpeg", "mp3", "opus", "vorbis", "flac"]
+            run_async(lambda: [n for n in names if rdx_streaming.has_encoder(n)], self._show_liquidsoap_encoders, self)
+        except Exception:
+            # On any error, hide to avoid UI noise
+            label.setVisible(False)
+
+    def _show_liquidsoap_encoders(self, available):
+        self._encoder_probe_pending = False
+        label = self.liquidsoap_encoders_label
+        try:
+            if available:
+                txt = "Encoders: " + ", ".join(available)
+                label.setText(txt)
+                label.setToolTip("Detected Liquidsoap encoders: " + ", ".join(available))
+                label.setVisible(True)
+            else:
+                label.setVisible(False)
+        except Exception:
+            # On any error, hide to avoid UI noise
+            label.setVisible(False)
+
+    def _has_liquidsoap_encoder(self, name: str) -> bool:
+        """Return True if 'encoder.<name>' help is available (plugin built/linked).
+        This prefers the per-user OPAM shim and augments PATH so GUI sessions see it.
+        """
+        return rdx_streaming.has_encoder(name)
+
+    def _config_requests_aac(self, config_file: Path) -> bool:
+        """Return True if the given config file appears to request an AAC output.
+        Heuristics: looks for '%fdkaac(' or ffmpeg with audio_codec="aac".
+        """
+        try:
+            if not config_file.exists():
+                return False
+            txt = config_file.read_text(encoding="utf-8", errors="ignore")
+            if re.search(r"%fdkaac\s*\(", txt):
+                return True
+            if re.search(r"%ffmpeg\s*\(.*audio_codec\s*=\s*\"aac\"", txt, flags=re.IGNORECASE | re.DOTALL):
+                return True
+            # Also consider generic AAC mentions in encoder lines
+            if re.search(r"encoder\.(ffmpeg|aac).*aac", txt, flags=re.IGNORECASE):
+                return True
+            return False
+        except Exception:
+            return False
+        
+    # Label text and color per service state reported by rdx.services
+    STATUS_DISPLAY = {
+        'running': ("✅ Running", "QLabel { color: #27ae60; font-weight: bold; }"),
+        'stopped': ("❌ Stopped", "QLabel { color: #e74c3c; font-weight: bold; }"),
+        'restarting': ("♻️ Restarting", "QLabel { color: #f39c12; font-weight: bold; }"),
+        'failed': ("❌ Failed", "QLabel { color: #e74c3c; font-weight: bold; }"),
+        'timeout': ("⏳ Probe Timeout", "QLabel { color: #f39c12; font-weight: bold; }"),
+        'unknown': ("❓ Unknown", "QLabel { color: #95a5a6; }"),
+    }
+
+    def update_all_status(self):
+        """Update status for all services (probes run off the GUI thread)"""
+        if self._status_probe_pending:
+            return
+        self._status_probe_pending = True
+        run_async(rdx_services.probe_all, self._on_status_probed, self)
+
+    def _on_status_probed(self, states):
+        self._status_probe_pending = False
+        if states is not None:
+            self.apply_status(states)
+
+    def apply_status(self, states: dict, details: dict = None):
+        """Render {service_key: state}, from a local probe or pushed by the rdx daemon.
+
+        ``details`` is the daemon's per-service status ({state, crashes, crash_loop}).
+        """
+        for service_key in self.services:
+            status_label = getattr(self, f"{service_key}_status_label", None)
+            if status_label is None:
+                continue
+            state = states.get(service_key, 'unknown')
+            self.services[service_key]['status'] = state
+            text, style = self.STATUS_DISPLAY.get(state, self.STATUS_DISPLAY['unknown'])
+            health = (details or {}).get(service_key) or {}
+            crashes = health.get('crashes') or 0
+            if health.get('crash_loop'):
+                text, style = "🔁 Crash Loop", "QLabel { color: #e74c3c; font-weight: bold; }"
+            elif crashes and state == 'running':
+                text += f" ({crashes}⚠)"
+            status_label.setText(text)
+            status_label.setStyleSheet(style)
+            status_label.setToolTip(f"{crashes} crash{'es' if crashes != 1 else ''} since the rdx daemon started; "
+                                    "details: rdx status --health" if crashes else "")
+        # Update Stereo Tool active info line
+        if hasattr(self, 'stereotool_active_label'):
+            try:
+                self.stereotool_active_label.setText(f"Active: {self._active_stereotool_display()}")
+            except Exception:
+                pass
+
+    def set_daemon_mode(self, enabled: bool):
+        """When the rdx daemon pushes status, stop polling locally"""
+        if enabled:
+            self.status_timer.stop()
+        elif not self.status_timer.isActive():
+            self.status_timer.start(3000)
+        self.refresh_xruns()
+
+    # ---- xruns and DSP load (rdx.xruns in the daemon) ----
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_xruns()
+        self.xrun_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.xrun_timer.stop()
+
+    def _daemon_link(self):
+        link = getattr(self.main_window, "daemon_link", None) if self.main_window is not None else None
+        return link if link is not None and link.is_connected() else None
+
+    def refresh_xruns(self, reset: bool = False):
+        link = self._daemon_link()
+        if link is None:
+            self.xrun_summary_label.setText("Needs the rdx daemon (xruns are counted by its JACK client)")
+            self.xrun_summary_label.setStyleSheet("QLabel { color: #7f8c8d; }")
+            self.xrun_table.setRowCount(0)
+            return
+        link.call("diagnostics.xruns", {'limit': 20, 'reset': bool(reset)}, callback=self._on_xruns)
+
+    def on_xrun_event(self, data):
+        """Pushed by the daemon when new xruns were counted"""
+        if self.isVisible():
+            self.refresh_xruns()
+
+    def _on_xruns(self, result, error):
+        if error or not result:
+            self.xrun_summary_label.setText(f"rdx daemon: {(error or {}).get('message', 'no data')}")
+            self.xrun_summary_label.setStyleSheet("QLabel { color: #7f8c8d; }")
+            return
+        load = result.get('load') or {}
+        if not result.get('session'):
+            text = "No JACK session in the daemon (JACK stopped, or python3-jack-client missing)"
+            style = "QLabel { color: #7f8c8d; }"
+        else:
+            text = (f"xruns: {result.get('total', 0)} total, {result.get('last_minute', 0)} last minute, "
+                    f"{result.get('last_hour', 0)} last hour")
+            if load.get('current') is not None:
+                text += f"  ·  DSP load {load['current']:.1f}% (1 min mean {load['mean']:.1f}%, max {load['max']:.1f}%)"
+            busy = result.get('last_minute', 0) or (load.get('max') or 0) >= 80
+            style = "QLabel { color: #e74c3c; font-weight: bold; }" if busy else \
+                "QLabel { color: #27ae60; font-weight: bold; }"
+        self.xrun_summary_label.setText(text)
+        self.xrun_summary_label.setStyleSheet(style)
+        rows = result.get('xruns') or []
+        self.xrun_table.setRowCount(len(rows))
+        for r, x in enumerate(rows):
+            around = "; ".join(f"{e['kind']}: {e['detail']} ({e['time'] - x['time']:+.1f} s)"
+                               for e in x.get('events', []))
+            cells = [
+                time.strftime("%H:%M:%S", time.localtime(x.get('time', 0))),
+                f"{x.get('delayed_usecs', 0) / 1000.0:.2f} ms",
+                f"{x['load']:.1f}%" if x.get('load') is not None else "—",
+                around or "—",
+            ]
+            for c, val in enumerate(cells):
+                item = QTableWidgetItem(val)
+                if c == 3 and around:
+                    item.setToolTip(around.replace("; ", "\n"))
+                self.xrun_table.setItem(r, c, item)
+
+    def update_log_view(self):
+        """Tail and display the Liquidsoap log inside the UI"""
+        try:
+            config_dir = self.get_config_directory()
+            log_path = config_dir / "liquidsoap.log"
+            if not log_path.exists():
+                self.log_text.setPlaceholderText("No Liquidsoap log found yet. Start Liquidsoap to generate logs.")
+                return
+            # Read last 500 lines to avoid huge memory usage
+            with open(log_path, 'r', errors='ignore') as f:
+                lines = f.readlines()
+            tail_lines = lines[-500:]
+            text = ''.join(tail_lines)
+            # Update only if changed to reduce flicker
+            if self.log_text.toPlainText() != text:
+                self.log_text.setPlainText(text)
+                if self.follow_log_checkbox.isChecked():
+                    cursor = self.log_text.textCursor()
+                    cursor.movePosition(cursor.End)
+                    self.log_text.setTextCursor(cursor)
+        except Exception:
+            # Non-fatal: keep UI responsive even if log read fails
+            pass
+        
+    def _announce(self, service_key, action):
+        """Tell the rdx daemon this state change is ours, so its supervisor does not count a crash"""
+        link = self._daemon_link()
+        if link is not None:
+            link.call("services.expect", {'service': service_key, 'action': action})
+
+    def start_service(self, service_key):
+        """Start a specific service automatically"""
+        service_info = self.services[service_key]
+        self._announce(service_key, "start")
+        try:
+            if service_key == 'jack':
+                # Respect management mode; if disabled, inform user
+                if not self.jack_settings.get("manage", False):
+                    QMessageBox.information(self, "JACK Managed Externally",
+                                            "RDX is set to not manage the JACK server.\n\n"
+                                            "Enable management in the JACK Settings (Configure) if you want RDX to start it.")
+                    return
+                # Avoid duplicate starts
+                if self._jack_is_running():
+                    QMessageBox.information(self, "JACK Already Running", "JACK audio server is already running.")
+                    return
+                ok, msg = self._start_jack_server()
+                if not ok:
+                    QMessageBox.critical(self, "JACK Start Failed", msg)
+                    return
+                # Brief grace period then probe
+                QTimer.singleShot(800, self.update_all_status)
+                QMessageBox.information(self, "JACK Start Requested", msg)
+
+            elif service_key == 'liquidsoap':
+                # Start liquidsoap via per-user systemd unit (with JACK readiness), falling back to direct launch
+                config_dir = self.get_config_directory()
+                config_file = config_dir / "radio.liq"
+                log_file = config_dir / "liquidsoap.log"
+
+                # Verify liquidsoap is available
+                liq_bin = self._liquidsoap_bin()
+                liq_in_path = shutil.which("liquidsoap") is not None or (os.path.isfile(liq_bin) and os.access(liq_bin, os.X_OK))
+                if not liq_in_path:
+                    QMessageBox.critical(self, "Liquidsoap Not Found",
+                                         "The 'liquidsoap' command is not installed or not in PATH.\n\n"
+                                         "Recommended: Build via OPAM (PPA-free) from the installer dialog, or run:\n"
+                                         "  pkexec /bin/bash /usr/share/rdx/install-liquidsoap-opam.sh\n\n"
+                                         "Alternative (may lack codecs):\n  sudo apt install liquidsoap")
+                    return
+                # If AAC is requested by the config, ensure at least one AAC path is available
+                try:
+                    if self._config_requests_aac(config_file):
+                        has_fdkaac = self._has_liquidsoap_encoder("fdkaac")
+                        has_ffmpeg = self._has_liquidsoap_encoder("ffmpeg")
+                        if not (has_fdkaac or has_ffmpeg):
+                            if self.prompt_install_ffmpeg_plugin():
+                                has_fdkaac = self._has_liquidsoap_encoder("fdkaac")
+                                has_ffmpeg = self._has_liquidsoap_encoder("ffmpeg")
+                                if not (has_fdkaac or has_ffmpeg):
+                                    QMessageBox.critical(self, "Liquidsoap AAC Encoder Missing",
+                                                         "No AAC encoder is available (fdkaac or ffmpeg).\n\n"
+                                                         "Consider building Liquidsoap via OPAM for full codec support, or install plugin packages where available.")
+                                    return
+                            else:
+                                QMessageBox.critical(self, "Liquidsoap AAC Encoder Missing",
+                                                     "No AAC encoder is available (fdkaac or ffmpeg).\n\n"
+                                                     "Options: Use MP3-only streams for now, or install Liquidsoap via OPAM for AAC support.")
+                                return
+                except Exception:
+                    pass
+
+                # Ensure log file exists early so UI can tail it even if Liquidsoap fails fast
+                try:
+                    log_file.touch(exist_ok=True)
+                except Exception:
+                    pass
+
+                # Always run a light sanitizer before parse-check.
+                # Rationale: literal "HOME/..." in log.file.path is syntactically valid, so -c succeeds
+                # but then Liquidsoap fails at runtime with: Log directory "HOME/.config/rdx" does not exist.
+                # Sanitizing preemptively fixes this without relying on a parse error.
+                try:
+                    self.sanitize_liquidsoap_config(config_file)
+                except Exception:
+                    pass
+
+                # Ensure config logs to stdout (systemd appends stdout/err to our file),
+                # disabling Liquidsoap-managed file logging to avoid HOME-literal path issues.
+                try:
+                    if config_file.exists():
+                        cfg_txt = config_file.read_text(encoding="utf-8", errors="ignore")
+                        need_stdout = 'set("log.stdout"' not in cfg_txt and 'log.stdout :=' not in cfg_txt
+                        # Always disable Liquidsoap file logging; unit redirects stdout/stderr to our logfile
+                        # to avoid runtime errors from literal HOME paths.
+                        need_disable_file = True  # we will prefix a guard to set log.file=false
+                        if need_stdout or need_disable_file:
+                            cfg_prefix = (
+                                '# Auto-injected by RDX: prefer stdout logging; systemd appends to ~/.config/rdx/liquidsoap.log\n'
+                                'set("log.stdout", true)\n'
+                                'set("log.file", false)\n'
+                            )
+                            # Place at top, but after a shebang if present
+                            if cfg_txt.startswith("#!/"):
+                                first_nl = cfg_txt.find("\n")
+                                if first_nl != -1:
+                                    cfg_txt = cfg_txt[:first_nl+1] + cfg_prefix + cfg_txt[first_nl+1:]
+                                else:
+                                    cfg_txt = cfg_prefix + cfg_txt
+                            else:
+                                cfg_txt = cfg_prefix + cfg_txt
+                            config_file.write_text(cfg_txt, encoding="utf-8")
+                except Exception:
+                    pass
+
+                # Parse-check Liquidsoap config before launching (tolerate slow CLIs)
+                try:
+                    check = rdx_runner.run([self._liquidsoap_bin(), "-c", str(config_file)], capture_output=True, text=True, timeout=10.0, env=self._subprocess_env_with_localbin())
+                except subprocess.TimeoutExpired:
+                    # If -c hangs (some builds are slow), attempt sanitize and continue without blocking the UI
+                    self.sanitize_liquidsoap_config(config_file)
+                    check = None
+                if check is not None and check.returncode != 0:
+                    orig_msg = (check.stderr or check.stdout or "Unknown parse error").strip()
+                    self.sanitize_liquidsoap_config(config_file)
+                    try:
+                        check2 = rdx_runner.run([self._liquidsoap_bin(), "-c", str(config_file)], capture_output=True, text=True, timeout=10.0, env=self._subprocess_env_with_localbin())
+                    except subprocess.TimeoutExpired:
+                        check2 = None
+                    if check2 is None or check2.returncode != 0:
+                        self.sanitize_liquidsoap_config_strict(config_file)
+                        try:
+                            check3 = rdx_runner.run([self._liquidsoap_bin(), "-c", str(config_file)], capture_output=True, text=True, timeout=10.0, env=self._subprocess_env_with_localbin())
+                        except subprocess.TimeoutExpired:
+                            check3 = None
+                        if check3 is None or check3.returncode != 0:
+                            msg2 = ("<timeout>" if check2 is None else (check2.stderr or check2.stdout or "Unknown parse error")).strip()
+                            msg3 = ("<timeout>" if check3 is None else (check3.stderr or check3.stdout or "Unknown parse error")).strip()
+                            QMessageBox.critical(self, "Liquidsoap Config Error",
+                                                 f"Failed to parse Liquidsoap config.\n\nFirst error:\n{orig_msg}\n\nAfter auto-fix:\n{msg2}\n\nAfter strict fix:\n{msg3}")
+                            return
+
+                if not config_file.exists():
+                    QMessageBox.warning(self, "No Config",
+                                        "Please generate Liquidsoap configuration first in Stream Builder tab.")
+                    return
+
+                # Create/update the user systemd unit and try starting it
+                self._ensure_liquidsoap_unit(liq_bin=self._liquidsoap_bin(), config_file=config_file)
+                unit_exists = (Path.home() / ".config" / "systemd" / "user" / "rdx-liquidsoap.service").exists()
+                try:
+                    if unit_exists:
+                        rdx_runner.run(["systemctl", "--user", "start", "rdx-liquidsoap", "--no-block"], check=False)
+                        QMessageBox.information(self, "Liquidsoap Start Requested",
+                                                f"Liquidsoap user service starting with config: {config_file}\n\n"
+                                                f"Logs: {log_file}")
+                        QTimer.singleShot(1000, lambda: self.update_liquidsoap_encoders_label(force=True))
+                        return
+                except Exception:
+                    # Fall through to direct launch
+                    pass
+
+                # Fallback: launch directly if unit couldn't be created/used
+                try:
+                    log_fh = open(log_file, "a", buffering=1)
+                except Exception:
+                    log_fh = None
+                try:
+                    subprocess.Popen([self._liquidsoap_bin(), str(config_file)],
+                                     stdout=log_fh or subprocess.DEVNULL,
+                                     stderr=log_fh or subprocess.DEVNULL,
+                                     start_new_session=True,
+                                     env=self._subprocess_env_with_localbin())
+                    QMessageBox.information(self, "Liquidsoap Started",
+                                            f"Liquidsoap started with config: {config_file}\n\n"
+                                            f"Logs: {log_file}")
+                    QTimer.singleShot(1000, lambda: self.update_liquidsoap_encoders_label(force=True))
+                except Exception as e:
+                    if log_fh:
+                        log_fh.close()
+                    QMessageBox.critical(self, "Liquidsoap Start Error",
+                                         f"Failed to launch Liquidsoap:\n{e}")
+                    return
+                if log_fh:
+                    try:
+                        log_fh.close()
+                    except Exception:
+                        pass
+
+                elif service_key == 'stereo_tool':
+                    # Ensure the user-unit exists and points to the active instance
+                    self._ensure_stereotool_unit()
+                    unit_path = Path.home() / ".config" / "systemd" / "user" / "rdx-stereotool-active.service"
+                    if not unit_path.exists():
+                        QMessageBox.information(self, "Stereo Tool Not Configured",
+                                                "No active Stereo Tool instance is set.\n\n"
+                                                "Open the 'Stereo Tool Manager' tab to add and activate one.")
+                        return
+                    rdx_runner.run(["systemctl", "--user", "start", "rdx-stereotool-active", "--no-block"], check=False)
+                    QMessageBox.information(self, "Stereo Tool Start Requested", "Stereo Tool user service starting.")
+
+            else:
+                # For other services, use systemctl
+                # Use --no-block so UI is never held while systemd stops/starts units.
+                if service_info.get('user_service', False):
+                    rdx_runner.run(["systemctl", "--user", "start", service_info['systemd'], "--no-block"], check=False)
+                else:
+                    rdx_runner.run(["systemctl", "start", service_info['systemd'], "--no-block"], check=False)
+                QMessageBox.information(self, f"{service_info['name']} Started",
+                                        f"{service_info['name']} service started successfully.")
+
+        except subprocess.CalledProcessError as e:
+            QMessageBox.critical(self, "Service Start Failed",
+                                 f"Failed to start {service_info['name']}:\n{str(e)}")
+        except Exception as e:
+            QMessageBox.critical(self, "Service Start Error",
+                                 f"Error starting {service_info['name']}:\n{str(e)}")
+
+                
+    def stop_service(self, service_key):
+        """Stop a specific service automatically"""
+        service_info = self.services[service_key]
+        self._announce(service_key, "stop")
+        
+        try:
+            if service_key == 'jack':
+                if not self.jack_settings.get("manage", False):
+                    QMessageBox.information(self, "JACK Managed Externally",
+                                            "RDX is set to not manage the JACK server, so it won't stop it.")
+                    return
+                # Stop JACK (best-effort)
+                self._stop_jack_server()
+                QTimer.singleShot(500, self.update_all_status)
+                QMessageBox.information(self, "JACK Stop Requested", "Requested JACK shutdown.")
+                
+            elif service_key == 'liquidsoap':
+                # Stop liquidsoap (prefer user unit if present)
+                unit_path = Path.home() / ".config" / "systemd" / "user" / "rdx-liquidsoap.service"
+                if unit_path.exists():
+                    rdx_runner.run(["systemctl", "--user", "stop", "rdx-liquidsoap", "--no-block"], check=False)
+                    QMessageBox.information(self, "Liquidsoap Stop Requested", "Liquidsoap user service stop requested.")
+                else:
+                    rdx_runner.run(["killall", "liquidsoap"], check=False)
+                    QMessageBox.information(self, "Liquidsoap Stopped", "Liquidsoap stopped.")
+            
+            elif service_key == 'stereo_tool':
+                rdx_runner.run(["systemctl", "--user", "stop", "rdx-stereotool-active", "--no-block"], check=False)
+                QMessageBox.information(self, "Stereo Tool Stop Requested", "Stereo Tool user service stop requested.")
+                
+            else:
+                # For other services, use systemctl non-blocking
+                rdx_runner.run(["systemctl", "stop", service_info['systemd'], "--no-block"], check=False)
+                QMessageBox.information(self, f"{service_info['name']} Stopped", 
+                                      f"{service_info['name']} service stopped successfully.")
+                
+        except subprocess.CalledProcessError as e:
+            QMessageBox.critical(self, "Service Stop Failed", 
+                               f"Failed to stop {service_info['name']}:\n{str(e)}")
+        except Exception as e:
+            QMessageBox.critical(self, "Service Stop Error", 
+                               f"Error stopping {service_info['name']}:\n{str(e)}")
+
+    def restart_service(self, service_key):
+        """Restart a specific service automatically"""
+        service_info = self.services[service_key]
+        self._announce(service_key, "restart")
+        try:
+            if service_key == 'jack':
+                if not self.jack_settings.get("manage", False):
+                    QMessageBox.information(self, "JACK Managed Externally",
+                                            "RDX is set to not manage the JACK server.")
+                    return
+                self._stop_jack_server()
+                time.sleep(0.8)
+                ok, msg = self._start_jack_server()
+                if not ok:
+                    QMessageBox.critical(self, "JACK Restart Failed", msg)
+                    return
+                QTimer.singleShot(900, self.update_all_status)
+                QMessageBox.information(self, "JACK Restart Requested", msg)
+
+            elif service_key == 'liquidsoap':
+                # Restart liquidsoap (prefer user unit if present), with preflight parse-check
+                unit_path = Path.home() / ".config" / "systemd" / "user" / "rdx-liquidsoap.service"
+                config_dir = self.get_config_directory()
+                config_file = config_dir / "radio.liq"
+                log_file = config_dir / "liquidsoap.log"
+
+                liq_bin = self._liquidsoap_bin()
+                if shutil.which("liquidsoap") is None and not (os.path.isfile(liq_bin) and os.access(liq_bin, os.X_OK)):
+                    QMessageBox.critical(self, "Liquidsoap Not Found",
+                                         "The 'liquidsoap' command is not installed or not in PATH.\n\n"
+                                         "Recommended: Build via OPAM (PPA-free) from the installer dialog, or run:\n"
+                                         "  pkexec /bin/bash /usr/share/rdx/install-liquidsoap-opam.sh\n\n"
+                                         "Alternative (may lack codecs):\n  sudo apt install liquidsoap")
+                    return
+
+                try:
+                    if self._config_requests_aac(config_file):
+                        has_fdkaac = self._has_liquidsoap_encoder("fdkaac")
+                        has_ffmpeg = self._has_liquidsoap_encoder("ffmpeg")
+                        if not (has_fdkaac or has_ffmpeg):
+                            if self.prompt_install_ffmpeg_plugin():
+                                has_fdkaac = self._has_liquidsoap_encoder("fdkaac")
+                                has_ffmpeg = self._has_liquidsoap_encoder("ffmpeg")
+                                if not (has_fdkaac or has_ffmpeg):
+                                    QMessageBox.critical(self, "Liquidsoap AAC Encoder Missing",
+                                                         "No AAC encoder is available (fdkaac or ffmpeg).\n\n"
+                                                         "Consider building Liquidsoap via OPAM for full codec support, or install plugin packages where available.")
+                                    return
+                            else:
+                                QMessageBox.critical(self, "Liquidsoap AAC Encoder Missing",
+                                                     "No AAC encoder is available (fdkaac or ffmpeg).\n\n"
+                                                     "Options: Use MP3-only streams for now, or install Liquidsoap via OPAM for AAC support.")
+                                return
+                except Exception:
+                    pass
+
+                # Pre-sanitize before parse-check for the same reason as Start: fix runtime-only issues like literal HOME paths
+                try:
+                    self.sanitize_liquidsoap_config(config_file)
+                except Exception:
+                    pass
+
+                try:
+                    check = rdx_runner.run([self._liquidsoap_bin(), "-c", str(config_file)], capture_output=True, text=True, timeout=10.0, env=self._subprocess_env_with_localbin())
+                except subprocess.TimeoutExpired:
+                    self.sanitize_liquidsoap_config(config_file)
+                    check = None
+                if check is not None and check.returncode != 0:
+                    orig_msg = (check.stderr or check.stdout or "Unknown parse error").strip()
+                    self.sanitize_liquidsoap_config(config_file)
+                    try:
+                        check2 = rdx_runner.run([self._liquidsoap_bin(), "-c", str(config_file)], capture_output=True, text=True, timeout=10.0, env=self._subprocess_env_with_localbin())
+                    except subprocess.TimeoutExpired:
+                        check2 = None
+                    if check2 is None or check2.returncode != 0:
+                        self.sanitize_liquidsoap_config_strict(config_file)
+                        try:
+                            check3 = rdx_runner.run([self._liquidsoap_bin(), "-c", str(config_file)], capture_output=True, text=True, timeout=10.0, env=self._subprocess_env_with_localbin())
+                        except subprocess.TimeoutExpired:
+                            check3 = None
+                        if check3 is None or check3.returncode != 0:
+                            msg2 = ("<timeout>" if check2 is None else (check2.stderr or check2.stdout or "Unknown parse error")).strip()
+                            msg3 = ("<timeout>" if check3 is None else (check3.stderr or check3.stdout or "Unknown parse error")).strip()
+                            QMessageBox.critical(self, "Liquidsoap Config Error",
+                                                 f"Failed to parse Liquidsoap config.\n\nFirst error:\n{orig_msg}\n\nAfter auto-fix:\n{msg2}\n\nAfter strict fix:\n{msg3}")
+                            return
+
+                if not config_file.exists():
+                    QMessageBox.warning(self, "No Config",
+                                        "Please generate Liquidsoap configuration first in Stream Builder tab.")
+                    return
+
+                if unit_path.exists():
+                    rdx_runner.run(["systemctl", "--user", "restart", "rdx-liquidsoap", "--no-block"], check=False)
+                    QMessageBox.information(self, "Liquidsoap Restart Requested",
+                                            f"Liquidsoap user service restarting with config: {config_file}\n\n"
+                                            f"Logs: {log_file}")
+                    QTimer.singleShot(1000, lambda: self.update_liquidsoap_encoders_label(force=True))
+                else:
+                    # Fallback to manual stop/start
+                    rdx_runner.run(["killall", "liquidsoap"], check=False)
+                    time.sleep(1)
+                    try:
+                        log_fh = open(log_file, "a", buffering=1)
+                    except Exception:
+                        log_fh = None
+                    try:
+                        subprocess.Popen([self._liquidsoap_bin(), str(config_file)],
+                                         stdout=log_fh or subprocess.DEVNULL,
+                                         stderr=log_fh or subprocess.DEVNULL,
+                                         start_new_session=True,
+                                         env=self._subprocess_env_with_localbin())
+                        QMessageBox.information(self, "Liquidsoap Restarted",
+                                                f"Liquidsoap restarted with config: {config_file}\n\n"
+                                                f"Logs: {log_file}")
+                        QTimer.singleShot(1000, lambda: self.update_liquidsoap_encoders_label(force=True))
+                    except Exception as e:
+                        if log_fh:
+                            log_fh.close()
+                        QMessageBox.critical(self, "Liquidsoap Restart Error",
+                                             f"Failed to launch Liquidsoap:\n{e}")
+                        return
+                    if log_fh:
+                        try:
+                            log_fh.close()
+                        except Exception:
+                            pass
+
+            elif service_key == 'stereo_tool':
+                # Ensure unit is current
+                self._ensure_stereotool_unit()
+                unit_path = Path.home() / ".config" / "systemd" / "user" / "rdx-stereotool-active.service"
+                if not unit_path.exists():
+                    QMessageBox.information(self, "Stereo Tool Not Configured",
+                                            "No active Stereo Tool instance is set.\n\n"
+                                            "Open the 'Stereo Tool Manager' tab to add and activate one.")
+                    return
+                rdx_runner.run(["systemctl", "--user", "restart", "rdx-stereotool-active", "--no-block"], check=False)
+                QMessageBox.information(self, "Stereo Tool Restart Requested", "Stereo Tool user service restarting.")
+
+            else:
+                # For other services, use systemctl
+                if service_info.get('user_service', False):
+                    rdx_runner.run(["systemctl", "--user", "restart", service_info['systemd'], "--no-block"], check=False)
+                else:
+                    rdx_runner.run(["systemctl", "restart", service_info['systemd'], "--no-block"], check=False)
+                QMessageBox.information(self, f"{service_info['name']} Restarted",
+                                        f"{service_info['name']} service restarted successfully.")
+
+        except subprocess.CalledProcessError as e:
+            QMessageBox.critical(self, "Service Restart Failed",
+                                 f"Failed to restart {service_info['name']}:\n{str(e)}")
+        except Exception as e:
+            QMessageBox.critical(self, "Service Restart Error",
+                                 f"Error restarting {service_info['name']}:\n{str(e)}")
+            
+    
+    def prompt_install_ffmpeg_plugin(self) -> bool:
+        """Install Liquidsoap's ffmpeg plugin with a modal progress dialog streaming logs.
+        Returns True if installation was attempted, False otherwise.
+        """
+        try:
+            from PyQt5.QtWidgets import QInputDialog, QDialog, QVBoxLayout
+            from PyQt5.QtCore import QProcess
+
+            options = [
+                "Build via OPAM (PPA-free)",
+                "Install from current repos",
+                "Add official Liquidsoap repo + install",
+                "Add vendor repo (Paravel) + install",
+                "Cancel",
+            ]
+            choice, ok = QInputDialog.getItem(self, "Install FFmpeg Plugin",
+                                              "FFmpeg encoder plugin is missing. Choose installation method:",
+                                              options, 0, False)
+            if not ok or choice == "Cancel":
+                return False
+            mode = "current"
+            if choice.startswith("Build via OPAM"):
+                mode = "opam"
+            elif choice.startswith("Add official"):
+                mode = "official"
+            elif choice.startswith("Add vendor"):
+                mode = "vendor"
+
+            # Prepare modal dialog
+            dlg = QDialog(self)
+            dlg.setWindowTitle("Installing FFmpeg Plugin…")
+            dlg.setModal(True)
+            v = QVBoxLayout(dlg)
+            log_view = QTextEdit()
+            log_view.setReadOnly(True)
+            log_view.setMinimumSize(600, 320)
+            v.addWidget(log_view)
+
+            # Start process with pkexec /bin/bash installer
+            installer = "/usr/share/rdx/install-liquidsoap-plugin.sh"
+            proc = QProcess(dlg)
+            if mode == "opam":
+                # Use dedicated OPAM installer which handles root+user phases
+                installer = "/usr/share/rdx/install-liquidsoap-opam.sh"
+                dlg.setWindowTitle("Building Liquidsoap via OPAM… (PPA-free)")
+                proc.setProgram("pkexec")
+                proc.setArguments(["/bin/bash", installer])
+            else:
+                proc.setProgram("pkexec")
+                proc.setArguments(["/bin/bash", installer, mode])
+            proc.setProcessChannelMode(QProcess.MergedChannels)
+
+            def append_output():
+                data = proc.readAll().data().decode(errors="replace")
+                if data:
+                    log_view.append(data.rstrip())
+            proc.readyRead.connect(append_output)
+
+            finished_ok = {"code": None}
+
+            def on_finished(code, _status):
+                finished_ok["code"] = int(code)
+                dlg.accept()
+
+            proc.finished.connect(on_finished)
+            proc.start()
+            dlg.exec_()
+
+            exit_code = finished_ok["code"] if finished_ok["code"] is not None else 1
+            if exit_code != 0 and mode != "opam":
+                # Attempt a fallback search/install directly from current repos and disable broken PPA entries
+                log_view.append("\n--- Fallback: trying alternative install from current repos ---\n")
+                alt_script = r"""#!/usr/bin/env bash
+set -euo pipefail
+log(){ echo "[rdx-alt] $*"; }
+disable_savonet(){ for f in /etc/apt/sources.list.d/*savonet* 2>/dev/null; do [ -f "$f" ] || continue; log "Disabling $f"; sed -i 's/^deb /# disabled by rdx: deb /' "$f" || true; sed -i 's/^deb-src /# disabled by rdx: deb-src /' "$f" || true; mv "$f" "$f.disabled" 2>/dev/null || true; done; }
+enable_repos(){ if command -v add-apt-repository >/dev/null 2>&1; then add-apt-repository -y universe || true; add-apt-repository -y multiverse || true; fi }
+try_install(){ local p; for p in "$@"; do if apt-get -s install "$p" >/dev/null 2>&1; then log "Installing $p"; DEBIAN_FRONTEND=noninteractive apt-get install -y --no-install-recommends "$p" && return 0; fi; done; return 1; }
+verify(){ liquidsoap -h encoder.ffmpeg >/dev/null 2>&1 && exit 0 || exit 2; }
+disable_savonet || true
+enable_repos || true
+apt-get update || true
+base=(liquidsoap-plugin-ffmpeg liquidsoap-plugin-all liquidsoap-plugin-extra liquidsoap-plugins-extra liquidsoap-plugins liquidsoap-plugin-fdkaac)
+dyn=$(apt-cache search -n '^liquidsoap.*(plugin|plugins).*' 2>/dev/null | awk '{print $1}' | grep -E 'ffmpeg|extra|all|fdkaac' | sort -u || true)
+pkgs=("${base[@]}")
+for n in $dyn; do pkgs+=("$n"); done
+try_install "${pkgs[@]}" || true
+verify
+"""
+                # Write and run fallback script
+                import tempfile
+                alt_path = Path(tempfile.gettempdir()) / "rdx-alt-install.sh"
+                try:
+                    alt_path.write_text(alt_script, encoding="utf-8")
+                    alt_path.chmod(0o755)
+                except Exception as werr:
+                    log_view.append(f"Could not write fallback script: {werr}")
+                proc2 = QProcess(dlg)
+                proc2.setProgram("pkexec")
+                proc2.setArguments(["/bin/bash", str(alt_path)])
+                proc2.setProcessChannelMode(QProcess.MergedChannels)
+                proc2.readyRead.connect(lambda: log_view.append(proc2.readAll().data().decode(errors="replace").rstrip()))
+                fin = {"code": None}
+                proc2.finished.connect(lambda code, status: (fin.update({"code": int(code)}), dlg.accept()))
+                # Reuse dialog to show fallback progress
+                dlg.setWindowTitle("Installing FFmpeg Plugin… (Fallback)")
+                proc2.start()
+                dlg.exec_()
+                fcode = fin["code"] if fin["code"] is not None else 1
+                if fcode != 0:
+                    tail = "\n".join(log_view.toPlainText().splitlines()[-80:])
+                    QMessageBox.critical(self, "Install Failed",
+                                         f"FFmpeg plugin installation failed (exit {exit_code}), fallback also failed (exit {fcode}).\n\nLast output:\n{tail}\n\n"
+                                         "Options: Use MP3 only for now, or install Liquidsoap via OPAM for full AAC.")
+                    return False
+
+            if mode == "opam":
+                # Quick self-check to surface environment to the user
+                try:
+                    v = rdx_runner.run(["bash", "-lc", "liquidsoap --version"], capture_output=True, text=True)
+                    e = rdx_runner.run(["bash", "-lc", "liquidsoap --list-encoders | head -n 200"], capture_output=True, text=True)
+                    log_view.append("\n--- Verification ---")
+                    log_view.append((v.stdout or v.stderr or "").strip())
+                    log_view.append((e.stdout or e.stderr or "").strip())
+                except Exception:
+                    pass
+                QMessageBox.information(self, "OPAM Install Complete",
+                                        "Liquidsoap was built via OPAM. If this is your first OPAM install, you may need to restart RDX for PATH to refresh.\n\nRechecking availability…")
+            else:
+                QMessageBox.information(self, "Install Complete",
+                                        "FFmpeg plugin installation attempted. Rechecking availability…")
+            return True
+        except Exception as e:
+            QMessageBox.critical(self, "Install Error", f"Error during installation: {e}")
+            return False
+
+    def get_config_directory(self):
+        """Get the application config directory, creating it if needed"""
+        
+        # Try standard config directory first
+        config_dir = Path.home() / ".config" / "rdx"
+        
+        try:
+            # Create and test if we can write to standard location
+            config_dir.mkdir(parents=True, exist_ok=True)
+            test_file = config_dir / ".test"
+            test_file.touch()
+            test_file.unlink()
+            return config_dir
+        except (PermissionError, OSError):
+            # If standard location fails, try creating in home directory
+            fallback_dir = Path.home() / ".rdx"
+            try:
+                fallback_dir.mkdir(parents=True, exist_ok=True)
+                return fallback_dir
+            except (PermissionError, OSError):
+                # Last resort - use temp directory with user-specific name
+                import tempfile
+                import getpass
+                temp_dir = Path(tempfile.gettempdir()) / f"rdx-{getpass.getuser()}"
+                temp_dir.mkdir(parents=True, exist_ok=True)
+                return temp_dir
+
+    def sanitize_liquidsoap_config(self, config_file: Path):
+        """Auto-fix common Liquidsoap config issues in-place (see rdx.streaming.sanitize_liquidsoap_text)."""
+        rdx_streaming.sanitize_liquidsoap_file(config_file)
+
+    def sanitize_liquidsoap_config_strict(self, config_file: Path):
+        """Apply stricter Liquidsoap/FFmpeg compatibility fixes in-place (bitrates in bps, codec/format
+        adapted to the installed ffmpeg encoder)."""
+        rdx_streaming.sanitize_liquidsoap_file(config_file, strict=True)
+
+    def _probe_ffmpeg_capabilities(self):
+        """Return (codecs, formats) sets supported by Liquidsoap ffmpeg encoder, or (None, None) on failure."""
+        return rdx_streaming.probe_ffmpeg_capabilities()
+                
+    def configure_service(self, service_key):
+        """Configure a specific service"""
+        service_info = self.services[service_key]
+        if service_key == 'jack':
+            self._open_jack_settings_dialog()
+            return
+        QMessageBox.information(self, "Configure Service", f"Configuration for {service_info['name']} will open the appropriate settings.")
+
+    def _open_jack_settings_dialog(self):
+        from PyQt5.QtWidgets import QFormLayout, QDialog, QDialogButtonBox, QComboBox, QCheckBox, QLineEdit, QSpinBox, QHBoxLayout, QPushButton
+        dlg = QDialog(self)
+        dlg.setWindowTitle("JACK Settings")
+        form = QFormLayout(dlg)
+
+        # Manage toggle
+        manage_cb = QCheckBox("Let RDX manage the JACK server")
+        manage_cb.setChecked(self.jack_settings.get("manage", False))
+        form.addRow("Management:", manage_cb)
+
+        # Autostart toggle
+        autostart_cb = QCheckBox("Start JACK at login (user service)")
+        autostart_cb.setToolTip("Creates/enables a per-user systemd unit 'rdx-jack' so JACK starts when you log in.\nFor pre-login headless boot, prefer jackd mode and enable user lingering.")
+        autostart_cb.setChecked(self.jack_settings.get("autostart", False))
+        form.addRow("Autostart:", autostart_cb)
+
+        # Mode selector
+        mode_combo = QComboBox()
+        mode_combo.addItems(["jackd", "jackdbus"])  # direct or jackdbus via jack_control
+        cur_mode = self.jack_settings.get("mode", "jackd")
+        midx = mode_combo.findText(cur_mode)
+        mode_combo.setCurrentIndex(max(0, midx))
+        form.addRow("Mode:", mode_combo)
+
+        # Backend selector
+        backend_combo = QComboBox()
+        backend_combo.addItems(["alsa", "dummy"])  # conservative set; more can be added later
+        cur_backend = self.jack_settings.get("backend", "alsa")
+        idx = backend_combo.findText(cur_backend)
+        backend_combo.setCurrentIndex(max(0, idx))
+        form.addRow("Backend:", backend_combo)
+
+        # ALSA device with dropdown + refresh; editable
+        dev_row = QHBoxLayout()
+        dev_combo = QComboBox(); dev_combo.setEditable(True)
+        try:
+            for dname in self._alsa_devices():
+                dev_combo.addItem(dname)
+        except Exception:
+            pass
+        cur_dev = self.jack_settings.get("device", "")
+        if cur_dev and dev_combo.findText(cur_dev) < 0:
+            dev_combo.addItem(cur_dev)
+        if cur_dev:
+            dev_combo.setCurrentText(cur_dev)
+        dev_combo.setEditable(True)
+        dev_combo.setInsertPolicy(QComboBox.NoInsert)
+        dev_btn = QPushButton("Refresh")
+        def _refresh_devs():
+            devs = self._alsa_devices()
+            dev_combo.clear()
+            for dname in devs:
+                dev_combo.addItem(dname)
+        dev_btn.clicked.connect(_refresh_devs)
+        dev_row.addWidget(dev_combo)
+        dev_row.addWidget(dev_btn)
+        form.addRow("ALSA Device:", dev_row)
+
+        # Numeric params
+        rate_spin = QSpinBox(); rate_spin.setRange(8000, 192000); rate_spin.setSingleStep(1000)
+        rate_spin.setValue(int(self.jack_settings.get("rate", 48000)))
+        form.addRow("Sample Rate (Hz):", rate_spin)
+
+        period_spin = QSpinBox(); period_spin.setRange(16, 4096)
+        period_spin.setValue(int(self.jack_settings.get("period", 256)))
+        form.addRow("Frames/Period:", period_spin)
+
+        nper_spin = QSpinBox(); nper_spin.setRange(2, 8)
+        nper_spin.setValue(int(self.jack_settings.get("nperiods", 2)))
+        form.addRow("Periods/Buffer:", nper_spin)
+
+        rt_cb = QCheckBox("Enable realtime (-R)")
+        rt_cb.setChecked(self.jack_settings.get("realtime", True))
+        form.addRow("Realtime:", rt_cb)
+
+        # Theoretical latency of the fields above; Air Chain… adds what the clients report
+        latency_row = QHBoxLayout()
+        latency_lbl = QLabel()
+        def _update_latency(*_):
+            b = rdx_latency.budget(rate_spin.value(), period_spin.value(), nper_spin.value())
+            latency_lbl.setText(f"in {b['capture_ms']} ms · out {b['playback_ms']} ms · round trip {b['round_trip_ms']} ms")
+        for spin in (rate_spin, period_spin, nper_spin):
+            spin.valueChanged.connect(_update_latency)
+        _update_latency()
+        chain_btn = QPushButton("Air Chain…")
+        chain_btn.setToolTip("Latency budget per buffer size, including the Rivendell → processor → Liquidsoap clients")
+        chain_btn.clicked.connect(lambda: self._open_latency_budget_dialog(dlg, rate_spin, period_spin, nper_spin))
+        measure_btn = QPushButton("Measure…")
+        measure_btn.setToolTip("Measure the real round trip with jack_iodelay through a loopback cable")
+        measure_btn.clicked.connect(lambda: self._measure_round_trip(dlg, measure_btn, rate_spin, period_spin, nper_spin))
+        latency_row.addWidget(latency_lbl, 1)
+        latency_row.addWidget(chain_btn)
+        latency_row.addWidget(measure_btn)
+        form.addRow("Latency:", latency_row)
+
+        # Last `rdx jack tune` result for this host and backend
+        tuned_row = QHBoxLayout()
+        tuned_lbl = QLabel()
+        tuned_lbl.setStyleSheet("QLabel { color: #7f8c8d; }")
+        use_tuned_btn = QPushButton("Use")
+        use_tuned_btn.setToolTip("Set Frames/Period and Periods/Buffer to the tuner's recommendation")
+        tuned = {}
+        def _update_tuned(*_):
+            tuned.clear()
+            try:
+                from rdx import tuner as rdx_tuner
+                tuned.update(rdx_tuner.recommendation(backend_combo.currentText()) or {})
+            except Exception:
+                pass
+            if tuned:
+                rec = tuned['recommended']
+                when = time.strftime("%Y-%m-%d", time.localtime(tuned.get('time', 0)))
+                tuned_lbl.setText(f"{rec['period']} × {rec['nperiods']} without xruns at {tuned.get('rate')} Hz (tuned {when})")
+            else:
+                tuned_lbl.setText("Not tuned on this host yet (rdx jack tune, in a maintenance window)")
+            use_tuned_btn.setEnabled(bool(tuned))
+        def _use_tuned():
+            if tuned:
+                period_spin.setValue(tuned['recommended']['period'])
+                nper_spin.setValue(tuned['recommended']['nperiods'])
+        use_tuned_btn.clicked.connect(_use_tuned)
+        backend_combo.currentTextChanged.connect(_update_tuned)
+        _update_tuned()
+        tuned_row.addWidget(tuned_lbl, 1)
+        tuned_row.addWidget(use_tuned_btn)
+        form.addRow("Tuned:", tuned_row)
+
+        extra_edit = QLineEdit(self.jack_settings.get("extra_args", ""))
+        extra_edit.setPlaceholderText("Extra jackd driver args (advanced)")
+        form.addRow("Extra Args:", extra_edit)
+
+        # Presets row
+        presets_row = QHBoxLayout()
+        preset_combo = QComboBox(); preset_combo.addItems(["Select a preset…", "Live Low Latency", "Production Stable", "Dummy (No HW)"])
+        # rdx-profiles.xml <jack-settings> as presets too
+        xml_presets = {}
+        try:
+            from rdx import rules as rdx_rules
+            for pname, prof in rdx_rules.load_xml_profiles().items():
+                vals = rdx_jackserver.profile_settings(prof.get("jack_settings"))
+                if vals:
+                    xml_presets[f"Profile: {pname}"] = vals
+                    preset_combo.addItem(f"Profile: {pname}")
+        except Exception:
+            pass
+        apply_preset_btn = QPushButton("Apply Preset")
+        def _apply_preset():
+            name = preset_combo.currentText()
+            if name in xml_presets:
+                vals = xml_presets[name]
+                rate_spin.setValue(vals.get("rate", rate_spin.value()))
+                period_spin.setValue(vals.get("period", period_spin.value()))
+                nper_spin.setValue(vals.get("nperiods", nper_spin.value()))
+            if name == "Live Low Latency":
+                backend_combo.setCurrentText("alsa")
+                rate_spin.setValue(48000)
+                period_spin.setValue(128)
+                nper_spin.setValue(3)
+                rt_cb.setChecked(True)
+            elif name == "Production Stable":
+                backend_combo.setCurrentText("alsa")
+                rate_spin.setValue(48000)
+                period_spin.setValue(256)
+                nper_spin.setValue(2)
+                rt_cb.setChecked(True)
+            elif name == "Dummy (No HW)":
+                backend_combo.setCurrentText("dummy")
+                rate_spin.setValue(48000)
+                period_spin.setValue(256)
+                nper_spin.setValue(2)
+                rt_cb.setChecked(False)
+        apply_preset_btn.clicked.connect(_apply_preset)
+        presets_row.addWidget(preset_combo)
+        presets_row.addWidget(apply_preset_btn)
+        form.addRow("Presets:", presets_row)
+
+        # Adopt/show current row
+        adopt_row = QHBoxLayout()
+        adopt_btn = QPushButton("Adopt From Running")
+        show_btn = QPushButton("Show Current")
+        def _adopt():
+            cur = self._probe_running_jack_config()
+            if not cur:
+                QMessageBox.information(dlg, "No Running JACK", "Could not detect a running JACK configuration.")
+                return
+            # Update fields with detected
+            mode_combo.setCurrentText(cur.get("mode", mode_combo.currentText()))
+            backend_combo.setCurrentText(cur.get("backend", backend_combo.currentText()))
+            dval = cur.get("device", dev_combo.currentText())
+            if dval and dev_combo.findText(dval) < 0:
+                dev_combo.addItem(dval)
+            if dval:
+                dev_combo.setCurrentText(dval)
+            rate_spin.setValue(int(cur.get("rate", rate_spin.value())))
+            period_spin.setValue(int(cur.get("period", period_spin.value())))
+            nper_spin.setValue(int(cur.get("nperiods", nper_spin.value())))
+            rt_cb.setChecked(bool(cur.get("realtime", rt_cb.isChecked())))
+        def _show():
+            cur = self._probe_running_jack_config()
+            if not cur:
+                QMessageBox.information(dlg, "No Running JACK", "Could not detect a running JACK configuration.")
+                return
+            # Prepare summary
+            lines = [
+                f"Mode: {cur.get('mode','?')}",
+                f"Backend: {cur.get('backend','?')}",
+                f"Device: {cur.get('device','')}",
+                f"Rate: {cur.get('rate','?')}",
+                f"Period: {cur.get('period','?')}",
+                f"Nperiods: {cur.get('nperiods','?')}",
+                f"Realtime: {cur.get('realtime','?')}"
+            ]
+            QMessageBox.information(dlg, "Detected JACK Settings", "\n".join(lines))
+        adopt_btn.clicked.connect(_adopt)
+        show_btn.clicked.connect(_show)
+        adopt_row.addWidget(adopt_btn)
+        adopt_row.addWidget(show_btn)
+        form.addRow("Detect:", adopt_row)
+
+        # Buttons
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        form.addRow(buttons)
+        buttons.accepted.connect(dlg.accept)
+        buttons.rejected.connect(dlg.reject)
+
+        if dlg.exec_() == QDialog.Accepted:
+            data = {
+                "manage": manage_cb.isChecked(),
+                "autostart": autostart_cb.isChecked(),
+                "mode": mode_combo.currentText(),
+                "backend": backend_combo.currentText(),
+                "device": dev_combo.currentText().strip(),
+                "rate": int(rate_spin.value()),
+                "period": int(period_spin.value()),
+                "nperiods": int(nper_spin.value()),
+                "realtime": rt_cb.isChecked(),
+                "extra_args": extra_edit.text().strip(),
+            }
+            # A running server gets a live buffer-size change where possible; restarts only when required
+            status = ""
+            plan = rdx_jackserver.apply(data, settings=self.jack_settings, dry_run=True)
+            if plan["action"] == "restart" and data["manage"]:
+                keys = ", ".join(sorted(plan["changes"]))
+                reply = QMessageBox.question(self, "Restart JACK", f"JACK must restart to apply {keys}.\n\nRestart it now?",
+                                             QMessageBox.Yes | QMessageBox.No)
+                if reply != QMessageBox.Yes:
+                    plan["action"] = "stopped"   # save only
+            if plan["action"] in ("live", "restart"):
+                status = rdx_jackserver.apply(data, settings=self.jack_settings)["message"] + "\n\n"
+            self._save_jack_settings(data)
+            self._apply_jack_manage_mode_to_controls()
+            # Show preview of resulting command
+            if data.get("mode", "jackd") == "jackdbus":
+                preview = "\n".join(self._jackdbus_preview_commands())
+                QMessageBox.information(self, "JACK Settings Saved", f"{status}JACK settings saved.\n\njack_control command:\n{preview}")
+            else:
+                cmd = self._build_jackd_command()
+                QMessageBox.information(self, "JACK Settings Saved", f"{status}JACK settings saved.\n\nCommand preview:\n{' '.join(cmd)}")
+        
+    def _open_latency_budget_dialog(self, parent, rate_spin, period_spin, nper_spin):
+        """Latency per candidate buffer size for the current rate/periods, with the air chain's client latencies."""
+        from PyQt5.QtWidgets import QDialog, QDialogButtonBox, QTableWidget, QTableWidgetItem, QAbstractItemView
+        dlg = QDialog(parent)
+        dlg.setWindowTitle("Latency Budget")
+        dlg.resize(620, 360)
+        layout = QVBoxLayout(dlg)
+        chain_lbl = QLabel("Reading port latencies from JACK…")
+        chain_lbl.setWordWrap(True)
+        layout.addWidget(chain_lbl)
+        table = QTableWidget(0, 5)
+        table.setHorizontalHeaderLabels(["Frames/Period", "In (ms)", "Out (ms)", "Round trip (ms)", "Air chain (ms)"])
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SingleSelection)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(table)
+        note = QLabel("Air chain: one processing period plus what each client reports. "
+                      "Liquidsoap's encoder and Icecast buffering come on top.")
+        note.setWordWrap(True)
+        layout.addWidget(note)
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.button(QDialogButtonBox.Ok).setText("Use Selected")
+        buttons.accepted.connect(dlg.accept)
+        buttons.rejected.connect(dlg.reject)
+        layout.addWidget(buttons)
+        rate, nperiods = rate_spin.value(), nper_spin.value()
+
+        def fill(data):
+            latencies, chain = data or ({}, [])
+            if chain:
+                b = rdx_latency.budget(rate, period_spin.value(), nperiods, latencies, chain)
+                added = {st['client']: st['ms'] for st in b['stages']}
+                chain_lbl.setText("Air chain: " + " → ".join(
+                    f"{c} (+{added[c]} ms)" if c in added else c for c, _, _ in chain))
+            else:
+                chain_lbl.setText("JACK is not running or the air chain is not patched; showing engine latency only.")
+            rows = rdx_latency.budget_table(rate, nperiods, latencies, chain)
+            table.setRowCount(len(rows))
+            for r, b in enumerate(rows):
+                for c, val in enumerate((b['period'], b['capture_ms'], b['playback_ms'], b['round_trip_ms'], b['chain_ms'])):
+                    table.setItem(r, c, QTableWidgetItem(str(val)))
+                if b['period'] == period_spin.value():
+                    table.selectRow(r)
+            table.resizeColumnsToContents()
+
+        def probe():
+            from rdx import jack as rdx_jack
+            ports = rdx_jack.list_ports(timeout=1.5)
+            return rdx_latency.port_latencies(), rdx_latency.air_chain(ports) if ports else []
+        run_async(probe, fill, dlg)
+        if dlg.exec_() == QDialog.Accepted and table.currentRow() >= 0:
+            period_spin.setValue(rdx_latency.PERIODS[table.currentRow()])
+
+    def _measure_round_trip(self, parent, button, rate_spin, period_spin, nper_spin):
+        """Pick a loopback (playback → capture) and measure its round trip with jack_iodelay, off the GUI thread."""
+        from PyQt5.QtWidgets import QInputDialog
+        from rdx import jack as rdx_jack
+        ports = rdx_jack.list_ports(timeout=1.5)
+        if not ports:
+            QMessageBox.information(parent, "Measure Round Trip", "JACK is not running.")
+            return
+        system = ports.get("system", {})
+        playback, ok = QInputDialog.getItem(parent, "Measure Round Trip", "Loopback from playback port:",
+                                            system.get("in", []) or ["system:playback_1"], 0, True)
+        if not ok:
+            return
+        capture, ok = QInputDialog.getItem(parent, "Measure Round Trip", "…cabled back into capture port:",
+                                           system.get("out", []) or ["system:capture_1"], 0, True)
+        if not ok:
+            return
+        theory = rdx_latency.budget(rate_spin.value(), period_spin.value(), nper_spin.value())
+        button.setEnabled(False)
+        button.setText("Measuring…")
+
+        def work():
+            try:
+                return rdx_latency.measure_round_trip(playback, capture)
+            except Exception as e:
+                return {'error': str(e)}
+
+        def done(res):
+            button.setEnabled(True)
+            button.setText("Measure…")
+            res = res or {'error': "Measurement failed"}
+            if res.get('error'):
+                QMessageBox.warning(parent, "Measure Round Trip", res['error'])
+                return
+            msg = (f"Measured round trip: {res['ms']:.2f} ms ({res['frames']:.0f} frames)\n"
+                   f"Theoretical (JACK buffers only): {theory['round_trip_ms']} ms")
+            if res.get('extra_frames') is not None:
+                msg += f"\nExtra latency from converters/driver: {res['extra_frames']} frames"
+            QMessageBox.information(parent, "Measure Round Trip", msg)
+        run_async(work, done, parent)
+
+    def start_all_services(self, confirm=True, timeouts=None):
+        """Start every configured service along the dependency graph, each as soon as what it needs is ready"""
+        if confirm:
+            reply = QMessageBox.question(self, "Start All Services",
+                                         "This will start all broadcast services:\n"
+                                         "JACK and Icecast first, then Liquidsoap and Stereo Tool\n"
+                                         "as soon as JACK is ready.\n\n"
+                                         "Continue?",
+                                         QMessageBox.Yes | QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+        # Preflight here on the GUI thread: the chain only starts units that exist
+        try:
+            self._ensure_stereotool_unit()
+            config_file = self.get_config_directory() / "radio.liq"
+            if config_file.exists():
+                try:
+                    self.sanitize_liquidsoap_config(config_file)
+                except Exception:
+                    pass
+                self._ensure_liquidsoap_unit(liq_bin=self._liquidsoap_bin(), config_file=config_file)
+        except Exception as e:
+            QMessageBox.critical(self, "Start All Error", f"Failed to prepare the service units: {e}")
+            return
+        keys = rdx_startup.configured()
+        for key in keys:
+            self._announce(key, "start")
+        self.start_all_btn.setEnabled(False)
+        self.start_all_btn.setText("🚀 STARTING…")
+        run_async(lambda: rdx_startup.start_chain(keys, timeouts=timeouts), self._on_chain_started, self)
+
+    def _on_chain_started(self, res):
+        self.start_all_btn.setEnabled(True)
+        self.start_all_btn.setText("🚀 START ALL SERVICES")
+        self.update_all_status()
+        if not res:
+            QMessageBox.critical(self, "Start All Error", "Failed to start the services.")
+            return
+        lines = []
+        for key, entry in res['services'].items():
+            name = self.services.get(key, {}).get('name', key)
+            if entry['state'] == "ready":
+                lines.append(f"✅ {name}: ready after {entry['ready']:.1f} s")
+            else:
+                lines.append(f"❌ {name}: {entry['state']}" + (f" ({entry['message']})" if entry['message'] else ""))
+        if res['ok']:
+            QMessageBox.information(self, "Start Complete",
+                                    f"All services ready after {res['seconds']:.1f} s.\n\n" + "\n".join(lines))
+        else:
+            QMessageBox.warning(self, "Start Incomplete", "\n".join(lines))
+
+    def stop_all_services(self):
+        """Stop all services in reverse order"""
+        reply = QMessageBox.question(self, "Stop All Services", 
+                                   "This will stop all broadcast services in reverse order:\n"
+                                   "Icecast → Liquidsoap → Stereo Tool → JACK\n\n"
+                                   "Continue?",
+                                   QMessageBox.Yes | QMessageBox.No)
+        
+        if reply == QMessageBox.Yes:
+            QMessageBox.information(self, "Stopping Services", 
+                                  "Stopping all services in reverse dependency order...")
+            
+    def emergency_stop(self):
+        """Emergency stop all services immediately"""
+        reply = QMessageBox.warning(self, "EMERGENCY STOP", 
+                                   "⚠️ EMERGENCY STOP ⚠️\n\n"
+                                   "This will immediately terminate all broadcast services!\n"
+                                   "Use only in emergency situations.\n\n"
+                                   "Continue?",
+                                   QMessageBox.Yes | QMessageBox.No)
+        
+        if reply == QMessageBox.Yes:
+            QMessageBox.information(self, "Emergency Stop", 
+                                  "🚨 All broadcast services stopped immediately!")
+
+    def open_stereotool_logs(self):
+        """Open a dialog with the last 500 lines of the Stereo Tool user-service log."""
+        try:
+            from PyQt5.QtWidgets import QDialog, QVBoxLayout
+            dlg = QDialog(self)
+            dlg.setWindowTitle("Stereo Tool Logs (rdx-stereotool-active)")
+            v = QVBoxLayout(dlg)
+            txt = QTextEdit()
+            txt.setReadOnly(True)
+            v.addWidget(txt)
+            # Fetch logs via journalctl
+            res = rdx_runner.run(["journalctl", "--user", "-u", "rdx-stereotool-active", "-n", "500", "--no-pager"],
+                                 capture_output=True, text=True)
+            output = (res.stdout or res.stderr or "No logs available").strip()
+            txt.setPlainText(output)
+            dlg.resize(800, 500)
+            dlg.exec_()
+        except Exception as e:
+            QMessageBox.critical(self, "Logs Error", f"Could not open logs: {e}")
+
+        # ---- Stereo Tool helpers (systemd user unit and active symlink) ----
+    def _st_path_root(self) -> Path:
+        return Path.home() / ".config" / "rdx" / "processing" / "stereotool"
+
+    def _active_symlink(self) -> Path:
+        return self._st_path_root() / "active"
+
+    def _ensure_stereotool_unit(self):
+        """Create/update per-user systemd unit that runs the active Stereo Tool binary.
+        Unit: rdx-stereotool-active.service under ~/.config/systemd/user
+        """
+        try:
+            root = self._st_path_root()
+            root.mkdir(parents=True, exist_ok=True)
+            active = self._active_symlink()
+            # If no active binary, do nothing (UI will guide to Stereo Tool Manager tab)
+            if not active.exists():
+                return
+            unit_dir = Path.home() / ".config" / "systemd" / "user"
+            unit_dir.mkdir(parents=True, exist_ok=True)
+            unit_path = unit_dir / "rdx-stereotool-active.service"
+            # Readiness gates: JACK must be up (hard), then the encoder's ports (soft, never fails the unit)
+            enc_name = (self._active_encoder_preference() or '').strip().lower()
+            enc_glob = enc_name if enc_name in ("liquidsoap","darkice","butt","glasscoder") else rdx_wait.ENCODERS
+            pre_jack = rdx_wait.exec_start_pre()
+            pre_enc = rdx_wait.exec_start_pre(clients=[enc_glob], soft=True)
+            unit = f"""[Unit]
+Description=RDX Stereo Tool (active instance)
+After=default.target
+Wants=default.target
+{rdx_supervisor.UNIT_POLICY}
+[Service]
+Type=simple
+{pre_jack}{pre_enc}ExecStart={str(active)}
+{rdx_supervisor.RESTART_POLICY}
+[Install]
+WantedBy=default.target
+"""
+            unit_path.write_text(unit, encoding="utf-8")
+            # Reload user daemon to pick up changes
+            rdx_runner.run(["systemctl", "--user", "daemon-reload"], check=False)
+            # Enable unit so it can be started at login if desired
+            rdx_runner.run(["systemctl", "--user", "enable", "rdx-stereotool-active"], check=False)
+        except Exception:
+            # Non-fatal; Service Control will still allow manual start attempts
+            pass
+
+    def _active_encoder_preference(self) -> str:
+        """Read user's preferred active encoder from settings.json.
+        Returns one of: 'liquidsoap','darkice','butt','glasscoder' or ''.
+        """
+        try:
+            sp = Path.home() / ".config" / "rdx" / "settings.json"
+            if sp.exists():
+                with open(sp, 'r') as f:
+                    data = json.load(f)
+                val = str(data.get('active_encoder', '')).lower()
+                if val in ("liquidsoap","darkice","butt","glasscoder"):
+                    return val
+        except Exception:
+            pass
+        return ""
+
+        # ---- Liquidsoap user-service helper (systemd user unit) ----
+    def _ensure_liquidsoap_unit(self, liq_bin: str, config_file: Path):
+        """Create/update a per-user systemd unit to run Liquidsoap with our config.
+        Unit: rdx-liquidsoap.service under ~/.config/systemd/user
+        Includes JACK readiness gate (ExecStartPre) and an augmented PATH so the OPAM shim is honored.
+        """
+        try:
+            unit_dir = Path.home() / ".config" / "systemd" / "user"
+            unit_dir.mkdir(parents=True, exist_ok=True)
+            unit_path = unit_dir / "rdx-liquidsoap.service"
+
+            # Ensure config dir exists
+            cfg_dir = config_file.parent
+            cfg_dir.mkdir(parents=True, exist_ok=True)
+
+            # Environment to prefer ~/.local/bin and ensure HOME/XDG paths are set for logging
+            env_path = str(Path.home() / ".local" / "bin") + ":/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin"
+            env_home = str(Path.home())
+            env_xdg = str(Path.home() / ".config")
+
+            # Where to append stdout/stderr as a safety-net for visibility
+            log_path = str(Path.home() / ".config" / "rdx" / "liquidsoap.log")
+
+            # Log file first, so the UI can tail it even if the JACK wait times out
+            pre = (f"ExecStartPre=/usr/bin/env mkdir -p {shlex.quote(str(cfg_dir))}\n"
+                   f"ExecStartPre=/usr/bin/env touch {shlex.quote(log_path)}\n"
+                   + rdx_wait.exec_start_pre())
+            unit = f"""[Unit]
+Description=RDX Liquidsoap (per-user)
+After=default.target
+Wants=default.target
+{rdx_supervisor.UNIT_POLICY}
+[Service]
+Type=simple
+{pre}Environment=PATH={env_path}
+Environment=HOME={env_home}
+Environment=XDG_CONFIG_HOME={env_xdg}
+ExecStart={liq_bin} {str(config_file)}
+StandardOutput=append:{log_path}
+StandardError=append:{log_path}
+{rdx_supervisor.RESTART_POLICY}
+[Install]
+WantedBy=default.target
+"""
+            unit_path.write_text(unit, encoding="utf-8")
+            # Reload and enable so we can manage it
+            rdx_runner.run(["systemctl", "--user", "daemon-reload"], check=False)
+            rdx_runner.run(["systemctl", "--user", "enable", "rdx-liquidsoap"], check=False)
+        except Exception:
+            # Non-fatal; we'll fall back to direct process launch if needed
+            pass
@@ -0,0 +1,433 @@
+"""
+Stereo Tool Manager tab: instances, downloads and the active user unit.
+"""
+
+import os
+import json
+import re
+import shutil
+from pathlib import Path
+
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QWidget,
+                             QMessageBox, QGroupBox, QLineEdit, QTableWidget,
+                             QTableWidgetItem, QHeaderView)
+
+from rdx import runner as rdx_runner
+from rdx import supervisor as rdx_supervisor
+from rdx import wait as rdx_wait
+
+
+class StereoToolManagerTab(QWidget):
+    """Tab: Stereo Tool Manager - manage multiple versions and active instance.
+    Features:
+    - Add instance from URL or local file
+    - Download helper to fetch Linux JACK x64 artifact from Thimeo site
+    - Manage active instance via symlink
+    - Generate per-user systemd unit for active instance
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.instances = []
+        self.setup_ui()
+        self._load_instances()
+        self._refresh_table()
+
+    def _root(self) -> Path:
+        return Path.home() / ".config" / "rdx" / "processing" / "stereotool"
+
+    def _instances_file(self) -> Path:
+        return self._root() / "stereotool_instances.json"
+
+    def _active_link(self) -> Path:
+        return self._root() / "active"
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        # Actions row
+        actions = QHBoxLayout()
+        btn_add_url = QPushButton("⬇️ Add from URL")
+        btn_add_url.clicked.connect(self.add_from_url)
+        actions.addWidget(btn_add_url)
+
+        btn_add_file = QPushButton("📦 Add from File")
+        btn_add_file.clicked.connect(self.add_from_file)
+        actions.addWidget(btn_add_file)
+
+        btn_download = QPushButton("🌐 Download JACK x64 (Auto)")
+        btn_download.clicked.connect(self.download_latest)
+        actions.addWidget(btn_download)
+
+        btn_latest = QPushButton("🔗 Download from 'Latest' URL")
+        btn_latest.setToolTip("Uses a configured 'latest' URL if set, or prompts you to paste one.")
+        btn_latest.clicked.connect(self.download_from_latest)
+        actions.addWidget(btn_latest)
+
+        actions.addStretch(1)
+        layout.addLayout(actions)
+
+        # Optional 'Latest URL' field (persisted in settings)
+        latest_group = QGroupBox("Optional: Official 'latest' URL")
+        lg = QHBoxLayout(latest_group)
+        self.latest_url_input = QLineEdit()
+        self.latest_url_input.setPlaceholderText("https://… (paste an official latest link here)")
+        self.latest_url_input.editingFinished.connect(self._save_latest_url)
+        lg.addWidget(QLabel("Latest URL:"))
+        lg.addWidget(self.latest_url_input)
+        layout.addWidget(latest_group)
+
+        # Table of instances
+        self.table = QTableWidget()
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["Name", "Version", "Path", "Active", "Actions"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        # Status area
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+
+        # Helper text
+        help_box = QGroupBox("About Stereo Tool management")
+        hl = QVBoxLayout(help_box)
+        hl.addWidget(QLabel("RDX stores Stereo Tool under ~/.config/rdx/processing/stereotool and switches the active version using a symlink. A per-user systemd unit runs the active instance."))
+        layout.addWidget(help_box)
+
+        # Load any saved 'latest' URL
+        try:
+            saved = self._load_latest_url()
+            if not saved:
+                # Default to vendor's direct JACK x64 link if nothing saved
+                saved = "https://www.stereotool.com/download/stereo_tool_gui_jack_64"
+            self.latest_url_input.setText(saved)
+        except Exception:
+            pass
+
+    def _refresh_table(self):
+        self.table.setRowCount(len(self.instances))
+        active = self._active_link()
+        active_target = None
+        try:
+            if active.is_symlink():
+                active_target = os.path.realpath(str(active))
+        except Exception:
+            active_target = None
+        for i, inst in enumerate(self.instances):
+            self.table.setItem(i, 0, QTableWidgetItem(inst.get('name', ''))) 
+            self.table.setItem(i, 1, QTableWidgetItem(inst.get('version', ''))) 
+            self.table.setItem(i, 2, QTableWidgetItem(inst.get('path', ''))) 
+            is_active = (active_target == inst.get('path'))
+            self.table.setItem(i, 3, QTableWidgetItem("Yes" if is_active else "No"))
+            # Actions
+            w = QWidget()
+            h = QHBoxLayout(w)
+            h.setContentsMargins(0,0,0,0)
+            btn_act = QPushButton("Activate")
+            btn_act.clicked.connect(lambda checked, idx=i: self.activate(idx))
+            h.addWidget(btn_act)
+            btn_start = QPushButton("Start")
+            btn_start.clicked.connect(lambda checked, idx=i: self.start(idx))
+            h.addWidget(btn_start)
+            btn_stop = QPushButton("Stop")
+            btn_stop.clicked.connect(lambda checked, idx=i: self.stop(idx))
+            h.addWidget(btn_stop)
+            btn_rm = QPushButton("Remove")
+            btn_rm.clicked.connect(lambda checked, idx=i: self.remove(idx))
+            h.addWidget(btn_rm)
+            h.addStretch(1)
+            self.table.setCellWidget(i, 4, w)
+
+    def _save_instances(self):
+        try:
+            self._root().mkdir(parents=True, exist_ok=True)
+            with open(self._instances_file(), 'w') as f:
+                json.dump(self.instances, f, indent=2)
+        except Exception as e:
+            self.status.setText(f"⚠️ Could not save instances: {e}")
+
+    def _load_instances(self):
+        try:
+            p = self._instances_file()
+            if p.exists():
+                with open(p, 'r') as f:
+                    self.instances = json.load(f)
+            else:
+                self.instances = []
+        except Exception as e:
+            self.instances = []
+            self.status.setText(f"⚠️ Could not load instances: {e}")
+
+    def add_from_url(self):
+        try:
+            import urllib.request
+            from PyQt5.QtWidgets import QInputDialog
+            url, ok = QInputDialog.getText(self, "Add from URL", "Direct download URL (.tar.gz/.zip/.run):")
+            if not ok or not url.strip():
+                return
+            self._root().mkdir(parents=True, exist_ok=True)
+            dest = self._root() / os.path.basename(url)
+            self.status.setText(f"Downloading {url} → {dest}…")
+            urllib.request.urlretrieve(url, str(dest))
+            # If it's a plain binary, make executable; otherwise leave as archive
+            if dest.suffix == '' or dest.suffix == '.bin':
+                dest.chmod(0o755)
+                self._add_instance_record(name=dest.name, path=str(dest), version=self._guess_version(dest.name))
+            else:
+                self._add_instance_record(name=dest.name, path=str(dest), version=self._guess_version(dest.name))
+            self._save_instances()
+            self._refresh_table()
+            self.status.setText(f"✅ Added: {dest}")
+        except Exception as e:
+            QMessageBox.critical(self, "Download Error", f"Failed to download: {e}")
+
+    def download_from_latest(self):
+        """Download using the configured 'latest' URL (if present), else prompt for one and persist it."""
+        try:
+            import urllib.request
+            url = (self.latest_url_input.text() or "").strip()
+            if not url:
+                from PyQt5.QtWidgets import QInputDialog
+                url, ok = QInputDialog.getText(self, "Latest URL", "Paste the official 'latest' JACK x64 link:")
+                if not ok or not url.strip():
+                    return
+                self.latest_url_input.setText(url.strip())
+                self._save_latest_url()
+            self._root().mkdir(parents=True, exist_ok=True)
+            dest = self._root() / os.path.basename(url)
+            self.status.setText(f"Downloading {url} → {dest}…")
+            urllib.request.urlretrieve(url, str(dest))
+            try:
+                dest.chmod(0o755)
+            except Exception:
+                pass
+            self._add_instance_record(name=dest.name, path=str(dest), version=self._guess_version(dest.name))
+            self._save_instances()
+            self._refresh_table()
+            self.status.setText(f"✅ Downloaded: {dest}")
+        except Exception as e:
+            QMessageBox.critical(self, "Latest URL Error", f"Failed to download from latest URL: {e}")
+
+    def add_from_file(self):
+        try:
+            from PyQt5.QtWidgets import QFileDialog
+            path, _ = QFileDialog.getOpenFileName(self, "Select Stereo Tool binary or archive", str(Path.home()))
+            if not path:
+                return
+            src = Path(path)
+            self._root().mkdir(parents=True, exist_ok=True)
+            dest = self._root() / src.name
+            shutil.copy2(str(src), str(dest))
+            try:
+                dest.chmod(0o755)
+            except Exception:
+                pass
+            self._add_instance_record(name=dest.name, path=str(dest), version=self._guess_version(dest.name))
+            self._save_instances()
+            self._refresh_table()
+            self.status.setText(f"✅ Added: {dest}")
+        except Exception as e:
+            QMessageBox.critical(self, "Add Error", f"Failed to add file: {e}")
+
+    def download_latest(self):
+        """Fetch Thimeo downloads page, find Linux JACK x64 artifacts, and download one.
+        More robust parser: collects all hrefs, filters by keywords, lets user pick if multiple.
+        """
+        try:
+            import urllib.request
+            from urllib.parse import urljoin
+            from PyQt5.QtWidgets import QInputDialog
+            self._root().mkdir(parents=True, exist_ok=True)
+            base = "https://www.thimeo.com/stereo-tool/download/"
+            self.status.setText("Fetching Thimeo downloads page…")
+            html = urllib.request.urlopen(base, timeout=20).read().decode("utf-8", errors="ignore")
+            # Collect all hrefs
+            links = re.findall(r'href=["\']([^"\']+)["\']', html, flags=re.IGNORECASE)
+            candidates = []
+            for href in links:
+                href_l = href.lower()
+                if not href_l.startswith("http"):
+                    full = urljoin(base, href)
+                else:
+                    full = href
+                # Heuristics for Linux JACK x64 artifacts
+                if all(k in href_l for k in ["linux", "jack"]) and any(k in href_l for k in ["64", "x64", "amd64"]):
+                    if any(href_l.endswith(ext) for ext in [".run", ".zip", ".tar.gz", ".tgz", ".tar.xz"]) or "stereo_tool" in href_l:
+                        candidates.append(full)
+            # Deduplicate while preserving order
+            seen = set()
+            unique = []
+            for c in candidates:
+                if c not in seen:
+                    unique.append(c)
+                    seen.add(c)
+            if not unique:
+                # Fallback: use the known direct JACK x64 URL suggested by vendor
+                direct = "https://www.stereotool.com/download/stereo_tool_gui_jack_64"
+                candidates = [direct]
+                unique = candidates
+            pick = unique[0]
+            if len(unique) > 1:
+                item, ok = QInputDialog.getItem(self, "Select Artifact", "Choose a Stereo Tool artifact to download:", unique, 0, False)
+                if not ok or not item:
+                    return
+                pick = item
+            dest = self._root() / os.path.basename(pick)
+            self.status.setText(f"Downloading {pick} → {dest}…")
+            urllib.request.urlretrieve(pick, str(dest))
+            try:
+                dest.chmod(0o755)
+            except Exception:
+                pass
+            self._add_instance_record(name=dest.name, path=str(dest), version=self._guess_version(dest.name))
+            self._save_instances()
+            self._refresh_table()
+            self.status.setText(f"✅ Downloaded: {dest}")
+        except Exception as e:
+            QMessageBox.warning(self, "Auto-download failed",
+                                f"Could not auto-detect Linux JACK x64 artifact.\n{e}\n\n"
+                                "Please use 'Add from URL' or 'Add from File'.")
+
+    def _add_instance_record(self, name: str, path: str, version: str = ""):
+        self.instances.append({
+            "name": name,
+            "path": path,
+            "version": version,
+        })
+
+    def _guess_version(self, name: str) -> str:
+        m = re.search(r"([0-9]{3,4,5})", name)
+        return m.group(1) if m else ""
+
+        # ---- Persist 'latest' URL in settings.json ----
+    def _settings_path(self) -> Path:
+        p = Path.home() / ".config" / "rdx"
+        try:
+            p.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+        return p / "settings.json"
+
+    def _load_latest_url(self) -> str:
+        try:
+            sp = self._settings_path()
+            if sp.exists():
+                with open(sp, 'r') as f:
+                    data = json.load(f)
+                return str(data.get('st_latest_url', ''))
+        except Exception:
+            pass
+        return ""
+
+    def _save_latest_url(self):
+        try:
+            sp = self._settings_path()
+            data = {}
+            if sp.exists():
+                try:
+                    with open(sp, 'r') as f:
+                        data = json.load(f) or {}
+                except Exception:
+                    data = {}
+            data['st_latest_url'] = self.latest_url_input.text().strip()
+            with open(sp, 'w') as f:
+                json.dump(data, f, indent=2)
+        except Exception:
+            pass
+
+    def activate(self, idx: int):
+        try:
+            inst = self.instances[idx]
+            target = Path(inst.get('path', ''))
+            if not target.exists():
+                QMessageBox.warning(self, "Missing File", f"Binary not found: {target}")
+                return
+            root = self._root()
+            root.mkdir(parents=True, exist_ok=True)
+            link = self._active_link()
+            if link.exists() or link.is_symlink():
+                try:
+                    link.unlink()
+                except Exception:
+                    pass
+            os.symlink(str(target), str(link))
+            # Write unit file (with readiness gates consistent with Service Control)
+            unit_dir = Path.home() / ".config" / "systemd" / "user"
+            unit_dir.mkdir(parents=True, exist_ok=True)
+            unit_path = unit_dir / "rdx-stereotool-active.service"
+            # Readiness gates: JACK (hard), then the active encoder's ports (soft)
+            enc_glob = rdx_wait.ENCODERS
+            try:
+                sp = Path.home() / ".config" / "rdx" / "settings.json"
+                if sp.exists():
+                    with open(sp, 'r') as f:
+                        data = json.load(f)
+                    val = str(data.get('active_encoder','')).lower()
+                    if val in ("liquidsoap","darkice","butt","glasscoder"):
+                        enc_glob = val
+            except Exception:
+                pass
+            pre_jack = rdx_wait.exec_start_pre()
+            pre_enc = rdx_wait.exec_start_pre(clients=[enc_glob], soft=True)
+            unit = f"""[Unit]
+Description=RDX Stereo Tool (active instance)
+After=default.target
+Wants=default.target
+{rdx_supervisor.UNIT_POLICY}
+[Service]
+Type=simple
+{pre_jack}{pre_enc}ExecStart={str(link)}
+{rdx_supervisor.RESTART_POLICY}
+[Install]
+WantedBy=default.target
+"""
+            unit_path.write_text(unit, encoding="utf-8")
+            rdx_runner.run(["systemctl", "--user", "daemon-reload"], check=False)
+            rdx_runner.run(["systemctl", "--user", "enable", "rdx-stereotool-active"], check=False)
+            self._refresh_table()
+            QMessageBox.information(self, "Activated", f"Active Stereo Tool set to: {target}")
+        except Exception as e:
+            QMessageBox.critical(self, "Activate Error", f"Failed to activate: {e}")
+
+    def start(self, idx: int):
+        try:
+            # Ensure unit exists
+            unit_path = Path.home() / ".config" / "systemd" / "user" / "rdx-stereotool-active.service"
+            if not unit_path.exists():
+                self.activate(idx)
+            rdx_runner.run(["systemctl", "--user", "start", "rdx-stereotool-active", "--no-block"], check=False)
+        except Exception as e:
+            QMessageBox.critical(self, "Start Error", f"Failed to start: {e}")
+
+    def stop(self, idx: int):
+        try:
+            rdx_runner.run(["systemctl", "--user", "stop", "rdx-stereotool-active", "--no-block"], check=False)
+        except Exception as e:
+            QMessageBox.critical(self, "Stop Error", f"Failed to stop: {e}")
+
+    def remove(self, idx: int):
+        try:
+            inst = self.instances[idx]
+            path = Path(inst.get('path', ''))
+            # Avoid deleting if it's the active symlink target
+            active_target = None
+            try:
+                if self._active_link().is_symlink():
+                    active_target = os.path.realpath(str(self._active_link()))
+            except Exception:
+                active_target = None
+            if active_target and str(path) == active_target:
+                QMessageBox.warning(self, "In Use", "This instance is active. Deactivate first.")
+                return
+            # Remove file
+            try:
+                if path.exists():
+                    path.unlink()
+            except Exception:
+                pass
+            # Remove from list
+            del self.instances[idx]
+            self._save_instances()
+            self._refresh_table()
+        except Exception as e:
+            QMessageBox.critical(self, "Remove Error", f"Failed to remove: {e}")
@@ -0,0 +1,329 @@
+"""
+Stream Builder tab: define streams and generate the Liquidsoap configuration.
+"""
+
+import os
+import json
+from pathlib import Path
+
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QPushButton, QWidget, QMessageBox,
+                             QGroupBox, QTextEdit, QComboBox, QLineEdit, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QFormLayout, QSizePolicy)
+
+from rdx import streaming as rdx_streaming
+from .common import run_async
+
+
+class StreamBuilderTab(QWidget):
+    """Tab 1: Stream Builder - Create and manage streaming configurations"""
+    
+    def __init__(self, main_window=None):
+        super().__init__()
+        self.main_window = main_window
+        self.streams = []  # List to store configured streams
+        self.setup_ui()
+        self.load_streams()  # Load saved streams on startup
+        
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        # Stream Builder Section
+        builder_group = QGroupBox("🎵 Add New Stream")
+        form = QFormLayout(builder_group)
+
+        # Codec and Bitrate
+        self.codec_input = QComboBox()
+        self.codec_input.addItems(["MP3", "AAC+", "FLAC", "OGG", "OPUS"])
+        form.addRow("Codec:", self.codec_input)
+
+        self.bitrate_input = QComboBox()
+        self.bitrate_input.addItems(["64 kbps", "96 kbps", "128 kbps", "192 kbps", "256 kbps", "320 kbps"])
+        form.addRow("Bitrate:", self.bitrate_input)
+
+        # Mount and Metadata
+        self.mount_input = QLineEdit("/stream")
+        form.addRow("Mount:", self.mount_input)
+
+        self.station_name_input = QLineEdit()
+        form.addRow("Station Name:", self.station_name_input)
+
+        self.genre_input = QLineEdit()
+        form.addRow("Genre:", self.genre_input)
+
+        self.description_input = QLineEdit()
+        form.addRow("Description:", self.description_input)
+
+        add_btn = QPushButton("➕ Add Stream")
+        add_btn.clicked.connect(self.add_stream)
+        form.addRow(add_btn)
+
+        layout.addWidget(builder_group)
+
+        # Streams table
+        self.streams_table = QTableWidget()
+        self.streams_table.setColumnCount(7)
+        self.streams_table.setHorizontalHeaderLabels(["Codec", "Bitrate", "Mount", "Station Name", "Genre", "Description", "Actions"])
+        self.streams_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        layout.addWidget(self.streams_table)
+
+        # Actions (Generate/Apply)
+        actions_row = QHBoxLayout()
+        gen_btn = QPushButton("🔧 Generate Liquidsoap Config")
+        gen_btn.setStyleSheet("QPushButton { background-color: #3498db; color: white; font-weight: bold; padding: 10px; font-size: 14px; }")
+        gen_btn.setMinimumHeight(44)
+        gen_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        gen_btn.clicked.connect(self.generate_liquidsoap_config)
+        actions_row.addWidget(gen_btn)
+
+        apply_btn = QPushButton("📡 Apply to Icecast")
+        apply_btn.setStyleSheet("QPushButton { background-color: #27ae60; color: white; font-weight: bold; padding: 10px; font-size: 14px; }")
+        apply_btn.setMinimumHeight(44)
+        apply_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        apply_btn.clicked.connect(self.apply_to_icecast)
+        actions_row.addWidget(apply_btn)
+
+        actions_row.addStretch(1)
+        layout.addLayout(actions_row)
+
+        # Status area group
+        status_group = QGroupBox("📄 Configuration Status")
+        status_layout = QVBoxLayout(status_group)
+        self.status_text = QTextEdit()
+        self.status_text.setReadOnly(True)
+        status_layout.addWidget(self.status_text)
+        layout.addWidget(status_group)
+
+    def add_stream(self):
+        """Add a new stream configuration from inputs"""
+        codec = self.codec_input.currentText()
+        bitrate = self.bitrate_input.currentText()
+        mount = self.mount_input.text().strip()
+        station_name = self.station_name_input.text().strip()
+        genre = self.genre_input.text().strip()
+        description = self.description_input.text().strip()
+
+        if not mount:
+            QMessageBox.warning(self, "Missing Mount", "Please enter a mount point (e.g., /stream).")
+            return
+        if not mount.startswith('/'):
+            mount = '/' + mount
+
+        # Prevent duplicates
+        for s in self.streams:
+            if s.get('mount') == mount:
+                QMessageBox.warning(self, "Duplicate Mount", f"Mount point {mount} already exists!")
+                return
+
+        stream = {
+            'codec': codec,
+            'bitrate': bitrate,
+            'mount': mount,
+            'station_name': station_name,
+            'genre': genre if genre else 'Various',
+            'description': description if description else f'{codec} stream at {bitrate}'
+        }
+        self.streams.append(stream)
+
+        # Update UI and persist
+        self.refresh_streams_table()
+        self.save_streams()
+
+        # Clear some inputs
+        self.mount_input.clear()
+        self.station_name_input.clear()
+        self.genre_input.clear()
+        self.description_input.clear()
+
+        self.status_text.append(f"✅ Added stream: {codec} {bitrate} → {mount}")
+    def refresh_streams_table(self):
+        """Refresh the streams table"""
+        self.streams_table.setRowCount(len(self.streams))
+        
+        for row, stream in enumerate(self.streams):
+            self.streams_table.setItem(row, 0, QTableWidgetItem(stream['codec']))
+            self.streams_table.setItem(row, 1, QTableWidgetItem(stream['bitrate']))
+            self.streams_table.setItem(row, 2, QTableWidgetItem(stream['mount']))
+            self.streams_table.setItem(row, 3, QTableWidgetItem(stream.get('station_name', '')))
+            self.streams_table.setItem(row, 4, QTableWidgetItem(stream.get('genre', '')))
+            self.streams_table.setItem(row, 5, QTableWidgetItem(stream.get('description', '')))
+            
+            # Remove button
+            remove_btn = QPushButton("🗑️ Remove")
+            remove_btn.setStyleSheet("QPushButton { background-color: #e74c3c; color: white; }")
+            remove_btn.clicked.connect(lambda checked, r=row: self.remove_stream(r))
+            self.streams_table.setCellWidget(row, 6, remove_btn)
+            
+    def remove_stream(self, row):
+        """Remove a stream configuration"""
+        if 0 <= row < len(self.streams):
+            removed_stream = self.streams.pop(row)
+            self.refresh_streams_table()
+            self.save_streams()  # Save after removal
+            self.status_text.append(f"🗑️ Removed stream: {removed_stream['codec']} {removed_stream['bitrate']} → {removed_stream['mount']}")
+            
+    def generate_liquidsoap_config(self):
+        """Write radio.liq and bring a running Liquidsoap in line with it, live where possible"""
+        if not self.streams:
+            QMessageBox.warning(self, "No Streams", "Please add at least one stream before generating config.")
+            return
+        streams = list(self.streams)
+        self.status_text.append("⏳ Applying streams…")
+        run_async(lambda: rdx_streaming.apply_streams(streams, restart=False), self._on_streams_applied, self)
+
+    def _on_streams_applied(self, res, restarted=False):
+        if res is None:
+            self.status_text.append("❌ Failed to apply streams")
+            return
+        for change in res['changes']:
+            self.status_text.append(f"   {change}")
+        action = res['action']
+        if action == "pending" and not restarted:
+            answer = QMessageBox.question(
+                self, "Restart Liquidsoap?",
+                f"{res['message']}.\n\nRestarting Liquidsoap drops every listener on every mount "
+                "for a few seconds. Restart now?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if answer != QMessageBox.Yes:
+                self.status_text.append("⚠️ radio.liq written; restart Liquidsoap to use it")
+                return
+            # Ours, not a crash: tell the daemon's supervisor before the worker restarts it
+            services = getattr(self.main_window, 'service_control', None)
+            if services is not None:
+                services._announce('liquidsoap', "restart")
+            streams = list(self.streams)
+            run_async(lambda: rdx_streaming.apply_streams(streams),
+                      lambda r: self._on_streams_applied(r, restarted=True), self)
+            return
+        icon = "✅" if res['ok'] else "❌"
+        text = {'none': "Liquidsoap already matches radio.liq",
+                'hot': "Streams changed live; other mounts kept their listeners",
+                'restart': "Liquidsoap restarted with the new config",
+                'written': "Generated Liquidsoap config"}.get(action, action)
+        self.status_text.append(f"{icon} {text}" + (f" ({res['message']})" if res['message'] else ""))
+        self.status_text.append(f"📄 Configured {len(self.streams)} stream(s)")
+
+    def get_config_directory(self):
+        """Get the application config directory, creating it if needed with proper ownership"""
+        import getpass
+        import pwd
+        import grp
+        
+        # Always use standard config directory - no fallbacks
+        config_dir = Path.home() / ".config" / "rdx"
+        
+        try:
+            current_user = getpass.getuser()
+            user_info = pwd.getpwnam(current_user)
+            user_uid = user_info.pw_uid
+            user_gid = user_info.pw_gid
+            
+            # Ensure parent .config directory exists and has correct ownership
+            config_parent = config_dir.parent
+            config_parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.chown(config_parent, user_uid, user_gid)
+            except (PermissionError, OSError):
+                # If we can't fix .config ownership, try to continue anyway
+                pass
+            
+            # Create and fix ownership of rdx directory
+            config_dir.mkdir(parents=True, exist_ok=True)
+            os.chown(config_dir, user_uid, user_gid)
+            
+            # Set proper permissions (755 for directory)
+            config_dir.chmod(0o755)
+            
+            # Test write access
+            test_file = config_dir / ".test"
+            test_file.touch()
+            test_file.unlink()
+            
+            return config_dir
+            
+        except (PermissionError, OSError) as e:
+            # Try to provide helpful error message and recovery
+            error_msg = f"Cannot create or access config directory {config_dir}: {e}\n\n"
+            error_msg += "To fix this manually:\n"
+            error_msg += f"sudo mkdir -p {config_dir}\n"
+            error_msg += f"sudo chown {current_user}:{current_user} {config_dir}\n"
+            error_msg += f"sudo chown {current_user}:{current_user} {config_parent}\n"
+            error_msg += f"sudo chmod 755 {config_dir}\n"
+            raise Exception(error_msg)
+            raise Exception(f"Cannot create config directory {config_dir}: {e}\nCheck permissions on ~/.config/")
+            
+    def load_streams(self):
+        """Load streams from persistent storage"""
+        try:
+            config_dir = self.get_config_directory()
+            streams_file = config_dir / "streams.json"
+            
+            if streams_file.exists():
+                with open(streams_file, 'r') as f:
+                    self.streams = json.load(f)
+                self.refresh_streams_table()
+                self.status_text.append(f"📂 Loaded {len(self.streams)} stream(s) from {streams_file}")
+        except Exception as e:
+            self.status_text.append(f"⚠️ Could not load saved streams: {str(e)}")
+            
+    def save_streams(self):
+        """Save streams to persistent storage"""
+        try:
+            config_dir = self.get_config_directory()
+            streams_file = config_dir / "streams.json"
+            
+            with open(streams_file, 'w') as f:
+                json.dump(self.streams, f, indent=2)
+                
+        except Exception as e:
+            self.status_text.append(f"⚠️ Could not save streams: {str(e)}")
+            
+    def build_liquidsoap_config(self):
+        """Build Liquidsoap configuration string"""
+        return rdx_streaming.build_liquidsoap_config(self.streams)
+        
+    def get_codec_config(self, codec, bitrate):
+        """Get codec-specific configuration"""
+        return rdx_streaming.codec_config(codec, bitrate)
+
+    def _has_fdkaac(self) -> bool:
+        """Return True if Liquidsoap fdkaac encoder is available (OPAM-aware)."""
+        return rdx_streaming.has_encoder("fdkaac")
+            
+    def apply_to_icecast(self):
+        """Apply stream configuration to Icecast"""
+        if not self.streams:
+            QMessageBox.warning(self, "No Streams", "Please add at least one stream before applying to Icecast.")
+            return
+            
+        # This will be implemented in the Icecast management tab
+        self.status_text.append("📡 Stream configuration ready for Icecast application")
+        self.status_text.append("🔄 Switch to Icecast Management tab to apply configuration")
+
+    def save_streams(self):
+        """Save current streams configuration to config file"""
+        try:
+            config_dir = self.get_config_directory()
+            streams_file = config_dir / "streams.json"
+            
+            with open(streams_file, 'w') as f:
+                json.dump(self.streams, f, indent=2)
+                
+        except Exception as e:
+            self.status_text.append(f"⚠️ Failed to save streams: {str(e)}")
+            
+    def load_streams(self):
+        """Load streams configuration from config file"""
+        try:
+            config_dir = self.get_config_directory()
+            streams_file = config_dir / "streams.json"
+            
+            if streams_file.exists():
+                with open(streams_file, 'r') as f:
+                    self.streams = json.load(f)
+                self.refresh_streams_table()
+                if self.streams:
+                    self.status_text.append(f"✅ Loaded {len(self.streams)} saved stream(s)")
+                    
+        except Exception as e:
+            self.status_text.append(f"⚠️ Failed to load streams: {str(e)}")
+            self.streams = []  # Reset to empty list if loading fails
@@ -0,0 +1,631 @@
+"""
+JACK helpers built on the jack_lsp / jack_connect command-line tools.
+
+These mirror what the JACK Graph tab does so the daemon, the CLI and the GUI
+share one implementation. Everything here is best-effort: probes time out
+quickly and return empty results instead of raising.
+"""
+
+import functools
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+from . import runner
+
+
+def run(args: list, timeout: float = 0.8):
+    """subprocess.run wrapper that turns a timeout into a failed CompletedProcess."""
+    try:
+        return runner.run(args, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return subprocess.CompletedProcess(args=args, returncode=1, stdout="", stderr="timeout")
+    except FileNotFoundError:
+        return subprocess.CompletedProcess(args=args, returncode=127, stdout="", stderr=f"{args[0]}: not found")
+
+
+def is_running(timeout: float = 0.7) -> bool:
+    return run(["jack_lsp"], timeout=timeout).returncode == 0
+
+
+def _guess_direction(port: str):
+    """Direction from the port name, for output without a properties line."""
+    pn = port.split(":", 1)[1].lower()
+    if "out" in pn and "in" not in pn:
+        return "out"
+    if "in" in pn and "out" not in pn:
+        return "in"
+    return None
+
+
+def _port_type(line: str) -> str:
+    low = line.lower()
+    if low.endswith("audio"):
+        return "audio"
+    if low.endswith("midi"):
+        return "midi"
+    return line
+
+
+def parse_topology(txt: str):
+    """Parse 'jack_lsp -c -p -t' output in one pass.
+
+    Returns (ports, connections, types):
+    - ports: {client: {"in": [ports], "out": [ports]}} in jack_lsp order
+    - connections: (output, input) tuples, each connection once
+    - types: {port: "audio" | "midi" | raw type string} for ports with a type line
+
+    jack_lsp prints each port unindented, then its connections indented with
+    spaces, then tab-indented property and type lines. Ports without a
+    properties line (plain 'jack_lsp') get a direction guessed from the name.
+    Works on the output of any subset of -c/-p/-t.
+    """
+    entries = []  # [port, direction, peers]
+    types = {}
+    cur = None
+    for raw in (txt or "").splitlines():
+        line = raw.rstrip()
+        if not line:
+            continue
+        body = line.strip()
+        is_props = body[:11].lower() == "properties:"
+        if not line[0].isspace() and not is_props:
+            if ":" in line:
+                cur = [line, None, []]
+                entries.append(cur)
+            else:
+                cur = None
+            continue
+        if cur is None:
+            continue
+        # Any indentation for properties (older jack_lsp builds used spaces)
+        if is_props:
+            cur[1] = "out" if "output" in body[11:] else "in"
+        elif line[0] == "\t":
+            types[cur[0]] = _port_type(body)
+        else:
+            cur[2].append(body)
+
+    ports = {}
+    direction = {}
+    for port, d, _ in entries:
+        d = d or _guess_direction(port)
+        direction[port] = d
+        lists = ports.setdefault(port.split(":", 1)[0], {"in": [], "out": []})
+        if d:
+            lists[d].append(port)
+    # Each connection is listed under both ends: keep it from the more output-like
+    # side (out, unknown, in), by name on a tie; a peer jack_lsp did not list is kept as is
+    rank = {"out": 0, None: 1, "in": 2}
+    cons = []
+    for port, _, peers in entries:
+        r = rank[direction[port]]
+        for peer in peers:
+            if peer not in direction:
+                cons.append((peer, port) if r == 2 else (port, peer))
+                continue
+            pr = rank[direction[peer]]
+            if r < pr or (r == pr and port < peer):
+                cons.append((port, peer))
+    return ports, cons, types
+
+
+def parse_ports(txt: str) -> dict:
+    """Parse 'jack_lsp -p' output into {client: {"in": [ports], "out": [ports]}}."""
+    return parse_topology(txt)[0]
+
+
+def parse_connections(txt: str) -> list:
+    """Parse 'jack_lsp -c' output into a list of (src, dst) tuples."""
+    cons = []
+    src = None
+    for line in (txt or "").splitlines():
+        if not line:
+            continue
+        # New source line has no leading whitespace (spaces or tabs)
+        if not line[:1].isspace():
+            src = line.strip()
+            continue
+        # Destination lines can have any indentation; accept if there is a current src
+        if src:
+            dst = line.strip()
+            if dst:
+                cons.append((src, dst))
+    return cons
+
+
+def list_ports(timeout: float = 3.0) -> dict:
+    res = run(["jack_lsp", "-p"], timeout=timeout)
+    return parse_ports(res.stdout) if res.returncode == 0 else {}
+
+
+def list_connections(timeout: float = 1.2) -> list:
+    return parse_connections(run(["jack_lsp", "-c"], timeout=timeout).stdout)
+
+
+def list_topology(timeout: float = 3.0):
+    """Ports, connections and types from one 'jack_lsp -c -p -t'; None when JACK is not running."""
+    res = run(["jack_lsp", "-c", "-p", "-t"], timeout=timeout)
+    if res.returncode != 0:
+        return None
+    return parse_topology(res.stdout)
+
+
+def is_connected(src_port: str, dst_port: str) -> bool:
+    return (src_port, dst_port) in set(list_connections())
+
+
+def connect(src_port: str, dst_port: str):
+    """Connect two ports; raises RuntimeError with guidance when JACK refuses."""
+    r = run(["jack_connect", src_port, dst_port], timeout=1.8)
+    if r.returncode == 0:
+        return
+    msg = (r.stderr or r.stdout or "jack_connect failed").strip()
+    low = msg.lower()
+    if "already connected" in low or is_connected(src_port, dst_port):
+        return
+    # Try jackdbus Patchbay fallback to avoid metadata/MLock failures in jack_connect
+    try:
+        if shutil.which("jack_control") and shutil.which("dbus-send"):
+            jc = run(["jack_control", "status"], timeout=1.5)
+            if "started" in (jc.stdout or "").lower():
+                db = run([
+                    "dbus-send", "--print-reply", "--type=method_call",
+                    "--dest=org.jackaudio.service",
+                    "/org/jackaudio/Patchbay",
+                    "org.jackaudio.JackPatchbay.ConnectPorts",
+                    f"string:{src_port}", f"string:{dst_port}"
+                ], timeout=2.0)
+                if db.returncode == 0 and is_connected(src_port, dst_port):
+                    return
+    except Exception:
+        pass
+    hint = None
+    if ("bdb" in low or "metadata db" in low or "/dev/shm/jack_db" in low or "mutex" in low) or ("cannot lock down" in low):
+        try:
+            uid = os.getuid()
+        except Exception:
+            uid = None
+        shm_path = f"/dev/shm/jack_db-{uid}" if uid is not None else "/dev/shm/jack_db-<uid>"
+        hint = (
+            "\n\nSuggestions:\n"
+            "- Increase realtime limits: add to /etc/security/limits.d/audio.conf and re-login:\n"
+            "    @audio - rtprio 95\n    @audio - memlock unlimited\n    @audio - nice -19\n"
+            "- Ensure your user is in the 'audio' group (then log out/in):\n"
+            "    sudo usermod -aG audio $USER\n"
+            "- Make sure /dev/shm has free space: df -h /dev/shm\n"
+            f"- If the JACK metadata DB is wedged, stop JACK/clients and clear: sudo rm -rf {shm_path}\n"
+            "  (Only after fully stopping jackd/jackdbus; it will be recreated automatically.)\n"
+        )
+    raise RuntimeError(msg + (hint or ""))
+
+
+def disconnect(src_port: str, dst_port: str) -> bool:
+    return run(["jack_disconnect", src_port, dst_port], timeout=1.2).returncode == 0
+
+
+# ---- Batched connect/disconnect ----
+
+TX_WORKERS = 8
+
+
+def _import_pyjack():
+    """python-jack-client if installed, else None; imported on first use (it loads libjack)."""
+    try:
+        import jack as _pyjack
+    except Exception:
+        _pyjack = None
+    return _pyjack
+
+
+def _linked(links: set, src: str, dst: str) -> bool:
+    return (src, dst) in links or (dst, src) in links
+
+
+def _tx_in_process(pending: list, client) -> list:
+    """Run operations through a JACK client; returns the ones that still need the tools."""
+    own = None
+    if client is None:
+        _pyjack = _import_pyjack()
+        if _pyjack is None:
+            return pending
+        try:
+            own = client = _pyjack.Client("rdx-tx", no_start_server=True)
+            client.activate()
+        except Exception:
+            if own is not None:
+                try:
+                    own.close()
+                except Exception:
+                    pass
+            return pending
+    leftover = []
+    try:
+        for r in pending:
+            try:
+                if r['op'] == "connect":
+                    client.connect(r['src'], r['dst'])
+                else:
+                    client.disconnect(r['src'], r['dst'])
+            except Exception as e:
+                r['error'] = str(e)
+                leftover.append(r)
+    finally:
+        if own is not None:
+            try:
+                own.deactivate()
+                own.close()
+            except Exception:
+                pass
+    return leftover
+
+
+def _tx_tools(pending: list, workers: int):
+    """jack_connect / jack_disconnect for each operation, several at a time."""
+    def one(r):
+        if r['op'] == "connect":
+            try:
+                connect(r['src'], r['dst'])
+            except RuntimeError as e:
+                r['error'] = str(e).split("\n\n", 1)[0]
+                r['detail'] = str(e)   # with connect()'s suggestions, for apply_pair()
+        elif not disconnect(r['src'], r['dst']):
+            r['error'] = "jack_disconnect failed"
+
+    if len(pending) == 1 or workers <= 1:
+        for r in pending:
+            one(r)
+        return
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+        list(pool.map(one, pending))
+
+
+def transaction(ops, client=None, workers: int = TX_WORKERS, topology=None, origin: str = None) -> dict:
+    """Apply a batch of connect/disconnect operations and verify them together.
+
+    ``ops`` is a list of ("connect" | "disconnect", src, dst); pairs given
+    input-first are turned round. One topology
+    snapshot up front (or ``topology`` as returned by list_topology) drops
+    duplicates, no-ops and pairs whose ports do not exist. The rest run
+    in-process through ``client`` (the daemon's JACK client) or a short-lived
+    client when python-jack-client is installed; whatever that cannot do runs
+    as concurrent jack_connect / jack_disconnect calls. One snapshot at the
+    end decides every result.
+
+    Returns {"applied", "total", "errors", "results"}. Each result is
+    {"op", "src", "dst", "status"} with status "done", "unchanged" (already in
+    the wanted state), "missing" (a port does not exist) or "failed" (with
+    "error"); "applied" counts done + unchanged. With ``origin`` the done
+    operations are recorded in the routing journal (rdx.journal).
+    """
+    results = []
+    seen = set()
+    for op, src, dst in ops:
+        key = (op, frozenset((src, dst)))
+        if key in seen:
+            continue
+        seen.add(key)
+        results.append({'op': op, 'src': src, 'dst': dst})
+    topo = topology if topology is not None else list_topology()
+    if topo is None:
+        for r in results:
+            r.update(status="failed", error="JACK is not running")
+        return _tx_summary(results)
+    ports, cons = topo[0], topo[1]
+    present = set()
+    for d in ports.values():
+        present.update(d.get("in", []))
+        present.update(d.get("out", []))
+    links = set(map(tuple, cons))
+    outputs = set()
+    for d in ports.values():
+        outputs.update(d.get("out", []))
+    pending = []
+    for r in results:
+        if r['dst'] in outputs and r['src'] not in outputs:
+            r['src'], r['dst'] = r['dst'], r['src']  # JACK wants output -> input
+        if r['op'] not in ("connect", "disconnect"):
+            r.update(status="failed", error=f"unknown operation '{r['op']}'")
+        elif r['src'] not in present or r['dst'] not in present:
+            r['status'] = "missing"
+        elif _linked(links, r['src'], r['dst']) == (r['op'] == "connect"):
+            r['status'] = "unchanged"
+        else:
+            pending.append(r)
+    if pending:
+        leftover = _tx_in_process(pending, client)
+        for r in leftover:
+            r.pop('error', None)
+        _tx_tools(leftover, workers)
+        final = list_topology()
+        links = set(final[1]) if final is not None else set()
+        for r in pending:
+            if final is not None and _linked(links, r['src'], r['dst']) == (r['op'] == "connect"):
+                r['status'] = "done"
+                r.pop('error', None)
+                r.pop('detail', None)
+            else:
+                r['status'] = "failed"
+                r.setdefault('error', "JACK is not running" if final is None else f"{r['op']} did not take effect")
+        if origin:
+            from . import journal
+            journal.record(origin, [(r['op'], r['src'], r['dst']) for r in pending if r['status'] == "done"])
+    return _tx_summary(results)
+
+
+def apply_pair(op: str, src: str, dst: str, origin: str = None, client=None) -> str:
+    """One connect/disconnect as a transaction(); returns "done" or "unchanged".
+
+    Unlike connect()/disconnect(), a pair that was already in the wanted
+    state is told apart, so with ``origin`` only a change that took effect is
+    journaled. Raises RuntimeError when a port is missing or JACK refused.
+    """
+    (r,) = transaction([(op, src, dst)], client=client, origin=origin)['results']
+    if r['status'] == "missing":
+        raise RuntimeError(f"port not found: {src} -> {dst}")
+    if r['status'] == "failed":
+        raise RuntimeError(r.get('detail') or r.get('error') or f"{op} failed")
+    return r['status']
+
+
+def _tx_summary(results: list) -> dict:
+    errors = [f"{r['src']} -> {r['dst']}: {r.get('error', 'failed')}" for r in results if r['status'] == "failed"]
+    applied = sum(1 for r in results if r['status'] in ("done", "unchanged"))
+    return {'applied': applied, 'total': len(results), 'errors': errors, 'results': results}
+
+
+# ---- Emergency disconnect ----
+
+PANIC_DEADLINE = 0.2   # seconds
+PANIC_WORKERS = 32
+
+
+def protected_file():
+    from . import config
+    return config.config_dir() / "jack_protected.json"
+
+
+def load_protected() -> set:
+    """Protected client pairs as {"src_client→dst_client", ...} (shared with the JACK tabs)."""
+    from . import config
+    data = config.load_json(protected_file(), {})
+    pairs = data.get("pairs", []) if isinstance(data, dict) else []
+    return {str(x) for x in pairs}
+
+
+def protected_key(src: str, dst: str) -> str:
+    return f"{src.split(':', 1)[0]}→{dst.split(':', 1)[0]}"
+
+
+def panic_log_file():
+    from . import config
+    return config.config_dir() / "emergency-disconnect.log"
+
+
+def panic_disconnect(connections=None, protected=None, deadline: float = PANIC_DEADLINE, client=None,
+                     log: bool = True) -> dict:
+    """Cut every connection whose client pair is not protected, within ``deadline`` seconds.
+
+    ``connections`` is the caller's cached [(output, input), ...] (the daemon's
+    topology or the last graph refresh), so nothing is probed first; None
+    reads one snapshot. The cuts go out in one batch: in-process through
+    ``client`` (or a short-lived client) and otherwise as concurrent
+    jack_disconnect calls. Calls still running at the deadline are reported
+    as "pending" and left to finish in the background; if the in-process
+    batch itself has not finished by then, all of it is.
+
+    Returns {"time", "deadline_ms", "elapsed_ms", "cut", "failed", "pending",
+    "kept"} with lists of [src, dst]. Unless ``log`` is False or nothing was
+    cut, the same record is appended to emergency-disconnect.log, which
+    restore_panic() replays.
+    """
+    start = time.monotonic()
+    end = start + deadline
+    if connections is None:
+        topo = list_topology(timeout=max(deadline, 0.1))
+        connections = topo[1] if topo else []
+    if protected is None:
+        protected = load_protected()
+    cut, kept = [], []
+    for src, dst in connections:
+        (kept if protected_key(src, dst) in protected else cut).append([src, dst])
+    failed, pending = [], []
+    if cut:
+        from concurrent.futures import ThreadPoolExecutor, wait
+        pool = ThreadPoolExecutor(max_workers=min(PANIC_WORKERS, len(cut)))
+        # The in-process batch runs against the deadline too: opening a short-lived
+        # client, or a JACK server that is slow to answer, can take far longer
+        step = pool.submit(_tx_in_process, [{'op': "disconnect", 'src': s, 'dst': d} for s, d in cut], client)
+        if not wait([step], timeout=max(0.0, end - time.monotonic()))[0]:
+            pool.shutdown(wait=False)
+
+            def _finish():
+                try:
+                    for r in step.result():
+                        disconnect(r['src'], r['dst'])
+                except Exception:
+                    pass
+
+            threading.Thread(target=_finish, name="rdx-panic-finish", daemon=True).start()
+            pending, cut = cut, []
+        else:
+            leftover = [[r['src'], r['dst']] for r in step.result()]
+            futures = {pool.submit(disconnect, s, d): [s, d] for s, d in leftover}
+            done, not_done = wait(futures, timeout=max(0.0, end - time.monotonic())) if futures else ((), ())
+            pool.shutdown(wait=False)
+            failed = [futures[f] for f in done if not f.result()]
+            pending = [futures[f] for f in not_done]
+            settled = {tuple(p) for p in failed + pending}
+            cut = [p for p in cut if tuple(p) not in settled]
+    res = {
+        'time': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'deadline_ms': round(deadline * 1000.0, 1),
+        'elapsed_ms': round((time.monotonic() - start) * 1000.0, 1),
+        'cut': cut,
+        'failed': failed,
+        'pending': pending,
+        'kept': kept,
+    }
+    if log and (cut or failed or pending):
+        from . import journal
+        journal.record("panic", [("disconnect", s, d) for s, d in cut + pending])
+        try:
+            path = panic_log_file()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a") as f:
+                f.write(json.dumps(res) + "\n")
+        except Exception:
+            pass
+    return res
+
+
+def last_panic():
+    """The most recent emergency-disconnect.log record, or None."""
+    try:
+        with open(panic_log_file()) as f:
+            lines = [line for line in f if line.strip()]
+        return json.loads(lines[-1]) if lines else None
+    except Exception:
+        return None
+
+
+def restore_panic(record=None, client=None) -> dict:
+    """Reconnect what an emergency disconnect cut (the last logged one by default), as one transaction.
+
+    Raises LookupError when there is nothing to restore.
+    """
+    record = record or last_panic()
+    if not record:
+        raise LookupError("no emergency disconnect recorded")
+    pairs = record.get('cut', []) + record.get('pending', [])
+    return transaction([("connect", s, d) for s, d in pairs], client=client, origin="panic-restore")
+
+
+# Port-name patterns for stereo pairing, compiled once
+_SIDE_L = re.compile(r"(^|[_.\-:])l(eft)?($|[_.\-:])")
+_SIDE_R = re.compile(r"(^|[_.\-:])r(ight)?($|[_.\-:])")
+_TRAIL_L = re.compile(r"[a-zA-Z0-9]_?[lL]$")   # record_0L
+_TRAIL_R = re.compile(r"[a-zA-Z0-9]_?[rR]$")
+_INDEX = re.compile(r"(?:[_:\-])(\d+)$")
+_STRIP_SIDE = re.compile(r"([_.:\-])?(l(eft)?|r(ight)?)$")
+_STRIP_INDEX = re.compile(r"([_.:\-])(\d+)$")
+
+
+@functools.lru_cache(maxsize=8192)
+def classify_port(port: str) -> tuple:
+    """(client, base, side, index) for a full port name, computed once per name.
+
+    ``side`` is "L", "R" or None; ``index`` is a trailing number or None; ``base``
+    is the lower-cased short name without them, so playout_0L and playout_0R
+    share a base, as do capture_1 and capture_2.
+    """
+    client, sep, pn = port.partition(":")
+    if not sep:
+        client, pn = "", port
+    pl = pn.lower()
+    side = None
+    if _SIDE_L.search(pl):
+        side = "L"
+    if _SIDE_R.search(pl):
+        side = "R"
+    if side is None and _TRAIL_L.search(pn):
+        side = "L"
+    if side is None and _TRAIL_R.search(pn):
+        side = "R"
+    m = _INDEX.search(pl)
+    index = int(m.group(1)) if m else None
+    base = _STRIP_INDEX.sub("", _STRIP_SIDE.sub("", pl))
+    return client, base, side, index
+
+
+def stereo_pairs(arr) -> list:
+    """Stereo pairs among full port names, best first.
+
+    Ranking: L/R pairs sharing a base (fm_l/fm_r, playout_0L/playout_0R), then
+    numeric 0/1 pairs, then 1/2 pairs (capture_1/capture_2); within a rank,
+    in the order the base first appears. Pairs never span clients.
+    """
+    groups = {}
+    for p in arr:
+        client, base, side, index = classify_port(p)
+        groups.setdefault((client.lower(), base), []).append((p, side, index))
+    lr, first, second = [], [], []
+    for items in groups.values():
+        left = next((p for p, side, _ in items if side == "L"), None)
+        right = next((p for p, side, _ in items if side == "R"), None)
+        if left and right:
+            lr.append([left, right])
+        by_index = {}
+        for p, _, index in items:
+            by_index.setdefault(index, p)
+        if 0 in by_index and 1 in by_index:
+            first.append([by_index[0], by_index[1]])
+        if 1 in by_index and 2 in by_index:
+            second.append([by_index[1], by_index[2]])
+    return lr + first + second
+
+
+def first_two(arr) -> list:
+    """Pick a sensible stereo pair from a list of full port names.
+    Preference order:
+    1) Matching L/R pair with same base (e.g., fm_l/fm_r, out_L/out_R)
+    2) Matching numeric pair with same base (0/1 then 1/2, e.g., in_0/in_1, out_1/out_2)
+    3) First available Left + first available Right across all ports
+    4) Fallback to the first two ports sorted stably
+    """
+    ports = list(arr)
+    if len(ports) <= 2:
+        return ports
+    pairs = stereo_pairs(ports)
+    if pairs:
+        return pairs[0]
+    sides = [classify_port(p)[2] for p in ports]
+    first_l = next((p for p, side in zip(ports, sides) if side == "L"), None)
+    first_r = next((p for p, side in zip(ports, sides) if side == "R"), None)
+    if first_l and first_r:
+        return [first_l, first_r]
+    ports.sort(key=lambda p: (classify_port(p)[0].lower(), p.split(":", 1)[-1].lower()))
+    return ports[:2]
+
+
+# ---- Connection profiles (~/.config/rdx/jack_profiles.json) ----
+
+def profiles_file():
+    from . import config
+    return config.config_dir() / "jack_profiles.json"
+
+
+def load_profiles() -> dict:
+    """Saved profiles as {name: [[src, dst], ...]}."""
+    from . import config
+    data = config.load_json(profiles_file(), {})
+    if not isinstance(data, dict):
+        return {}
+    return {str(k): list(v) for k, v in data.items()}
+
+
+def apply_profile(name: str, client=None) -> dict:
+    """Connect every pair of profile ``name`` whose ports exist now, as one transaction.
+
+    ``name`` is a jack_profiles.json profile, else an rdx-profiles.xml one
+    whose wildcard rules are resolved against the current topology (rdx.rules).
+    Returns transaction()'s {"applied", "total", "errors", "results"}; raises
+    KeyError for an unknown profile.
+    """
+    profiles = load_profiles()
+    topology = None
+    if name in profiles:
+        pairs = profiles[name]
+    else:
+        from . import rules
+        if name not in rules.load_xml_profiles():
+            raise KeyError(name)
+        topology = list_topology()
+        pairs = rules.xml_profile_pairs(name, topology[0]) if topology else []
+    return transaction([("connect", s, d) for s, d in pairs], client=client, topology=topology,
+                       origin=f"profile:{name}")
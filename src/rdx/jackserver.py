@@ -0,0 +1,426 @@
+"""
+JACK server settings and lifecycle (jackd or jackdbus via jack_control).
+
+Settings live in ~/.config/rdx/jack_settings.json and are shared by the
+Service Control tab, the daemon and the CLI.
+
+jackdbus is configured with one ``jack_control`` run that chains every
+parameter write and ``start`` (jack_control executes its arguments as a
+command sequence over a single D-Bus connection). apply() moves a running
+server to new settings with as little disruption as possible: nothing when
+they already match, a live ``jack_bufsize`` when only the buffer size
+changed, and a stop/start only for what JACK cannot change while running.
+"""
+
+import json
+import re
+import shlex
+import subprocess
+import time
+from pathlib import Path
+
+from . import runner
+
+DEFAULTS = {
+    "manage": False,           # Default: OFF — let Rivendell manage JACK unless enabled here
+    "mode": "jackd",          # jackd | jackdbus
+    "backend": "dummy",       # Default backend when enabled: dummy
+    "device": "",             # e.g., hw:PCH or hw:0
+    "rate": 48000,             # Sample rate
+    "period": 1024,            # Frames/period (-p)
+    "nperiods": 2,             # Periods/buffer (-n)
+    "realtime": True,          # Use -R for realtime
+    "extra_args": ""          # Extra args for jackd driver
+}
+
+
+def settings_path() -> Path:
+    return Path.home() / ".config" / "rdx" / "jack_settings.json"
+
+
+def load_settings() -> dict:
+    d = dict(DEFAULTS)
+    try:
+        p = settings_path()
+        if p.exists():
+            with open(p, 'r') as f:
+                data = json.load(f)
+                if isinstance(data, dict):
+                    d.update(data)
+    except Exception:
+        pass
+    return d
+
+
+def save_settings(data: dict) -> bool:
+    try:
+        p = settings_path()
+        p.parent.mkdir(parents=True, exist_ok=True)
+        with open(p, 'w') as f:
+            json.dump(data, f, indent=2)
+        return True
+    except Exception:
+        return False
+
+
+def is_running() -> bool:
+    try:
+        res = runner.run(["jack_lsp"], capture_output=True, timeout=0.7)
+        return res.returncode == 0
+    except Exception:
+        return False
+
+
+def tail_file(path: Path, n: int = 60) -> str:
+    try:
+        data = path.read_text(errors='ignore')
+        lines = data.splitlines()
+        return "\n".join(lines[-n:])
+    except Exception:
+        return ""
+
+
+def jackdbus_commands(settings: dict) -> list:
+    """jack_control invocations (argument lists) that apply ``settings`` and start the server."""
+    s = settings
+    cmds = []
+    backend = s.get("backend", "alsa")
+    cmds.append(["jack_control", "ds", backend])
+    # Engine params
+    rt = str(bool(s.get("realtime", True))).lower()
+    cmds.append(["jack_control", "eps", "realtime", rt])
+    # Driver params
+    if backend.lower() == "alsa":
+        dev = s.get("device", "").strip()
+        if dev:
+            cmds.append(["jack_control", "dps", "device", dev])
+    rate = int(s.get("rate", 48000) or 48000)
+    period = int(s.get("period", 256) or 256)
+    nperiods = int(s.get("nperiods", 2) or 2)
+    cmds.append(["jack_control", "dps", "rate", str(rate)])
+    cmds.append(["jack_control", "dps", "period", str(period)])
+    cmds.append(["jack_control", "dps", "nperiods", str(nperiods)])
+    cmds.append(["jack_control", "start"])
+    return cmds
+
+
+def jackdbus_batch(settings: dict, start: bool = True) -> list:
+    """jackdbus_commands() chained into one ``jack_control`` invocation (one D-Bus session)."""
+    cmds = jackdbus_commands(settings)
+    if not start:
+        cmds = cmds[:-1]
+    return ["jack_control"] + [a for args in cmds for a in args[1:]]
+
+
+def build_jackd_command(settings: dict) -> list:
+    s = settings
+    cmd = ["jackd"]
+    if s.get("realtime", True):
+        cmd.append("-R")
+    cmd += ["-d", s.get("backend", "alsa")]  # select driver
+    if s.get("backend", "alsa").lower() == "alsa":
+        dev = s.get("device", "").strip()
+        if dev:
+            cmd += ["-d", dev]
+        rate = int(s.get("rate", 48000) or 48000)
+        period = int(s.get("period", 256) or 256)
+        nperiods = int(s.get("nperiods", 2) or 2)
+        cmd += ["-r", str(rate), "-p", str(period), "-n", str(nperiods)]
+    # Simple dummy backend params: sample rate and period
+    # Note: dummy driver does NOT support '-n' (nperiods). Only ALSA uses '-n'.
+    if s.get("backend", "alsa").lower() == "dummy":
+        rate = int(s.get("rate", 48000) or 48000)
+        period = int(s.get("period", 256) or 256)
+        cmd += ["-r", str(rate), "-p", str(period)]
+    extra = s.get("extra_args", "").strip()
+    if extra:
+        try:
+            cmd += shlex.split(extra)
+        except Exception:
+            # Fallback: append as a single token to avoid crash
+            cmd.append(extra)
+    return cmd
+
+
+def start(settings: dict) -> tuple:
+    """Start JACK according to selected mode. Returns (ok: bool, message: str)."""
+    mode = settings.get("mode", "jackd").lower()
+    if mode == "jackdbus":
+        # Apply settings via jack_control then start
+        try:
+            # Best-effort stop before reconfiguring
+            runner.run(["jack_control", "stop"], check=False)
+            # Every parameter write and the start in one jack_control run
+            r = runner.run(jackdbus_batch(settings), capture_output=True, text=True)
+            if r.returncode == 0:
+                return True, "Started JACK (jackdbus)"
+            return False, (r.stderr or r.stdout or "jack_control start failed").strip()
+        except FileNotFoundError:
+            return False, "'jack_control' not found in PATH. Install jackdbus (jackd2)."
+        except Exception as e:
+            return False, f"Error starting jackdbus: {e}"
+    else:
+        # jackd direct
+        cmd = build_jackd_command(settings)
+        try:
+            # Guard: if ALSA backend selected without device, refuse to start implicitly
+            try:
+                backend = settings.get("backend", "alsa").lower()
+            except Exception:
+                backend = "alsa"
+            if backend == "alsa" and not settings.get("device", "").strip():
+                return False, "ALSA backend selected but no device set. RDX will not auto-pick a device.\nSet Device in JACK Settings or switch backend to Dummy."
+
+            # Write jackd output to a per-user log for diagnostics
+            log_path = Path.home() / ".config" / "rdx" / "jackd.log"
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_path, 'ab', buffering=0) as lf:
+                subprocess.Popen(cmd, stdout=lf, stderr=lf, start_new_session=True)
+            # Brief grace period then verify
+            time.sleep(0.5)
+            if is_running():
+                return True, f"Launched JACK: {' '.join(cmd)}"
+            # Wait a bit longer in case ALSA needed time
+            time.sleep(1.0)
+            if is_running():
+                return True, f"Launched JACK: {' '.join(cmd)}"
+            # Read last lines from log for error detail
+            try:
+                tail = tail_file(log_path, 40)
+            except Exception:
+                tail = ""
+            return False, ("jackd failed to start. Last log lines:\n" + tail).strip()
+        except FileNotFoundError:
+            return False, "'jackd' not found in PATH. Install JACK (jackd/jackd2)."
+        except Exception as e:
+            return False, f"Failed to start jackd: {e}"
+
+
+def stop():
+    """Best-effort stop regardless of mode."""
+    try:
+        runner.run(["jack_control", "stop"], check=False)
+        runner.run(["jack_control", "exit"], check=False)
+    except Exception:
+        pass
+    try:
+        runner.run(["killall", "-q", "jackd"], check=False)
+    except Exception:
+        pass
+
+
+def probe_running_config() -> dict:
+    """Attempt to detect current running JACK configuration.
+    Returns a dict with keys: mode, backend, device, rate, period, nperiods, realtime.
+    Empty dict if not detected.
+    """
+    # First try jackdbus via jack_control
+    try:
+        st = runner.run(["jack_control", "status"], capture_output=True, text=True, timeout=1.0)
+        sout = (st.stdout or "") + (st.stderr or "")
+        if st.returncode == 0 and ("started" in sout.lower() or "running" in sout.lower()):
+            res = {"mode": "jackdbus"}
+            # Driver
+            ds = runner.run(["jack_control", "ds"], capture_output=True, text=True, timeout=1.0)
+            dso = (ds.stdout or ds.stderr or "").strip().lower()
+            # Heuristics: often prints just the driver name
+            drv = None
+            for cand in ("alsa", "dummy", "firewire", "coreaudio"):
+                if cand in dso:
+                    drv = cand
+                    break
+            if drv:
+                res["backend"] = drv
+            # Params
+            dp = runner.run(["jack_control", "dp"], capture_output=True, text=True, timeout=1.0)
+            ep = runner.run(["jack_control", "ep"], capture_output=True, text=True, timeout=1.0)
+            txt = (dp.stdout or "") + "\n" + (ep.stdout or "")
+            def _grab(k, cast=str):
+                m = re.search(rf"\b{k}\s*=\s*([\w:\-\.]+)", txt)
+                if not m:
+                    return None
+                val = m.group(1)
+                try:
+                    if cast is bool:
+                        return str(val).lower() in ("1", "true", "yes", "on")
+                    return cast(val)
+                except Exception:
+                    return None
+            res["device"] = _grab("device", str) or ""
+            res["rate"] = _grab("rate", int)
+            res["period"] = _grab("period", int)
+            res["nperiods"] = _grab("nperiods", int)
+            res["realtime"] = _grab("realtime", bool)
+            return {k: v for k, v in res.items() if v is not None}
+    except Exception:
+        pass
+    # Fallback: parse jackd command line
+    try:
+        ps = runner.run(["bash", "-lc", "ps -C jackd -o args="], capture_output=True, text=True, timeout=1.0)
+        args = (ps.stdout or "").strip()
+        if args:
+            parts = shlex.split(args)
+            res = {"mode": "jackd", "realtime": False}
+            i = 0
+            backend = None
+            device = None
+            while i < len(parts):
+                t = parts[i]
+                if t == "-R":
+                    res["realtime"] = True
+                    i += 1
+                    continue
+                if t == "-d" and i + 1 < len(parts):
+                    val = parts[i+1]
+                    if backend is None:
+                        backend = val
+                    else:
+                        device = val
+                    i += 2
+                    continue
+                if t == "-r" and i + 1 < len(parts):
+                    res["rate"] = int(parts[i+1])
+                    i += 2
+                    continue
+                if t == "-p" and i + 1 < len(parts):
+                    res["period"] = int(parts[i+1])
+                    i += 2
+                    continue
+                if t == "-n" and i + 1 < len(parts):
+                    res["nperiods"] = int(parts[i+1])
+                    i += 2
+                    continue
+                i += 1
+            if backend:
+                res["backend"] = backend
+            if device:
+                res["device"] = device
+            return res
+    except Exception:
+        pass
+    return {}
+
+
+# ---- Switching settings on a running server ----
+# Parameters JACK only picks up on a restart; "period" alone can change live
+RESTART_KEYS = ("mode", "backend", "device", "rate", "nperiods", "realtime")
+LIVE_PERIODS = range(16, 8193)   # jack_bufsize accepts powers of two in this range
+
+
+def profile_settings(jack_settings: dict) -> dict:
+    """An rdx-profiles.xml <jack-settings> block (rdx.rules keys) as jack_settings.json keys."""
+    keys = {"sample_rate": "rate", "buffer_size": "period", "periods": "nperiods"}
+    return {keys[k]: int(v) for k, v in (jack_settings or {}).items() if k in keys and v}
+
+
+def plan_change(current: dict, wanted: dict) -> dict:
+    """How to get from the running configuration ``current`` (probe_running_config) to ``wanted``.
+
+    Returns {"action", "changes"}: action is "none", "live" (buffer size via
+    jack_bufsize), "restart" or "stopped" (JACK not running; settings only);
+    changes maps each differing key to [running, wanted]. Keys the probe could
+    not read are not compared.
+    """
+    if not current:
+        return {"action": "stopped", "changes": {}}
+    changes = {}
+    for key in RESTART_KEYS + ("period",):
+        if key not in current or key not in wanted:
+            continue
+        cur, new = current[key], wanted[key]
+        if key == "device" and str(wanted.get("backend", current.get("backend", ""))).lower() != "alsa":
+            continue
+        if isinstance(cur, str) or isinstance(new, str):
+            differs = str(cur or "").strip().lower() != str(new or "").strip().lower()
+        else:
+            differs = cur != new
+        if differs:
+            changes[key] = [cur, new]
+    if not changes:
+        action = "none"
+    elif set(changes) == {"period"} and _live_period_ok(wanted["period"]):
+        action = "live"
+    else:
+        action = "restart"
+    return {"action": action, "changes": changes}
+
+
+def _live_period_ok(period) -> bool:
+    try:
+        period = int(period)
+    except Exception:
+        return False
+    return period in LIVE_PERIODS and period & (period - 1) == 0
+
+
+def set_buffer_size(period: int, jackdbus: bool = False) -> tuple:
+    """Change the running server's buffer size without a restart. Returns (ok, message).
+
+    With jackdbus the stored driver parameter is updated too, so the next start keeps it.
+    """
+    try:
+        r = runner.run(["jack_bufsize", str(int(period))], capture_output=True, text=True, timeout=2.0)
+    except FileNotFoundError:
+        return False, "'jack_bufsize' not found in PATH (jack-example-tools)"
+    except Exception as e:
+        return False, f"jack_bufsize failed: {e}"
+    if r.returncode != 0:
+        return False, (r.stderr or r.stdout or "jack_bufsize failed").strip()
+    if jackdbus:
+        try:
+            runner.run(["jack_control", "dps", "period", str(int(period))], check=False,
+                       capture_output=True, timeout=2.0)
+        except Exception:
+            pass
+    return True, f"Buffer size changed live to {int(period)} frames"
+
+
+def apply(wanted: dict, settings: dict = None, current: dict = None, dry_run: bool = False) -> dict:
+    """Save ``wanted`` over the JACK settings and bring a running server to it, restarting only when required.
+
+    Only the keys in ``wanted`` are compared with the running server, so a
+    profile that sets the rate does not restart JACK just because
+    jack_settings.json names another backend than the one running.
+
+    Returns plan_change()'s {"action", "changes"} plus "ok" and "message". A
+    restart only happens when RDX manages JACK ("manage"); otherwise ok is
+    False and the message says what needs a restart. A failed live change
+    falls back to a restart.
+    """
+    settings = load_settings() if settings is None else dict(settings)
+    target = dict(settings, **wanted)
+    current = probe_running_config() if current is None else current
+    res = dict(plan_change(current, wanted), ok=True, message="")
+    if dry_run:
+        return res
+    if target != settings and not save_settings(target):
+        return dict(res, ok=False, message="Could not write jack_settings.json")
+    action = res["action"]
+    if action == "none":
+        res["message"] = "JACK already runs with these settings"
+    elif action == "stopped":
+        res["message"] = "JACK is not running; settings saved for the next start"
+    elif action == "live":
+        ok, msg = set_buffer_size(target["period"], jackdbus=current.get("mode") == "jackdbus")
+        if ok:
+            res["message"] = msg
+        else:
+            res["action"] = action = "restart"
+    if action == "restart":
+        keys = ", ".join(sorted(res["changes"]))
+        if not target.get("manage", False):
+            res.update(ok=False, message=f"Restart JACK to apply {keys} (RDX does not manage the JACK server)")
+        else:
+            stop()
+            ok, msg = start(target)
+            res.update(ok=ok, message=f"Restarted JACK for {keys}: {msg}" if ok else msg)
+    return res
+
+
+def apply_profile(name: str, dry_run: bool = False) -> dict:
+    """apply() the <jack-settings> of rdx-profiles.xml profile ``name``; KeyError when there is no such profile."""
+    from . import rules
+    profiles = rules.load_xml_profiles()
+    if name not in profiles:
+        raise KeyError(name)
+    return apply(profile_settings(profiles[name]["jack_settings"]), dry_run=dry_run)
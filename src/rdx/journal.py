@@ -0,0 +1,173 @@
+"""
+Routing journal: every JACK connect/disconnect RDX makes, with time and origin.
+
+One JSON line per batch is appended to ``~/.config/rdx/routing-journal.jsonl``:
+
+    {"seq": 41, "time": 1760870400.125, "origin": "auto-connect",
+     "ops": [["connect", "rivendell_0:playout_0L", "stereo_tool:in_l"], ...]}
+
+Only operations that took effect are recorded (see rdx.jack.transaction's
+``origin``). Origins are "graph", "patchboard", "auto-connect",
+"profile:<name>", "reconciler", "api", "cli", "panic", plus "undo", "redo"
+and "restore" for the entries this module writes itself.
+
+undo() reverts the last N batches, redo() re-applies what undo took back, and
+restore_to() returns routing to how it was right after entry ``seq``. Each
+runs as one transaction over the net change per port pair, so reverting a
+30-edge emergency disconnect is a single batch. The daemon, the GUI and the
+CLI share the file; appends take an flock so sequence numbers stay unique.
+"""
+
+import fcntl
+import json
+import time
+
+MAX_ENTRIES = 5000   # older entries are dropped once the journal grows past this
+_TRIM_EVERY = 200
+
+
+def journal_file():
+    from . import config
+    return config.config_dir() / "routing-journal.jsonl"
+
+
+def _last_seq(f) -> int:
+    f.seek(0, 2)
+    size = f.tell()
+    f.seek(max(0, size - 8192))
+    for line in reversed(f.read().splitlines()):
+        try:
+            return int(json.loads(line)['seq'])
+        except Exception:
+            continue
+    return 0
+
+
+def record(origin: str, ops, **extra):
+    """Append one batch of ("connect" | "disconnect", src, dst) that took effect; returns the entry."""
+    ops = [[str(op), str(src), str(dst)] for op, src, dst in ops]
+    if not ops:
+        return None
+    try:
+        path = journal_file()
+        with open(path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            entry = dict(seq=_last_seq(f) + 1, time=round(time.time(), 3), origin=str(origin), ops=ops, **extra)
+            f.seek(0, 2)
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            if entry['seq'] % _TRIM_EVERY == 0:
+                f.seek(0)
+                lines = f.readlines()
+                if len(lines) > MAX_ENTRIES:
+                    f.seek(0)
+                    f.truncate()
+                    f.writelines(lines[-MAX_ENTRIES:])
+        return entry
+    except Exception:
+        return None
+
+
+def entries(limit: int = None) -> list:
+    """Journal entries, oldest first (the last ``limit`` when given)."""
+    out = []
+    try:
+        with open(journal_file()) as f:
+            for line in f:
+                try:
+                    out.append(json.loads(line))
+                except Exception:
+                    continue
+    except Exception:
+        return []
+    return out[-limit:] if limit else out
+
+
+def seq_at(when: float, items=None) -> int:
+    """The last entry recorded at or before ``when`` (epoch seconds); 0 if none."""
+    seq = 0
+    for e in entries() if items is None else items:
+        if e.get('time', 0) <= when:
+            seq = e['seq']
+    return seq
+
+
+def _stacks(items: list):
+    """Entry seqs that undo() and redo() would act on, most recent last."""
+    done, undone = [], []
+    for e in items:
+        if e.get('undoes'):
+            for s in e['undoes']:
+                if s in done:
+                    done.remove(s)
+                    undone.append(s)
+        elif e.get('redoes'):
+            for s in e['redoes']:
+                if s in undone:
+                    undone.remove(s)
+                    done.append(s)
+        else:
+            done.append(e['seq'])
+            undone.clear()
+    return done, undone
+
+
+def _inverse(op: str) -> str:
+    return "disconnect" if op == "connect" else "connect"
+
+
+def _net(ops) -> list:
+    """Collapse a sequence of operations to the final wanted state per port pair."""
+    want = {}
+    for op, src, dst in ops:
+        key = frozenset((src, dst))
+        want.pop(key, None)
+        want[key] = (op, src, dst)
+    return list(want.values())
+
+
+def _apply(origin: str, ops: list, client=None, **extra) -> dict:
+    from . import jack as rdx_jack
+    res = rdx_jack.transaction(_net(ops), client=client)
+    done = [(r['op'], r['src'], r['dst']) for r in res['results'] if r['status'] == "done"]
+    res['entry'] = record(origin, done, **extra)
+    return res
+
+
+def undo(n: int = 1, client=None) -> dict:
+    """Revert the last ``n`` batches as one transaction. Raises LookupError when there is nothing to undo."""
+    items = entries()
+    done, _ = _stacks(items)
+    seqs = list(reversed(done[-max(1, int(n)):])) if done else []
+    if not seqs:
+        raise LookupError("nothing to undo")
+    by_seq = {e['seq']: e for e in items}
+    ops = [(_inverse(op), src, dst) for s in seqs for op, src, dst in reversed(by_seq[s]['ops'])]
+    return _apply("undo", ops, client, undoes=seqs)
+
+
+def redo(n: int = 1, client=None) -> dict:
+    """Re-apply the last ``n`` undone batches. Raises LookupError when there is nothing to redo."""
+    items = entries()
+    _, undone = _stacks(items)
+    seqs = list(reversed(undone[-max(1, int(n)):])) if undone else []
+    if not seqs:
+        raise LookupError("nothing to redo")
+    by_seq = {e['seq']: e for e in items}
+    ops = [tuple(op) for s in seqs for op in by_seq[s]['ops']]
+    return _apply("redo", ops, client, redoes=seqs)
+
+
+def restore_to(seq: int, client=None) -> dict:
+    """Put every pair touched after entry ``seq`` back the way it was then (0: before the first entry).
+
+    Raises LookupError when nothing was recorded after ``seq``.
+    """
+    later = [e for e in entries() if e['seq'] > int(seq)]
+    first = {}
+    for e in later:
+        for op, src, dst in e['ops']:
+            first.setdefault(frozenset((src, dst)), (_inverse(op), src, dst))
+    if not first:
+        raise LookupError(f"no routing changes after entry {seq}")
+    return _apply("restore", list(first.values()), client, restores_to=int(seq))
@@ -0,0 +1,166 @@
+"""
+Latency budget for the air chain, and a measured round trip.
+
+budget() turns the engine settings and the port latencies JACK reports
+(``jack_lsp -l``) into milliseconds:
+
+- capture: one period (ALSA driver)
+- playback: ``nperiods`` periods
+- round trip (capture → playback): both
+- air chain: each client on the Rivendell → processor → Liquidsoap path adds
+  what its output ports report beyond its input ports (JACK propagates
+  capture latency downstream), plus the one period the graph runs in.
+  Liquidsoap's own encoder and Icecast buffering are not reported to JACK
+  and are not included.
+
+measure_round_trip() runs ``jack_iodelay`` through a physical loopback
+(playback port cabled to a capture port) and reads the round trip it detects
+from its test signal, for comparison with the theoretical figure.
+"""
+
+import re
+import subprocess
+import time
+
+from . import jack as rdx_jack
+from . import runner
+
+PERIODS = (32, 64, 128, 256, 512, 1024, 2048)
+
+_LATENCY = re.compile(r"port (capture|playback) latency = \[\s*(\d+)\s+(\d+)\s*\]")
+_OLD_LATENCY = re.compile(r"^\s*port latency = (\d+) frames")
+_IODELAY = re.compile(r"([\d.]+) frames\s+([\d.]+) ms total roundtrip latency")
+_IODELAY_EXTRA = re.compile(r"extra loopback latency:\s*(-?\d+) frames")
+
+
+def parse_latencies(txt: str) -> dict:
+    """{port: {"capture": max frames, "playback": max frames}} from ``jack_lsp -l`` output.
+
+    Old JACK1 output (a single "port latency = N frames") is read as capture latency.
+    """
+    out = {}
+    port = None
+    for line in (txt or "").splitlines():
+        if not line.strip():
+            continue
+        if not line[0].isspace():
+            port = line.strip()
+            out[port] = {"capture": 0, "playback": 0}
+            continue
+        if port is None:
+            continue
+        m = _LATENCY.search(line)
+        if m:
+            out[port][m.group(1)] = int(m.group(3))
+            continue
+        m = _OLD_LATENCY.match(line)
+        if m:
+            out[port]["capture"] = int(m.group(1))
+    return out
+
+
+def port_latencies(timeout: float = 2.0) -> dict:
+    """parse_latencies() of the running server; {} when JACK is not running."""
+    res = rdx_jack.run(["jack_lsp", "-l"], timeout=timeout)
+    return parse_latencies(res.stdout) if res.returncode == 0 else {}
+
+
+def air_chain(ports: dict) -> list:
+    """[(client, in ports, out ports)] along Rivendell → processor → Liquidsoap (rdx.rules.STATION_CHAIN).
+
+    Only the ports the chain would use are listed; the first client has no
+    inputs and the last no outputs.
+    """
+    from . import rules
+    stages = {}
+    for m in rules.STATION.resolve(ports):
+        src = m['pairs'][0][0].split(":", 1)[0]
+        dst = m['pairs'][0][1].split(":", 1)[0]
+        if dst == "system":
+            continue
+        stages.setdefault(src, ([], []))[1].extend(s for s, _ in m['pairs'])
+        stages.setdefault(dst, ([], []))[0].extend(d for _, d in m['pairs'])
+    return [(client, ins, outs) for client, (ins, outs) in stages.items()]
+
+
+def _ms(frames, rate) -> float:
+    return round(frames * 1000.0 / rate, 2) if rate else 0.0
+
+
+def budget(rate: int, period: int, nperiods: int, latencies: dict = None, chain: list = None) -> dict:
+    """Theoretical latencies for one engine setting.
+
+    ``latencies`` is port_latencies() output and ``chain`` air_chain() output;
+    without them the air chain is the processing period alone. Returns
+    {rate, period, nperiods, period_ms, capture_ms, playback_ms, round_trip_ms,
+    stages: [{client, frames, ms}], chain_frames, chain_ms}.
+    """
+    rate, period, nperiods = int(rate), int(period), int(nperiods)
+    latencies = latencies or {}
+    stages = []
+    for client, ins, outs in chain or []:
+        if not outs:
+            continue
+        out_lat = max(latencies.get(p, {}).get("capture", 0) for p in outs)
+        in_lat = max((latencies.get(p, {}).get("capture", 0) for p in ins), default=0)
+        frames = max(0, out_lat - in_lat)
+        stages.append({"client": client, "frames": frames, "ms": _ms(frames, rate)})
+    chain_frames = period + sum(s["frames"] for s in stages)
+    return {
+        "rate": rate, "period": period, "nperiods": nperiods,
+        "period_ms": _ms(period, rate),
+        "capture_ms": _ms(period, rate),
+        "playback_ms": _ms(period * nperiods, rate),
+        "round_trip_ms": _ms(period * (nperiods + 1), rate),
+        "stages": stages,
+        "chain_frames": chain_frames,
+        "chain_ms": _ms(chain_frames, rate),
+    }
+
+
+def budget_table(rate: int, nperiods: int, latencies: dict = None, chain: list = None, periods=PERIODS) -> list:
+    """budget() for each candidate period, smallest first."""
+    return [budget(rate, p, nperiods, latencies, chain) for p in periods]
+
+
+def measure_round_trip(playback: str, capture: str, seconds: float = 3.0) -> dict:
+    """Round trip through a loopback from ``playback`` to ``capture``, measured by jack_iodelay.
+
+    Returns {frames, ms, extra_frames}. Raises RuntimeError when jack_iodelay
+    is missing or never detects its signal (no cable, or the level is too low).
+    """
+    try:
+        proc = subprocess.Popen(["jack_iodelay"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    except FileNotFoundError:
+        raise RuntimeError("'jack_iodelay' not found in PATH (jack-example-tools)")
+    t0 = time.perf_counter()
+    try:
+        # Its ports appear once the client is up
+        end = time.monotonic() + 2.0
+        while time.monotonic() < end:
+            ports = rdx_jack.list_ports(timeout=1.0)
+            if "jack_delay" in ports:
+                break
+            time.sleep(0.1)
+        else:
+            raise RuntimeError("jack_iodelay did not register with JACK")
+        out_port = next(iter(ports["jack_delay"].get("out", [])), "jack_delay:out")
+        in_port = next(iter(ports["jack_delay"].get("in", [])), "jack_delay:in")
+        rdx_jack.connect(out_port, playback)
+        rdx_jack.connect(capture, in_port)
+        time.sleep(max(0.5, float(seconds)))
+    finally:
+        proc.terminate()
+        try:
+            text = proc.communicate(timeout=2.0)[0] or ""
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            text = proc.communicate()[0] or ""
+        runner.record(runner.command_key(["jack_iodelay"]), time.perf_counter() - t0, "ok", None)
+    found = _IODELAY.findall(text)
+    if not found:
+        raise RuntimeError("No loopback signal detected: check the cable from "
+                           f"{playback} to {capture} and the levels")
+    frames, ms = found[-1]
+    extra = _IODELAY_EXTRA.findall(text)
+    return {"frames": float(frames), "ms": float(ms), "extra_frames": int(extra[-1]) if extra else None}
@@ -0,0 +1,287 @@
+"""
+Prometheus text-format metrics for the rdx daemon.
+
+Values are pushed by the code that already owns the data (the status loop sets
+service states, the topology refresh sets port counts, the JACK session counts
+xruns), so rendering ``/metrics`` is a dictionary walk. The few values nobody
+polls for us (Icecast listeners, encoder CPU from /proc) are read by collectors
+at scrape time and cached briefly, so an idle box does no extra work.
+
+    from rdx import metrics
+    UP = metrics.gauge("rdx_service_up", "1 if the service is running", ["service"])
+    UP.labels(service="icecast").set(1)
+    text = metrics.REGISTRY.render()
+"""
+
+import math
+import os
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _fmt(value) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if math.isnan(value):
+            return "NaN"
+        return repr(value)
+    return str(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labelstr(names, values, extra=None) -> str:
+    pairs = list(zip(names, values)) + list(extra or [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Child:
+    __slots__ = ("_metric", "_key")
+
+    def __init__(self, metric, key):
+        self._metric = metric
+        self._key = key
+
+    def inc(self, amount: float = 1.0):
+        self._metric._inc(self._key, amount)
+
+    def set(self, value: float):
+        self._metric._set(self._key, value)
+
+    def observe(self, value: float):
+        self._metric._observe(self._key, value)
+
+
+class Metric:
+    """One metric family; label sets are created on first use."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def labels(self, **labels) -> _Child:
+        try:
+            key = tuple(str(labels[n]) for n in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f"{self.name}: missing label {e}")
+        return _Child(self, key)
+
+    # Unlabelled shortcuts
+    def inc(self, amount: float = 1.0):
+        self._inc((), amount)
+
+    def set(self, value: float):
+        self._set((), value)
+
+    def observe(self, value: float):
+        self._observe((), value)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def _inc(self, key, amount):
+        raise TypeError(f"{self.kind} {self.name} does not support inc()")
+
+    def _set(self, key, value):
+        raise TypeError(f"{self.kind} {self.name} does not support set()")
+
+    def _observe(self, key, value):
+        raise TypeError(f"{self.kind} {self.name} does not support observe()")
+
+    def samples(self):
+        """Yield ``(suffix, label_values, extra_labels, value)``."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", key, None, value
+
+    def render(self, out: list):
+        out.append(f"# HELP {self.name} {self.help}")
+        out.append(f"# TYPE {self.name} {self.kind}")
+        for suffix, key, extra, value in self.samples():
+            out.append(f"{self.name}{suffix}{_labelstr(self.labelnames, key, extra)} {_fmt(value)}")
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _inc(self, key, amount):
+        if amount < 0:
+            raise ValueError("counters only go up")
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _set(self, key, value):
+        # For totals maintained elsewhere (e.g. /proc CPU seconds) and copied in at scrape time
+        with self._lock:
+            self._values[key] = value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _inc(self, key, amount):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _set(self, key, value):
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _observe(self, key, value):
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._values[key] = (counts, total + value)
+
+    def set_buckets(self, key, counts, total):
+        """Copy in a histogram kept elsewhere (per-bucket, non-cumulative counts)."""
+        with self._lock:
+            self._values[tuple(key)] = (list(counts), total)
+
+    def samples(self):
+        with self._lock:
+            items = [(k, (list(c), t)) for k, (c, t) in self._values.items()]
+        for key, (counts, total) in items:
+            running = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                running += n
+                yield "_bucket", key, [("le", _fmt(float(bound)))], running
+            yield "_sum", key, None, total
+            yield "_count", key, None, running
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        self._collectors = []
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, fn):
+        """``fn()`` runs before each render to copy in values owned elsewhere."""
+        with self._lock:
+            if fn not in self._collectors:
+                self._collectors.append(fn)
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for fn in collectors:
+            try:
+                fn()
+            except Exception:
+                pass
+        out = []
+        for m in sorted(metrics, key=lambda m: m.name):
+            m.render(out)
+        return "\n".join(out) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help_text: str, labelnames=()) -> Counter:
+    return REGISTRY.register(Counter(name, help_text, labelnames))
+
+
+def gauge(name: str, help_text: str, labelnames=()) -> Gauge:
+    return REGISTRY.register(Gauge(name, help_text, labelnames))
+
+
+def histogram(name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, help_text, labelnames, buckets))
+
+
+class Cached:
+    """Call ``fn()`` at most once per ``ttl`` seconds (scrape-time readers)."""
+
+    def __init__(self, fn, ttl: float = 5.0):
+        self.fn = fn
+        self.ttl = ttl
+        self._at = 0.0
+        self._value = None
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._at == 0.0 or now - self._at >= self.ttl:
+                try:
+                    self._value = self.fn()
+                except Exception:
+                    self._value = None
+                self._at = now
+            return self._value
+
+
+# ---- /proc readers ----
+def process_stats(names, proc: str = "/proc") -> dict:
+    """``{name: (cpu_seconds, rss_bytes, count)}`` summed over processes whose comm is, or
+    starts with, one of *names* (comm is truncated to 15 characters by the kernel).
+    An exact name wins, then the longest prefix, so jackdbus is not counted as jackd."""
+    wanted = sorted(set(names), key=len, reverse=True)
+    out = {}
+    try:
+        tick = float(os.sysconf("SC_CLK_TCK"))
+        page = os.sysconf("SC_PAGE_SIZE")
+        pids = [p for p in os.listdir(proc) if p.isdigit()]
+    except Exception:
+        return out
+    for pid in pids:
+        try:
+            with open(f"{proc}/{pid}/stat") as f:
+                raw = f.read()
+            comm = raw[raw.index("(") + 1:raw.rindex(")")]
+            match = next((n for n in wanted if comm == n[:15]), None)
+            if match is None:
+                match = next((n for n in wanted if comm.startswith(n[:15])), None)
+            if match is None:
+                continue
+            fields = raw[raw.rindex(")") + 2:].split()
+            # utime, stime are fields 14 and 15; rss (pages) is field 24
+            cpu = (int(fields[11]) + int(fields[12])) / tick
+            rss = int(fields[21]) * page
+        except Exception:
+            continue
+        c, r, n = out.get(match, (0.0, 0, 0))
+        out[match] = (c + cpu, r + rss, n + 1)
+    return out
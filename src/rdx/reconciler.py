@@ -0,0 +1,115 @@
+"""
+Declarative JACK routing: converge the live graph on a desired state.
+
+The desired state has three parts:
+
+- the active profile (setting ``active_profile``, a name in
+  jack_profiles.json or rdx-profiles.xml): every pair whose ports exist
+  should be connected; an XML profile's wildcard rules are resolved against
+  the topology (rdx.rules), and its critical connections are protected too
+- rules, each ``rule(ports, links) -> [(op, src, dst), ...]`` and switched on
+  by a setting (``auto_reconnect_vlc`` for the VLC → Rivendell rule)
+- protected client pairs (jack_protected.json): never disconnected
+
+plan() diffs that against one topology snapshot and returns only the
+operations that change something; reconcile() applies them as one
+transaction (journal origin "reconciler"). The daemon runs it on JACK
+port/connection events, and the GUI does the same while the daemon is
+offline, so the VLC watcher, profiles and rules no longer poll or fight.
+"""
+
+from . import jack as rdx_jack
+from . import rules as rdx_rules
+
+ORIGIN = "reconciler"
+
+
+def vlc_rule(ports: dict, links: set) -> list:
+    """VLC outputs feed the first Rivendell Record-In pair whose inputs are free.
+
+    Never overrides an existing connection on a Record-In port.
+    """
+    fed = {dst for _, dst in links}
+    return [("connect", sp, dp) for m in rdx_rules.VLC.resolve(ports) for sp, dp in m['pairs'] if dp not in fed]
+
+
+# setting key -> (rule, enabled by default)
+RULES = {
+    'auto_reconnect_vlc': (vlc_rule, True),
+}
+
+
+def enabled_rules(settings: dict) -> list:
+    return [rule for key, (rule, default) in RULES.items() if bool(settings.get(key, default))]
+
+
+def active(settings: dict) -> bool:
+    """True when reconciling could change anything (a profile is active or a rule is on)."""
+    return bool(settings.get('active_profile')) or bool(enabled_rules(settings))
+
+
+def profile_names() -> list:
+    """Profiles that can be kept connected: jack_profiles.json, then rdx-profiles.xml."""
+    names = list(rdx_jack.load_profiles())
+    return names + [n for n in rdx_rules.load_xml_profiles() if n not in names]
+
+
+def plan(topology, settings: dict = None, profiles: dict = None, protected: set = None, rules=None) -> list:
+    """Minimal [(op, src, dst)] that brings ``topology`` (ports, connections[, types]) to the desired state.
+
+    Profile connections win over rule disconnects; protected client pairs are never disconnected.
+    """
+    from . import config
+    settings = config.load_settings() if settings is None else settings
+    ports, cons = topology[0], topology[1]
+    links = set(map(tuple, cons))
+    present = set()
+    for d in ports.values():
+        present.update(d.get("in", []))
+        present.update(d.get("out", []))
+
+    want = {}
+    for rule in (enabled_rules(settings) if rules is None else rules):
+        try:
+            for op, src, dst in rule(ports, links):
+                want.setdefault(frozenset((src, dst)), (op, src, dst))
+        except Exception:
+            continue
+    protected = set(rdx_jack.load_protected() if protected is None else protected)
+    name = settings.get('active_profile')
+    if name:
+        profiles = rdx_jack.load_profiles() if profiles is None else profiles
+        pairs = profiles.get(name)
+        if pairs is None:
+            pairs = rdx_rules.xml_profile_pairs(name, ports) or []
+            protected.update(rdx_jack.protected_key(s, d)
+                             for s, d in rdx_rules.xml_profile_pairs(name, ports, critical_only=True) or [])
+        for src, dst in pairs:
+            want[frozenset((src, dst))] = ("connect", src, dst)
+
+    ops = []
+    for op, src, dst in want.values():
+        if src not in present or dst not in present:
+            continue
+        linked = (src, dst) in links or (dst, src) in links
+        if op == "connect" and not linked:
+            ops.append((op, src, dst))
+        elif op == "disconnect" and linked and rdx_jack.protected_key(src, dst) not in protected \
+                and rdx_jack.protected_key(dst, src) not in protected:
+            ops.append((op, src, dst))
+    return ops
+
+
+def reconcile(topology=None, client=None, settings: dict = None, **kw):
+    """Apply plan() as one transaction; None when JACK is down or nothing needs to change."""
+    from . import config
+    settings = config.load_settings() if settings is None else settings
+    if not active(settings):
+        return None
+    topology = topology if topology is not None else rdx_jack.list_topology()
+    if topology is None:
+        return None
+    ops = plan(topology, settings, **kw)
+    if not ops:
+        return None
+    return rdx_jack.transaction(ops, client=client, topology=topology, origin=ORIGIN)
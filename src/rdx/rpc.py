@@ -0,0 +1,133 @@
+"""
+Wire protocol for the rdx daemon socket.
+
+Messages are JSON-RPC 2.0 objects, one per line (UTF-8, newline terminated).
+Clients send requests with an ``id``; the daemon answers with ``result`` or
+``error`` and may interleave notifications (no ``id``) carrying events:
+
+    {"jsonrpc": "2.0", "method": "event", "params": {"topic": "status", "data": {...}}}
+
+``Client`` is a small blocking client for scripts, the CLI and the launcher;
+the GUI uses a non-blocking QLocalSocket with the same framing.
+"""
+
+import json
+import socket
+
+from . import config
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+# Server-defined: the request was valid but the operation failed (JACK refused, unit missing, ...)
+OPERATION_FAILED = -32000
+
+
+class RPCError(Exception):
+    def __init__(self, code: int, message: str, data=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_dict(self) -> dict:
+        err = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            err["data"] = self.data
+        return err
+
+
+def encode(msg: dict) -> bytes:
+    return (json.dumps(msg, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def notification(topic: str, data) -> dict:
+    return {"jsonrpc": "2.0", "method": "event", "params": {"topic": topic, "data": data}}
+
+
+class Client:
+    """Blocking JSON-RPC client over the daemon's Unix socket."""
+
+    def __init__(self, path=None, timeout: float = 2.0):
+        self.path = str(path or config.socket_path())
+        self.timeout = timeout
+        self._sock = None
+        self._buf = b""
+        self._next_id = 1
+        self.pending_events = []
+
+    def connect(self):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(self.timeout)
+        s.connect(self.path)
+        self._sock = s
+        return self
+
+    def close(self):
+        try:
+            if self._sock:
+                self._sock.close()
+        except Exception:
+            pass
+        self._sock = None
+
+    def __enter__(self):
+        if self._sock is None:
+            self.connect()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_message(self, timeout=None) -> dict:
+        if timeout is not None:
+            self._sock.settimeout(timeout)
+        while b"\n" not in self._buf:
+            chunk = self._sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("rdx daemon closed the connection")
+            self._buf += chunk
+        line, self._buf = self._buf.split(b"\n", 1)
+        return json.loads(line.decode("utf-8"))
+
+    def call(self, method: str, **params):
+        """Send a request and wait for its response; events received meanwhile are queued."""
+        if self._sock is None:
+            self.connect()
+        req_id = self._next_id
+        self._next_id += 1
+        self._sock.settimeout(self.timeout)
+        self._sock.sendall(encode({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params}))
+        while True:
+            msg = self._read_message(self.timeout)
+            if msg.get("id") == req_id:
+                if "error" in msg:
+                    err = msg["error"]
+                    raise RPCError(err.get("code", INTERNAL_ERROR), err.get("message", "error"), err.get("data"))
+                return msg.get("result")
+            if msg.get("method") == "event":
+                self.pending_events.append(msg.get("params", {}))
+
+    def events(self, timeout=None):
+        """Yield pushed events ({"topic", "data"}) until the connection closes or times out."""
+        while self.pending_events:
+            yield self.pending_events.pop(0)
+        while True:
+            try:
+                msg = self._read_message(timeout)
+            except socket.timeout:
+                return
+            if msg.get("method") == "event":
+                yield msg.get("params", {})
+
+
+def daemon_available(path=None) -> bool:
+    try:
+        with Client(path, timeout=0.3) as c:
+            c.call("ping")
+        return True
+    except Exception:
+        return False
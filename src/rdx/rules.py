@@ -0,0 +1,224 @@
+"""
+Wildcard connection rules, as written in rdx-profiles.xml.
+
+A rule is a dict with ``source`` and ``dest`` globs (fnmatch, case-insensitive;
+``{a,b}`` lists alternatives) plus any XML attributes it came with:
+
+- ``client:port`` on both sides (``*stereo_tool*:*in*1*``, ``vlc_*:vlc_*_out_1``):
+  every output port matching ``source`` goes to the first input port matching
+  ``dest``
+- a bare client glob on both sides (``*liquidsoap*``): the first matching
+  client (sorted) with a stereo output pair goes to the first other matching
+  client with a stereo input pair, channel by channel (see rdx.jack.first_two)
+
+compile_rules() turns a rule list into a Matcher once. Every distinct pattern
+is indexed by the literal prefix of its client glob, so Matcher.resolve()
+walks the topology's clients once and only tests the patterns whose prefix
+fits; a few hundred rules against a thousand ports stays a single cheap pass.
+
+The XML itself is read from ``~/.config/rdx/rdx-profiles.xml``, else the
+installed ``/etc/rdx/rdx-profiles.xml``; load_xml_profiles() keeps the parsed
+and compiled profiles until the file changes.
+"""
+
+import fnmatch
+import re
+from pathlib import Path
+
+from . import jack as rdx_jack
+
+SYSTEM_XML = Path("/etc/rdx/rdx-profiles.xml")
+
+_WILD = re.compile(r"[*?\[]")
+_BRACES = re.compile(r"\{([^{}]*)\}")
+
+
+def expand(glob: str) -> list:
+    """``{a,b}`` alternatives expanded into plain fnmatch globs."""
+    m = _BRACES.search(glob)
+    if not m:
+        return [glob]
+    out = []
+    for alt in m.group(1).split(","):
+        out += expand(glob[:m.start()] + alt.strip() + glob[m.end():])
+    return out
+
+
+def _glob_re(glob: str):
+    return re.compile(fnmatch.translate(glob), re.IGNORECASE)
+
+
+class Matcher:
+    """Compiled rules; resolve() matches them all against one topology."""
+
+    def __init__(self, rules):
+        self.rules = [dict(r) for r in rules]
+        # lower-cased client prefix -> [(side, client re, port re or None, [rule no, ...])];
+        # a pattern shared by several rules is matched once per client
+        self._index = {}
+        patterns = {}
+        for i, rule in enumerate(self.rules):
+            for side, key in ((0, 'source'), (1, 'dest')):
+                for glob in expand(str(rule.get(key, ""))):
+                    client, sep, port = glob.partition(":")
+                    pk = (side, client.lower(), port.lower() if sep else None)
+                    if pk not in patterns:
+                        m = _WILD.search(client)
+                        prefix = (client[:m.start()] if m else client).lower()
+                        patterns[pk] = (side, _glob_re(client), _glob_re(port) if sep else None, [])
+                        self._index.setdefault(prefix, []).append(patterns[pk])
+                    if i not in patterns[pk][3]:
+                        patterns[pk][3].append(i)
+        self._lengths = sorted({len(p) for p in self._index})
+
+    def __len__(self):
+        return len(self.rules)
+
+    def resolve(self, ports: dict) -> list:
+        """[{"rule", "pairs": [(src, dst), ...]}] for every rule that matches ``ports`` ({client: {in, out}}).
+
+        Rules without a match on both sides are left out; order follows the rule list.
+        """
+        hits = [({}, {}) for _ in self.rules]   # per rule: source / dest {client: [ports]}
+        for client in sorted(ports):
+            lc = client.lower()
+            for n in self._lengths:
+                if n > len(lc):
+                    break
+                for side, client_re, port_re, rule_nos in self._index.get(lc[:n], ()):
+                    if not client_re.match(client):
+                        continue
+                    names = ports[client].get("out" if side == 0 else "in", []) or []
+                    if port_re is None:
+                        sel = rdx_jack.first_two(names)
+                        if len(sel) != 2:
+                            continue
+                    else:
+                        sel = [p for p in names if port_re.match(p.partition(":")[2])]
+                        if not sel:
+                            continue
+                    for i in rule_nos:
+                        hits[i][side].setdefault(client, sel)
+        out = []
+        for rule, (srcs, dsts) in zip(self.rules, hits):
+            if not (srcs and dsts):
+                continue
+            if ":" in str(rule.get('source', "")):
+                dst = next(iter(dsts.values()))[0]
+                pairs = [(sp, dst) for sel in srcs.values() for sp in sel]
+            else:
+                src = next(iter(srcs))
+                dst = next((c for c in dsts if c != src), None)
+                if dst is None:
+                    continue
+                pairs = list(zip(srcs[src], dsts[dst]))
+            out.append({'rule': rule, 'pairs': pairs})
+        return out
+
+
+def compile_rules(rules) -> Matcher:
+    return Matcher(rules)
+
+
+# ---- Built-in rules (Auto-Connect, Generate Profile, the reconciler's VLC rule) ----
+RIVENDELL = "{*rivendell*,rd*}"
+PROCESSOR = "{*stereo?tool*,*stereotool*,*thimeo*}"
+
+VLC_TO_RIVENDELL = {'source': "*vlc*", 'dest': RIVENDELL}
+# Rivendell (else the soundcard's capture) → processor → Liquidsoap → soundcard
+STATION_CHAIN = [
+    {'source': "{*rivendell*,rd*,system}", 'dest': PROCESSOR},
+    {'source': PROCESSOR, 'dest': "*liquidsoap*"},
+    {'source': "*liquidsoap*", 'dest': "system"},
+]
+
+VLC = compile_rules([VLC_TO_RIVENDELL])
+STATION = compile_rules(STATION_CHAIN)
+CHAIN = compile_rules([VLC_TO_RIVENDELL] + STATION_CHAIN)
+
+
+# ---- rdx-profiles.xml ----
+def xml_file():
+    """The user's rdx-profiles.xml, else the installed one; None when neither exists."""
+    from . import config
+    for path in (config.config_dir() / "rdx-profiles.xml", SYSTEM_XML):
+        if path.is_file():
+            return path
+    return None
+
+
+def _int(text):
+    try:
+        return int(str(text).strip())
+    except Exception:
+        return None
+
+
+def parse_xml(text: str) -> dict:
+    """{name: {description, auto_activate, jack_settings, connections, critical}} from rdx-profiles.xml text."""
+    import xml.etree.ElementTree as ET
+    root = ET.fromstring(text)
+    profiles = {}
+    for prof in root.iter("profile"):
+        name = prof.get("name")
+        if not name:
+            continue
+        js = prof.find("jack-settings")
+        jack_settings = {}
+        if js is not None:
+            for tag, key in (("sample-rate", "sample_rate"), ("buffer-size", "buffer_size"), ("periods", "periods")):
+                val = _int(js.findtext(tag))
+                if val:
+                    jack_settings[key] = val
+
+        def connections(section, critical):
+            el = prof.find(section)
+            rules = []
+            for c in (el.iter("connection") if el is not None else ()):
+                if c.get("source") and c.get("dest"):
+                    rules.append(dict(c.attrib, critical=critical))
+            return rules
+
+        profiles[name] = {
+            'description': (prof.findtext("description") or "").strip(),
+            'auto_activate': prof.get("auto-activate", "false").lower() == "true",
+            'jack_settings': jack_settings,
+            'connections': connections("connections", False),
+            'critical': connections("critical-connections", True),
+        }
+        profiles[name]['matcher'] = compile_rules(profiles[name]['critical'] + profiles[name]['connections'])
+    return profiles
+
+
+_xml_cache = {}
+
+
+def load_xml_profiles(path=None) -> dict:
+    """Parsed and compiled rdx-profiles.xml profiles ({} when missing or invalid), cached per file mtime."""
+    path = Path(path) if path else xml_file()
+    if path is None:
+        return {}
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except Exception:
+        return {}
+    if key not in _xml_cache:
+        try:
+            profiles = parse_xml(path.read_text())
+        except Exception:
+            profiles = {}
+        _xml_cache.clear()
+        _xml_cache[key] = profiles
+    return _xml_cache[key]
+
+
+def xml_profile_pairs(name: str, ports: dict, critical_only: bool = False):
+    """[(src, dst)] that XML profile ``name`` resolves to against ``ports``; None for an unknown profile."""
+    prof = load_xml_profiles().get(name)
+    if prof is None:
+        return None
+    pairs = {}
+    for m in prof['matcher'].resolve(ports):
+        if m['rule'].get('critical') or not critical_only:
+            pairs.update(dict.fromkeys(m['pairs']))
+    return list(pairs)
@@ -0,0 +1,183 @@
+"""
+Instrumented command runner.
+
+``run()`` is a drop-in for ``subprocess.run`` (same arguments, same return value,
+same exceptions) that also records, per command, how many times it ran, a
+latency histogram, and how often it timed out, exited non-zero or could not be
+started. The Diagnostics tab and the daemon's ``diagnostics.commands`` method
+show these so the hard-coded probe timeouts can be tuned from real data.
+
+Commands are grouped by a short key rather than the full argument list:
+
+    ["jack_lsp", "-c"]                          -> "jack_lsp -c"
+    ["systemctl", "--user", "is-active", unit]  -> "systemctl is-active"
+    ["liquidsoap", "-c", path]                  -> "liquidsoap -c"
+    ["pkexec", script]                          -> "pkexec"
+    ["bash", "-lc", "aplay -l"]                 -> "bash -lc aplay"
+"""
+
+import os
+import subprocess
+import threading
+import time
+
+# Upper bucket bounds in milliseconds (the last bucket is open ended)
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Tools whose first non-option argument is a verb worth keeping in the key
+_VERB_TOOLS = {"systemctl", "jack_control", "loginctl"}
+# Wrappers that run another command: the key includes the wrapped command
+_WRAPPERS = {"sudo", "nice", "ionice", "timeout", "env"}
+
+
+def command_key(args) -> str:
+    """Short, low-cardinality name for a command line (see module docstring)."""
+    if isinstance(args, (str, bytes)):
+        args = os.fsdecode(args).split()
+    argv = [os.fsdecode(a) if isinstance(a, bytes) else str(a) for a in (args or [])]
+    if not argv:
+        return "?"
+    prog = os.path.basename(argv[0])
+    rest = argv[1:]
+    if prog in _WRAPPERS:
+        # Skip the wrapper's own options (and a duration for timeout(1))
+        while rest and (rest[0].startswith("-") or (prog == "timeout" and rest[0][:1].isdigit())
+                        or (prog == "env" and "=" in rest[0])):
+            rest = rest[1:]
+        return f"{prog} {command_key(rest)}" if rest else prog
+    if prog in ("bash", "sh") and len(rest) >= 2 and rest[0].startswith("-") and "c" in rest[0]:
+        words = rest[1].split()
+        return f"{prog} {rest[0]} {os.path.basename(words[0])}" if words else f"{prog} {rest[0]}"
+    if prog in _VERB_TOOLS:
+        verb = next((a for a in rest if not a.startswith("-")), None)
+        return f"{prog} {verb}" if verb else prog
+    # Keep one short option (jack_lsp -c, liquidsoap -c); drop paths and long options
+    if rest and len(rest[0]) == 2 and rest[0].startswith("-") and rest[0] != "--":
+        return f"{prog} {rest[0]}"
+    return prog
+
+
+class CommandStats:
+    """Counters and a latency histogram for one command key."""
+
+    __slots__ = ("key", "count", "timeouts", "nonzero", "errors", "total_s", "max_s",
+                 "buckets", "last_timeout", "last_run")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.count = 0
+        self.timeouts = 0
+        self.nonzero = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.last_timeout = None
+        self.last_run = 0.0
+
+    def observe(self, seconds: float, outcome: str, timeout=None):
+        self.count += 1
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+        ms = seconds * 1000.0
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        if outcome == "timeout":
+            self.timeouts += 1
+        elif outcome == "nonzero":
+            self.nonzero += 1
+        elif outcome == "error":
+            self.errors += 1
+        if timeout is not None:
+            self.last_timeout = timeout
+        self.last_run = time.time()
+
+    def quantile_ms(self, q: float) -> float:
+        """Upper bucket bound containing quantile *q* (histogram resolution)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else self.max_s * 1000.0
+        return self.max_s * 1000.0
+
+    def to_dict(self) -> dict:
+        n = self.count or 1
+        return {
+            "command": self.key,
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "nonzero": self.nonzero,
+            "errors": self.errors,
+            "timeout_rate": self.timeouts / n,
+            "error_rate": (self.nonzero + self.errors) / n,
+            "mean_ms": self.total_s * 1000.0 / n,
+            "p50_ms": self.quantile_ms(0.5),
+            "p95_ms": self.quantile_ms(0.95),
+            "p99_ms": self.quantile_ms(0.99),
+            "max_ms": self.max_s * 1000.0,
+            "timeout_s": self.last_timeout,
+            "buckets_ms": list(BUCKETS_MS),
+            "histogram": list(self.buckets),
+            "last_run": self.last_run,
+        }
+
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def record(key: str, seconds: float, outcome: str = "ok", timeout=None):
+    """Record one execution (for callers that time a command themselves)."""
+    with _lock:
+        st = _stats.get(key)
+        if st is None:
+            st = _stats[key] = CommandStats(key)
+        st.observe(seconds, outcome, timeout)
+
+
+def run(args, *popenargs, timeout=None, **kwargs):
+    """``subprocess.run`` with per-command latency/outcome accounting.
+
+    Behaviour is unchanged: the CompletedProcess is returned and TimeoutExpired,
+    CalledProcessError and OSError propagate to the caller as before.
+    """
+    key = command_key(args)
+    t0 = time.perf_counter()
+    outcome = "ok"
+    try:
+        res = subprocess.run(args, *popenargs, timeout=timeout, **kwargs)
+        if res.returncode != 0:
+            outcome = "nonzero"
+        return res
+    except subprocess.TimeoutExpired:
+        outcome = "timeout"
+        raise
+    except subprocess.CalledProcessError:
+        outcome = "nonzero"
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        record(key, time.perf_counter() - t0, outcome, timeout)
+
+
+def snapshot() -> list:
+    """Per-command statistics, busiest first."""
+    with _lock:
+        rows = [st.to_dict() for st in _stats.values()]
+    rows.sort(key=lambda r: (-r["count"], r["command"]))
+    return rows
+
+
+def reset():
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,131 @@
+"""
+Service catalogue and status probes for the broadcast chain.
+
+States are plain strings so they travel over the daemon socket unchanged:
+running, stopped, restarting, failed, timeout, unknown.
+"""
+
+import subprocess
+import time
+from pathlib import Path
+
+from . import runner
+
+SERVICES = {
+    'jack': {'name': 'JACK Audio', 'systemd': 'jack', 'user_service': False},
+    # Per-user unit that points to the currently active Stereo Tool instance
+    'stereo_tool': {'name': 'Stereo Tool', 'systemd': 'rdx-stereotool-active', 'user_service': True},
+    'liquidsoap': {'name': 'Liquidsoap', 'systemd': 'liquidsoap', 'user_service': True},
+    'icecast': {'name': 'Icecast', 'systemd': 'icecast2', 'user_service': False},
+}
+
+PROBE_TIMEOUT = 0.7
+
+
+def liquidsoap_unit_path() -> Path:
+    return Path.home() / ".config" / "systemd" / "user" / "rdx-liquidsoap.service"
+
+
+def _systemctl(args: list, user: bool):
+    cmd = ["systemctl", "--user"] + args if user else ["systemctl"] + args
+    return runner.run(cmd, capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+
+
+def probe(service_key: str) -> str:
+    """Return the current state of one service."""
+    info = SERVICES[service_key]
+    try:
+        if service_key == 'jack':
+            result = runner.run(["jack_lsp"], capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+            return "running" if result.returncode == 0 else "stopped"
+        if service_key == 'liquidsoap':
+            # Prefer user systemd unit status if present; otherwise fall back to process check
+            if liquidsoap_unit_path().exists():
+                result = _systemctl(["is-active", "rdx-liquidsoap"], user=True)
+                if result.stdout.strip() == "active":
+                    return "running"
+                # Distinguish failed/restarting vs clean stop to avoid UI loop confusion
+                try:
+                    sub = (_systemctl(["show", "-p", "SubState", "rdx-liquidsoap"], user=True).stdout or "").strip()
+                except subprocess.TimeoutExpired:
+                    sub = ""
+                if "SubState=auto-restart" in sub:
+                    return "restarting"
+                if "SubState=failed" in sub:
+                    return "failed"
+                return "stopped"
+            proc_check = runner.run(["pgrep", "-x", "liquidsoap"], capture_output=True, timeout=PROBE_TIMEOUT)
+            return "running" if proc_check.returncode == 0 else "stopped"
+        result = _systemctl(["is-active", info['systemd']], user=info.get('user_service', False))
+        return "running" if result.stdout.strip() == "active" else "stopped"
+    except subprocess.TimeoutExpired:
+        return "timeout"
+    except Exception:
+        return "unknown"
+
+
+def probe_all() -> dict:
+    """Return {service_key: state} for every known service."""
+    return {key: probe(key) for key in SERVICES}
+
+
+# ---- Control (headless) ----
+# The Service Control tab keeps its interactive preflight (encoder checks,
+# config sanitising); these helpers cover the daemon and CLI, which only act
+# on units the GUI has already set up.
+
+def _control_jack(action: str):
+    from . import jackserver
+    settings = jackserver.load_settings()
+    if not settings.get("manage", False):
+        return False, "RDX is set to not manage the JACK server"
+    if action in ("stop", "restart"):
+        jackserver.stop()
+        if action == "stop":
+            return True, "Requested JACK shutdown"
+        time.sleep(0.8)
+    elif jackserver.is_running():
+        return True, "JACK audio server is already running"
+    return jackserver.start(settings)
+
+
+def control(service_key: str, action: str):
+    """Start, stop or restart a service without blocking on systemd. Returns (ok, message)."""
+    if service_key not in SERVICES:
+        raise KeyError(service_key)
+    if action not in ("start", "stop", "restart"):
+        raise ValueError(f"unknown action: {action}")
+    info = SERVICES[service_key]
+    if service_key == 'jack':
+        return _control_jack(action)
+    unit = info['systemd']
+    user = info.get('user_service', False)
+    if service_key == 'liquidsoap':
+        if not liquidsoap_unit_path().exists():
+            if action == "stop":
+                runner.run(["killall", "liquidsoap"], capture_output=True, check=False)
+                return True, "Liquidsoap stopped"
+            return False, "rdx-liquidsoap user unit not found; start Liquidsoap once from Service Control"
+        unit = "rdx-liquidsoap"
+    try:
+        r = runner.run((["systemctl", "--user"] if user else ["systemctl"]) + [action, unit, "--no-block"],
+                       capture_output=True, text=True, timeout=5.0)
+    except subprocess.TimeoutExpired:
+        return False, f"systemctl {action} {unit} timed out"
+    except FileNotFoundError:
+        return False, "systemctl not found"
+    if r.returncode != 0:
+        return False, (r.stderr or r.stdout or f"systemctl {action} {unit} failed").strip()
+    return True, f"{info['name']} {action} requested"
+
+
+def start(service_key: str):
+    return control(service_key, "start")
+
+
+def stop(service_key: str):
+    return control(service_key, "stop")
+
+
+def restart(service_key: str):
+    return control(service_key, "restart")
@@ -0,0 +1,216 @@
+"""
+Cold start of the broadcast chain: each service as soon as what it needs is ready.
+
+Dependencies use systemd's vocabulary:
+
+- REQUIRES: Stereo Tool and Liquidsoap start once JACK is ready, and are
+  skipped ("blocked") if it never gets there
+- WANTS: Liquidsoap also waits for Icecast, so its first connection
+  succeeds instead of sitting out Liquidsoap's reconnect delay; if Icecast
+  fails, Liquidsoap starts anyway
+
+Everything else runs in parallel. JACK and Icecast start at once;
+Liquidsoap and Stereo Tool follow the moment JACK has ports. Readiness is
+checked in-process instead of fixed sleeps between services: from JACK's
+port registration callback (rdx.wait) for the JACK-side checks, otherwise
+a probe every POLL_INTERVAL:
+
+- JACK: the server answers and has at least one port (jack-wait-ready.sh)
+- Liquidsoap, Stereo Tool: their JACK client has registered its ports
+  (encoder-wait-ready.sh)
+- Icecast: its listen port accepts connections
+
+start_chain() returns when every service is ready, has failed, or has run
+out of time (READY_TIMEOUT).
+"""
+
+import fnmatch
+import socket
+import threading
+import time
+from pathlib import Path
+
+from . import jack as rdx_jack
+from . import rules as rdx_rules
+from . import services as rdx_services
+from . import wait as rdx_wait
+
+REQUIRES = {'stereo_tool': ('jack',), 'liquidsoap': ('jack',)}
+WANTS = {'liquidsoap': ('icecast',)}
+# JACK client (glob, as in rdx.rules) whose ports mean the service is up
+CLIENTS = {'liquidsoap': "*liquidsoap*", 'stereo_tool': rdx_rules.PROCESSOR}
+
+READY_TIMEOUT = 30.0
+POLL_INTERVAL = 0.1
+
+
+def saved_timeouts(settings: dict) -> dict:
+    """Per-service readiness timeouts from settings.json (``service_ready_timeouts``).
+
+    Settings from before the start chain only have ``service_delays``, the
+    seconds the old fixed-order start slept after each service. A delay
+    raised above READY_TIMEOUT meant the service was slow to come up, so it
+    becomes that service's timeout; shorter ones are covered by the default.
+    The old ``service_launch_order`` has no equivalent (dependencies decide).
+    """
+    saved = (settings or {}).get('service_ready_timeouts')
+    legacy = not isinstance(saved, dict)
+    if legacy:
+        saved = (settings or {}).get('service_delays')
+    out = {}
+    for key, value in (saved.items() if isinstance(saved, dict) else ()):
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            continue
+        if not legacy or value > READY_TIMEOUT:
+            out[key] = value
+    return out
+
+
+def stereotool_unit_path() -> Path:
+    return Path.home() / ".config" / "systemd" / "user" / "rdx-stereotool-active.service"
+
+
+def configured() -> list:
+    """The services there is something to start for: JACK, Icecast, and the units Service Control has written."""
+    keys = ['jack']
+    if rdx_services.liquidsoap_unit_path().exists():
+        keys.append('liquidsoap')
+    if stereotool_unit_path().exists():
+        keys.append('stereo_tool')
+    return keys + ['icecast']
+
+
+def after(key: str, keys=None) -> tuple:
+    """The services ``key`` waits for (required first), limited to ``keys``."""
+    deps = REQUIRES.get(key, ()) + WANTS.get(key, ())
+    return tuple(d for d in deps if keys is None or d in keys)
+
+
+def plan(keys=None) -> list:
+    """``keys`` in waves: each wave only waits for earlier ones. Raises ValueError on a cycle."""
+    left = list(configured() if keys is None else keys)
+    waves, done = [], set()
+    while left:
+        wave = [k for k in left if all(d in done for d in after(k, left + list(done)))]
+        if not wave:
+            raise ValueError(f"dependency cycle between {', '.join(left)}")
+        waves.append(wave)
+        done.update(wave)
+        left = [k for k in left if k not in done]
+    return waves
+
+
+# ---- readiness ----
+def _icecast_up(timeout: float = 0.3) -> bool:
+    from . import streaming
+    try:
+        with socket.create_connection((streaming.ICECAST_DEFAULTS['host'], streaming.ICECAST_DEFAULTS['port']),
+                                      timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def _has_client(ports: dict, glob: str) -> bool:
+    globs = [g.lower() for g in rdx_rules.expand(glob)]
+    return any(fnmatch.fnmatchcase(client.lower(), g) for client in ports for g in globs)
+
+
+def ready(key: str) -> bool:
+    """One readiness probe for ``key``."""
+    if key == 'icecast':
+        return _icecast_up()
+    ports = rdx_jack.list_ports(timeout=1.0)
+    if key == 'jack':
+        return bool(ports)
+    glob = CLIENTS.get(key)
+    if glob is None:
+        return rdx_services.probe(key) == "running"
+    return _has_client(ports, glob)
+
+
+def wait_ready(key: str, timeout: float = READY_TIMEOUT, check=ready, interval: float = POLL_INTERVAL) -> bool:
+    """Block until ``check(key)`` passes; False after ``timeout`` seconds."""
+    if check is ready and (key == 'jack' or key in CLIENTS) and rdx_wait.available():
+        return rdx_wait.wait(clients=[CLIENTS[key]] if key in CLIENTS else (), timeout=timeout)['ready']
+    end = time.monotonic() + timeout
+    while True:
+        try:
+            if check(key):
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= end:
+            return False
+        time.sleep(interval)
+
+
+# ---- starting ----
+def _start(key: str):
+    if key == 'jack':
+        from . import jackserver
+        if not jackserver.load_settings().get("manage", False):
+            return True, "managed outside RDX; waiting for it"
+    return rdx_services.control(key, "start")
+
+
+def start_chain(keys=None, start=_start, check=ready, timeouts: dict = None, progress=None) -> dict:
+    """Start ``keys`` (default: configured()) along the dependency graph.
+
+    ``start(key)`` returns (ok, message), like rdx.services.control;
+    ``check(key)`` is one readiness probe; ``timeouts`` overrides READY_TIMEOUT
+    per service. ``progress(key, entry)`` is called from worker threads as
+    each service settles. Returns {ok, seconds, services: {key: {state,
+    message, started, ready}}}: ``state`` is ready, failed, timeout or
+    blocked; ``started``/``ready`` are seconds from the start of the chain.
+    """
+    keys = list(configured() if keys is None else keys)
+    plan(keys)   # refuse a cycle before starting anything
+    timeouts = timeouts or {}
+    t0 = time.monotonic()
+    settled = {k: threading.Event() for k in keys}
+    out = {k: {'state': None, 'message': "", 'started': None, 'ready': None} for k in keys}
+
+    def run(key):
+        entry = out[key]
+        try:
+            for dep in after(key, keys):
+                settled[dep].wait()
+            missing = [d for d in REQUIRES.get(key, ()) if d in keys and out[d]['state'] != "ready"]
+            if missing:
+                entry.update(state="blocked", message=f"{', '.join(missing)} not ready")
+                return
+            entry['started'] = round(time.monotonic() - t0, 3)
+            if check(key):
+                entry.update(state="ready", message="already running", ready=entry['started'])
+                return
+            ok, msg = start(key)
+            entry['message'] = msg
+            if not ok:
+                entry['state'] = "failed"
+                return
+            limit = float(timeouts.get(key, READY_TIMEOUT))
+            if wait_ready(key, limit, check):
+                entry.update(state="ready", ready=round(time.monotonic() - t0, 3))
+            else:
+                entry.update(state="timeout", message=f"not ready after {limit:g} s")
+        except Exception as e:
+            entry.update(state="failed", message=str(e))
+        finally:
+            settled[key].set()
+            if progress:
+                try:
+                    progress(key, dict(entry))
+                except Exception:
+                    pass
+
+    threads = [threading.Thread(target=run, args=(k,), name=f"rdx-start-{k}", daemon=True) for k in keys]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {'ok': all(e['state'] == "ready" for e in out.values()),
+            'seconds': round(time.monotonic() - t0, 3),
+            'services': out}
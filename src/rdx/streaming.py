@@ -0,0 +1,768 @@
+"""
+Stream definitions and config generation for Liquidsoap and Icecast.
+
+Streams are persisted in ~/.config/rdx/streams.json as a list of dicts:
+    {"codec", "bitrate", "mount", "station_name", "genre", "description"}
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+from . import config
+from . import runner
+
+CODECS = ["MP3", "AAC+", "FLAC", "OGG", "OPUS"]
+BITRATES = ["64 kbps", "96 kbps", "128 kbps", "192 kbps", "256 kbps", "320 kbps"]
+
+# Liquidsoap's telnet control interface (see build_liquidsoap_config)
+CONTROL_HOST = "127.0.0.1"
+CONTROL_PORT = 1234
+
+ICECAST_DEFAULTS = {
+    'host': "localhost",
+    'port': 8000,
+    'source_password': "hackm3",
+    'admin_password': "Hackm333",
+    'relay_password': "hackm33",
+}
+
+
+def streams_file() -> Path:
+    return config.config_dir() / "streams.json"
+
+
+def load_streams() -> list:
+    data = config.load_json(streams_file(), [])
+    return data if isinstance(data, list) else []
+
+
+def save_streams(streams: list) -> bool:
+    return config.save_json(streams_file(), streams)
+
+
+def make_stream(codec: str, bitrate: str, mount: str, station_name: str = "",
+                genre: str = "", description: str = "") -> dict:
+    """Normalise user input into a stream dict; raises ValueError on bad input."""
+    mount = (mount or "").strip()
+    if not mount:
+        raise ValueError("Please enter a mount point (e.g., /stream).")
+    if not mount.startswith('/'):
+        mount = '/' + mount
+    if codec not in CODECS and codec != "AAC":
+        raise ValueError(f"Unknown codec {codec!r} (choose from {', '.join(CODECS)})")
+    if bitrate and bitrate.isdigit():
+        bitrate = f"{bitrate} kbps"
+    return {
+        'codec': codec,
+        'bitrate': bitrate,
+        'mount': mount,
+        'station_name': station_name.strip(),
+        'genre': genre.strip() if genre.strip() else 'Various',
+        'description': description.strip() if description.strip() else f'{codec} stream at {bitrate}'
+    }
+
+
+def add_stream(streams: list, stream: dict) -> list:
+    """Return a new list with ``stream`` appended; refuses duplicate mounts."""
+    for s in streams:
+        if s.get('mount') == stream['mount']:
+            raise ValueError(f"Mount point {stream['mount']} already exists!")
+    return list(streams) + [stream]
+
+
+# ---- Liquidsoap ----
+def liquidsoap_bin() -> str:
+    """Prefer the per-user OPAM shim at ~/.local/bin/liquidsoap if present.
+    Fallback to whichever 'liquidsoap' is on PATH.
+    """
+    try:
+        home_bin = str(Path.home() / ".local" / "bin" / "liquidsoap")
+        if os.path.isfile(home_bin) and os.access(home_bin, os.X_OK):
+            return home_bin
+    except Exception:
+        pass
+    return "liquidsoap"
+
+
+def env_with_localbin() -> dict:
+    """Return env with ~/.local/bin prepended to PATH so OPAM shim is found."""
+    env = os.environ.copy()
+    try:
+        home_local_bin = str(Path.home() / ".local" / "bin")
+        path = env.get("PATH", "")
+        parts = path.split(":") if path else []
+        if home_local_bin and home_local_bin not in parts:
+            env["PATH"] = f"{home_local_bin}:{path}" if path else home_local_bin
+    except Exception:
+        pass
+    return env
+
+
+def has_encoder(name: str) -> bool:
+    """Return True if 'encoder.<name>' help is available (plugin built/linked)."""
+    try:
+        res = runner.run([liquidsoap_bin(), "-h", f"encoder.{name}"],
+                         capture_output=True, text=True, timeout=1.0, env=env_with_localbin())
+        out = (res.stdout or "") + (res.stderr or "")
+        return res.returncode == 0 and "Plugin not found" not in out
+    except Exception:
+        return False
+
+
+def codec_config(codec: str, bitrate: str, fdkaac=None) -> str:
+    """Liquidsoap encoder expression for a stream.
+
+    ``fdkaac`` may be passed to skip the encoder probe (None = probe on demand).
+    """
+    if codec == "MP3":
+        kbps = bitrate.split()[0]
+        return f"%mp3(bitrate={kbps})"
+    elif codec in ("AAC+", "AAC"):
+        # Prefer native fdkaac encoder if available; otherwise fall back to ffmpeg aac
+        kbps = bitrate.split()[0]
+        try:
+            kbps_int = int(kbps)
+        except Exception:
+            kbps_int = 64
+        if fdkaac is None:
+            fdkaac = has_encoder("fdkaac")
+        if fdkaac:
+            # fdkaac expects numeric kbps bitrate
+            return f"%fdkaac(bitrate={kbps_int})"
+        # Fallback: ffmpeg-based AAC (audio-only flags for Liquidsoap 2.x)
+        return f"%ffmpeg(audio=true, video=false, format=\"adts\", audio_codec=\"aac\", audio_bitrate=\"{kbps_int}k\")"
+    elif codec == "FLAC":
+        # For Icecast, FLAC is typically sent in an Ogg container
+        return "%ogg(%flac())"
+    elif codec == "OGG":
+        return "%vorbis(quality=0.7)"
+    elif codec == "OPUS":
+        kbps = bitrate.split()[0]
+        return f"%opus(bitrate={kbps})"
+    else:
+        return "%mp3(bitrate=192)"
+
+
+def format_key(stream: dict) -> str:
+    """Name of the compiled encoder a stream needs: "mp3_128", "aac_64", "ogg", ..."""
+    codec = {'AAC+': "aac"}.get(stream['codec'], stream['codec'].lower())
+    if codec in ("flac", "ogg"):
+        return codec   # bitrate is not used (see codec_config)
+    kbps = str(stream.get('bitrate') or "").split()
+    return f"{codec}_{kbps[0]}" if kbps else codec
+
+
+def _liq_str(text) -> str:
+    return '"' + str(text).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _output_fields(stream: dict) -> list:
+    """[format, mount, name, genre, description] as rdx_start() and the rdx.add command take them."""
+    return [format_key(stream), stream['mount'], stream.get('station_name', 'RDX Station'),
+            stream.get('genre', 'Various'),
+            stream.get('description', f"{stream['codec']} stream at {stream['bitrate']}")]
+
+
+def build_liquidsoap_config(streams: list, fdkaac=None, icecast: dict = None) -> str:
+    """Build the radio.liq text: JACK input, the control interface and one Icecast output per stream.
+
+    Outputs are started through ``rdx_start()``, which knows one encoder per
+    format the streams use; the telnet commands on CONTROL_PORT add, remove
+    and list outputs while Liquidsoap runs (see apply_streams()).
+    """
+    ice = dict(ICECAST_DEFAULTS)
+    ice.update(icecast or {})
+    if fdkaac is None and any(s.get('codec') in ("AAC+", "AAC") for s in streams):
+        fdkaac = has_encoder("fdkaac")
+    config_text = f'''#!/usr/bin/liquidsoap
+
+# Prefer stdout logging; RDX user service appends stdout/stderr to ~/.config/rdx/liquidsoap.log
+set("log.stdout", true)
+set("log.file", false)
+
+# Set sample rate to 48kHz
+set("frame.audio.samplerate", 48000)
+
+# Enable ICY metadata globally
+set("icy.metadata", true)
+
+# Control interface: RDX adds, removes and updates outputs without a restart
+set("server.telnet", true)
+set("server.telnet.bind_addr", "{CONTROL_HOST}")
+set("server.telnet.port", {CONTROL_PORT})
+
+# Grab JACK input
+radio = input.jack(id="liquidsoap")
+
+# Ensure stream stability
+radio = mksafe(radio)
+
+# Running outputs: (mount, (description line for rdx.list, stop function))
+rdx_outputs = ref([])
+
+def rdx_running(mount) =
+  list.exists(fun (o) -> fst(o) == mount, rdx_outputs())
+end
+
+def rdx_keep(fmt, mount, name, genre, description, stop) =
+  line = url.encode(mount) ^ " " ^ fmt ^ " " ^ url.encode(name) ^ " " ^ url.encode(genre) ^ " " ^ url.encode(description)
+  rdx_outputs := list.add((mount, (line, stop)), rdx_outputs())
+end
+
+# One Icecast output; encoders are compiled in, so only these formats can be added at runtime
+def rdx_start(fmt, mount, name, genre, description) =
+  url_field = string.sub(mount, start=1, length=string.length(mount) - 1)
+  if rdx_running(mount) then
+    "ERROR: " ^ mount ^ " is already running"
+'''
+    formats = []
+    for stream in streams:
+        key = format_key(stream)
+        if key not in formats:
+            formats.append(key)
+    for key in formats:
+        stream = next(s for s in streams if format_key(s) == key)
+        enc = codec_config(stream['codec'], stream['bitrate'], fdkaac=fdkaac)
+        config_text += f'''  elsif fmt == "{key}" then
+    o = output.icecast(
+      {enc},
+      host="{ice['host']}",
+      port={ice['port']},
+      password="{ice['source_password']}",
+      mount=mount,
+      genre=genre,
+      url=url_field,
+      name=name,
+      description=description,
+      radio
+    )
+    rdx_keep(fmt, mount, name, genre, description, fun () -> source.shutdown(o))
+    "OK"
+'''
+    config_text += f'''  else
+    "ERROR: no " ^ fmt ^ " encoder in this script; restart Liquidsoap"
+  end
+end
+
+def rdx_stop(mount) =
+  if rdx_running(mount) then
+    list.iter(fun (o) -> if fst(o) == mount then snd(snd(o))() end, rdx_outputs())
+    rdx_outputs := list.filter(fun (o) -> fst(o) != mount, rdx_outputs())
+    "OK"
+  else
+    "ERROR: " ^ mount ^ " is not running"
+  end
+end
+
+# Each field arrives as "_" + URL-encoded value, so an empty one still splits
+def rdx_add(args) =
+  a = string.split(separator=" ", args)
+  def arg(n) =
+    x = list.nth(default="_", a, n)
+    url.decode(string.sub(x, start=1, length=string.length(x) - 1))
+  end
+  rdx_start(arg(0), arg(1), arg(2), arg(3), arg(4))
+end
+
+server.register(namespace="rdx", usage="add <format> <mount> <name> <genre> <description>",
+                description="Start an Icecast output (fields _URL-encoded).", "add", rdx_add)
+server.register(namespace="rdx", usage="remove <mount>", description="Stop an Icecast output.",
+                "remove", fun (mount) -> rdx_stop(url.decode(mount)))
+server.register(namespace="rdx", description="Running outputs, one per line.", "list",
+                fun (_) -> string.concat(separator="\\n", list.rev(list.map(fun (o) -> fst(snd(o)), rdx_outputs()))))
+server.register(namespace="rdx", description="Formats rdx.add can start.", "formats",
+                fun (_) -> "{' '.join(formats)}")
+'''
+    # Add output for each stream
+    for stream in streams:
+        fields = ", ".join(_liq_str(f) for f in _output_fields(stream))
+        config_text += f'''
+# {stream['codec']} {stream['bitrate']} stream
+ignore(rdx_start({fields}))
+'''
+    return config_text
+
+
+def write_liquidsoap_config(streams: list = None) -> Path:
+    streams = load_streams() if streams is None else streams
+    path = config.config_dir() / "radio.liq"
+    with open(path, 'w') as f:
+        f.write(build_liquidsoap_config(streams))
+    return path
+
+
+# ---- Liquidsoap control interface (hot reload) ----
+def telnet(commands, host: str = CONTROL_HOST, port: int = CONTROL_PORT, timeout: float = 2.0) -> list:
+    """Send commands to Liquidsoap's telnet server; returns each reply as a string.
+
+    Raises OSError when nothing is listening.
+    """
+    import socket
+    replies = []
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        f = sock.makefile("rwb")
+        for cmd in commands:
+            f.write(cmd.encode("utf-8") + b"\n")
+            f.flush()
+            lines = []
+            while True:
+                line = f.readline()
+                if not line:
+                    raise OSError("Liquidsoap closed the control connection")
+                line = line.decode("utf-8", "replace").rstrip("\r\n")
+                if line == "END":
+                    break
+                lines.append(line)
+            replies.append("\n".join(lines))
+        try:
+            f.write(b"quit\n")
+            f.flush()
+        except OSError:
+            pass
+    return replies
+
+
+def live_outputs(**kw):
+    """(formats, {mount: {format, station_name, genre, description}}) from the running Liquidsoap.
+
+    None when it does not answer on the control port (not running, or started
+    from a radio.liq without the control interface).
+    """
+    from urllib.parse import unquote
+    try:
+        formats, listing = telnet(["rdx.formats", "rdx.list"], **kw)
+    except OSError:
+        return None
+    if formats.startswith("ERROR") or "Unknown command" in formats:
+        return None
+    outputs = {}
+    for line in listing.splitlines():
+        parts = [unquote(p) for p in line.split(" ")]
+        if len(parts) >= 5:
+            outputs[parts[0]] = {'format': parts[1], 'station_name': parts[2], 'genre': parts[3],
+                                 'description': parts[4]}
+    return set(formats.split()), outputs
+
+
+def reload_plan(streams: list, formats: set, outputs: dict) -> dict:
+    """What to change on a running Liquidsoap to serve ``streams``.
+
+    Returns {remove: [mounts], add: [streams], update: [streams], restart}:
+    ``restart`` says why the change cannot be made live (a format whose
+    encoder the running script was not built with), else "".
+    """
+    plan = {'remove': [], 'add': [], 'update': [], 'restart': ""}
+    wanted = {}
+    for stream in streams:
+        fields = _output_fields(stream)
+        wanted[stream['mount']] = fields
+        if fields[0] not in formats:
+            plan['restart'] = f"new encoder {fields[0]} for {stream['mount']}"
+        live = outputs.get(stream['mount'])
+        if live is None:
+            plan['add'].append(stream)
+        elif [live['format'], stream['mount'], live['station_name'], live['genre'], live['description']] != fields:
+            plan['update'].append(stream)
+    plan['remove'] = [m for m in outputs if m not in wanted]
+    return plan
+
+
+def apply_streams(streams: list = None, dry_run: bool = False, restart: bool = True, before_restart=None,
+                  **kw) -> dict:
+    """Write radio.liq and bring a running Liquidsoap in line with it, live where possible.
+
+    Outputs are removed, updated (stopped and started again: a short
+    reconnect on that mount only) and added over the control interface; the
+    other mounts keep their listeners. Liquidsoap is restarted only for a
+    new encoder or a running script without the control interface, and only
+    with ``restart`` (``before_restart()`` is called first). Returns
+    {action, changes, ok, message}; action is none, hot, restart, written
+    (Liquidsoap not running) or pending (a restart is needed but was not
+    allowed, or ``dry_run``).
+    """
+    from . import services as rdx_services
+    streams = load_streams() if streams is None else streams
+    if not dry_run:
+        write_liquidsoap_config(streams)
+    res = {'action': "none", 'changes': [], 'ok': True, 'message': ""}
+    if rdx_services.probe('liquidsoap') != "running":
+        res.update(action="written" if not dry_run else "none",
+                   message="Liquidsoap is not running; it will use the new config when it starts")
+        return res
+    live = live_outputs(**kw)
+    if live is None:
+        plan = {'remove': [], 'add': [], 'update': [], 'restart': "the running config has no control interface"}
+    else:
+        plan = reload_plan(streams, *live)
+    res['changes'] = ([f"- {m}" for m in plan['remove']] + [f"~ {s['mount']}" for s in plan['update']]
+                      + [f"+ {s['mount']}" for s in plan['add']])
+    if plan['restart']:
+        res.update(action="pending", message=f"Restart needed: {plan['restart']}")
+        if dry_run or not restart:
+            return res
+        return _restart_liquidsoap(res, before_restart)
+    if not res['changes']:
+        res['message'] = "Liquidsoap already runs these outputs"
+        return res
+    if dry_run:
+        res.update(action="hot", message="Changes can be applied live")
+        return res
+    from urllib.parse import quote
+    commands = [f"rdx.remove {quote(m, safe='')}" for m in plan['remove']]
+    commands += [f"rdx.remove {quote(s['mount'], safe='')}" for s in plan['update']]
+    commands += ["rdx.add " + " ".join("_" + quote(f, safe="") for f in _output_fields(s))
+                 for s in plan['update'] + plan['add']]
+    try:
+        errors = [r for r in telnet(commands, **kw) if r.strip() != "OK"]
+    except OSError as e:
+        errors = [str(e)]
+    if not errors:
+        res.update(action="hot", message=f"Applied {len(res['changes'])} change(s) live")
+        return res
+    res.update(action="pending", ok=False, message="; ".join(errors))
+    return _restart_liquidsoap(res, before_restart) if restart else res
+
+
+def _restart_liquidsoap(res: dict, before_restart=None) -> dict:
+    from . import services as rdx_services
+    if before_restart:
+        try:
+            before_restart()
+        except Exception:
+            pass
+    ok, msg = rdx_services.restart('liquidsoap')
+    res.update(action="restart", ok=ok, message=f"{res['message']}; {msg}" if res['message'] else msg)
+    return res
+
+
+# ---- Icecast ----
+def build_icecast_config(host: str = "localhost", port: int = 8000, source_pass: str = "hackm3",
+                         admin_pass: str = "Hackm333", relay_pass: str = "hackm33", streams: list = None) -> str:
+    """Build Icecast XML configuration with comprehensive template"""
+    streams = load_streams() if streams is None else streams
+    # Build shoutcast-mounts from configured streams
+    shoutcast_mounts = ""
+    for stream in streams or []:
+        mount_path = stream['mount']
+        shoutcast_mounts += f'        <shoutcast-mount>{mount_path}</shoutcast-mount>\n'
+
+    # Add default mounts if no streams configured
+    if not shoutcast_mounts:
+        shoutcast_mounts = '        <shoutcast-mount>/192</shoutcast-mount>\n        <shoutcast-mount>/stream</shoutcast-mount>\n'
+
+    config_text = f'''<icecast>
+    <!-- location and admin are two arbitrary strings that are e.g. visible
+         on the server info page of the icecast web interface
+         (server_version.xsl). -->
+    <location>Earth</location>
+    <admin>icemaster@{host}</admin>
+
+    <!-- IMPORTANT!
+         Especially for inexperienced users:
+         Start out by ONLY changing all passwords and restarting Icecast.
+         For detailed setup instructions please refer to the documentation.
+         It's also available here: http://icecast.org/docs/
+    -->
+
+    <limits>
+        <clients>100</clients>
+        <sources>10</sources>
+        <queue-size>524288</queue-size>
+        <client-timeout>30</client-timeout>
+        <header-timeout>15</header-timeout>
+        <source-timeout>10</source-timeout>
+        <!-- If enabled, this will provide a burst of data when a client 
+             first connects, thereby significantly reducing the startup 
+             time for listeners that do substantial buffering. However,
+             it also significantly increases latency between the source
+             client and listening client.  For low-latency setups, you
+             might want to disable this. -->
+        <burst-on-connect>1</burst-on-connect>
+        <!-- same as burst-on-connect, but this allows for being more
+             specific on how much to burst. Most people won't need to
+             change from the default 64k. Applies to all mountpoints  -->
+        <burst-size>65535</burst-size>
+    </limits>
+
+    <authentication>
+        <!-- Sources log in with username 'source' -->
+        <source-password>{source_pass}</source-password>
+        <!-- Relays log in with username 'relay' -->
+        <relay-password>{relay_pass}</relay-password>
+
+        <!-- Admin logs in with the username given below -->
+        <admin-user>admin</admin-user>
+        <admin-password>{admin_pass}</admin-password>
+    </authentication>
+
+    <!-- set the mountpoint for a shoutcast source to use, the default if not
+         specified is /stream but you can change it here if an alternative is
+         wanted or an extension is required
+    <shoutcast-mount>/live.nsv</shoutcast-mount>
+    -->
+
+    <!-- Uncomment this if you want directory listings -->
+    <!--
+    <directory>
+        <yp-url-timeout>15</yp-url-timeout>
+        <yp-url>http://dir.xiph.org/cgi-bin/yp-cgi</yp-url>
+    </directory>
+    -->
+
+    <!-- This is the hostname other people will use to connect to your server.
+         It affects mainly the urls generated by Icecast for playlists and yp
+         listings. You MUST configure it properly for YP listings to work!
+    -->
+    <hostname>{host}</hostname>
+
+    <!-- You may have multiple <listen-socket> elements -->
+    <listen-socket>
+        <port>{port}</port>
+{shoutcast_mounts.rstrip()}
+        <!-- <bind-address>127.0.0.1</bind-address> -->
+    </listen-socket>
+
+    <!-- Global header settings 
+         Headers defined here will be returned for every HTTP request to Icecast.
+
+         The ACAO header makes Icecast public content/API by default
+         This will make streams easier embeddable (some HTML5 functionality needs it).
+         Also it allows direct access to e.g. /status-json.xsl from other sites.
+         If you don't want this, comment out the following line or read up on CORS. 
+    -->
+    <http-headers>
+        <header name="Access-Control-Allow-Origin" value="*" />
+    </http-headers>
+
+    <!-- Relaying
+         You don't need this if you only have one server.
+         Please refer to the documentation for a detailed explanation.
+    -->
+    <!--<master-server>127.0.0.1</master-server>-->
+    <!--<master-server-port>8001</master-server-port>-->
+    <!--<master-update-interval>120</master-update-interval>-->
+    <!--<master-password>hackme</master-password>-->
+
+    <!-- setting this makes all relays on-demand unless overridden, this is
+         useful for master relays which do not have <relay> definitions here.
+         The default is 0 -->
+    <!--<relays-on-demand>1</relays-on-demand>-->
+
+    <!-- Mountpoints
+         Only define <mount> sections if you want to use advanced options,
+         like alternative usernames or passwords
+    -->
+
+    <!-- Default settings for all mounts that don't have a specific <mount type="normal">.
+    -->
+    <!-- 
+    <mount type="default">
+        <public>0</public>
+        <intro>/server-wide-intro.ogg</intro>
+        <max-listener-duration>3600</max-listener-duration>
+        <authentication type="url">
+                <option name="mount_add" value="http://auth.example.org/stream_start.php"/>
+        </authentication>
+        <http-headers>
+                <header name="foo" value="bar" />
+        </http-headers>
+    </mount>
+    -->
+
+    <fileserve>1</fileserve>
+
+    <paths>
+        <!-- basedir is only used if chroot is enabled -->
+        <basedir>/usr/share/icecast2</basedir>
+
+        <!-- Note that if <chroot> is turned on below, these paths must both
+             be relative to the new root, not the original root -->
+        <logdir>/var/log/icecast2</logdir>
+        <webroot>/usr/share/icecast2/web</webroot>
+        <adminroot>/usr/share/icecast2/admin</adminroot>
+        <!-- <pidfile>/usr/share/icecast2/icecast.pid</pidfile> -->
+
+        <!-- Aliases: treat requests for 'source' path as being for 'dest' path
+             May be made specific to a port or bound address using the "port"
+             and "bind-address" attributes.
+          -->
+        <!--
+        <alias source="/foo" destination="/bar"/>
+        -->
+        <!-- Aliases: can also be used for simple redirections as well,
+             this example will redirect all requests for http://server:port/ to
+             the status page
+        -->
+        <alias source="/" destination="/status.xsl"/>
+        <!-- The certificate file needs to contain both public and private part.
+             Both should be PEM encoded.
+        <ssl-certificate>/usr/share/icecast2/icecast.pem</ssl-certificate>
+        -->
+    </paths>
+
+    <logging>
+        <accesslog>access.log</accesslog>
+        <errorlog>error.log</errorlog>
+        <!-- <playlistlog>playlist.log</playlistlog> -->
+        <loglevel>3</loglevel> <!-- 4 Debug, 3 Info, 2 Warn, 1 Error -->
+        <logsize>10000</logsize> <!-- Max size of a logfile -->
+        <!-- If logarchive is enabled (1), then when logsize is reached
+             the logfile will be moved to [error|access|playlist].log.DATESTAMP,
+             otherwise it will be moved to [error|access|playlist].log.old.
+             Default is non-archive mode (i.e. overwrite)
+        -->
+        <!-- <logarchive>1</logarchive> -->
+    </logging>
+
+    <security>
+        <chroot>0</chroot>
+        <!--
+        <changeowner>
+            <user>nobody</user>
+            <group>nogroup</group>
+        </changeowner>
+        -->
+    </security>
+</icecast>'''
+
+    return config_text
+
+
+def write_icecast_config(**kwargs) -> Path:
+    path = config.config_dir() / "icecast.xml"
+    with open(path, 'w') as f:
+        f.write(build_icecast_config(**kwargs))
+    return path
+
+
+# ---- radio.liq sanitizers ----
+_LOG_TO_STDOUT = 'set("log.stdout", true)\nset("log.file", false)\n'
+_LOG_PATH_CANONICAL = 'set("log.file.path", getenv("HOME", "") ^ "/.config/rdx/liquidsoap.log")'
+
+
+def _sanitize_common(new: str) -> str:
+    # Remove shebang if present; Liquidsoap parse-check (-c) treats it as a syntax error
+    if new.startswith("#!/"):
+        new = re.sub(r'^#!.*\n', '', new, count=1)
+    # Fix getenv signature for Liquidsoap 2.x: require default argument
+    new = re.sub(r'getenv\(\s*["\']HOME["\']\s*\)', 'getenv("HOME", "")', new)
+    # Prefer stdout logging and disable Liquidsoap-managed file logging to avoid HOME-literal path issues.
+    if 'set("log.stdout"' not in new and 'log.stdout :=' not in new:
+        new = _LOG_TO_STDOUT + new
+    # Remove/neutralize any explicit file logging directives anywhere (robust against trailing comments)
+    new = re.sub(r'(?mi)^\s*set\(\s*["\']log\.file(?:\.path)?["\']\s*,.*$', '', new)
+    new = re.sub(r'(?mi)^\s*log\.file(?:\.path)?\s*:=\s*.*$', '', new)
+    # Also ensure any plain set("log.file", true/false) occurrences are disabled
+    new = re.sub(r'(?mi)^\s*set\(\s*["\']log\.file["\']\s*,\s*(true|false)\s*\)\s*(?:#.*)?$', 'set("log.file", false)', new)
+    new = re.sub(r'(?mi)^\s*log\.file\s*:=\s*(true|false)\s*(?:#.*)?$', 'set("log.file", false)', new)
+    # As a fallback, if any literal HOME path assignments for log.file.path remain, rewrite to canonical getenv form
+    new = re.sub(r'set\(\s*["\']log\.file\.path["\']\s*,\s*["\']HOME(?:/[^"\')]*)?["\']\s*\)\s*',
+                 _LOG_PATH_CANONICAL, new)
+    new = re.sub(r'(?m)^\s*log\.file\.path\s*:=\s*["\']HOME(?:/[^"\')]*)?["\']\s*$',
+                 _LOG_PATH_CANONICAL, new)
+    # Tidy any excess blank lines after removals
+    new = re.sub(r'\n{3,}', '\n\n', new)
+    # Ensure ffmpeg encoder is marked as audio to avoid type errors in 2.x
+    return re.sub(r'%ffmpeg\((?![^)]*\baudio\s*=)', r'%ffmpeg(audio=true, video=false, ', new)
+
+
+def sanitize_liquidsoap_text(txt: str) -> str:
+    """Auto-fix common Liquidsoap config issues.
+    - Quote ffmpeg audio_bitrate values: 64k -> "64k"
+    - Replace unsupported 'source=radio' with positional 'radio'
+    """
+    new = _sanitize_common(txt)
+    # Fix unquoted audio_bitrate values
+    new = re.sub(r'(audio_bitrate\s*=\s*)(\d+k)(\b)', r'\1"\2"', new)
+    # Replace source=radio with positional radio while preserving separators
+    new = re.sub(r'\bsource\s*=\s*radio\s*,', 'radio,', new)
+    return re.sub(r'\bsource\s*=\s*radio(\s*[)\n])', r'radio\1', new)
+
+
+def sanitize_liquidsoap_text_strict(txt: str, codecs=None, formats=None) -> str:
+    """Stricter fixes for Liquidsoap/FFmpeg compatibility.
+    - Ensure ffmpeg has audio=true, video=false
+    - Convert audio_bitrate values like "64k" or 64k to integer bits per second (e.g., 64000)
+    - Adapt codec/format to what ``probe_ffmpeg_capabilities()`` reported
+    """
+    new = _sanitize_common(txt)
+    # Replace quoted or unquoted Nk with integer N000 (approximate kbps to bps)
+    new = re.sub(r'audio_bitrate\s*=\s*"(\d+)k"', lambda m: f'audio_bitrate={int(m.group(1))}000', new)
+    new = re.sub(r'audio_bitrate\s*=\s*(\d+)k\b', lambda m: f'audio_bitrate={int(m.group(1))}000', new)
+    # If 'aac' codec not available but libfdk_aac is, switch
+    if codecs is not None and 'aac' not in codecs and 'libfdk_aac' in codecs:
+        new = re.sub(r'audio_codec\s*=\s*"aac"', 'audio_codec="libfdk_aac"', new)
+    # If 'adts' format not available, remove explicit format parameter
+    if formats is not None and 'adts' not in formats:
+        new = re.sub(r',\s*format\s*=\s*"[^"]+"', '', new)
+    # Remove any duplicate commas from earlier insertions
+    return re.sub(r',\s*,', ', ', new)
+
+
+def probe_ffmpeg_capabilities():
+    """Return (codecs, formats) sets supported by Liquidsoap ffmpeg encoder, or (None, None) on failure."""
+    try:
+        res = runner.run([liquidsoap_bin(), "-h", "encoder.ffmpeg"], capture_output=True, text=True,
+                         env=env_with_localbin())
+        if res.returncode != 0:
+            return (None, None)
+        out = res.stdout or res.stderr or ""
+        codecs = set()
+        formats = set()
+        # Heuristics: look for sections listing codecs/formats
+        for line in out.splitlines():
+            l = line.strip()
+            if l.startswith("audio_codec") and ":" in l:
+                # skip option description line
+                continue
+            if l.startswith(("Available audio codecs", "Audio codecs", "Available formats", "Formats")):
+                continue
+            # Common tokens; naive classification: container formats vs codecs
+            for token in ("aac", "libfdk_aac", "adts", "mp4", "mpegts"):
+                if token in l:
+                    (formats if token in ("adts", "mp4", "mpegts") else codecs).add(token)
+        return (codecs or None, formats or None)
+    except Exception:
+        return (None, None)
+
+
+def sanitize_liquidsoap_file(config_file: Path, strict: bool = False) -> bool:
+    """Sanitize a radio.liq in place; returns True if it was rewritten."""
+    try:
+        txt = Path(config_file).read_text(encoding="utf-8")
+    except Exception:
+        return False
+    if strict:
+        new = sanitize_liquidsoap_text_strict(txt, *probe_ffmpeg_capabilities())
+    else:
+        new = sanitize_liquidsoap_text(txt)
+    if new == txt:
+        return False
+    try:
+        Path(config_file).write_text(new, encoding="utf-8")
+        return True
+    except Exception:
+        return False
+
+
+def icecast_listeners(host: str = None, port: int = None, timeout: float = 1.0) -> dict:
+    """Current listeners per mount from Icecast's public ``/status-json.xsl``.
+
+    Returns ``{"/mount": listeners}``; raises OSError/ValueError if Icecast is unreachable.
+    """
+    import urllib.request
+    host = host or ICECAST_DEFAULTS['host']
+    port = port or ICECAST_DEFAULTS['port']
+    with urllib.request.urlopen(f"http://{host}:{port}/status-json.xsl", timeout=timeout) as resp:
+        data = json.loads(resp.read().decode("utf-8", "replace"))
+    sources = (data.get('icestats') or {}).get('source') or []
+    if isinstance(sources, dict):
+        sources = [sources]  # a single mount is not wrapped in a list
+    out = {}
+    for src in sources:
+        url = src.get('listenurl') or ""
+        mount = "/" + url.split("/", 3)[3] if url.count("/") >= 3 else (src.get('server_name') or "?")
+        out[mount] = int(src.get('listeners') or 0)
+    return out
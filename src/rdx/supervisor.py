@@ -0,0 +1,187 @@
+"""
+Crash tracking for the managed services: restart history, crash loops, MTBF.
+
+Restarting stays with systemd. The units RDX writes (rdx-jack,
+rdx-liquidsoap, rdx-stereotool-active) use RESTART_POLICY: the restart delay
+grows exponentially from 2 s to 2 minutes (``RestartSteps``, systemd 254+;
+older versions ignore it and keep the flat 2 s), and ``StartLimitIntervalSec=0``
+keeps systemd retrying instead of giving up on an on-air service.
+
+Supervisor adds no probes of its own. The daemon's status loop hands it the
+states it already has; a service leaving "running" that nobody asked to stop
+(see expect()) is a crash. Only then does it look closer: one ``systemctl
+show`` to tell a clean exit from a crash and read systemd's restart counter,
+and the last log lines, kept with the crash. A service that crashes
+LOOP_CRASHES times within LOOP_WINDOW seconds is in a crash loop until it
+has run for STABLE_AFTER seconds.
+"""
+
+import time
+from collections import deque
+
+from . import config
+from . import runner
+from . import services as rdx_services
+
+RESTART_POLICY = (
+    "Restart=on-failure\n"
+    "RestartSec=2\n"
+    "RestartSteps=6\n"
+    "RestartMaxDelaySec=120\n"
+)
+UNIT_POLICY = "StartLimitIntervalSec=0\n"
+
+LOOP_CRASHES = 3
+LOOP_WINDOW = 300.0
+STABLE_AFTER = 600.0
+# A state change within this long of a requested start/stop/restart is expected
+EXPECT_WINDOW = 30.0
+CRASHES_KEPT = 20
+LOG_LINES = 20
+
+UNITS = {'jack': ("rdx-jack", True), 'stereo_tool': ("rdx-stereotool-active", True),
+         'liquidsoap': ("rdx-liquidsoap", True), 'icecast': ("icecast2", False)}
+LOG_FILES = {'liquidsoap': "liquidsoap.log", 'jack': "jackd.log"}
+# systemd Result= values of a unit that stopped because it was asked to
+CLEAN_RESULTS = ("success",)
+
+
+def unit_info(key: str) -> dict:
+    """{result, restarts} from one ``systemctl show`` of the service's unit; {} when unknown."""
+    unit, user = UNITS.get(key, (None, False))
+    if unit is None:
+        return {}
+    cmd = (["systemctl", "--user"] if user else ["systemctl"]) + ["show", "-p", "LoadState", "-p", "Result",
+                                                                  "-p", "NRestarts", unit]
+    try:
+        res = runner.run(cmd, capture_output=True, text=True, timeout=rdx_services.PROBE_TIMEOUT)
+    except Exception:
+        return {}
+    props = dict(line.split("=", 1) for line in (res.stdout or "").splitlines() if "=" in line)
+    if props.get("LoadState", "loaded") != "loaded":
+        return {}   # not run by this unit (e.g. jackd started directly)
+    out = {}
+    if props.get("Result"):
+        out['result'] = props["Result"]
+    if props.get("NRestarts", "").isdigit():
+        out['restarts'] = int(props["NRestarts"])
+    return out
+
+
+def last_log_lines(key: str, n: int = LOG_LINES) -> list:
+    """The service's own log file tail, else its journal."""
+    name = LOG_FILES.get(key)
+    if name:
+        try:
+            lines = (config.config_dir() / name).read_text(errors="ignore").splitlines()
+            if lines:
+                return lines[-n:]
+        except Exception:
+            pass
+    unit, user = UNITS.get(key, (None, False))
+    if unit is None:
+        return []
+    cmd = ["journalctl"] + (["--user"] if user else []) + ["-u", unit, "-n", str(n), "-o", "cat", "--no-pager"]
+    try:
+        res = runner.run(cmd, capture_output=True, text=True, timeout=2.0)
+    except Exception:
+        return []
+    return (res.stdout or "").splitlines()[-n:]
+
+
+class _Service:
+    def __init__(self):
+        self.state = None
+        self.up_since = None
+        self.up_total = 0.0
+        self.crashes = deque(maxlen=CRASHES_KEPT)
+        self.crash_count = 0
+        self.systemd_restarts = None
+        self.expected = None   # (action, time)
+
+
+class Supervisor:
+    def __init__(self, inspect=unit_info, logs=last_log_lines):
+        self.started = time.time()
+        self._inspect = inspect
+        self._logs = logs
+        self._services = {}
+
+    def _svc(self, key: str) -> _Service:
+        return self._services.setdefault(key, _Service())
+
+    def expect(self, key: str, action: str, t: float = None):
+        """A start/stop/restart was requested: the state changes that follow are not crashes."""
+        self._svc(key).expected = (action, time.time() if t is None else t)
+
+    def observe(self, states: dict, t: float = None) -> list:
+        """Feed one status cycle ({key: state}); returns the crashes it detected."""
+        now = time.time() if t is None else t
+        found = []
+        for key, state in states.items():
+            if state in ("timeout", "unknown"):
+                continue   # a slow probe says nothing; compare the next real state with the last one
+            svc = self._svc(key)
+            prev, svc.state = svc.state, state
+            if state == "running":
+                if svc.up_since is None:
+                    svc.up_since = now
+                continue
+            if svc.up_since is not None:
+                svc.up_total += now - svc.up_since
+                svc.up_since = None
+            went_down = prev == "running"
+            failed_start = prev == "stopped" and state in ("restarting", "failed")
+            if not (went_down or failed_start):
+                continue
+            expected = svc.expected
+            if expected and now - expected[1] <= EXPECT_WINDOW:
+                continue
+            info = self._inspect(key) if state == "stopped" else {}
+            if 'restarts' in info:
+                svc.systemd_restarts = info['restarts']
+            if info.get('result') in CLEAN_RESULTS:
+                continue
+            crash = {'time': now, 'service': key, 'state': state, 'result': info.get('result'),
+                     'log': self._logs(key)}
+            svc.crashes.append(crash)
+            svc.crash_count += 1
+            found.append(crash)
+        return found
+
+    def crash_loop(self, key: str, t: float = None) -> bool:
+        """LOOP_CRASHES crashes within LOOP_WINDOW, and not running for STABLE_AFTER since."""
+        svc = self._services.get(key)
+        if svc is None or not svc.crashes:
+            return False
+        now = time.time() if t is None else t
+        last = svc.crashes[-1]['time']
+        if sum(1 for c in svc.crashes if last - c['time'] <= LOOP_WINDOW) < LOOP_CRASHES:
+            return False
+        return svc.up_since is None or now - svc.up_since < STABLE_AFTER
+
+    def health(self, key: str, t: float = None, log: bool = False) -> dict:
+        """{crashes, crash_loop, uptime, mtbf, last_crash, systemd_restarts[, recent]} for one service.
+
+        ``mtbf`` is the time spent running per crash (None before the first
+        crash); ``recent`` (with ``log``) lists the kept crashes with their log lines.
+        """
+        now = time.time() if t is None else t
+        svc = self._svc(key)
+        up = svc.up_total + (now - svc.up_since if svc.up_since is not None else 0.0)
+        out = {
+            'state': svc.state,
+            'crashes': svc.crash_count,
+            'crash_loop': self.crash_loop(key, now),
+            'uptime': round(now - svc.up_since, 1) if svc.up_since is not None else 0.0,
+            'mtbf': round(up / svc.crash_count, 1) if svc.crash_count else None,
+            'last_crash': svc.crashes[-1]['time'] if svc.crashes else None,
+            'systemd_restarts': svc.systemd_restarts,
+        }
+        if log:
+            out['recent'] = list(svc.crashes)
+        return out
+
+    def snapshot(self, log: bool = True, t: float = None) -> dict:
+        return {'since': self.started,
+                'services': {key: self.health(key, t, log) for key in self._services}}
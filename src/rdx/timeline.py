@@ -0,0 +1,58 @@
+"""
+Startup timeline: named marks relative to process start, for diagnosing slow
+start-up (for example time-to-window on xRDP sessions).
+"""
+
+import os
+import time
+from pathlib import Path
+
+
+def process_age() -> float:
+    """Seconds since this process was exec'd (Linux /proc), or 0.0 if unknown."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (starttime) follows the parenthesised command name
+            fields = f.read().rsplit(")", 1)[1].split()
+        start_ticks = int(fields[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except Exception:
+        return 0.0
+
+
+class Timeline:
+    """Collects ``(label, perf_counter)`` marks; times are reported from process exec."""
+
+    def __init__(self, marks=None):
+        now = time.perf_counter()
+        # perf_counter value that corresponds to exec(); interpreter start-up shows up as the first gap
+        self.t0 = now - process_age()
+        self.marks = list(marks or [])
+        self.reported = False
+
+    def mark(self, label: str):
+        self.marks.append((label, time.perf_counter()))
+
+    def elapsed_ms(self, label: str = None) -> float:
+        for name, t in reversed(self.marks):
+            if label is None or name == label:
+                return (t - self.t0) * 1000.0
+        return 0.0
+
+    def report(self) -> str:
+        lines = ["RDX startup timeline (ms since process start)"]
+        prev = self.t0
+        for label, t in sorted(self.marks, key=lambda m: m[1]):
+            lines.append(f"  {(t - self.t0) * 1000.0:8.1f}  (+{(t - prev) * 1000.0:7.1f})  {label}")
+            prev = t
+        return "\n".join(lines)
+
+    def write(self, path: Path) -> bool:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(time.strftime("%Y-%m-%d %H:%M:%S") + "\n" + self.report() + "\n")
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,197 @@
+"""
+Buffer-size tuner: the lowest period/nperiods this machine runs without xruns.
+
+tune() steps the running server down from its current settings, one
+rdx.jackserver.apply() at a time, and measures each step for a while:
+
+1. period: halved with nperiods unchanged (live with jack_bufsize), until a
+   step is unstable or ``min_period`` is reached
+2. nperiods: lowered one at a time at the lowest stable period, down to
+   ``min_nperiods`` (ALSA only, and a restart per step: needs "Manage JACK")
+
+A step is stable when it saw no xruns and the DSP load never went above
+``max_load``. Each step lets the server settle before a fresh JACK client
+(python3-jack-client) counts xruns and samples DSP load, so a restart's own
+glitches are not held against it. The load is whatever runs at the time (the
+real station chain), plus optionally a synthetic client that spends a share
+of every period busy in its process callback.
+
+Every step changes the live server: run it in a maintenance window (see
+in_window()). Afterwards the original settings are put back, or the
+recommendation is applied with ``keep=True``. Results are saved in
+``~/.config/rdx/buffer-tuning.json`` per host and per backend.
+"""
+
+import socket
+import time
+
+from . import config
+from . import jackserver
+from . import latency
+from . import xruns
+
+MAX_LOAD = 75.0
+
+
+def _import_pyjack():
+    try:
+        import jack as _pyjack
+    except Exception:
+        _pyjack = None
+    return _pyjack
+
+
+def measure(seconds: float, synthetic: float = 0.0, interval: float = 0.25) -> dict:
+    """xruns and DSP load over ``seconds`` from a short-lived JACK client: {xruns, load: {current, mean, p95, max, samples}}.
+
+    ``synthetic`` (0..1) is the share of each period the client spends busy in
+    its process callback. Raises RuntimeError without python3-jack-client or a running server.
+    """
+    pyjack = _import_pyjack()
+    if pyjack is None:
+        raise RuntimeError("python3-jack-client is needed to count xruns")
+    try:
+        client = pyjack.Client("rdx-tuner", no_start_server=True)
+    except Exception as e:
+        raise RuntimeError(f"cannot open a JACK client: {e}")
+    stats = xruns.Collector()
+    client.set_xrun_callback(lambda delayed_usecs: stats.xrun(delayed_usecs))
+    if synthetic > 0:
+        busy = min(0.95, float(synthetic))
+
+        def _process(frames):
+            end = time.perf_counter() + frames * busy / client.samplerate
+            while time.perf_counter() < end:
+                pass
+
+        client.set_process_callback(_process)
+    try:
+        client.activate()
+        end = time.monotonic() + float(seconds)
+        while time.monotonic() < end:
+            time.sleep(interval)
+            stats.load(client.cpu_load())
+    finally:
+        try:
+            client.deactivate()
+            client.close()
+        except Exception:
+            pass
+    return {'xruns': stats.total, 'load': stats.load_stats()}
+
+
+def candidates(period: int, nperiods: int, min_period: int = 64, min_nperiods: int = 2):
+    """(periods to try, nperiods to try) below the current settings, largest first."""
+    periods = [p for p in sorted(latency.PERIODS, reverse=True) if min_period <= p < int(period)]
+    counts = list(range(int(nperiods) - 1, int(min_nperiods) - 1, -1))
+    return periods, counts
+
+
+def tune(seconds: float = 30.0, settle: float = 2.0, max_load: float = MAX_LOAD, min_period: int = 64,
+         min_nperiods: int = 2, synthetic: float = 0.0, keep: bool = False, settings: dict = None,
+         current: dict = None, measure_fn=None, progress=None) -> dict:
+    """Find the lowest stable period/nperiods on the running server.
+
+    Returns {time, host, backend, device, rate, start, recommended, steps,
+    applied}: ``start`` and ``recommended`` are {period, nperiods}; each step
+    is {period, nperiods, action, ok, message, xruns, load, stable}.
+    ``progress(step)`` is called after every step. Raises RuntimeError when
+    JACK is not running.
+    """
+    settings = jackserver.load_settings() if settings is None else dict(settings)
+    current = jackserver.probe_running_config() if current is None else dict(current)
+    if not current:
+        raise RuntimeError("JACK is not running")
+    measure_fn = measure_fn or (lambda secs: measure(secs, synthetic))
+    start = {'period': int(current.get('period', settings.get('period', 1024))),
+             'nperiods': int(current.get('nperiods', settings.get('nperiods', 2)))}
+    backend = str(current.get('backend', settings.get('backend', ""))).lower()
+    steps = []
+
+    def step(wanted: dict) -> bool:
+        nonlocal settings, current
+        res = jackserver.apply(wanted, settings=settings, current=current)
+        settings = dict(settings, **wanted)
+        entry = dict(wanted, action=res['action'], ok=res['ok'], message=res['message'],
+                     xruns=None, load=None, stable=False)
+        if res['ok']:
+            current = dict(current, **{k: v for k, v in wanted.items() if k in current})
+            time.sleep(settle)
+            try:
+                got = measure_fn(seconds)
+            except Exception as e:
+                entry['message'] = str(e)
+            else:
+                peak = got['load'].get('max')
+                entry.update(xruns=got['xruns'], load=got['load'],
+                             stable=got['xruns'] == 0 and (peak is None or peak <= max_load))
+        steps.append(entry)
+        if progress:
+            progress(entry)
+        return entry['stable']
+
+    best = dict(start)
+    periods, counts = candidates(start['period'], start['nperiods'], min_period, min_nperiods)
+    for period in periods:
+        if not step({'period': period, 'nperiods': best['nperiods']}):
+            break
+        best['period'] = period
+    if backend == "alsa":
+        for n in counts:
+            if not step({'period': best['period'], 'nperiods': n}):
+                break
+            best['nperiods'] = n
+
+    final = best if keep else start
+    if steps and (steps[-1]['period'], steps[-1]['nperiods']) != (final['period'], final['nperiods']):
+        jackserver.apply(dict(final), settings=settings, current=current)
+    result = {
+        'time': time.time(),
+        'host': socket.gethostname(),
+        'backend': backend,
+        'device': current.get('device', settings.get('device', "")),
+        'rate': current.get('rate', settings.get('rate')),
+        'seconds': seconds,
+        'max_load': max_load,
+        'synthetic': synthetic,
+        'start': start,
+        'recommended': best,
+        'steps': steps,
+        'applied': bool(keep),
+    }
+    save_result(result)
+    return result
+
+
+# ---- results: {host: {backend: result}} ----
+def results_path():
+    return config.config_dir() / "buffer-tuning.json"
+
+
+def load_results() -> dict:
+    data = config.load_json(results_path(), {})
+    return data if isinstance(data, dict) else {}
+
+
+def save_result(result: dict) -> bool:
+    data = load_results()
+    data.setdefault(result['host'], {})[result['backend']] = result
+    return config.save_json(results_path(), data)
+
+
+def recommendation(backend: str, host: str = None):
+    """The last tune() result for ``backend`` on this host (or ``host``); None if it was never tuned."""
+    return load_results().get(host or socket.gethostname(), {}).get(str(backend).lower())
+
+
+def in_window(spec: str, now: float = None) -> bool:
+    """True when local time is inside ``"HH:MM-HH:MM"`` (which may wrap past midnight)."""
+    try:
+        a, b = (part.strip() for part in spec.split("-", 1))
+        start = int(a.split(":")[0]) * 60 + int(a.split(":")[1])
+        end = int(b.split(":")[0]) * 60 + int(b.split(":")[1])
+    except Exception:
+        raise ValueError(f"maintenance window must look like 03:00-05:00, not {spec!r}")
+    t = time.localtime(time.time() if now is None else now)
+    minute = t.tm_hour * 60 + t.tm_min
+    return start <= minute < end if start <= end else minute >= start or minute < end
@@ -0,0 +1,211 @@
+"""
+``rdx-wait``: block until JACK is up and the wanted ports exist.
+
+Meant for ``ExecStartPre=`` in the units RDX writes, replacing the bash
+loops that ran jack_lsp and grep every half second:
+
+    rdx-wait [--timeout 30]                          # JACK running with at least one port
+    rdx-wait --client '{liquidsoap,darkice}' --soft  # an encoder's ports (never fails the unit)
+    rdx-wait --port 'system:playback_*'
+
+It opens one JACK client (python3-jack-client) and learns about new ports
+from JACK's port registration callback, so it returns as soon as the last
+wanted port registers. JACK cannot call back about a server that is not
+running yet, so until it is, the connection is retried every CONNECT_RETRY
+seconds (in-process: no tools are spawned). A server that shuts down
+mid-wait sends it back to that step. Without python3-jack-client it falls
+back to probing ``jack_lsp -p`` every FALLBACK_INTERVAL.
+
+Patterns are globs as in rdx.rules (case-insensitive, ``{a,b}``
+alternatives): ``--client`` matches the client name, ``--port`` the full
+``client:port`` name. Every pattern must be matched; with none, any port
+will do. Exit status: 0 ready, 1 timeout (0 with ``--soft``), 2 bad usage.
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from . import jack as rdx_jack
+from . import rules as rdx_rules
+
+WAIT_BIN = "/usr/local/bin/rdx-wait"
+ENCODERS = "{liquidsoap,darkice,butt,glasscoder}"
+TIMEOUT = 30.0
+CONNECT_RETRY = 0.05
+FALLBACK_INTERVAL = 0.1
+
+
+def _import_pyjack():
+    try:
+        import jack as _pyjack
+    except Exception:
+        _pyjack = None
+    return _pyjack
+
+
+def available() -> bool:
+    """True when waits are callback-driven (python3-jack-client is installed)."""
+    return _import_pyjack() is not None
+
+
+class _Want:
+    """The patterns still unmatched; feed() port names until done."""
+
+    def __init__(self, clients=(), ports=()):
+        self.patterns = [('client', [g.lower() for g in rdx_rules.expand(c)], c) for c in clients]
+        self.patterns += [('port', [g.lower() for g in rdx_rules.expand(p)], p) for p in ports]
+        self.any = not self.patterns
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start over (the server went away, and its ports with it)."""
+        with self.lock:
+            self.pending = list(self.patterns)
+            self.matched = {}
+
+    def feed(self, name: str) -> bool:
+        with self.lock:
+            if self.any:
+                self.matched.setdefault('*', name)
+                return True
+            full = name.lower()
+            client = full.partition(":")[0]
+            left = []
+            for kind, globs, pattern in self.pending:
+                subject = client if kind == 'client' else full
+                if any(fnmatch.fnmatchcase(subject, g) for g in globs):
+                    self.matched[pattern] = name
+                else:
+                    left.append((kind, globs, pattern))
+            self.pending = left
+            return self.done
+
+    @property
+    def done(self) -> bool:
+        return bool(self.matched) if self.any else not self.pending
+
+
+def _wait_pyjack(pyjack, want: _Want, end: float) -> bool:
+    for fn in ("set_error_function", "set_info_function"):
+        try:
+            getattr(pyjack, fn)(lambda msg: None)   # no "cannot connect" line every retry
+        except Exception:
+            pass
+    while time.monotonic() < end:
+        try:
+            client = pyjack.Client("rdx-wait", no_start_server=True)
+        except Exception:
+            time.sleep(CONNECT_RETRY)
+            continue
+        ready, gone = threading.Event(), threading.Event()
+
+        def _registered(port, register):
+            if register and want.feed(port.name):
+                ready.set()
+
+        def _shutdown(status, reason):
+            gone.set()
+            ready.set()
+
+        try:
+            client.set_port_registration_callback(_registered)
+            client.set_shutdown_callback(_shutdown)
+            client.activate()
+            for port in client.get_ports():
+                if want.feed(port.name):
+                    ready.set()
+            ready.wait(max(0.0, end - time.monotonic()))
+        finally:
+            try:
+                client.deactivate()
+                client.close()
+            except Exception:
+                pass
+        if gone.is_set():
+            want.reset()
+            continue
+        return want.done   # ready, or timed out with the server up
+    return False
+
+
+def _wait_tools(want: _Want, end: float) -> bool:
+    while True:
+        want.reset()
+        for sides in rdx_jack.list_ports(timeout=1.0).values():
+            for port in sides['out'] + sides['in']:
+                if want.feed(port):
+                    return True
+        if time.monotonic() >= end:
+            return False
+        time.sleep(FALLBACK_INTERVAL)
+
+
+def wait(clients=(), ports=(), timeout: float = TIMEOUT) -> dict:
+    """Block until every pattern has a port (any port without patterns).
+
+    Returns {ready, seconds, matched: {pattern: port}, via}; ``via`` is
+    "callback" or "jack_lsp" (no python3-jack-client).
+    """
+    t0 = time.monotonic()
+    end = t0 + float(timeout)
+    want = _Want(clients, ports)
+    pyjack = _import_pyjack()
+    if pyjack is not None:
+        ok, via = _wait_pyjack(pyjack, want, end), "callback"
+    else:
+        ok, via = _wait_tools(want, end), "jack_lsp"
+    return {'ready': ok, 'seconds': round(time.monotonic() - t0, 3), 'matched': dict(want.matched), 'via': via}
+
+
+# ---- units ----
+def command() -> str:
+    """How a unit runs rdx-wait: the installed helper, else the shim in this source tree."""
+    if os.access(WAIT_BIN, os.X_OK):
+        return WAIT_BIN
+    shim = Path(__file__).resolve().parent.parent / "rdx-wait.py"
+    if shim.is_file():
+        return f"{sys.executable} {shim}"
+    return WAIT_BIN
+
+
+def exec_start_pre(clients=(), ports=(), timeout: float = TIMEOUT, soft: bool = False) -> str:
+    """An ``ExecStartPre=`` line (with newline) that waits for JACK and the given ports."""
+    args = [command()]
+    for c in clients:
+        args += ["--client", f"'{c}'"]
+    for p in ports:
+        args += ["--port", f"'{p}'"]
+    args += ["--timeout", f"{float(timeout):g}"] + (["--soft"] if soft else [])
+    return "ExecStartPre=" + " ".join(args) + "\n"
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="rdx-wait", description="Wait for the JACK server and ports to appear")
+    ap.add_argument("--client", action="append", default=[], metavar="GLOB",
+                    help="a client with this name has ports (repeatable; {a,b} alternatives)")
+    ap.add_argument("--port", action="append", default=[], metavar="GLOB", help="a client:port exists (repeatable)")
+    ap.add_argument("--timeout", "-t", type=float, default=TIMEOUT)
+    ap.add_argument("--soft", action="store_true", help="exit 0 on timeout too")
+    ap.add_argument("--quiet", "-q", action="store_true")
+    try:
+        args = ap.parse_args(argv)
+    except SystemExit as e:
+        return 2 if e.code else 0
+    what = ", ".join(args.client + args.port) or "any port"
+    try:
+        res = wait(args.client, args.port, args.timeout)
+    except KeyboardInterrupt:
+        return 130
+    if res['ready']:
+        if not args.quiet:
+            print(f"[rdx-wait] JACK ready ({what}) after {res['seconds']:.3f} s")
+        return 0
+    print(f"[rdx-wait] Timeout after {args.timeout:g} s waiting for JACK ({what})"
+          + ("; continuing" if args.soft else ""), file=sys.stderr)
+    return 0 if args.soft else 1
@@ -0,0 +1,127 @@
+"""
+xrun and DSP-load telemetry from the daemon's JACK client.
+
+The daemon feeds one Collector:
+
+- xrun(): from JACK's xrun callback. It runs on JACK's notification thread,
+  so it only appends to a ring buffer (no locks, no I/O)
+- load(): DSP load samples, polled from ``client.cpu_load()`` once a second
+  (JACK has no load callback)
+- event(): service state changes and routing changes, the usual suspects
+  when xruns bunch up
+
+Everything lives in bounded deques, so a week of uptime costs the same memory
+as a minute. snapshot() is what ``jack.xruns`` returns: totals, per-minute
+xrun counts, load statistics and every recent xrun with the events around it.
+"""
+
+import time
+from collections import deque
+
+XRUNS_KEPT = 1000
+LOAD_KEPT = 3600          # one hour at one sample a second
+EVENTS_KEPT = 500
+# An event this long before an xrun (or this long after, for a restart whose
+# state change the status loop only sees later) is reported next to it
+BEFORE_S = 10.0
+AFTER_S = 3.0
+
+
+class Collector:
+    def __init__(self, xruns_kept: int = XRUNS_KEPT, load_kept: int = LOAD_KEPT, events_kept: int = EVENTS_KEPT):
+        self.started = time.time()
+        self.total = 0
+        self._xruns = deque(maxlen=xruns_kept)     # (time, delayed_usecs)
+        self._load = deque(maxlen=load_kept)       # (time, percent)
+        self._events = deque(maxlen=events_kept)   # (time, kind, detail)
+
+    # ---- feeding ----
+    def xrun(self, delayed_usecs: float = 0.0, t: float = None):
+        self._xruns.append((time.time() if t is None else t, float(delayed_usecs or 0.0)))
+        self.total += 1
+
+    def load(self, percent, t: float = None):
+        if percent is not None:
+            self._load.append((time.time() if t is None else t, round(float(percent), 2)))
+
+    def event(self, kind: str, detail: str, t: float = None):
+        self._events.append((time.time() if t is None else t, kind, detail))
+
+    def reset(self):
+        self.started = time.time()
+        self.total = 0
+        self._xruns.clear()
+        self._load.clear()
+        self._events.clear()
+
+    # ---- queries ----
+    def xruns_since(self, since: float) -> int:
+        """xruns at or after ``since`` (only as far back as the ring buffer reaches)."""
+        return sum(1 for t, _ in list(self._xruns) if t >= since)
+
+    def load_stats(self, since: float = 0.0) -> dict:
+        """{current, mean, p95, max, samples} of the DSP load samples at or after ``since``."""
+        values = [v for t, v in list(self._load) if t >= since]
+        if not values:
+            return {'current': None, 'mean': None, 'p95': None, 'max': None, 'samples': 0}
+        ranked = sorted(values)
+        return {
+            'current': values[-1],
+            'mean': round(sum(values) / len(values), 2),
+            'p95': ranked[min(len(ranked) - 1, int(len(ranked) * 0.95))],
+            'max': ranked[-1],
+            'samples': len(values),
+        }
+
+    def per_minute(self, minutes: int = 60, now: float = None) -> list:
+        """xrun counts for the last ``minutes`` minutes, oldest first."""
+        now = time.time() if now is None else now
+        counts = [0] * minutes
+        for t, _ in list(self._xruns):
+            age = int((now - t) // 60)
+            if 0 <= age < minutes:
+                counts[minutes - 1 - age] += 1
+        return counts
+
+    def correlate(self, limit: int = 50, before: float = BEFORE_S, after: float = AFTER_S) -> list:
+        """The last ``limit`` xruns, newest first: [{time, delayed_usecs, load, events: [{time, kind, detail}]}].
+
+        ``load`` is the DSP load sample closest before the xrun, ``events`` the
+        service and routing events from ``before`` seconds before to ``after`` seconds after it.
+        """
+        events = list(self._events)
+        load = list(self._load)
+        out = []
+        for t, delayed in reversed(list(self._xruns)[-limit:]):
+            near = [{'time': et, 'kind': kind, 'detail': detail}
+                    for et, kind, detail in events if t - before <= et <= t + after]
+            sample = next((v for lt, v in reversed(load) if lt <= t), None)
+            out.append({'time': t, 'delayed_usecs': delayed, 'load': sample, 'events': near})
+        return out
+
+    def snapshot(self, limit: int = 50) -> dict:
+        now = time.time()
+        return {
+            'since': self.started,
+            'total': self.total,
+            'last_minute': self.xruns_since(now - 60),
+            'last_hour': self.xruns_since(now - 3600),
+            'per_minute': self.per_minute(60, now),
+            'load': self.load_stats(now - 60),
+            'load_hour': self.load_stats(now - 3600),
+            'xruns': self.correlate(limit),
+            'events': [{'time': t, 'kind': kind, 'detail': detail} for t, kind, detail in list(self._events)[-limit:]],
+        }
+
+
+def routing_detail(info: dict) -> str:
+    """One line for a ``routing`` event payload ({origin, connected, disconnected, profile, ...})."""
+    parts = [str(info.get('origin', "?"))]
+    for key, sign in (('connected', "+"), ('disconnected', "-")):
+        pairs = info.get(key) or []
+        if pairs:
+            parts.append(f"{sign}{len(pairs)}")
+    for key in ('profile', 'active_profile'):
+        if info.get(key):
+            parts.append(str(info[key]))
+    return " ".join(parts)
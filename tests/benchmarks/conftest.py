@@ -0,0 +1,7 @@
+"""Benchmark suite settings; the stub tools live in tests/conftest.py."""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+PORT_COUNTS = (10, 100, 1000)
@@ -0,0 +1,50 @@
+"""Config generation and sanitising: radio.liq, icecast.xml and the Liquidsoap fix-ups."""
+
+import pytest
+
+from rdx import streaming
+
+
+def _streams(n: int) -> list:
+    codecs = ["MP3", "AAC+", "OGG", "OPUS", "FLAC"]
+    return [streaming.make_stream(codecs[i % len(codecs)], "128", f"/stream{i}", "RDX FM") for i in range(n)]
+
+
+@pytest.mark.parametrize("n_streams", (1, 8, 32))
+def test_build_liquidsoap_config(benchmark, n_streams):
+    # fdkaac=False skips the encoder probe so only config generation is timed
+    text = benchmark(streaming.build_liquidsoap_config, _streams(n_streams), False)
+    assert text.count("ignore(rdx_start(") == n_streams
+
+
+def test_build_icecast_config(benchmark):
+    xml = benchmark(streaming.build_icecast_config)
+    assert "<icecast>" in xml
+
+
+@pytest.mark.parametrize("n_streams", (1, 8, 32))
+def test_sanitize_liquidsoap(benchmark, n_streams):
+    text = streaming.build_liquidsoap_config(_streams(n_streams), False)
+    out = benchmark(streaming.sanitize_liquidsoap_text, text)
+    assert not out.startswith("#!")
+    assert streaming.sanitize_liquidsoap_text(out) == out
+
+
+@pytest.mark.parametrize("n_streams", (1, 8, 32))
+def test_sanitize_liquidsoap_strict(benchmark, n_streams):
+    text = streaming.build_liquidsoap_config(_streams(n_streams), False)
+    out = benchmark(streaming.sanitize_liquidsoap_text_strict, text, {"libfdk_aac"}, {"mp4"})
+    assert 'audio_codec="aac"' not in out
+
+
+def test_sanitize_liquidsoap_file_strict(benchmark, stub_tools, tmp_path):
+    """Strict sanitising as Service Control runs it: includes the (stub) ``liquidsoap -h encoder.ffmpeg`` probe."""
+    path = tmp_path / "radio.liq"
+    text = streaming.build_liquidsoap_config(_streams(8), False)
+
+    def run():
+        path.write_text(text)
+        return streaming.sanitize_liquidsoap_file(path, strict=True)
+
+    assert benchmark(run) is True
+    assert "audio_bitrate=128000" in path.read_text()
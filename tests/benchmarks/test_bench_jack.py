@@ -0,0 +1,132 @@
+"""JACK topology hot paths: jack_lsp parsing, connection listing, stereo pair selection and rule matching."""
+
+import pytest
+
+from rdx import jack as rdx_jack
+from rdx import rules
+
+import synthetic_jack
+from conftest import PORT_COUNTS
+
+
+@pytest.mark.parametrize("n_ports", PORT_COUNTS)
+def test_parse_ports(benchmark, n_ports):
+    topo = synthetic_jack.generate(n_ports)
+    ports = benchmark(rdx_jack.parse_ports, topo.lsp("-p"))
+    assert ports == topo.expected_ports()
+
+
+@pytest.mark.parametrize("n_ports", PORT_COUNTS)
+@pytest.mark.parametrize("tab", ["jack_graph.JackGraphTab", "jack_matrix.JackMatrixTab"])
+def test_parse_jack_ports(benchmark, n_ports, tab):
+    pytest.importorskip("PyQt5.QtWidgets")
+    import importlib
+    module, cls = tab.split(".")
+    parse = getattr(importlib.import_module(f"rdx.gui.{module}"), cls)._parse_jack_ports
+    topo = synthetic_jack.generate(n_ports)
+    ports = benchmark(parse, None, topo.lsp("-p"))
+    assert ports == topo.expected_ports()
+
+
+@pytest.mark.parametrize("n_ports", PORT_COUNTS)
+def test_parse_topology(benchmark, n_ports):
+    """Single pass over 'jack_lsp -c -p -t': what a JACK Graph refresh parses."""
+    topo = synthetic_jack.generate(n_ports)
+    ports, cons, types = benchmark(rdx_jack.parse_topology, topo.lsp("-c", "-p", "-t"))
+    assert ports == topo.expected_ports()
+    assert sorted(cons) == sorted(topo.connections)
+
+
+@pytest.mark.parametrize("n_ports", PORT_COUNTS)
+def test_list_topology(benchmark, stub_tools, n_ports):
+    topo = stub_tools.jack(n_ports)
+    ports, cons, _ = benchmark(rdx_jack.list_topology)
+    assert ports == topo.expected_ports()
+
+
+@pytest.mark.parametrize("n_ports", PORT_COUNTS)
+def test_parse_connections(benchmark, n_ports):
+    topo = synthetic_jack.generate(n_ports)
+    cons = benchmark(rdx_jack.parse_connections, topo.lsp("-c"))
+    assert set(topo.connections) <= set(cons)
+
+
+@pytest.mark.parametrize("n_ports", PORT_COUNTS)
+def test_list_connections(benchmark, stub_tools, n_ports):
+    """``_list_connections`` end to end: spawn (stub) jack_lsp -c and parse its output."""
+    topo = stub_tools.jack(n_ports)
+    cons = benchmark(rdx_jack.list_connections)
+    assert cons == rdx_jack.parse_connections(topo.lsp("-c"))
+
+
+@pytest.mark.parametrize("n_ports", PORT_COUNTS)
+def test_list_ports(benchmark, stub_tools, n_ports):
+    topo = stub_tools.jack(n_ports)
+    ports = benchmark(rdx_jack.list_ports)
+    assert ports == topo.expected_ports()
+
+
+@pytest.mark.parametrize("n_ports", PORT_COUNTS)
+def test_first_two(benchmark, n_ports):
+    outs = synthetic_jack.generate(n_ports).expected_ports()["rivendell_0"]["out"]
+    pair = benchmark(rdx_jack.first_two, outs)
+    assert pair == ["rivendell_0:playout_0L", "rivendell_0:playout_0R"]
+
+
+def _all_sides(ports: dict):
+    return [d[direction] for d in ports.values() for direction in ("in", "out") if len(d[direction]) >= 2]
+
+
+@pytest.mark.parametrize("cache", ["warm", "cold"])
+def test_stereo_pairs_1000_ports(benchmark, cache):
+    """Ranked stereo pairs for every client side of a 1,000-port graph, as auto-connect and profile generation ask."""
+    sides = _all_sides(synthetic_jack.generate(1000).expected_ports())
+
+    def run():
+        return [rdx_jack.stereo_pairs(ports) for ports in sides]
+
+    if cache == "cold":
+        pairs = benchmark.pedantic(run, setup=rdx_jack.classify_port.cache_clear, rounds=50)
+    else:
+        pairs = benchmark(run)
+    assert ["rivendell_0:playout_0L", "rivendell_0:playout_0R"] in [p[0] for p in pairs if p]
+
+
+def test_transaction_40_pairs(benchmark, stub_tools):
+    """Auto-connect sized batch: 40 connects through the stub jack_connect, verified by one snapshot."""
+    topo = synthetic_jack.generate(100)
+    ins = [p for d in topo.expected_ports().values() for p in d["in"]]
+    outs = [p for d in topo.expected_ports().values() for p in d["out"]]
+    ops = [("connect", s, d) for s, d in zip(outs, reversed(ins)) if (s, d) not in topo._wired][:40]
+
+    def setup():
+        topo.write_stub_data(stub_tools.path)
+
+    res = benchmark.pedantic(rdx_jack.transaction, args=(ops,), setup=setup, rounds=3)
+    assert res["applied"] == len(ops) == 40 and not res["errors"]
+
+
+def test_panic_disconnect_1000_ports(benchmark):
+    """Emergency disconnect from a cached 1,000-port topology through an in-process client."""
+    topo = synthetic_jack.generate(1000)
+
+    class Client:
+        def disconnect(self, src, dst):
+            pass
+
+    protected = {"stereo_tool→liquidsoap"}
+    res = benchmark(rdx_jack.panic_disconnect, topo.connections, protected, client=Client(), log=False)
+    assert len(res['kept']) == 2 and len(res['cut']) == len(topo.connections) - 2
+
+
+@pytest.mark.parametrize("n_ports", PORT_COUNTS)
+def test_rules_resolve_300_rules(benchmark, n_ports):
+    """300 rdx-profiles.xml style wildcard rules (plus the built-in chain) against one topology."""
+    topo = synthetic_jack.generate(n_ports)
+    matcher = rules.compile_rules(
+        [{'source': f"rivendell_0:playout_{i % 8}?", 'dest': f"system:playback_{i % 16 + 1}"} for i in range(100)]
+        + [{'source': f"*stereo_tool*:*out*{'lr'[i % 2]}*", 'dest': f"*liquidsoap*:*in*{i % 2}*"} for i in range(100)]
+        + [{'source': f"vlc_*:out_{i % 2 + 1}", 'dest': f"rivendell_*:record_{i % 4}L"} for i in range(100)]
+        + rules.STATION_CHAIN)
+    found = benchmark(matcher.resolve, topo.expected_ports())
+    assert len(found) > 100   # every stereo_tool rule at least; the rest depend on the card count
@@ -0,0 +1,18 @@
+"""Service status probing (what the Service Control tab's update_all_status runs off the GUI thread)."""
+
+import pytest
+
+from rdx import services as rdx_services
+
+
+@pytest.mark.parametrize("scenario", ["all_running", "all_stopped"])
+def test_update_all_status(benchmark, stub_tools, scenario):
+    if scenario == "all_running":
+        stub_tools.jack(10)
+        units = [info["systemd"] for info in rdx_services.SERVICES.values()]
+        stub_tools.services(active_units=units, processes=["liquidsoap"])
+    else:
+        stub_tools.services()
+    states = benchmark(rdx_services.probe_all)
+    expected = "running" if scenario == "all_running" else "stopped"
+    assert set(states.values()) == {expected}
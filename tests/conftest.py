@@ -0,0 +1,172 @@
+"""
+Shared pytest setup: make the in-tree ``rdx`` package importable, and stub tools.
+
+``stub_tools`` puts fake ``jack_lsp``, ``jack_connect``, ``jack_disconnect``,
+``jack_control``, ``jack_bufsize``, ``systemctl``, ``pgrep`` and
+``liquidsoap`` executables first on PATH. They replay canned output from a
+data directory (``RDX_STUB_DATA``), so the code under test runs its real
+subprocess paths without JACK, systemd or Liquidsoap on the machine. ``stub_tools.jack(n)`` writes that data for a synthetic graph
+of at least *n* ports (see synthetic_jack.py); jack_connect and
+jack_disconnect change it, so later jack_lsp calls see the new connections.
+"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+TESTS = Path(__file__).resolve().parent
+SRC = TESTS.parent / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import synthetic_jack  # noqa: E402
+
+# jack_connect / jack_disconnect edit topology.json and re-render the jack_lsp files
+_EDIT_TOPOLOGY = r'''#!{python}
+import fcntl, os, sys
+sys.path.insert(0, {tests!r})
+import synthetic_jack
+data = os.environ["RDX_STUB_DATA"]
+if not os.path.exists(os.path.join(data, "jack_running")):
+    sys.exit("JACK server not running")
+# Transactions run several of these at once: one edit at a time
+lock = open(os.path.join(data, "topology.lock"), "w")
+fcntl.flock(lock, fcntl.LOCK_EX)
+topo = synthetic_jack.Topology.load(os.path.join(data, "topology.json"))
+src, dst = sys.argv[1:3]
+for p in (src, dst):
+    if p not in topo._index:
+        sys.exit(f"ERROR {{p}} not a valid port")
+if os.path.basename(sys.argv[0]) == "jack_connect":
+    if not topo.ports[topo._index[src]][1]:
+        src, dst = dst, src
+    if (src, dst) in topo._wired:
+        sys.exit("already connected")
+    topo.wire(src, dst)
+elif not topo.unwire(src, dst):
+    sys.exit(f"cannot disconnect {{src}} from {{dst}}")
+topo.write_stub_data(data)
+'''
+
+_STUBS = {
+    # Flags are concatenated into the file name: "jack_lsp -c -p" reads jack_lsp-cp.txt
+    "jack_lsp": r'''#!/bin/sh
+key=""
+for a in "$@"; do
+    case "$a" in -*) key="$key${a#-}" ;; esac
+done
+f="$RDX_STUB_DATA/jack_lsp${key:+-$key}.txt"
+[ -f "$RDX_STUB_DATA/jack_running" ] || { echo "JACK server not running" >&2; exit 1; }
+[ -f "$f" ] && exec cat "$f"
+exit 1
+''',
+    "systemctl": r'''#!/bin/sh
+[ "$1" = "--user" ] && shift
+verb="$1"; shift
+unit=""
+for a in "$@"; do
+    case "$a" in -*) ;; SubState) ;; *) unit="$a" ;; esac
+done
+case "$verb" in
+    is-active)
+        if grep -qx "$unit" "$RDX_STUB_DATA/active_units" 2>/dev/null; then echo active; exit 0; fi
+        echo inactive; exit 3 ;;
+    show)
+        if grep -qx "$unit" "$RDX_STUB_DATA/active_units" 2>/dev/null; then echo "SubState=running"; else echo "SubState=dead"; fi
+        exit 0 ;;
+esac
+exit 0
+''',
+    "pgrep": r'''#!/bin/sh
+for a in "$@"; do name="$a"; done
+grep -qx "$name" "$RDX_STUB_DATA/processes" 2>/dev/null
+''',
+    "jack_connect": _EDIT_TOPOLOGY,
+    "jack_disconnect": _EDIT_TOPOLOGY,
+    # JACK server control: every call is logged to calls.log; touch jack_bufsize_fails to fail live changes
+    "jack_control": r'''#!/bin/sh
+echo "jack_control $*" >> "$RDX_STUB_DATA/calls.log"
+exit 0
+''',
+    "jack_bufsize": r'''#!/bin/sh
+echo "jack_bufsize $*" >> "$RDX_STUB_DATA/calls.log"
+[ -f "$RDX_STUB_DATA/jack_bufsize_fails" ] && { echo "could not change buffer size" >&2; exit 1; }
+exit 0
+''',
+    "liquidsoap": r'''#!/bin/sh
+case "$1 $2" in
+    "-h encoder.ffmpeg") cat "$RDX_STUB_DATA/liquidsoap-encoder-ffmpeg.txt" ;;
+    "-h encoder."*) echo "Plugin not found!" ; exit 1 ;;
+    -c*) exit 0 ;;
+esac
+exit 0
+''',
+}
+
+_FFMPEG_HELP = """Encoder: %ffmpeg
+Available formats: adts, mp4, mpegts, ogg
+Available audio codecs: aac, libfdk_aac, libmp3lame, libopus
+"""
+
+
+@pytest.fixture(scope="session")
+def stub_bin(tmp_path_factory) -> Path:
+    bin_dir = tmp_path_factory.mktemp("stub-bin")
+    for name, text in _STUBS.items():
+        path = bin_dir / name
+        path.write_text(text.format(python=sys.executable, tests=str(TESTS)) if text is _EDIT_TOPOLOGY else text)
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return bin_dir
+
+
+@pytest.fixture
+def stub_tools(stub_bin, tmp_path, monkeypatch):
+    """Stub executables on PATH with an empty data directory; returns a writer for canned output."""
+    data = tmp_path / "stub-data"
+    data.mkdir()
+    (data / "liquidsoap-encoder-ffmpeg.txt").write_text(_FFMPEG_HELP)
+    monkeypatch.setenv("RDX_STUB_DATA", str(data))
+    monkeypatch.setenv("PATH", f"{stub_bin}{os.pathsep}{os.environ.get('PATH', '')}")
+    # No per-user OPAM shim: rdx.streaming.liquidsoap_bin() must resolve to the stub
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    class StubData:
+        path = data
+
+        def write(self, name: str, text: str):
+            (data / name).write_text(text)
+
+        def jack(self, n_ports: int, seed: int = 0) -> synthetic_jack.Topology:
+            topo = synthetic_jack.generate(n_ports, seed)
+            topo.write_stub_data(data)
+            return topo
+
+        def calls(self) -> list:
+            """jack_control / jack_bufsize invocations so far, one string each."""
+            log = data / "calls.log"
+            return log.read_text().splitlines() if log.exists() else []
+
+        def services(self, active_units=(), processes=()):
+            self.write("active_units", "".join(f"{u}\n" for u in active_units))
+            self.write("processes", "".join(f"{p}\n" for p in processes))
+
+    return StubData()
+
+
+@pytest.fixture
+def rdx_daemon(stub_tools, tmp_path, monkeypatch):
+    """An rdx daemon serving its Unix socket (RDX_SOCKET) from a thread, without the probe loops."""
+    import threading
+    from rdx import daemon as rdx_daemon_module
+    path = tmp_path / "rdxd.sock"
+    monkeypatch.setenv("RDX_SOCKET", str(path))
+    d = rdx_daemon_module.Daemon(socket_path=path)
+    server = rdx_daemon_module._Server(str(path), rdx_daemon_module._Session)
+    server.rdx_daemon = d
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    yield d
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,245 @@
+"""
+Synthetic JACK topologies for parser tests, benchmarks and the graph profiler.
+
+``generate(n_ports, seed)`` builds a graph shaped like a playout box:
+
+- ``system`` with up to 64 capture/playback channels (physical, terminal)
+- one ``rivendell_N`` client per card with ``playout_NL/R`` / ``record_NL/R``
+- ``stereo_tool`` and ``liquidsoap`` in the processing chain
+- ``vlc_<pid>`` players, an ``a2j`` MIDI bridge
+- awkward names: spaces, colons and tabs inside port names, and ports whose
+  name says the opposite of their direction (``monitor_out`` as an input)
+
+then pads with seeded filler clients until there are at least ``n_ports``
+ports. ``Topology.lsp("-c", "-p", "-t")`` renders the text ``jack_lsp`` would
+print for the same flags, and ``Topology.expected_ports()`` is what a parser
+should make of it. The same ``(n_ports, seed)`` always gives the same graph.
+
+Used by tests/ (the stub JACK tools in conftest.py) and by scripts/profile-jack-graph.py, which also dumps the
+rendered text (``--dump DIR``) for the benchmark stub ``jack_lsp``.
+"""
+
+import json
+import os
+import random
+import threading
+from pathlib import Path
+
+AUDIO = "32 bit float mono audio"
+MIDI = "8 bit raw midi"
+
+# Port names that trip up parsers: colons, spaces and a tab inside the short
+# name, and direction words that contradict the port's real direction
+ODD_PORTS = [
+    ("a2j", "Midi Through [14] (capture): Midi Through Port-0", True, MIDI),
+    ("a2j", "Midi Through [14] (playback): Midi Through Port-0", False, MIDI),
+    ("PulseAudio JACK Sink", "front-left", False, AUDIO),
+    ("PulseAudio JACK Sink", "front-right", False, AUDIO),
+    ("PulseAudio JACK Source", "front-left", True, AUDIO),
+    ("PulseAudio JACK Source", "front-right", True, AUDIO),
+    ("mixer", "in:bus 1\tleft", False, AUDIO),
+    ("mixer", "in:bus 1\tright", False, AUDIO),
+    ("mixer", "out:main:L", True, AUDIO),
+    ("mixer", "out:main:R", True, AUDIO),
+    ("mixer", "monitor_out_1", False, AUDIO),
+    ("mixer", "line_in_1", True, AUDIO),
+]
+
+_FILLER_NAMES = ["carla", "jamin", "calf", "ardour", "audacity", "zita-rev1", "jack_mixer", "non-mixer",
+                 "qtractor", "guitarix", "meterbridge", "jaaa"]
+
+
+class Topology:
+    """Ports in registration order plus connections, renderable as jack_lsp output."""
+
+    def __init__(self):
+        self.ports = []         # [(full_name, is_output, type, flags)]
+        self.connections = []   # [(src, dst)], src is always an output
+        self._index = {}
+        self._wired = set()
+
+    def add(self, client: str, port: str, is_output: bool, kind: str = AUDIO, physical: bool = False) -> str:
+        full = f"{client}:{port}"
+        if full in self._index:
+            return full
+        flags = ["output" if is_output else "input"]
+        if physical:
+            flags += ["physical", "terminal"]
+        self._index[full] = len(self.ports)
+        self.ports.append((full, is_output, kind, flags))
+        return full
+
+    def wire(self, src: str, dst: str):
+        if src in self._index and dst in self._index and (src, dst) not in self._wired:
+            self._wired.add((src, dst))
+            self.connections.append((src, dst))
+
+    def unwire(self, src: str, dst: str) -> bool:
+        for pair in ((src, dst), (dst, src)):
+            if pair in self._wired:
+                self._wired.discard(pair)
+                self.connections.remove(pair)
+                return True
+        return False
+
+    def free_pairs(self, n: int) -> list:
+        """Up to ``n`` unconnected (output, input) audio pairs, one per output."""
+        ins = [p for p, o, kind, _ in self.ports if not o and kind == AUDIO]
+        pairs = []
+        for src, is_output, kind, _ in self.ports:
+            if len(pairs) == n:
+                break
+            if is_output and kind == AUDIO:
+                dst = next((d for d in ins if (src, d) not in self._wired), None)
+                if dst:
+                    pairs.append((src, dst))
+        return pairs
+
+    def save(self, path):
+        Path(path).write_text(json.dumps({"ports": self.ports, "connections": self.connections}))
+
+    @classmethod
+    def load(cls, path) -> "Topology":
+        data = json.loads(Path(path).read_text())
+        t = cls()
+        for full, is_output, kind, flags in data["ports"]:
+            t._index[full] = len(t.ports)
+            t.ports.append((full, is_output, kind, flags))
+        for src, dst in data["connections"]:
+            t.wire(src, dst)
+        return t
+
+    def __len__(self):
+        return len(self.ports)
+
+    def lsp(self, *flags) -> str:
+        """Text ``jack_lsp`` prints with ``flags`` (any of -c, -p, -t, combined or separate)."""
+        opts = set("".join(f.lstrip("-") for f in flags))
+        peers = {}
+        if "c" in opts:
+            for src, dst in self.connections:
+                peers.setdefault(src, []).append(dst)
+                peers.setdefault(dst, []).append(src)
+        out = []
+        # Same order as jack_lsp.c: name, connections, properties, type
+        for full, _is_output, kind, pflags in self.ports:
+            out.append(full)
+            if "c" in opts:
+                out += [f"   {p}" for p in peers.get(full, [])]
+            if "p" in opts:
+                out.append("\tproperties: " + "".join(f + "," for f in pflags))
+            if "t" in opts:
+                out.append(f"\t{kind}")
+        return "".join(line + "\n" for line in out)
+
+    def expected_ports(self, kind: str = None) -> dict:
+        """{client: {"in": [...], "out": [...]}} as a parser should build it from ``lsp("-p")``."""
+        ports = {}
+        for full, is_output, k, _ in self.ports:
+            if kind and k != kind:
+                continue
+            d = ports.setdefault(full.split(":", 1)[0], {"in": [], "out": []})
+            d["out" if is_output else "in"].append(full)
+        return ports
+
+    def write_stub_data(self, directory) -> Path:
+        """Write the files the stub jack_lsp replays (jack_lsp-<flags>.txt) and topology.json,
+        which the stub jack_connect / jack_disconnect edit."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "jack_running").write_text("")
+        self.save(directory / "topology.json")
+        for key in ("", "c", "p", "t", "cp", "pt", "cpt"):
+            name = f"jack_lsp-{key}.txt" if key else "jack_lsp.txt"
+            # Replaced in one step: a stub jack_lsp running meanwhile never reads half a file
+            tmp = directory / f".{name}.{os.getpid()}.{threading.get_ident()}"
+            tmp.write_text(self.lsp(*(f"-{k}" for k in key)))
+            os.replace(tmp, directory / name)
+        return directory
+
+
+def generate(n_ports: int = 200, seed: int = 0, cards: int = None, system_channels: int = None,
+             odd_names: bool = True) -> Topology:
+    """A playout-box topology with at least ``n_ports`` ports (the fixed core is always present)."""
+    rng = random.Random(seed)
+    if system_channels is None:
+        system_channels = max(2, min(64, (n_ports // 8) & ~1))
+    if cards is None:
+        cards = max(1, min(8, n_ports // 150))
+    streams = max(1, min(8, n_ports // (cards * 24) or 1))
+    t = Topology()
+
+    for i in range(1, system_channels + 1):
+        t.add("system", f"capture_{i}", True, physical=True)
+    for i in range(1, system_channels + 1):
+        t.add("system", f"playback_{i}", False, physical=True)
+    for card in range(cards):
+        client = f"rivendell_{card}"
+        for s in range(streams):
+            t.add(client, f"playout_{s}L", True)
+            t.add(client, f"playout_{s}R", True)
+        for s in range(streams):
+            t.add(client, f"record_{s}L", False)
+            t.add(client, f"record_{s}R", False)
+    for side in ("l", "r"):
+        t.add("stereo_tool", f"in_{side}", False)
+    for side in ("l", "r"):
+        t.add("stereo_tool", f"out_{side}", True)
+    t.add("liquidsoap", "in_0", False)
+    t.add("liquidsoap", "in_1", False)
+    vlc = f"vlc_{rng.randint(1000, 99999)}"
+    t.add(vlc, "out_1", True)
+    t.add(vlc, "out_2", True)
+    if odd_names:
+        for client, port, is_output, kind in ODD_PORTS:
+            t.add(client, port, is_output, kind)
+
+    # Wiring: card 0 stream 0 feeds the processor, the rest go to the soundcard;
+    # capture pairs feed record inputs; VLC feeds the last card's first record pair
+    playback = [p for p, o, _, f in t.ports if not o and "physical" in f]
+    capture = [p for p, o, _, f in t.ports if o and "physical" in f]
+    pair = 0
+    for card in range(cards):
+        client = f"rivendell_{card}"
+        for s in range(streams):
+            l, r = f"{client}:playout_{s}L", f"{client}:playout_{s}R"
+            if card == 0 and s == 0:
+                t.wire(l, "stereo_tool:in_l")
+                t.wire(r, "stereo_tool:in_r")
+            elif 2 * pair + 3 < len(playback):
+                t.wire(l, playback[2 * pair + 2])
+                t.wire(r, playback[2 * pair + 3])
+                pair += 1
+            if 2 * (card * streams + s) + 1 < len(capture) and (card, s) != (cards - 1, 0):
+                t.wire(capture[2 * (card * streams + s)], f"{client}:record_{s}L")
+                t.wire(capture[2 * (card * streams + s) + 1], f"{client}:record_{s}R")
+    t.wire("stereo_tool:out_l", "liquidsoap:in_0")
+    t.wire("stereo_tool:out_r", "liquidsoap:in_1")
+    t.wire("stereo_tool:out_l", "system:playback_1")
+    t.wire("stereo_tool:out_r", "system:playback_2")
+    t.wire(f"{vlc}:out_1", f"rivendell_{cards - 1}:record_0L")
+    t.wire(f"{vlc}:out_2", f"rivendell_{cards - 1}:record_0R")
+    if odd_names:
+        t.wire("mixer:out:main:L", "PulseAudio JACK Sink:front-left")
+        t.wire("mixer:out:main:R", "PulseAudio JACK Sink:front-right")
+        t.wire("mixer:line_in_1", "mixer:monitor_out_1")
+        t.wire("a2j:Midi Through [14] (capture): Midi Through Port-0",
+               "a2j:Midi Through [14] (playback): Midi Through Port-0")
+
+    # Filler clients up to the requested size, each wired to random existing inputs
+    inputs = [p for p, o, kind, _ in t.ports if not o and kind == AUDIO]
+    k = 0
+    while len(t) < n_ports:
+        client = f"{rng.choice(_FILLER_NAMES)}-{k:02d}"
+        k += 1
+        n_pairs = rng.choice((1, 1, 2, 4))
+        outs = []
+        for i in range(n_pairs):
+            outs.append(t.add(client, f"out_{2 * i + 1}", True))
+            outs.append(t.add(client, f"out_{2 * i + 2}", True))
+            inputs.append(t.add(client, f"in_{2 * i + 1}", False))
+            inputs.append(t.add(client, f"in_{2 * i + 2}", False))
+        for src in outs:
+            if rng.random() < 0.7:
+                t.wire(src, rng.choice(inputs))
+    return t
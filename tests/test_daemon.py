@@ -0,0 +1,83 @@
+"""The daemon's socket: JSON-RPC and HTTP round trips to the Control API, and the CLI as its client."""
+
+import json
+import socket
+
+import pytest
+
+from rdx import cli
+from rdx import journal
+from rdx import rpc
+
+
+def test_json_rpc_round_trip(rdx_daemon, stub_tools):
+    topo = stub_tools.jack(30)
+    (free,) = topo.free_pairs(1)
+    wired = topo.connections[0]
+    with rpc.Client() as c:
+        assert c.call("ping") == "pong"
+        assert c.call("services.expect", service="liquidsoap", action="restart") is True
+        assert rdx_daemon.supervisor._svc('liquidsoap').expected[0] == "restart"
+
+        c.call("events.subscribe", topics=["routing"])
+        res = c.call("jack.transaction", ops=[["connect", *free], {'op': "connect", 'src': wired[0], 'dst': wired[1]}])
+        assert [r['status'] for r in res['results']] == ["done", "unchanged"]
+        assert c.pending_events == [{'topic': "routing", 'data': {'origin': "api", 'connected': [list(free)],
+                                                                  'disconnected': []}}]
+        assert [e['ops'] for e in journal.entries()] == [[["connect", *free]]]
+
+        for method, params, code in (("no.such", {}, rpc.METHOD_NOT_FOUND),
+                                     ("services.expect", {'service': "liquidsoap", 'action': "reboot"}, rpc.INVALID_PARAMS),
+                                     ("services.health", {'bogus': 1}, rpc.INVALID_PARAMS),
+                                     ("diagnostics.xruns", {'limit': "lots"}, rpc.INVALID_PARAMS),
+                                     ("jack.transaction", {'ops': ["abc"]}, rpc.INVALID_PARAMS),
+                                     ("jack.transaction", {'ops': [["connect", *free, "extra"]]}, rpc.INVALID_PARAMS),
+                                     ("jack.transaction", {'ops': "abc"}, rpc.INVALID_PARAMS)):
+            with pytest.raises(rpc.RPCError) as e:
+                c.call(method, **params)
+            assert e.value.code == code
+
+
+def test_apply_profile_notifies_only_on_change(rdx_daemon, stub_tools):
+    from rdx import jack as rdx_jack
+    topo = stub_tools.jack(30)
+    rdx_jack.profiles_file().parent.mkdir(parents=True, exist_ok=True)
+    rdx_jack.profiles_file().write_text(json.dumps({'air': [list(topo.connections[0])]}))
+    with rpc.Client() as c:
+        c.call("events.subscribe", topics=["routing"])
+        res = c.call("jack.apply_profile", name="air")
+        assert [r['status'] for r in res['results']] == ["unchanged"]
+        assert c.call("ping") == "pong" and c.pending_events == []
+
+
+def _http(path, request: bytes) -> tuple:
+    with socket.socket(socket.AF_UNIX) as s:
+        s.settimeout(2)
+        s.connect(str(path))
+        s.sendall(request)
+        data = b""
+        while chunk := s.recv(65536):
+            data += chunk
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body) if body.strip() else None
+
+
+def test_http_routes(rdx_daemon):
+    body = json.dumps({"jsonrpc": "2.0", "id": 7, "method": "services.expect",
+                       "params": {"service": "icecast", "action": "start"}}).encode()
+    status, reply = _http(rdx_daemon.socket_path, b"POST /rpc HTTP/1.1\r\nConnection: close\r\n"
+                          + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    assert status == 200 and reply == {"jsonrpc": "2.0", "id": 7, "result": True}
+    assert rdx_daemon.supervisor._svc('icecast').expected[0] == "start"
+    status, reply = _http(rdx_daemon.socket_path, b"GET /status HTTP/1.1\r\nConnection: close\r\n\r\n")
+    assert status == 200 and set(reply) >= {'services', 'jack'}
+    assert _http(rdx_daemon.socket_path, b"GET /nowhere HTTP/1.1\r\nConnection: close\r\n\r\n")[0] == 404
+
+
+def test_cli_talks_to_daemon(rdx_daemon, capsys):
+    rdx_daemon.status = {'services': {'icecast': {'name': "Icecast", 'state': "running"}},
+                         'jack': {'running': False, 'session': False}, 'updated': 1.0}
+    assert cli.main(["status", "--json"]) == 0
+    assert json.loads(capsys.readouterr().out)['source'] == "daemon"
+    cli._expect(['jack', 'icecast'], "start")
+    assert rdx_daemon.supervisor._svc('jack').expected[0] == "start"
@@ -0,0 +1,79 @@
+"""rdx.jack.panic_disconnect / restore_panic against the stub JACK tools."""
+
+import json
+import time
+
+import pytest
+
+from rdx import jack as rdx_jack
+
+
+def _protect_first(topo):
+    src, dst = topo.connections[0]
+    return {rdx_jack.protected_key(src, dst)}
+
+
+def test_panic_cuts_cached_connections_and_logs(stub_tools):
+    topo = stub_tools.jack(30)
+    protected = _protect_first(topo)
+    res = rdx_jack.panic_disconnect(topo.connections, protected=protected, deadline=5.0)
+    assert not res['failed'] and not res['pending']
+    assert res['kept'] and all(rdx_jack.protected_key(s, d) in protected for s, d in res['kept'])
+    assert len(res['cut']) + len(res['kept']) == len(topo.connections)
+    assert sorted(map(list, rdx_jack.list_topology()[1])) == sorted(res['kept'])
+
+    lines = (stub_tools.path.parent / ".config" / "rdx" / "emergency-disconnect.log").read_text().splitlines()
+    assert json.loads(lines[-1])['cut'] == res['cut']
+    assert rdx_jack.last_panic()['cut'] == res['cut']
+
+    restored = rdx_jack.restore_panic()
+    assert restored['applied'] == len(res['cut']) and not restored['errors']
+    assert sorted(rdx_jack.list_topology()[1]) == sorted(topo.connections)
+
+
+def test_panic_in_process_client(stub_tools):
+    topo = stub_tools.jack(60)
+
+    class Client:
+        def disconnect(self, src, dst):
+            topo.unwire(src, dst)
+
+    cons = list(topo.connections)
+    res = rdx_jack.panic_disconnect(cons, protected=set(), client=Client(), log=False)
+    assert len(res['cut']) == len(cons) and not topo.connections
+    assert res['elapsed_ms'] < 50
+
+
+def test_panic_deadline_reports_late_cuts(stub_tools):
+    topo = stub_tools.jack(20)
+    res = rdx_jack.panic_disconnect(topo.connections, protected=set(), deadline=0.001, log=False)
+    assert res['pending']
+    assert len(res['cut']) + len(res['pending']) == len(topo.connections)
+    # Late cuts still finish in the background
+    end = time.monotonic() + 15
+    while rdx_jack.list_topology()[1] and time.monotonic() < end:
+        time.sleep(0.1)
+    assert rdx_jack.list_topology()[1] == []
+
+
+def test_panic_deadline_bounds_in_process_batch(stub_tools):
+    topo = stub_tools.jack(20)
+    cons = list(topo.connections)
+
+    class SlowClient:
+        def disconnect(self, src, dst):
+            time.sleep(0.05)   # a JACK server slow to answer
+            topo.unwire(src, dst)
+            topo.write_stub_data(stub_tools.path)
+
+    res = rdx_jack.panic_disconnect(cons, protected=set(), deadline=0.1, client=SlowClient(), log=False)
+    assert res['elapsed_ms'] < 300 and sorted(res['pending']) == sorted(map(list, cons)) and not res['cut']
+    end = time.monotonic() + 15
+    while rdx_jack.list_topology()[1] and time.monotonic() < end:
+        time.sleep(0.1)
+    assert rdx_jack.list_topology()[1] == []
+
+
+def test_restore_without_record(stub_tools):
+    with pytest.raises(LookupError):
+        rdx_jack.restore_panic()
@@ -0,0 +1,76 @@
+"""jack_lsp parsing against synthetic topologies (odd names, 64-channel system, several cards)."""
+
+import pytest
+
+from rdx import jack as rdx_jack
+
+import synthetic_jack
+
+SIZES = (10, 300, 2000)
+SEEDS = (0, 1, 7)
+
+
+def test_generator_is_deterministic():
+    a = synthetic_jack.generate(500, seed=3)
+    b = synthetic_jack.generate(500, seed=3)
+    assert a.lsp("-c", "-p", "-t") == b.lsp("-c", "-p", "-t")
+    assert a.lsp("-p") != synthetic_jack.generate(500, seed=4).lsp("-p")
+
+
+def test_generator_shape():
+    topo = synthetic_jack.generate(2000, seed=0)
+    ports = topo.expected_ports()
+    assert len(topo) >= 2000
+    assert len(ports["system"]["out"]) == 64 and len(ports["system"]["in"]) == 64
+    assert {"rivendell_0", "rivendell_1", "stereo_tool", "liquidsoap", "a2j"} <= set(ports)
+    assert "mixer:in:bus 1\tleft" in ports["mixer"]["in"]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("n_ports", SIZES)
+def test_parse_ports(n_ports, seed):
+    topo = synthetic_jack.generate(n_ports, seed)
+    assert rdx_jack.parse_ports(topo.lsp("-p")) == topo.expected_ports()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("n_ports", SIZES)
+def test_parse_connections(n_ports, seed):
+    topo = synthetic_jack.generate(n_ports, seed)
+    both_ways = set(topo.connections) | {(d, s) for s, d in topo.connections}
+    assert set(rdx_jack.parse_connections(topo.lsp("-c"))) == both_ways
+
+
+@pytest.mark.parametrize("flags", [("-c", "-p", "-t"), ("-c", "-p"), ("-p", "-t"), ("-c",)])
+@pytest.mark.parametrize("n_ports", SIZES)
+def test_parse_topology(n_ports, flags):
+    topo = synthetic_jack.generate(n_ports, seed=5)
+    ports, cons, types = rdx_jack.parse_topology(topo.lsp(*flags))
+    if "-p" in flags:
+        assert ports == topo.expected_ports()
+    if "-c" in flags:
+        # Each connection once; oriented output -> input when directions are known
+        assert len(cons) == len(topo.connections)
+        if "-p" in flags:
+            assert sorted(cons) == sorted(topo.connections)
+    if "-t" in flags:
+        assert types["system:capture_1"] == "audio"
+        assert types["a2j:Midi Through [14] (capture): Midi Through Port-0"] == "midi"
+    else:
+        assert types == {}
+
+
+def test_parse_topology_without_properties_guesses_direction():
+    ports, cons, _ = rdx_jack.parse_topology("vlc_1:out_1\n   rd:in_1\nrd:in_1\n   vlc_1:out_1\n")
+    assert ports == {"vlc_1": {"in": [], "out": ["vlc_1:out_1"]}, "rd": {"in": ["rd:in_1"], "out": []}}
+    assert cons == [("vlc_1:out_1", "rd:in_1")]
+
+
+@pytest.mark.parametrize("tab", ["jack_graph.JackGraphTab", "jack_matrix.JackMatrixTab"])
+def test_tab_parsers(tab):
+    pytest.importorskip("PyQt5.QtWidgets")
+    import importlib
+    module, cls = tab.split(".")
+    parse = getattr(importlib.import_module(f"rdx.gui.{module}"), cls)._parse_jack_ports
+    topo = synthetic_jack.generate(1000, seed=2)
+    assert parse(None, topo.lsp("-p")) == topo.expected_ports()
@@ -0,0 +1,42 @@
+"""Stereo pair classification (rdx.jack.classify_port / stereo_pairs / first_two)."""
+
+import pytest
+
+from rdx import jack as rdx_jack
+
+import synthetic_jack
+
+
+@pytest.mark.parametrize("port, expected", [
+    ("rivendell_0:playout_3L", ("rivendell_0", "playout", "L", None)),
+    ("stereo_tool:out_r", ("stereo_tool", "out", "R", None)),
+    ("system:capture_12", ("system", "capture", None, 12)),
+    ("mixer:out:main:L", ("mixer", "out:main", "L", None)),
+    ("PulseAudio JACK Sink:front-left", ("PulseAudio JACK Sink", "front", "L", None)),
+    ("noclient", ("", "noclient", None, None)),
+])
+def test_classify_port(port, expected):
+    assert rdx_jack.classify_port(port) == expected
+
+
+@pytest.mark.parametrize("ports, pair", [
+    (["rivendell_0:playout_0L", "rivendell_0:playout_0R", "rivendell_0:playout_1L", "rivendell_0:playout_1R"],
+     ["rivendell_0:playout_0L", "rivendell_0:playout_0R"]),
+    (["system:capture_1", "system:capture_2", "system:capture_3"], ["system:capture_1", "system:capture_2"]),
+    (["liquidsoap:in_0", "liquidsoap:in_1", "liquidsoap:in_2"], ["liquidsoap:in_0", "liquidsoap:in_1"]),
+    (["x:mon", "x:fm_r", "x:aux_l"], ["x:aux_l", "x:fm_r"]),
+    (["x:c", "x:b", "x:a"], ["x:a", "x:b"]),
+])
+def test_first_two(ports, pair):
+    assert rdx_jack.first_two(ports) == pair
+
+
+def test_stereo_pairs_ranking():
+    ports = ["c:in_1", "c:in_2", "c:in_0", "c:fm_l", "c:fm_r"]
+    assert rdx_jack.stereo_pairs(ports) == [["c:fm_l", "c:fm_r"], ["c:in_0", "c:in_1"], ["c:in_1", "c:in_2"]]
+
+
+def test_every_rivendell_card_pairs_up():
+    ports = synthetic_jack.generate(2000, seed=4).expected_ports()
+    for client in (c for c in ports if c.startswith("rivendell_")):
+        assert rdx_jack.first_two(ports[client]["out"]) == [f"{client}:playout_0L", f"{client}:playout_0R"]
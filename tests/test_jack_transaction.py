@@ -0,0 +1,64 @@
+"""rdx.jack.transaction against the stub jack_lsp / jack_connect / jack_disconnect."""
+
+from rdx import jack as rdx_jack
+
+
+def test_connect_batch_through_tools(stub_tools):
+    topo = stub_tools.jack(100)
+    pairs = topo.free_pairs(40)
+    res = rdx_jack.transaction([("connect", s, d) for s, d in pairs])
+    assert res["applied"] == res["total"] == 40 and not res["errors"]
+    assert {r["status"] for r in res["results"]} == {"done"}
+    assert set(pairs) <= set(rdx_jack.list_topology()[1])
+
+
+def test_statuses(stub_tools):
+    topo = stub_tools.jack(50)
+    wired = topo.connections[0]
+    (free,) = topo.free_pairs(1)
+    res = rdx_jack.transaction([
+        ("connect", *wired),
+        ("connect", free[1], free[0]),      # input first: turned round
+        ("connect", *free),                 # duplicate of the one above
+        ("connect", "nobody:out_1", free[1]),
+        ("disconnect", *free),
+        ("rewire", *free),
+    ])
+    by_op = [(r["op"], r["status"]) for r in res["results"]]
+    assert by_op == [("connect", "unchanged"), ("connect", "done"), ("connect", "missing"),
+                     ("disconnect", "unchanged"), ("rewire", "failed")]
+    assert (res["results"][1]["src"], res["results"][1]["dst"]) == free
+    assert res["applied"] == 3 and len(res["errors"]) == 1
+
+
+def test_disconnect_everything(stub_tools):
+    topo = stub_tools.jack(100)
+    res = rdx_jack.transaction([("disconnect", s, d) for s, d in topo.connections])
+    assert res["applied"] == len(topo.connections) and not res["errors"]
+    assert rdx_jack.list_topology()[1] == []
+
+
+def test_in_process_client_with_tool_fallback(stub_tools):
+    topo = stub_tools.jack(50)
+    a, b = topo.free_pairs(2)
+
+    class Client:
+        calls = []
+
+        def connect(self, src, dst):
+            self.calls.append((src, dst))
+            if (src, dst) == b:
+                raise RuntimeError("port busy")
+            topo.wire(src, dst)
+            topo.write_stub_data(stub_tools.path)
+
+    res = rdx_jack.transaction([("connect", *a), ("connect", *b)], client=Client())
+    assert Client.calls == [a, b]
+    assert [r["status"] for r in res["results"]] == ["done", "done"]  # b made by jack_connect
+
+
+def test_jack_not_running(stub_tools):
+    res = rdx_jack.transaction([("connect", "a:out", "b:in")])
+    assert res["applied"] == 0
+    assert res["results"][0]["status"] == "failed"
+    assert res["errors"] == ["a:out -> b:in: JACK is not running"]
@@ -0,0 +1,62 @@
+"""rdx.jackserver: switching a running JACK server to new settings with as few restarts as possible."""
+
+from rdx import jackserver
+
+RUNNING = {'mode': "jackdbus", 'backend': "alsa", 'device': "hw:0", 'rate': 48000, 'period': 256,
+           'nperiods': 2, 'realtime': True}
+
+
+def test_profile_settings():
+    assert jackserver.profile_settings({'sample_rate': 44100, 'buffer_size': 512, 'periods': 3}) == \
+        {'rate': 44100, 'period': 512, 'nperiods': 3}
+    assert jackserver.profile_settings(None) == {}
+
+
+def test_plan_change():
+    plan = jackserver.plan_change
+    assert plan(RUNNING, {'rate': 48000, 'period': 256}) == {'action': "none", 'changes': {}}
+    assert plan(RUNNING, {'period': 512}) == {'action': "live", 'changes': {'period': [256, 512]}}
+    assert plan(RUNNING, {'period': 300})['action'] == "restart"   # jack_bufsize only takes powers of two
+    assert plan(RUNNING, {'period': 512, 'nperiods': 3})['changes'] == {'period': [256, 512], 'nperiods': [2, 3]}
+    assert plan(RUNNING, {'device': "HW:0"})['action'] == "none"
+    assert plan(RUNNING, {'backend': "dummy", 'device': "hw:1"})['changes'] == {'backend': ["alsa", "dummy"]}
+    assert plan({}, {'rate': 44100})['action'] == "stopped"
+    assert plan({'mode': "jackd", 'rate': 48000}, {'period': 128})['action'] == "none"   # period not probed
+
+
+def test_buffer_size_changes_live(stub_tools):
+    res = jackserver.apply({'period': 512}, settings={'manage': True, 'mode': "jackdbus"}, current=RUNNING)
+    assert res['ok'] and res['action'] == "live"
+    assert stub_tools.calls() == ["jack_bufsize 512", "jack_control dps period 512"]
+    assert jackserver.load_settings()['period'] == 512
+
+
+def test_restart_batches_jack_control(stub_tools):
+    settings = dict(jackserver.DEFAULTS, manage=True, mode="jackdbus", backend="alsa", device="hw:0")
+    res = jackserver.apply({'rate': 44100, 'period': 512}, settings=settings, current=RUNNING)
+    assert res['ok'] and res['action'] == "restart"
+    starts = [c for c in stub_tools.calls() if c.endswith(" start")]
+    assert starts == ["jack_control ds alsa eps realtime true dps device hw:0 dps rate 44100 dps period 512 "
+                      "dps nperiods 2 start"]
+    assert not any(c.startswith("jack_control dps") for c in stub_tools.calls())
+
+
+def test_no_restart_unless_managed(stub_tools):
+    res = jackserver.apply({'rate': 44100}, settings={'manage': False}, current=RUNNING)
+    assert not res['ok'] and "rate" in res['message']
+    assert stub_tools.calls() == []
+    assert jackserver.load_settings()['rate'] == 44100   # saved for the next start
+
+
+def test_failed_live_change_falls_back_to_restart(stub_tools):
+    stub_tools.write("jack_bufsize_fails", "")
+    settings = dict(jackserver.DEFAULTS, manage=True, mode="jackdbus")
+    res = jackserver.apply({'period': 128}, settings=settings, current=RUNNING)
+    assert res['action'] == "restart" and res['ok']
+    assert stub_tools.calls()[0] == "jack_bufsize 128" and stub_tools.calls()[-1].endswith(" start")
+
+
+def test_dry_run_changes_nothing(stub_tools):
+    res = jackserver.apply({'rate': 44100}, settings={'manage': True}, current=RUNNING, dry_run=True)
+    assert res['action'] == "restart" and stub_tools.calls() == []
+    assert not jackserver.settings_path().exists()
@@ -0,0 +1,141 @@
+"""Routing journal: recording, undo/redo and restore-to-point against the stub JACK tools."""
+
+import pytest
+
+from rdx import jack as rdx_jack
+from rdx import journal
+
+
+def _links():
+    return set(rdx_jack.list_topology()[1])
+
+
+def test_transaction_records_only_what_took_effect(stub_tools):
+    topo = stub_tools.jack(30)
+    a, b = topo.free_pairs(2)
+    rdx_jack.transaction([("connect", *a), ("connect", *topo.connections[0]), ("connect", "x:out", b[1])],
+                         origin="graph")
+    rdx_jack.transaction([("connect", *b)])  # no origin: not journaled
+    (entry,) = journal.entries()
+    assert entry['seq'] == 1 and entry['origin'] == "graph"
+    assert entry['ops'] == [["connect", *a]]
+
+
+def test_undo_redo(stub_tools):
+    topo = stub_tools.jack(30)
+    a, b, c = topo.free_pairs(3)
+    before = _links()
+    rdx_jack.transaction([("connect", *a), ("connect", *b)], origin="auto-connect")
+    rdx_jack.transaction([("disconnect", *a)], origin="graph")
+
+    journal.undo()
+    assert _links() == before | {a, b}
+    journal.undo()
+    assert _links() == before
+    with pytest.raises(LookupError):
+        journal.undo()
+
+    journal.redo(2)
+    assert _links() == before | {b}
+    journal.undo()
+    rdx_jack.transaction([("connect", *c)], origin="graph")  # a new change drops the redo stack
+    with pytest.raises(LookupError):
+        journal.redo()
+    assert [e['origin'] for e in journal.entries()] == ["auto-connect", "graph", "undo", "undo", "redo", "undo", "graph"]
+
+
+def test_undo_emergency_disconnect_in_one_batch(stub_tools):
+    topo = stub_tools.jack(60)
+    before = _links()
+
+    class Client:
+        def disconnect(self, src, dst):
+            topo.unwire(src, dst)
+            topo.write_stub_data(stub_tools.path)
+
+    res = rdx_jack.panic_disconnect(list(topo.connections), protected=set(), client=Client())
+    assert len(res['cut']) == len(before) >= 25 and _links() == set()
+    undone = journal.undo()
+    assert undone['applied'] == len(before) and not undone['errors']
+    assert _links() == before
+    assert journal.entries()[-1]['undoes'] == [1]
+
+
+def test_restore_to(stub_tools):
+    topo = stub_tools.jack(30)
+    a, b = topo.free_pairs(2)
+    first = topo.connections[0]
+    before = _links()
+    rdx_jack.transaction([("connect", *a)], origin="graph")
+    after_first = _links()
+    rdx_jack.transaction([("connect", *b), ("disconnect", *first)], origin="graph")
+    rdx_jack.transaction([("disconnect", *a)], origin="graph")
+
+    journal.restore_to(1)
+    assert _links() == after_first
+    journal.restore_to(0)
+    assert _links() == before
+    assert journal.entries()[-1]['restores_to'] == 0
+
+
+def test_net_keeps_last_operation_per_pair():
+    ops = [("connect", "a:o", "b:i"), ("disconnect", "b:i", "a:o"), ("connect", "c:o", "b:i")]
+    assert journal._net(ops) == [("disconnect", "b:i", "a:o"), ("connect", "c:o", "b:i")]
+
+
+class _Daemon:
+    """What ControlAPI's JACK methods use of rdx.daemon."""
+
+    def __init__(self):
+        self.jack_session = type("Session", (), {'client': None})()
+        self.changes = []
+
+    def topology_changed(self, **kw):
+        self.changes.append(kw)
+
+
+def test_single_pair_ops_journal_only_changes(stub_tools):
+    from rdx.api import ControlAPI
+    from rdx import rpc
+    topo = stub_tools.jack(30)
+    wired = topo.connections[0]
+    (free,) = topo.free_pairs(1)
+    d = _Daemon()
+    api = ControlAPI(d)
+    # Re-connecting a pair that was already there: an undo must not cut it
+    assert api.jack_connect(None, *wired)['status'] == "unchanged"
+    assert rdx_jack.apply_pair("connect", *wired, origin="graph") == "unchanged"
+    # Disconnecting a pair that was never connected: an undo must not create it
+    assert api.jack_disconnect(None, *free)['status'] == "unchanged"
+    assert journal.entries() == [] and d.changes == []
+    with pytest.raises(LookupError):
+        journal.undo()
+    assert wired in _links()
+
+    assert api.jack_connect(None, *free)['status'] == "done"
+    assert [e['ops'] for e in journal.entries()] == [[["connect", *free]]]
+    with pytest.raises(rpc.RPCError):
+        api.jack_connect(None, "nobody:out_1", free[1])
+
+
+def test_graph_disconnect_all_on_port_is_one_undo(stub_tools, monkeypatch):
+    pytest.importorskip("PyQt5.QtWidgets")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from rdx.gui.jack_graph import JackGraphTab
+    topo = stub_tools.jack(60)
+    out = topo.connections[0][0]
+    inputs = [d for _, d in topo.free_pairs(10) if (out, d) not in set(topo.connections)][:2]
+    rdx_jack.transaction([("connect", out, d) for d in inputs])
+    before = _links()
+    on_port = {c for c in before if out in c}
+    assert len(on_port) >= 2
+
+    JackGraphTab()._disconnect_port(out)
+    app.processEvents()
+    assert not {c for c in _links() if out in c}
+    (entry,) = journal.entries()
+    assert sorted(map(tuple, (o[1:] for o in entry['ops']))) == sorted(on_port)
+    journal.undo()
+    assert _links() == before
@@ -0,0 +1,81 @@
+"""rdx.latency: latency budget from engine settings and port latencies, and the jack_iodelay round trip."""
+
+import os
+import sys
+
+import pytest
+
+from rdx import latency
+
+import synthetic_jack
+
+JACK2 = """system:capture_1
+\tport playback latency = [ 0 0 ] frames
+\tport capture latency = [ 256 256 ] frames
+\ttotal latency = 256 frames
+stereo_tool:out_l
+\tport playback latency = [ 0 0 ] frames
+\tport capture latency = [ 1200 1440 ] frames
+stereo_tool:in_l
+\tport playback latency = [ 0 0 ] frames
+\tport capture latency = [ 0 0 ] frames
+"""
+
+# Joins JACK as jack_delay, then reports a round trip until it is terminated
+IODELAY = r'''#!{python}
+import os, signal, sys, time
+sys.path.insert(0, {tests!r})
+import synthetic_jack
+data = os.environ["RDX_STUB_DATA"]
+topo = synthetic_jack.Topology.load(os.path.join(data, "topology.json"))
+topo.add("jack_delay", "out", True)
+topo.add("jack_delay", "in", False)
+topo.write_stub_data(data)
+signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+while True:
+    print("   768.000 frames     16.000 ms total roundtrip latency", flush=True)
+    print("\textra loopback latency: 0 frames", flush=True)
+    time.sleep(0.1)
+'''
+
+
+def test_parse_latencies():
+    lat = latency.parse_latencies(JACK2)
+    assert lat["system:capture_1"] == {"capture": 256, "playback": 0}
+    assert lat["stereo_tool:out_l"]["capture"] == 1440
+    assert latency.parse_latencies("a:out\n\tport latency = 512 frames\n")["a:out"]["capture"] == 512
+
+
+def test_budget_engine_and_air_chain():
+    b = latency.budget(48000, 256, 2)
+    assert (b["period_ms"], b["playback_ms"], b["round_trip_ms"]) == (5.33, 10.67, 16.0)
+    assert b["chain_ms"] == 5.33 and b["stages"] == []
+
+    ports = synthetic_jack.generate(100).expected_ports()
+    chain = latency.air_chain(ports)
+    assert [c for c, _, _ in chain] == ["rivendell_0", "stereo_tool", "liquidsoap"]
+    assert chain[1][1] == ["stereo_tool:in_l", "stereo_tool:in_r"] and chain[2][2] == []
+    b = latency.budget(48000, 256, 2, latency.parse_latencies(JACK2), chain)
+    assert b["stages"][1] == {"client": "stereo_tool", "frames": 1440, "ms": 30.0}
+    assert b["chain_frames"] == 256 + 1440
+
+    table = latency.budget_table(48000, 2)
+    assert [row["period"] for row in table] == list(latency.PERIODS)
+
+
+def test_measure_round_trip(stub_tools, tmp_path, monkeypatch):
+    stub_tools.jack(30)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    tool = bin_dir / "jack_iodelay"
+    tool.write_text(IODELAY.format(python=sys.executable, tests=os.path.dirname(__file__)))
+    tool.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    res = latency.measure_round_trip("system:playback_1", "system:capture_1", seconds=0.5)
+    assert res == {"frames": 768.0, "ms": 16.0, "extra_frames": 0}
+
+
+def test_measure_without_jack_iodelay(stub_tools, monkeypatch):
+    monkeypatch.setenv("PATH", str(stub_tools.path))   # no jack_iodelay here
+    with pytest.raises(RuntimeError):
+        latency.measure_round_trip("system:playback_1", "system:capture_1")
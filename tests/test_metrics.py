@@ -0,0 +1,26 @@
+"""rdx.metrics.process_stats against a fake /proc."""
+
+import os
+
+from rdx import metrics
+
+
+def _stat(proc, pid, comm, utime, rss_pages):
+    (proc / str(pid)).mkdir()
+    # pid (comm) state, then fields 4..: utime is field 14, stime 15, rss 24
+    fields = ["S"] + ["0"] * 10 + [str(utime), "0"] + ["0"] * 8 + [str(rss_pages)]
+    (proc / str(pid) / "stat").write_text(f"{pid} ({comm}) " + " ".join(fields) + "\n")
+
+
+def test_exact_name_beats_prefix(tmp_path):
+    tick = os.sysconf("SC_CLK_TCK")
+    page = os.sysconf("SC_PAGE_SIZE")
+    _stat(tmp_path, 10, "jackd", tick, 1)
+    _stat(tmp_path, 11, "jackdbus", 2 * tick, 2)
+    _stat(tmp_path, 12, "jackdbus", 2 * tick, 2)
+    _stat(tmp_path, 13, "stereo_tool_gui", tick, 4)   # truncated comm, matched by prefix
+    _stat(tmp_path, 14, "bash", tick, 1)
+    for names in (("jackd", "jackdbus", "stereo_tool"), ("jackdbus", "jackd", "stereo_tool")):
+        stats = metrics.process_stats(names, proc=str(tmp_path))
+        assert stats == {'jackd': (1.0, page, 1), 'jackdbus': (4.0, 4 * page, 2),
+                         'stereo_tool': (1.0, 4 * page, 1)}
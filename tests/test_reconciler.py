@@ -0,0 +1,66 @@
+"""rdx.reconciler: desired routing state, minimal plans and one-batch convergence."""
+
+from rdx import jack as rdx_jack
+from rdx import journal
+from rdx import reconciler
+
+import synthetic_jack
+
+OFF = {'auto_reconnect_vlc': False}
+
+
+def _vlc(topo):
+    return next(p for p, *_ in topo.ports if p.startswith("vlc_")).split(":", 1)[0]
+
+
+def test_vlc_rule_only_fills_free_record_inputs():
+    topo = synthetic_jack.generate(100)
+    vlc = _vlc(topo)
+    ports, links = topo.expected_ports(), set(topo.connections)
+    assert reconciler.vlc_rule(ports, links) == []  # the generator already wires VLC in
+    links -= {(f"{vlc}:out_1", "rivendell_0:record_0L")}
+    assert reconciler.vlc_rule(ports, links) == [("connect", f"{vlc}:out_1", "rivendell_0:record_0L")]
+    links.add(("system:capture_9", "rivendell_0:record_0L"))  # someone else feeds it now
+    assert reconciler.vlc_rule(ports, links) == []
+
+
+def test_plan_is_minimal_and_respects_protection():
+    topo = synthetic_jack.generate(100)
+    (free,) = topo.free_pairs(1)
+    wired = topo.connections[0]
+    profiles = {"Live": [list(free), list(wired), ["gone:out", "system:playback_1"]]}
+    ports = (topo.expected_ports(), topo.connections)
+    plan = reconciler.plan(ports, {'active_profile': "Live", **OFF}, profiles=profiles, protected=set())
+    assert plan == [("connect", *free)]
+
+    def cut(ports, links):
+        return [("disconnect", *wired), ("disconnect", *topo.connections[2])]
+
+    plan = reconciler.plan(ports, OFF, profiles={}, protected={rdx_jack.protected_key(*wired)}, rules=[cut])
+    assert plan == [("disconnect", *topo.connections[2])]
+    # The active profile wins over a rule that wants the same pair gone
+    plan = reconciler.plan(ports, {'active_profile': "Live"}, profiles=profiles, protected=set(), rules=[cut])
+    assert ("disconnect", *wired) not in plan
+
+
+def test_reconcile_converges_in_one_batch(stub_tools):
+    topo = stub_tools.jack(100)
+    vlc = _vlc(topo)
+    pairs = topo.free_pairs(5)
+    rdx_jack.transaction([("disconnect", f"{vlc}:out_1", "rivendell_0:record_0L")])
+    settings = {'active_profile': "Live"}
+    profiles = {"Live": [list(p) for p in pairs]}
+
+    res = reconciler.reconcile(settings=settings, profiles=profiles, protected=set())
+    assert res['applied'] == res['total'] == 6 and not res['errors']
+    links = set(rdx_jack.list_topology()[1])
+    assert set(pairs) <= links and (f"{vlc}:out_1", "rivendell_0:record_0L") in links
+    assert [e['origin'] for e in journal.entries()] == ["reconciler"]
+    # Converged: the next topology event finds nothing to do
+    assert reconciler.reconcile(settings=settings, profiles=profiles, protected=set()) is None
+
+
+def test_inactive_without_profile_or_rules(stub_tools):
+    stub_tools.jack(30)
+    assert not reconciler.active(OFF)
+    assert reconciler.reconcile(settings=OFF) is None
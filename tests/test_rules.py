@@ -0,0 +1,79 @@
+"""rdx.rules: wildcard connection rules and rdx-profiles.xml profiles."""
+
+import fnmatch
+from pathlib import Path
+
+from rdx import config
+from rdx import jack as rdx_jack
+from rdx import reconciler
+from rdx import rules
+
+import synthetic_jack
+
+REPO_XML = Path(__file__).resolve().parent.parent / "config" / "rdx-profiles.xml"
+
+
+def test_expand_alternatives():
+    assert rules.expand("{*rivendell*,rd*}:in_{1,2}") == ["*rivendell*:in_1", "*rivendell*:in_2",
+                                                          "rd*:in_1", "rd*:in_2"]
+    assert rules.expand("system") == ["system"]
+
+
+def test_shipped_profiles_parse():
+    profiles = rules.load_xml_profiles(REPO_XML)
+    assert set(profiles) == {"live-broadcast", "production", "automation"}
+    live = profiles["live-broadcast"]
+    assert live['jack_settings'] == {'sample_rate': 48000, 'buffer_size': 512, 'periods': 3}
+    assert len(live['critical']) == 6 and all(r['critical'] for r in live['critical'])
+    assert {'source': "vlc_*:vlc_*_out_1", 'dest': "rivendell_0:record_0L"}.items() <= live['connections'][6].items()
+
+
+def test_port_and_client_rules():
+    topo = synthetic_jack.generate(100)
+    vlc = next(p for p, *_ in topo.ports if p.startswith("vlc_")).split(":", 1)[0]
+    ports = topo.expected_ports()
+    matcher = rules.compile_rules([
+        {'source': "*STEREO_TOOL*:*out*l*", 'dest': "*liquidsoap*:*in*0*"},
+        {'source': "system:capture_[12]", 'dest': "rivendell_0:record_1?"},
+        {'source': "nobody:*", 'dest': "system:*"},
+        {'source': "*vlc*", 'dest': rules.RIVENDELL},
+    ])
+    found = [m['pairs'] for m in matcher.resolve(ports)]
+    assert found == [
+        [("stereo_tool:out_l", "liquidsoap:in_0")],
+        [("system:capture_1", "rivendell_0:record_1L"), ("system:capture_2", "rivendell_0:record_1L")],
+        [(f"{vlc}:out_1", "rivendell_0:record_0L"), (f"{vlc}:out_2", "rivendell_0:record_0R")],
+    ]
+
+
+def test_prefix_index_matches_brute_force():
+    topo = synthetic_jack.generate(400, odd_names=True)
+    ports = topo.expected_ports()
+    clients = sorted(ports)
+    globs = ["*", "rivendell_*", "riv*", "system", "*mix*", "jack_mixer*", "PulseAudio*", "*-0?", "a2j", "zzz*"]
+    matcher = rules.compile_rules([{'source': f"{g}:*", 'dest': "system:playback_1"} for g in globs])
+    got = {m['rule']['source']: {s for s, _ in m['pairs']} for m in matcher.resolve(ports)}
+    for g in globs:
+        want = {p for c in clients if fnmatch.fnmatchcase(c.lower(), g.lower()) for p in ports[c]["out"]}
+        assert got.get(f"{g}:*", set()) == want, g
+
+
+def test_reconciler_keeps_xml_profile(stub_tools):
+    stub_tools.jack(40)
+    (config.config_dir() / "rdx-profiles.xml").write_text(REPO_XML.read_text())
+    assert "live-broadcast" in reconciler.profile_names()
+    cut = ("stereo_tool:out_l", "liquidsoap:in_0")
+    rdx_jack.transaction([("disconnect", *cut)])
+    settings = {'active_profile': "live-broadcast", 'auto_reconnect_vlc': False}
+
+    def drop_critical(ports, links):
+        return [("disconnect", "stereo_tool:out_r", "liquidsoap:in_1")]
+
+    plan = reconciler.plan(rdx_jack.list_topology(), settings, profiles={}, protected=set(), rules=[drop_critical])
+    assert ("connect", *cut) in plan
+    assert not any(op == "disconnect" for op, *_ in plan)   # critical connections are protected
+    res = reconciler.reconcile(settings=settings, profiles={}, protected=set())
+    assert not res['errors'] and cut in set(rdx_jack.list_topology()[1])
+    # apply_profile resolves the same rules: nothing is left to connect
+    again = rdx_jack.apply_profile("live-broadcast")
+    assert again['results'] and {r['status'] for r in again['results']} == {"unchanged"}
@@ -0,0 +1,76 @@
+"""rdx.startup: dependency waves, parallel start, readiness instead of fixed delays."""
+
+import threading
+import time
+
+import pytest
+
+from rdx import startup
+
+ALL = ['jack', 'liquidsoap', 'stereo_tool', 'icecast']
+
+
+def test_plan(monkeypatch):
+    assert startup.plan(ALL) == [['jack', 'icecast'], ['liquidsoap', 'stereo_tool']]
+    assert startup.plan(['liquidsoap', 'stereo_tool']) == [['liquidsoap', 'stereo_tool']]
+    monkeypatch.setitem(startup.REQUIRES, 'jack', ('liquidsoap',))
+    with pytest.raises(ValueError):
+        startup.plan(ALL)
+
+
+def test_saved_timeouts_migrate_old_delays():
+    assert startup.saved_timeouts({'service_ready_timeouts': {'jack': "45", 'icecast': "x"}}) == {'jack': 45}
+    # Old fixed-order delays: only one longer than the default readiness timeout carries over
+    old = {'service_launch_order': ['icecast', 'jack'], 'service_delays': {'jack': 60, 'icecast': 2}}
+    assert startup.saved_timeouts(old) == {'jack': 60}
+    assert startup.saved_timeouts(dict(old, service_ready_timeouts={})) == {}
+    assert startup.saved_timeouts(None) == {}
+
+
+class Chain:
+    """Services that become ready a fixed time after they were started."""
+
+    def __init__(self, delays, fail=()):
+        self.delays, self.fail = delays, fail
+        self.started = {}
+        self.lock = threading.Lock()
+
+    def start(self, key):
+        with self.lock:
+            self.started[key] = time.monotonic()
+        return (key not in self.fail), f"{key} start requested"
+
+    def check(self, key):
+        with self.lock:
+            t = self.started.get(key)
+        return t is not None and time.monotonic() - t >= self.delays[key]
+
+
+def test_parallel_and_ready_driven(monkeypatch):
+    monkeypatch.setattr(startup, "POLL_INTERVAL", 0.01)
+    chain = Chain({'jack': 0.1, 'icecast': 0.1, 'liquidsoap': 0.05, 'stereo_tool': 0.05})
+    res = startup.start_chain(ALL, start=chain.start, check=chain.check)
+    assert res['ok'] and set(res['services']) == set(ALL)
+    # JACK and Icecast together, the JACK clients together right after JACK
+    assert abs(chain.started['jack'] - chain.started['icecast']) < 0.05
+    assert abs(chain.started['liquidsoap'] - chain.started['stereo_tool']) < 0.05
+    assert res['services']['liquidsoap']['started'] >= 0.1
+    assert res['seconds'] < 0.4   # sequential with fixed delays would be well over that
+
+
+def test_failures_block_only_what_requires_them(monkeypatch):
+    monkeypatch.setattr(startup, "POLL_INTERVAL", 0.01)
+    chain = Chain({k: 0 for k in ALL}, fail=('icecast',))
+    res = startup.start_chain(ALL, start=chain.start, check=chain.check)
+    assert not res['ok']
+    assert res['services']['icecast']['state'] == "failed"
+    assert res['services']['liquidsoap']['state'] == "ready"   # only wants Icecast
+
+    chain = Chain({k: 0 for k in ALL})
+    chain.delays['jack'] = 10
+    seen = []
+    res = startup.start_chain(ALL, start=chain.start, check=chain.check, timeouts={'jack': 0.05},
+                              progress=lambda key, entry: seen.append((key, entry['state'])))
+    states = {k: e['state'] for k, e in res['services'].items()}
+    assert states == {'jack': "timeout", 'icecast': "ready", 'liquidsoap': "blocked", 'stereo_tool': "blocked"}
+    assert 'liquidsoap' not in chain.started and sorted(seen) == sorted(states.items())
@@ -0,0 +1,113 @@
+"""rdx.streaming: radio.liq with a control interface, and changing outputs without a restart."""
+
+import socket
+import threading
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+from rdx import cli
+from rdx import streaming
+
+
+class FakeLiquidsoap:
+    """Liquidsoap's telnet server as the generated script sets it up: rdx.formats/list/add/remove."""
+
+    def __init__(self, formats, streams=()):
+        self.formats = list(formats)
+        self.outputs = {}   # mount -> [format, mount, name, genre, description]
+        self.commands = []
+        for s in streams:
+            f = streaming._output_fields(s)
+            self.outputs[f[1]] = f
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _reply(self, line):
+        cmd, _, args = line.partition(" ")
+        self.commands.append(cmd)
+        if cmd == "rdx.formats":
+            return " ".join(self.formats)
+        if cmd == "rdx.list":
+            return "\n".join(" ".join(quote(x, safe="") for x in [f[1], f[0]] + f[2:]) for f in self.outputs.values())
+        if cmd == "rdx.remove":
+            return "OK" if self.outputs.pop(unquote(args), None) else "ERROR: not running"
+        if cmd == "rdx.add":
+            f = [unquote(a[1:]) for a in args.split(" ")]
+            if f[0] not in self.formats:
+                return f"ERROR: no {f[0]} encoder in this script; restart Liquidsoap"
+            self.outputs[f[1]] = f
+            return "OK"
+        return "ERROR: unknown command"
+
+    def _serve(self):
+        while True:
+            conn, _ = self.sock.accept()
+            with conn, conn.makefile("rwb") as f:
+                for raw in f:
+                    line = raw.decode().strip()
+                    if line == "quit":
+                        break
+                    f.write((self._reply(line) + "\r\nEND\r\n").encode())
+                    f.flush()
+
+
+def _streams():
+    return [streaming.make_stream("MP3", "128", "/live", "RDX FM"),
+            streaming.make_stream("AAC+", "64", "/mobile", "")]
+
+
+def test_config_has_control_interface():
+    text = streaming.build_liquidsoap_config(_streams() + [streaming.make_stream("MP3", "128", "/b")], False)
+    assert 'set("server.telnet.port", 1234)' in text
+    assert text.count("output.icecast(") == 2   # one per encoder, not per mount
+    assert 'fun (_) -> "mp3_128 aac_64"' in text
+    assert 'ignore(rdx_start("aac_64", "/mobile", "", "Various", "AAC+ stream at 64 kbps"))' in text
+    assert streaming.sanitize_liquidsoap_text(text).count("output.icecast(") == 2
+
+
+def test_hot_add_update_remove(stub_tools):
+    stub_tools.services(processes=["liquidsoap"])
+    old = _streams()
+    liq = FakeLiquidsoap(["mp3_128", "aac_64"], old)
+    new = [dict(old[0], station_name="RDX FM Live"), streaming.make_stream("MP3", "128", "/backup")]
+    assert streaming.reload_plan(new, *streaming.live_outputs(port=liq.port)) == {
+        'remove': ["/mobile"], 'add': [new[1]], 'update': [new[0]], 'restart': ""}
+    res = streaming.apply_streams(new, port=liq.port)
+    assert res['action'] == "hot" and res['ok'] and res['changes'] == ["- /mobile", "~ /live", "+ /backup"]
+    assert sorted(liq.outputs) == ["/backup", "/live"] and liq.outputs["/live"][2] == "RDX FM Live"
+    assert (Path.home() / ".config" / "rdx" / "radio.liq").exists()
+    assert streaming.apply_streams(new, port=liq.port)['action'] == "none"
+
+
+def test_new_encoder_needs_restart(stub_tools):
+    stub_tools.services(processes=["liquidsoap"])
+    liq = FakeLiquidsoap(["mp3_128"], _streams()[:1])
+    streams = _streams()
+    res = streaming.apply_streams(streams, dry_run=True, port=liq.port)
+    assert res['action'] == "pending" and "aac_64" in res['message'] and "rdx.add" not in liq.commands
+    unit = streaming.config.config_dir().parent / "systemd" / "user" / "rdx-liquidsoap.service"
+    unit.parent.mkdir(parents=True)
+    unit.write_text("[Service]\n")
+    stub_tools.services(active_units=["rdx-liquidsoap"])
+    told = []
+    res = streaming.apply_streams(streams, port=liq.port, before_restart=lambda: told.append(True))
+    assert res['action'] == "restart" and res['ok'] and told
+    # Not running: only the file is written
+    stub_tools.services()
+    unit.unlink()
+    assert streaming.apply_streams(streams, port=liq.port)['action'] == "written"
+
+
+def test_cli_apply_announces_restart(rdx_daemon, stub_tools, monkeypatch):
+    liq = FakeLiquidsoap(["mp3_128"], _streams()[:1])
+    telnet = streaming.telnet
+    monkeypatch.setattr(streaming, "telnet", lambda commands, **kw: telnet(commands, port=liq.port))
+    streaming.save_streams(_streams())   # a new AAC encoder: needs a restart
+    unit = streaming.config.config_dir().parent / "systemd" / "user" / "rdx-liquidsoap.service"
+    unit.parent.mkdir(parents=True)
+    unit.write_text("[Service]\n")
+    stub_tools.services(active_units=["rdx-liquidsoap"], processes=["liquidsoap"])
+    assert cli.main(["streams", "apply"]) == 0
+    # Ours, not a crash
+    assert rdx_daemon.supervisor._svc('liquidsoap').expected[0] == "restart"
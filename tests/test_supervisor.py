@@ -0,0 +1,60 @@
+"""rdx.supervisor: crash detection from status cycles, crash loops and MTBF."""
+
+from rdx import config
+from rdx import supervisor
+
+
+def _sup(result="exit-code"):
+    inspected = []
+
+    def inspect(key):
+        inspected.append(key)
+        return {'result': result, 'restarts': len(inspected)}
+
+    return supervisor.Supervisor(inspect=inspect, logs=lambda key: [f"{key} log"]), inspected
+
+
+def test_crashes_and_expected_stops():
+    sup, inspected = _sup()
+    assert sup.observe({'liquidsoap': "running", 'icecast': "running"}, t=0) == []
+    assert sup.observe({'liquidsoap': "restarting", 'icecast': "timeout"}, t=100) == [
+        {'time': 100, 'service': "liquidsoap", 'state': "restarting", 'result': None, 'log': ["liquidsoap log"]}]
+    assert inspected == []   # "restarting" is a crash already; no extra systemctl call
+    assert sup.observe({'liquidsoap': "running", 'icecast': "running"}, t=103) == []   # timeout is not a state change
+    sup.expect("icecast", "stop", t=200)
+    assert sup.observe({'icecast': "stopped"}, t=203) == []
+    crash, = sup.observe({'liquidsoap': "stopped"}, t=303)
+    assert crash['result'] == "exit-code" and inspected == ["liquidsoap"]
+    h = sup.health("liquidsoap", t=303)
+    assert h['crashes'] == 2 and h['mtbf'] == 150.0 and h['systemd_restarts'] == 1 and not h['crash_loop']
+
+
+def test_clean_exit_is_not_a_crash():
+    sup, _ = _sup(result="success")
+    sup.observe({'stereo_tool': "running"}, t=0)
+    assert sup.observe({'stereo_tool': "stopped"}, t=10) == []
+    assert sup.health("stereo_tool")['crashes'] == 0
+
+
+def test_crash_loop_until_stable():
+    sup, _ = _sup()
+    t = 0
+    for _ in range(3):
+        sup.observe({'liquidsoap': "running"}, t=t)
+        sup.observe({'liquidsoap': "restarting"}, t=t + 20)
+        t += 40
+    assert sup.health("liquidsoap", t=t)['crash_loop']
+    sup.observe({'liquidsoap': "running"}, t=t)
+    assert sup.crash_loop("liquidsoap", t=t + 60)
+    assert not sup.crash_loop("liquidsoap", t=t + supervisor.STABLE_AFTER + 1)
+    # a failing start counts too
+    sup.observe({'liquidsoap': "stopped"}, t=t + 700)
+    assert sup.observe({'liquidsoap': "failed"}, t=t + 710)
+
+
+def test_unit_info_and_logs(stub_tools):
+    (config.config_dir()).mkdir(parents=True, exist_ok=True)
+    (config.config_dir() / "liquidsoap.log").write_text("".join(f"line {i}\n" for i in range(50)))
+    assert supervisor.last_log_lines("liquidsoap", 3) == ["line 47", "line 48", "line 49"]
+    # The systemctl stub only reports SubState: nothing to conclude from
+    assert supervisor.unit_info("liquidsoap") == {}
@@ -0,0 +1,61 @@
+"""rdx.tuner: stepping the buffer down, the stability verdict and saved results."""
+
+import time
+
+import pytest
+
+from rdx import jackserver
+from rdx import tuner
+
+RUNNING = {'mode': "jackdbus", 'backend': "alsa", 'device': "hw:0", 'rate': 48000, 'period': 256,
+           'nperiods': 3, 'realtime': True}
+SETTINGS = dict(jackserver.DEFAULTS, manage=True, mode="jackdbus", backend="alsa", device="hw:0",
+                period=256, nperiods=3)
+
+
+def test_candidates():
+    assert tuner.candidates(1024, 3) == ([512, 256, 128, 64], [2])
+    assert tuner.candidates(128, 2, min_period=32) == ([64, 32], [])
+
+
+def test_tune_finds_lowest_stable_and_restores(stub_tools):
+    tried = []
+
+    def fake_measure(seconds):
+        s = jackserver.load_settings()
+        tried.append((s['period'], s['nperiods']))
+        bad = s['period'] < 128
+        return {'xruns': 3 if bad else 0, 'load': {'max': 40.0 if s['nperiods'] == 3 else 60.0}}
+
+    res = tuner.tune(seconds=0, settle=0, settings=SETTINGS, current=RUNNING, measure_fn=fake_measure)
+    assert tried == [(128, 3), (64, 3), (128, 2)]
+    assert res['recommended'] == {'period': 128, 'nperiods': 2} and not res['applied']
+    assert [s['stable'] for s in res['steps']] == [True, False, True]
+    calls = stub_tools.calls()
+    assert [c for c in calls if c.startswith("jack_bufsize")] == ["jack_bufsize 128", "jack_bufsize 64"]
+    assert calls[-1].endswith("dps period 256 dps nperiods 3 start")   # back where it started
+    assert jackserver.load_settings()['period'] == 256
+    assert tuner.recommendation("alsa")['recommended'] == {'period': 128, 'nperiods': 2}
+    assert tuner.recommendation("dummy") is None
+
+
+def test_dsp_load_limit_and_keep(stub_tools):
+    def busy(seconds):
+        return {'xruns': 0, 'load': {'max': 90.0 if jackserver.load_settings()['period'] < 256 else 50.0}}
+
+    res = tuner.tune(seconds=0, settle=0, settings=dict(SETTINGS, period=512), current=dict(RUNNING, period=512),
+                     measure_fn=busy, keep=True, min_nperiods=3)
+    assert res['recommended'] == {'period': 256, 'nperiods': 3} and res['applied']
+    # Period-only steps stay live: no restart at all
+    assert [c for c in stub_tools.calls() if not c.startswith("jack_control dps period")] == \
+        ["jack_bufsize 256", "jack_bufsize 128", "jack_bufsize 256"]
+    assert jackserver.load_settings()['period'] == 256
+
+
+def test_in_window():
+    at = time.mktime((2026, 10, 19, 3, 30, 0, 0, 0, -1))
+    assert tuner.in_window("03:00-05:00", at)
+    assert tuner.in_window("23:00-04:00", at)
+    assert not tuner.in_window("04:00-23:00", at)
+    with pytest.raises(ValueError):
+        tuner.in_window("early morning")
@@ -0,0 +1,73 @@
+"""rdx.wait: waiting for JACK and ports, from callbacks or (without python-jack) jack_lsp."""
+
+import threading
+import time
+import types
+
+from rdx import wait
+
+
+def test_jack_lsp_fallback(stub_tools, monkeypatch):
+    monkeypatch.setattr(wait, "_import_pyjack", lambda: None)
+    monkeypatch.setattr(wait, "FALLBACK_INTERVAL", 0.01)
+    assert not wait.wait(timeout=0.05)['ready']   # no JACK
+    stub_tools.jack(200)
+    res = wait.wait(clients=[wait.ENCODERS], ports=["system:playback_*"], timeout=1)
+    assert res['ready'] and res['via'] == "jack_lsp"
+    assert res['matched'][wait.ENCODERS].startswith("liquidsoap:")
+    assert wait.main(["--client", "nosuch", "--timeout", "0.05", "--quiet"]) == 1
+    assert wait.main(["--client", "nosuch", "--timeout", "0.05", "--soft"]) == 0
+    assert wait.main(["--bogus"]) == 2
+
+
+def _fake_pyjack(server_after: float, port_after: float, name: str):
+    """A server that comes up after ``server_after`` s and registers ``name`` ``port_after`` s after a client activates."""
+    up = time.monotonic() + server_after
+    opened = []
+
+    class Port:
+        def __init__(self, n):
+            self.name = n
+
+    class Client:
+        def __init__(self, *args, **kwargs):
+            if time.monotonic() < up:
+                raise RuntimeError("server not running")
+            opened.append(self)
+
+        def set_port_registration_callback(self, cb):
+            self.cb = cb
+
+        def set_shutdown_callback(self, cb):
+            pass
+
+        def activate(self):
+            threading.Timer(port_after, lambda: self.cb(Port(name), True)).start()
+
+        def get_ports(self):
+            return [Port("system:capture_1")]
+
+        def deactivate(self):
+            pass
+
+        def close(self):
+            pass
+
+    return types.SimpleNamespace(Client=Client), opened
+
+
+def test_port_registration_callback(monkeypatch):
+    pyjack, opened = _fake_pyjack(0.1, 0.2, "Liquidsoap:in_0")
+    monkeypatch.setattr(wait, "_import_pyjack", lambda: pyjack)
+    res = wait.wait(clients=["liquidsoap"], timeout=2)
+    assert res['ready'] and res['via'] == "callback" and len(opened) == 1
+    assert 0.25 <= res['seconds'] < 0.6   # the moment the port registers, not a poll later
+    assert wait.wait(timeout=1)['matched'] == {'*': "system:capture_1"}
+    assert not wait.wait(ports=["rivendell_0:*"], timeout=0.1)['ready']
+
+
+def test_exec_start_pre(monkeypatch):
+    monkeypatch.setattr(wait, "command", lambda: "/usr/local/bin/rdx-wait")
+    assert wait.exec_start_pre() == "ExecStartPre=/usr/local/bin/rdx-wait --timeout 30\n"
+    assert wait.exec_start_pre(clients=[wait.ENCODERS], soft=True) == (
+        "ExecStartPre=/usr/local/bin/rdx-wait --client '{liquidsoap,darkice,butt,glasscoder}' --timeout 30 --soft\n")
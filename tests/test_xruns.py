@@ -0,0 +1,46 @@
+"""rdx.xruns: ring buffers, load statistics and xrun/event correlation."""
+
+from rdx import xruns
+
+
+def test_ring_buffers_stay_bounded():
+    c = xruns.Collector(xruns_kept=10, load_kept=5, events_kept=3)
+    for i in range(100):
+        c.xrun(250.0, t=1000.0 + i)
+        c.load(float(i), t=1000.0 + i)
+        c.event("service", f"e{i}", t=1000.0 + i)
+    assert c.total == 100
+    assert c.xruns_since(0) == 10
+    assert c.load_stats()['samples'] == 5 and c.load_stats()['max'] == 99.0
+    assert [e['detail'] for e in c.snapshot()['events']] == ["e97", "e98", "e99"]
+    c.reset()
+    assert c.total == 0 and c.snapshot()['xruns'] == []
+
+
+def test_load_stats_and_per_minute():
+    c = xruns.Collector()
+    for i, v in enumerate([10, 20, 30, 40, 90]):
+        c.load(v, t=100.0 + i)
+    c.load(None, t=200.0)   # no JACK session: not a sample
+    assert c.load_stats(since=101.0) == {'current': 90.0, 'mean': 45.0, 'p95': 90.0, 'max': 90.0, 'samples': 4}
+    now = 10000.0
+    for t in (now - 10, now - 20, now - 70, now - 3000):
+        c.xrun(t=t)
+    counts = c.per_minute(60, now)
+    assert counts[-1] == 2 and counts[-2] == 1 and counts[-51] == 1 and sum(counts) == 4
+
+
+def test_correlate_finds_events_around_each_xrun():
+    c = xruns.Collector()
+    c.load(35.0, t=95.0)
+    c.load(88.5, t=99.5)
+    c.event("service", "liquidsoap: running → restarting", t=98.0)
+    c.event("routing", xruns.routing_detail({'origin': "reconciler", 'connected': [["a:o", "b:i"]]}), t=101.0)
+    c.event("service", "icecast: stopped → running", t=150.0)
+    c.xrun(1500.0, t=100.0)
+    c.xrun(0.0, t=170.0)
+    late, first = c.correlate()
+    assert late['events'] == [] and late['load'] == 88.5
+    assert first['delayed_usecs'] == 1500.0 and first['load'] == 88.5
+    assert [(e['kind'], e['detail']) for e in first['events']] == [
+        ("service", "liquidsoap: running → restarting"), ("routing", "reconciler +1")]